@@ -16,8 +16,10 @@ from app.routers import (
     image_analysis_router,
     clinic_router,
     package_router,
+    conversation_router,
 )
 from app.config.rate_limits import limiter, custom_rate_limit_handler
+from app.services.cache_invalidation import invalidation_listener
 from slowapi.errors import RateLimitExceeded
 
 settings.validate()
@@ -38,6 +40,10 @@ tags_metadata = [
         "name": "Packages",
         "description": "Maintain reusable package templates that can be assigned to clinics.",
     },
+    {
+        "name": "Conversations",
+        "description": "Page through logged WhatsApp and chat transcripts with stable cursors.",
+    },
 ]
 
 app = FastAPI(
@@ -82,12 +88,26 @@ app.include_router(patient_image_router.router)
 app.include_router(image_analysis_router.router)
 app.include_router(clinic_router.router)
 app.include_router(package_router.router)
+app.include_router(conversation_router.router)
 app.include_router(healthcheck.router)
 
 # Only include test router in debug mode
 if settings.DEBUG:
     app.include_router(test.router)
 
+# Evict in-process caches when other workers write
+@app.on_event("startup")
+def start_cache_invalidation_listener():
+    if invalidation_listener is not None:
+        invalidation_listener.start()
+
+
+@app.on_event("shutdown")
+def stop_cache_invalidation_listener():
+    if invalidation_listener is not None:
+        invalidation_listener.stop()
+
+
 # Root endpoint
 @app.get("/")
 async def read_root():
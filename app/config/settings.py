@@ -1,5 +1,5 @@
 import os
-from typing import List
+from typing import List, Optional
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -12,6 +12,14 @@ class Settings:
     TWILIO_PHONE_NUMBER: str = os.getenv("TWILIO_PHONE_NUMBER", "whatsapp:+14155238886")
     
     DATABASE_URL: str = os.getenv("DATABASE_URL")
+    # Optional read replica for read-only requests and exports; unset keeps
+    # every read on DATABASE_URL
+    DATABASE_READ_URL: Optional[str] = os.getenv("DATABASE_READ_URL") or None
+    # Seconds a client's reads stay on the primary after it wrote, so it sees
+    # its own writes; also when caches filled from the replica are evicted again
+    DATABASE_READ_STICKY_SECONDS: int = int(os.getenv("DATABASE_READ_STICKY_SECONDS", 10))
+    # Replica lag (seconds) beyond which reads fall back to the primary
+    DATABASE_READ_MAX_LAG_SECONDS: float = float(os.getenv("DATABASE_READ_MAX_LAG_SECONDS", 5))
 
     OPENAI_API_KEY: str = os.getenv("OPENAI_API_KEY")
     
@@ -35,6 +43,45 @@ class Settings:
         "SUPABASE_IMAGE_BUCKET", "istanbulmedic_patient_images"
     )
     
+    # Read cache backend: "memory" (per-process LRU) or "redis" (shared by all
+    # workers; CACHE_URL points at any Redis-compatible server)
+    CACHE_BACKEND: str = os.getenv("CACHE_BACKEND", "memory").lower()
+    CACHE_URL: str = os.getenv("CACHE_URL", "redis://localhost:6379/0")
+    # Entry bound for the memory backend
+    CACHE_MAX_ENTRIES: int = int(os.getenv("CACHE_MAX_ENTRIES", 4096))
+    # Seconds a patient detail response may be served from the read cache
+    PATIENT_DETAILS_CACHE_TTL: int = int(os.getenv("PATIENT_DETAILS_CACHE_TTL", 30))
+    # Seconds a single clinic or package response may be served from the read cache
+    CATALOG_DETAILS_CACHE_TTL: int = int(os.getenv("CATALOG_DETAILS_CACHE_TTL", 300))
+    # Seconds today's consultation list may be served from the read cache
+    CONSULTATIONS_CACHE_TTL: int = int(os.getenv("CONSULTATIONS_CACHE_TTL", 30))
+    # Postgres LISTEN/NOTIFY channel workers use to evict each other's
+    # in-process caches after writes; empty disables publishing and listening
+    CACHE_INVALIDATION_CHANNEL: str = os.getenv("CACHE_INVALIDATION_CHANNEL", "cache_invalidation")
+    # Seconds between full local cache flushes while a worker's invalidation
+    # listener is disconnected, bounding staleness until it re-subscribes
+    CACHE_INVALIDATION_FALLBACK_SECONDS: int = int(os.getenv("CACHE_INVALIDATION_FALLBACK_SECONDS", 30))
+    # Seconds clinic catalog totals (per hasContract filter) are reused between writes
+    CLINIC_COUNT_CACHE_TTL: int = int(os.getenv("CLINIC_COUNT_CACHE_TTL", 300))
+    # Seconds before the in-memory clinic geo index is rebuilt from the database
+    CLINIC_GEO_INDEX_TTL: int = int(os.getenv("CLINIC_GEO_INDEX_TTL", 300))
+    # Seconds before the in-memory faceted catalog search index is rebuilt
+    CATALOG_SEARCH_INDEX_TTL: int = int(os.getenv("CATALOG_SEARCH_INDEX_TTL", 300))
+    # Seconds before the clinic recommender's feature matrix is rebuilt
+    CLINIC_RECOMMENDER_TTL: int = int(os.getenv("CLINIC_RECOMMENDER_TTL", 300))
+    # Seconds a pre-rendered catalog response (clinic pages, package lists) may
+    # be served from memory when no local write has retired it; 0 disables
+    CATALOG_SNAPSHOT_TTL: int = int(os.getenv("CATALOG_SNAPSHOT_TTL", 300))
+    # Currency package prices are normalised into, and the offline rate file
+    # used when the fx_rates table is empty or unreachable
+    FX_BASE_CURRENCY: str = os.getenv("FX_BASE_CURRENCY", "USD").upper()
+    FX_RATES_FILE: str = os.getenv(
+        "FX_RATES_FILE",
+        os.path.join(os.path.dirname(os.path.abspath(__file__)), "fx_rates.json"),
+    )
+    # Seconds FX rates are reused in-process before being re-read
+    FX_RATES_CACHE_TTL: int = int(os.getenv("FX_RATES_CACHE_TTL", 3600))
+    
     ENVIRONMENT: str = os.getenv("ENVIRONMENT", "development")
     DEBUG: bool = os.getenv("DEBUG", "true").lower() == "true"
     
@@ -6,16 +6,28 @@ from app.config.settings import settings
 
 
 DATABASE_URL = settings.DATABASE_URL
+DATABASE_READ_URL = settings.DATABASE_READ_URL
 
-# Create engine with connection pooling
-engine = create_engine(
-    DATABASE_URL,
-    pool_pre_ping=True,
-    pool_recycle=300,
-    echo=False,
-    connect_args={"options": "-c timezone=utc"}
-)
+
+def _create_engine(url):
+    # Create engine with connection pooling
+    return create_engine(
+        url,
+        pool_pre_ping=True,
+        pool_recycle=300,
+        echo=False,
+        connect_args={"options": "-c timezone=utc"}
+    )
+
+
+engine = _create_engine(DATABASE_URL)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+# Optional read replica (see app.services.read_routing); without one, reads
+# share the primary engine
+read_engine = _create_engine(DATABASE_READ_URL) if DATABASE_READ_URL else engine
+ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=read_engine)
+
 Base = declarative_base()
 
 # Dependency for FastAPI routes
@@ -4,11 +4,13 @@ import uuid
 from datetime import datetime
 from typing import Any, List, Optional
 
-from sqlalchemy import Boolean, DateTime, Float, Integer, String, text
+from sqlalchemy import Boolean, DateTime, Float, Index, Integer, LargeBinary, String, event, inspect, text
 from sqlalchemy.dialects.postgresql import ARRAY, JSONB, UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.sql import func
 
+from app.utils.opening_hours_utils import OpeningHoursUtils
+
 from .base import Base
 
 
@@ -48,6 +50,13 @@ class Clinic(Base):
     opening_hours: Mapped[Optional[dict[str, Any]]] = mapped_column(
         JSONB, nullable=True
     )
+    # `opening_hours` parsed into one bit per local 15-minute slot of the week
+    # (see OpeningHoursUtils) and the IANA timezone those slots are in; kept in
+    # sync on flush so open-now filters never re-parse the JSON
+    opening_hours_bitmap: Mapped[Optional[bytes]] = mapped_column(
+        LargeBinary, nullable=True
+    )
+    timezone: Mapped[Optional[str]] = mapped_column(String, nullable=True)
     additional_info: Mapped[Optional[dict[str, Any]]] = mapped_column(
         JSONB, nullable=True
     )
@@ -81,5 +90,33 @@ class Clinic(Base):
         lazy="selectin",
     )
 
+    # Keyset pagination indexes for the catalog listing (see migration 015)
+    __table_args__ = (
+        Index("idx_clinics_updated_at_id", "updated_at", "id"),
+        Index("idx_clinics_has_contract_updated_at_id", "has_contract", "updated_at", "id"),
+    )
+
     def __repr__(self) -> str:
         return f"<Clinic {self.id} ({self.title})>"
+
+
+def _set_opening_hours_bitmap(target: Clinic) -> None:
+    target.opening_hours_bitmap = OpeningHoursUtils.parse(target.opening_hours)
+    target.timezone = OpeningHoursUtils.resolve_timezone(
+        target.opening_hours, target.country, target.lng
+    )
+
+
+@event.listens_for(Clinic, "before_insert")
+def _set_opening_hours_bitmap_on_insert(mapper, connection, target: Clinic) -> None:
+    _set_opening_hours_bitmap(target)
+
+
+@event.listens_for(Clinic, "before_update")
+def _set_opening_hours_bitmap_on_update(mapper, connection, target: Clinic) -> None:
+    state = inspect(target)
+    if any(
+        state.attrs[name].history.has_changes()
+        for name in ("opening_hours", "country", "lng")
+    ):
+        _set_opening_hours_bitmap(target)
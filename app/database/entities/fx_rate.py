@@ -0,0 +1,32 @@
+from __future__ import annotations
+
+from datetime import datetime
+from decimal import Decimal
+
+from sqlalchemy import DateTime, Numeric, String
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.sql import func
+
+from .base import Base
+
+
+class FxRate(Base):
+    """
+    Conversion rate from a package currency into the catalog base currency
+    (settings.FX_BASE_CURRENCY): one unit of `currency` is `rate_to_base`
+    units of the base currency.
+    """
+
+    __tablename__ = "fx_rates"
+
+    currency: Mapped[str] = mapped_column(String(3), primary_key=True)
+    rate_to_base: Mapped[Decimal] = mapped_column(Numeric(18, 8), nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        onupdate=func.now(),
+        nullable=False,
+    )
+
+    def __repr__(self) -> str:  # pragma: no cover - simple repr helper
+        return f"<FxRate {self.currency}={self.rate_to_base}>"
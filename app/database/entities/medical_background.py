@@ -1,7 +1,9 @@
 import typing
 import uuid
 
-from sqlalchemy import ForeignKey, UniqueConstraint
+from typing import Optional
+
+from sqlalchemy import ForeignKey, Index, String, UniqueConstraint
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.ext.mutable import MutableDict
 from sqlalchemy.orm import Mapped, mapped_column, relationship
@@ -37,6 +39,11 @@ class MedicalBackground(Base, IdMixin):
         default_factory=dict
     )
 
+    # Cal.com booking UID of the questionnaire submission that last wrote this record
+    booking_uid: Mapped[Optional[str]] = mapped_column(
+        String, nullable=True, default=None
+    )
+
     # Relationships
     patient_profile: Mapped["PatientProfile"] = relationship(
         "PatientProfile",
@@ -47,6 +54,7 @@ class MedicalBackground(Base, IdMixin):
     # Constraints
     __table_args__ = (
         UniqueConstraint("patient_profile_id", name="uq_medical_background_patient_profile_id"),
+        Index("idx_medical_backgrounds_booking_uid", "booking_uid"),
     )
 
     def __repr__(self):
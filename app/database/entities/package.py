@@ -10,17 +10,23 @@ from sqlalchemy import (
     Column,
     DateTime,
     ForeignKey,
+    Index,
     Integer,
     Numeric,
     String,
     Table,
     Text,
+    event,
+    inspect,
+    literal,
+    select,
 )
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.sql import func
 
 from .base import Base
+from .fx_rate import FxRate
 
 
 clinic_packages = Table(
@@ -61,6 +67,9 @@ class Package(Base):
     description: Mapped[str | None] = mapped_column(Text, nullable=True)
     price: Mapped[Decimal | None] = mapped_column(Numeric(12, 2), nullable=True)
     currency: Mapped[str] = mapped_column(String(3), nullable=False, default="USD")
+    # `price` converted into the FX base currency; kept in sync on flush and
+    # recomputed in bulk when fx_rates change (see app.services.fx_rates)
+    price_normalized: Mapped[Decimal | None] = mapped_column(Numeric(12, 2), nullable=True)
     is_active: Mapped[bool] = mapped_column(
         Boolean, nullable=False, server_default="true", default=True
     )
@@ -111,5 +120,49 @@ class Package(Base):
         lazy="selectin",
     )
 
+    __table_args__ = (
+        Index("idx_packages_active_price_normalized", "is_active", "price_normalized"),
+    )
+
+    @staticmethod
+    def normalized_price_expression(price: Decimal | None, currency: str | None):
+        """
+        SQL for `price` in the base currency, read from fx_rates in the same
+        statement. NULL when the price or the currency's rate is unknown.
+        """
+        if price is None or not currency:
+            return None
+        return (
+            select(func.round(literal(price, Numeric(12, 2)) * FxRate.rate_to_base, 2))
+            .where(FxRate.currency == currency.upper())
+            .scalar_subquery()
+        )
+
+    @staticmethod
+    def method_token(value: str | None) -> str | None:
+        """
+        A transplant method as a short lowercase token, so stored values and
+        patient or client input compare equal: "FUE Transplant Method",
+        "FUE" and "fue" -> "fue"; "Sapphire FUE Method" -> "sapphire fue".
+        None when the value is empty.
+        """
+        words = (value or "").lower().split()
+        for suffix in ("method", "transplant"):
+            if len(words) > 1 and words[-1] == suffix:
+                words.pop()
+        return " ".join(words) or None
+
     def __repr__(self) -> str:  # pragma: no cover - simple repr helper
         return f"<Package {self.id} ({self.name})>"
+
+
+@event.listens_for(Package, "before_insert")
+def _set_price_normalized_on_insert(mapper, connection, target: Package) -> None:
+    target.price_normalized = Package.normalized_price_expression(target.price, target.currency)
+
+
+@event.listens_for(Package, "before_update")
+def _set_price_normalized_on_update(mapper, connection, target: Package) -> None:
+    state = inspect(target)
+    if state.attrs.price.history.has_changes() or state.attrs.currency.history.has_changes():
+        target.price_normalized = Package.normalized_price_expression(target.price, target.currency)
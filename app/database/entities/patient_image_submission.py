@@ -1,8 +1,9 @@
+import hashlib
 import typing
 import uuid
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterable, List, Optional
 
-from sqlalchemy import ForeignKey, String, Text
+from sqlalchemy import ForeignKey, Index, String, Text, event
 from sqlalchemy.dialects.postgresql import ARRAY, JSONB
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -24,10 +25,39 @@ class PatientImageSubmission(Base, IdMixin):
     image_urls: Mapped[List[str]] = mapped_column(ARRAY(String), nullable=False)
     analysis: Mapped[Optional[Dict[str, Any]]] = mapped_column(JSONB, nullable=True)
     analysis_notes: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    # SHA-256 of the sorted URL set, kept in sync on flush (see hash_image_urls)
+    image_urls_hash: Mapped[Optional[str]] = mapped_column(
+        String(64), nullable=True, init=False, default=None
+    )
 
     patient_profile: Mapped["PatientProfile"] = relationship(
         "PatientProfile", back_populates="image_submissions", init=False
     )
 
+    __table_args__ = (
+        Index(
+            "idx_patient_image_submissions_profile_id_urls_hash",
+            "patient_profile_id",
+            "image_urls_hash",
+        ),
+    )
+
+    @staticmethod
+    def hash_image_urls(image_urls: Iterable[str]) -> str:
+        """
+        Order-insensitive digest of a URL list.
+
+        URLs are sorted by code point and newline-joined, matching the SQL
+        backfill in migration 014 (`string_agg(url, E'\\n' ORDER BY url COLLATE "C")`).
+        """
+        joined = "\n".join(sorted(image_urls))
+        return hashlib.sha256(joined.encode("utf-8")).hexdigest()
+
     def __repr__(self) -> str:  # pragma: no cover - debug helper
         return f"<PatientImageSubmission {self.id}>"
+
+
+@event.listens_for(PatientImageSubmission, "before_insert")
+@event.listens_for(PatientImageSubmission, "before_update")
+def _sync_image_urls_hash(mapper, connection, target: PatientImageSubmission) -> None:
+    target.image_urls_hash = PatientImageSubmission.hash_image_urls(target.image_urls or [])
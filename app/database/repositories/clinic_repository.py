@@ -1,11 +1,16 @@
 from __future__ import annotations
 
 import uuid
+from datetime import datetime, timezone
 from typing import List, Optional, Sequence, Tuple
 
-from sqlalchemy.orm import Session
+from sqlalchemy import Integer, bindparam, cast, delete, func, select, text, true, tuple_, update
+from sqlalchemy.dialects.postgresql import aggregate_order_by, insert
+from sqlalchemy.orm import Session, lazyload, load_only, selectinload
 
 from app.database.entities import Clinic, Package
+from app.database.entities.package import clinic_packages
+from app.utils.opening_hours_utils import SLOT_MINUTES, SLOTS_PER_DAY, OpeningHoursUtils
 
 
 class ClinicRepository:
@@ -14,42 +19,199 @@ class ClinicRepository:
     def __init__(self, db: Session) -> None:
         self.db = db
 
+    @staticmethod
+    def read_options(columns: Optional[Sequence[str]] = None, with_packages: bool = True) -> list:
+        """
+        Loader options for read queries.
+
+        `columns` projects the clinic row onto those attributes (id and
+        updated_at are always kept for lookups and cursors). Packages are
+        selectin-loaded without their own back-reference to clinics, or not
+        loaded at all when `with_packages` is False.
+        """
+        options = []
+        if columns is not None:
+            wanted = dict.fromkeys(["id", "updated_at", *columns])
+            options.append(load_only(*(getattr(Clinic, name) for name in wanted)))
+        if with_packages:
+            options.append(selectinload(Clinic.packages).lazyload(Package.clinics))
+        else:
+            options.append(lazyload(Clinic.packages))
+        return options
+
     def list_paginated(
         self,
         *,
         page: int,
         limit: int,
         has_contract: Optional[bool] = None,
-    ) -> Tuple[List[Clinic], int]:
-        query = self.db.query(Clinic)
+        open_at: Optional[datetime] = None,
+        columns: Optional[Sequence[str]] = None,
+        with_packages: bool = True,
+    ) -> List[Clinic]:
+        """
+        One page of clinics by OFFSET, ordered like list_page. Totals come
+        from `count`.
+        """
+        query = self.db.query(Clinic).options(*self.read_options(columns, with_packages))
         if has_contract is not None:
             query = query.filter(Clinic.has_contract.is_(has_contract))
+        if open_at is not None:
+            query = query.filter(self.open_at_clause(open_at))
 
-        total = query.count()
-        clinics = (
-            query.order_by(Clinic.updated_at.desc())
+        return (
+            query.order_by(Clinic.updated_at.desc(), Clinic.id.desc())
             .offset((page - 1) * limit)
             .limit(limit)
             .all()
         )
-        return clinics, total
 
-    def get_by_id(self, clinic_id: uuid.UUID) -> Optional[Clinic]:
+    def list_page(
+        self,
+        *,
+        limit: int,
+        after: Optional[Tuple[datetime, uuid.UUID]] = None,
+        has_contract: Optional[bool] = None,
+        open_at: Optional[datetime] = None,
+        columns: Optional[Sequence[str]] = None,
+        with_packages: bool = True,
+    ) -> List[Clinic]:
+        """
+        Keyset-paginated clinics ordered by (updated_at, id), most recent first.
+
+        Returns up to `limit + 1` rows so callers can tell whether another page exists.
+        """
+        query = self.db.query(Clinic).options(*self.read_options(columns, with_packages))
+        if has_contract is not None:
+            query = query.filter(Clinic.has_contract.is_(has_contract))
+        if open_at is not None:
+            query = query.filter(self.open_at_clause(open_at))
+        if after is not None:
+            query = query.filter(tuple_(Clinic.updated_at, Clinic.id) < tuple_(*after))
+
         return (
-            self.db.query(Clinic)
-            .filter(Clinic.id == clinic_id)
-            .one_or_none()
+            query.order_by(Clinic.updated_at.desc(), Clinic.id.desc())
+            .limit(limit + 1)
+            .all()
         )
 
-    def get_by_ids(self, clinic_ids: Sequence[uuid.UUID]) -> List[Clinic]:
+    def count(
+        self,
+        *,
+        has_contract: Optional[bool] = None,
+        open_at: Optional[datetime] = None,
+    ) -> int:
+        """Total clinics for the filter; see app.services.clinic_cache for the cached totals."""
+        query = self.db.query(func.count(Clinic.id))
+        if has_contract is not None:
+            query = query.filter(Clinic.has_contract.is_(has_contract))
+        if open_at is not None:
+            query = query.filter(self.open_at_clause(open_at))
+        return query.scalar()
+
+    @staticmethod
+    def open_at_clause(at: datetime):
+        """
+        Clinics whose opening-hours bitmap has the slot for `at` set, with the
+        slot computed in each clinic's own timezone. Naive datetimes are UTC.
+        """
+        if at.tzinfo is None:
+            at = at.replace(tzinfo=timezone.utc)
+        local = func.timezone(func.coalesce(Clinic.timezone, "UTC"), at)
+        slot = (
+            (cast(func.extract("isodow", local), Integer) - 1) * SLOTS_PER_DAY
+            + cast(func.extract("hour", local), Integer) * (60 // SLOT_MINUTES)
+            + cast(func.floor(func.extract("minute", local) / SLOT_MINUTES), Integer)
+        )
+        return func.get_bit(Clinic.opening_hours_bitmap, slot) == 1
+
+    def backfill_opening_hours(self, *, batch_size: int = 500, only_missing: bool = True) -> int:
+        """
+        Parse `opening_hours` into `opening_hours_bitmap`/`timezone` for existing rows.
+
+        Walks clinics in id order, one commit per batch, without touching
+        updated_at. With `only_missing`, rows that already have a timezone
+        (i.e. were written since migration 017) are skipped.
+        """
+        clinics = Clinic.__table__
+        statement = (
+            update(clinics)
+            .where(clinics.c.id == bindparam("clinic_id"))
+            .values(
+                opening_hours_bitmap=bindparam("bitmap"),
+                timezone=bindparam("timezone_name"),
+                updated_at=clinics.c.updated_at,
+            )
+        )
+        updated = 0
+        after: Optional[uuid.UUID] = None
+        while True:
+            query = (
+                select(clinics.c.id, clinics.c.opening_hours, clinics.c.country, clinics.c.lng)
+                .order_by(clinics.c.id)
+                .limit(batch_size)
+            )
+            if only_missing:
+                query = query.where(clinics.c.timezone.is_(None))
+            if after is not None:
+                query = query.where(clinics.c.id > after)
+            rows = self.db.execute(query).all()
+            if not rows:
+                break
+            self.db.execute(
+                statement,
+                [
+                    {
+                        "clinic_id": row.id,
+                        "bitmap": OpeningHoursUtils.parse(row.opening_hours),
+                        "timezone_name": OpeningHoursUtils.resolve_timezone(
+                            row.opening_hours, row.country, row.lng
+                        ),
+                    }
+                    for row in rows
+                ],
+            )
+            self.db.commit()
+            updated += len(rows)
+            after = rows[-1].id
+        return updated
+
+    def get_by_id(
+        self,
+        clinic_id: uuid.UUID,
+        *,
+        columns: Optional[Sequence[str]] = None,
+        with_packages: bool = True,
+    ) -> Optional[Clinic]:
+        query = self.db.query(Clinic)
+        if columns is not None or not with_packages:
+            query = query.options(*self.read_options(columns, with_packages))
+        return query.filter(Clinic.id == clinic_id).one_or_none()
+
+    def get_by_ids(
+        self,
+        clinic_ids: Sequence[uuid.UUID],
+        *,
+        columns: Optional[Sequence[str]] = None,
+        with_packages: bool = True,
+    ) -> List[Clinic]:
         if not clinic_ids:
             return []
         return (
             self.db.query(Clinic)
+            .options(*self.read_options(columns, with_packages))
             .filter(Clinic.id.in_(list(clinic_ids)))
             .all()
         )
 
+    def missing_ids(self, clinic_ids: Sequence[uuid.UUID]) -> List[uuid.UUID]:
+        """Ids among `clinic_ids` with no clinic, checked without loading the clinics."""
+        wanted = set(clinic_ids)
+        if not wanted:
+            return []
+        found = set(self.db.scalars(select(Clinic.id).where(Clinic.id.in_(list(wanted)))))
+        return sorted(wanted - found)
+
     def get_packages(self, clinic: Clinic) -> List[Package]:
         """Get all packages associated with a clinic."""
         return list(clinic.packages)
@@ -61,17 +223,142 @@ class ClinicRepository:
         *,
         has_contract: Optional[bool] = None,
     ) -> Clinic:
-        clinic.packages = list(packages)
-        clinic.package_ids = [pkg.id for pkg in packages]
+        """Replace the clinic's packages; see assign_packages."""
+        self.assign_packages(
+            [pkg.id for pkg in packages],
+            clinic_ids=[clinic.id],
+            replace=True,
+            has_contract=has_contract,
+        )
+        return clinic
 
-        if has_contract is not None:
-            clinic.has_contract = has_contract
+    def add_package(self, clinic_id: uuid.UUID, package_id: uuid.UUID) -> Optional[Clinic]:
+        """
+        Link one package to a clinic and refresh its `package_ids` mirror.
 
-        self.db.add(clinic)
+        The clinic row is locked first, so concurrent link changes to one
+        clinic run one after another and none is lost. The package must
+        exist; callers validate it beforehand.
+        return:
+            return the updated clinic, or None when the clinic does not exist
+        """
+        linked = (
+            insert(clinic_packages)
+            .values(clinic_id=clinic_id, package_id=package_id)
+            .on_conflict_do_nothing()
+        )
+        return self._change_links(clinic_id, linked)
+
+    def remove_package(self, clinic_id: uuid.UUID, package_id: uuid.UUID) -> Optional[Clinic]:
+        """
+        Unlink one package from a clinic and refresh its `package_ids` mirror.
+        return:
+            return the updated clinic, or None when the clinic does not exist
+        """
+        unlinked = delete(clinic_packages).where(
+            clinic_packages.c.clinic_id == clinic_id, clinic_packages.c.package_id == package_id
+        )
+        return self._change_links(clinic_id, unlinked)
+
+    def _change_links(self, clinic_id: uuid.UUID, link_statement) -> Optional[Clinic]:
+        if not self._lock_clinics(Clinic.id == clinic_id):
+            self.db.rollback()
+            return None
+        self.db.execute(link_statement)
+        statement = (
+            update(Clinic)
+            .where(Clinic.id == clinic_id)
+            .values(package_ids=self._mirrored_package_ids())
+            .returning(Clinic)
+            .execution_options(populate_existing=True)
+        )
+        clinic = self.db.scalars(statement).one()
         self.db.commit()
-        self.db.refresh(clinic)
         return clinic
 
+    def _lock_clinics(self, scope) -> List[uuid.UUID]:
+        # Lock clinic rows before their links change. Each later statement in
+        # the transaction then sees every link committed by earlier holders,
+        # so the mirror rebuilt from clinic_packages is never stale. Locks are
+        # taken in id order so overlapping writers cannot deadlock.
+        return list(self.db.scalars(
+            select(Clinic.id).where(scope).order_by(Clinic.id).with_for_update()
+        ))
+
+    @staticmethod
+    def _mirrored_package_ids():
+        """`package_ids` rebuilt from clinic_packages, for an UPDATE of clinics."""
+        clinics = Clinic.__table__
+        mirrored = (
+            select(func.array_agg(aggregate_order_by(
+                clinic_packages.c.package_id, clinic_packages.c.assigned_at, clinic_packages.c.package_id
+            )))
+            .where(clinic_packages.c.clinic_id == clinics.c.id)
+            .scalar_subquery()
+        )
+        return func.coalesce(mirrored, text("'{}'::uuid[]"))
+
+    def assign_packages(
+        self,
+        package_ids: Sequence[uuid.UUID],
+        *,
+        clinic_ids: Optional[Sequence[uuid.UUID]] = None,
+        replace: bool = False,
+        has_contract: Optional[bool] = None,
+    ) -> Tuple[int, int, int]:
+        """
+        Link packages to many clinics with set-based statements in one transaction.
+
+        `clinic_ids=None` targets every clinic. With `replace`, links to other
+        packages are removed first. The `package_ids` mirror is rebuilt from
+        clinic_packages for the targeted clinics only. Unknown ids are ignored;
+        callers validate them beforehand.
+        return:
+            return (clinics touched, links inserted, links removed)
+        """
+        clinics = Clinic.__table__
+        packages = Package.__table__
+        package_ids = list(dict.fromkeys(package_ids))
+        clinic_scope = true() if clinic_ids is None else clinics.c.id.in_(list(clinic_ids))
+        link_scope = true() if clinic_ids is None else clinic_packages.c.clinic_id.in_(list(clinic_ids))
+
+        self._lock_clinics(clinic_scope)
+        # Core statements on the session's connection: ORM execution drops rowcount
+        connection = self.db.connection()
+        removed = 0
+        if replace:
+            statement = delete(clinic_packages).where(link_scope)
+            if package_ids:
+                statement = statement.where(clinic_packages.c.package_id.not_in(package_ids))
+            removed = connection.execute(statement).rowcount
+
+        inserted = 0
+        if package_ids:
+            pairs = (
+                select(clinics.c.id, packages.c.id)
+                .join(packages, packages.c.id.in_(package_ids))
+                .where(clinic_scope)
+            )
+            # rowcount is not reported for ON CONFLICT inserts; count the RETURNING rows instead
+            linked = (
+                insert(clinic_packages)
+                .from_select(["clinic_id", "package_id"], pairs)
+                .on_conflict_do_nothing()
+                .returning(clinic_packages.c.clinic_id)
+                .cte("linked")
+            )
+            inserted = connection.execute(select(func.count()).select_from(linked)).scalar_one()
+
+        values = {
+            "package_ids": self._mirrored_package_ids(),
+            "updated_at": func.now(),
+        }
+        if has_contract is not None:
+            values["has_contract"] = has_contract
+        touched = connection.execute(update(clinics).where(clinic_scope).values(**values)).rowcount
+        self.db.commit()
+        return touched, inserted, removed
+
     def update_has_contract(
         self,
         clinic: Clinic,
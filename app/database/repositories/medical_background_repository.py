@@ -1,6 +1,8 @@
 import uuid
 from typing import Optional, Union, Dict, Any
-from sqlalchemy.orm import Session
+from sqlalchemy import func, text
+from sqlalchemy.dialects.postgresql import JSONB, insert
+from sqlalchemy.orm import Session, joinedload
 
 from app.database.entities import MedicalBackground
 
@@ -12,7 +14,8 @@ class MedicalBackgroundRepository:
     def create(
         self, 
         patient_profile_id: Union[str, uuid.UUID], 
-        medical_data: Optional[Dict[str, Any]] = None
+        medical_data: Optional[Dict[str, Any]] = None,
+        booking_uid: Optional[str] = None
     ) -> MedicalBackground:
         # Convert string UUIDs to UUID objects if needed
         if isinstance(patient_profile_id, str):
@@ -23,7 +26,8 @@ class MedicalBackgroundRepository:
 
         medical_background = MedicalBackground(
             patient_profile_id=patient_profile_id,
-            medical_data=medical_data
+            medical_data=medical_data,
+            booking_uid=booking_uid
         )
         self.db.add(medical_background)
         self.db.commit()
@@ -36,6 +40,44 @@ class MedicalBackgroundRepository:
         self.db.refresh(medical_background)
         return medical_background
 
+    def merge_medical_data(
+        self,
+        patient_profile_id: Union[str, uuid.UUID],
+        changes: Dict[str, Any],
+    ) -> MedicalBackground:
+        """
+        Merge top-level keys into the patient's medical data in one statement,
+        creating the record when the patient has none. Keys not in `changes`
+        keep their stored values, so concurrent edits to different keys are
+        all kept.
+        """
+        if isinstance(patient_profile_id, str):
+            patient_profile_id = uuid.UUID(patient_profile_id)
+
+        table = MedicalBackground.__table__
+        statement = insert(MedicalBackground).values(
+            id=uuid.uuid4(),
+            patient_profile_id=patient_profile_id,
+            medical_data=changes,
+        )
+        statement = (
+            statement.on_conflict_do_update(
+                index_elements=[MedicalBackground.patient_profile_id],
+                set_={
+                    "medical_data": func.coalesce(table.c.medical_data, text("'{}'::jsonb"))
+                    .op("||", return_type=JSONB)(statement.excluded.medical_data),
+                    "updated_at": func.now(),
+                },
+            )
+            .returning(MedicalBackground)
+            .execution_options(populate_existing=True)
+        )
+        medical_background = self.db.scalars(statement).one()
+        # Detach so the commit does not expire the returned state
+        self.db.expunge(medical_background)
+        self.db.commit()
+        return medical_background
+
     def get_by_id(self, medical_background_id: Union[str, uuid.UUID]) -> Optional[MedicalBackground]:
         if isinstance(medical_background_id, str):
             medical_background_id = uuid.UUID(medical_background_id)
@@ -47,3 +89,13 @@ class MedicalBackgroundRepository:
             patient_profile_id = uuid.UUID(patient_profile_id)
 
         return self.db.query(MedicalBackground).filter(MedicalBackground.patient_profile_id == patient_profile_id).first()
+
+    def get_by_booking_uid(self, booking_uid: str) -> Optional[MedicalBackground]:
+        """Fetch the medical background for a booking, with its patient profile joined in."""
+        return (
+            self.db.query(MedicalBackground)
+            .options(joinedload(MedicalBackground.patient_profile))
+            .filter(MedicalBackground.booking_uid == booking_uid)
+            .order_by(MedicalBackground.updated_at.desc())
+            .first()
+        )
@@ -1,6 +1,8 @@
 import uuid
-from typing import Optional, Union, List
-from sqlalchemy.orm import Session
+from datetime import datetime
+from typing import Optional, Union, List, Tuple
+from sqlalchemy import tuple_
+from sqlalchemy.orm import Session, selectinload
 
 from app.database.entities import Message
 
@@ -39,4 +41,56 @@ class MessageRepository:
         if isinstance(user_id, str):
             user_id = uuid.UUID(user_id)
         
-        return self.db.query(Message).filter(Message.user_id == user_id).order_by(Message.created_at.desc()).limit(limit).all()
+        return (
+            self.db.query(Message)
+            .options(selectinload(Message.media))
+            .filter(Message.user_id == user_id)
+            .order_by(Message.created_at.desc())
+            .limit(limit)
+            .all()
+        )
+
+    def list_page_by_user(
+        self,
+        user_id: Union[str, uuid.UUID],
+        *,
+        limit: int,
+        after: Optional[Tuple[datetime, uuid.UUID]] = None,
+        newest_first: bool = True,
+        direction: Optional[str] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+    ) -> List[Message]:
+        """
+        Keyset-paginated slice of a user's messages ordered by `(created_at, id)`.
+
+        `after` is the sort key of the last row of the previous page. Up to
+        `limit + 1` rows are returned so callers can tell whether another page exists.
+        Media is batch-loaded with a single extra query per page.
+        """
+        if isinstance(user_id, str):
+            user_id = uuid.UUID(user_id)
+
+        query = (
+            self.db.query(Message)
+            .options(selectinload(Message.media))
+            .filter(Message.user_id == user_id)
+        )
+        if direction is not None:
+            query = query.filter(Message.direction == direction)
+        if since is not None:
+            query = query.filter(Message.created_at >= since)
+        if until is not None:
+            query = query.filter(Message.created_at < until)
+
+        sort_key = tuple_(Message.created_at, Message.id)
+        if after is not None:
+            cursor_key = tuple_(*after)
+            query = query.filter(sort_key < cursor_key if newest_first else sort_key > cursor_key)
+
+        if newest_first:
+            query = query.order_by(Message.created_at.desc(), Message.id.desc())
+        else:
+            query = query.order_by(Message.created_at.asc(), Message.id.asc())
+
+        return query.limit(limit + 1).all()
@@ -2,41 +2,100 @@ from __future__ import annotations
 
 import uuid
 from decimal import Decimal
-from typing import Iterable, List, Optional, Sequence
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence
 
-from sqlalchemy.orm import Session
+from sqlalchemy import func, inspect, literal_column, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session, lazyload, load_only
 
-from app.database.entities import Package
+from app.database.entities import FxRate, Package
+
+
+# Columns callers may set through bulk_upsert; timestamps and the normalized
+# price are maintained by the statement itself
+_UPSERT_COLUMNS = frozenset(
+    column.key
+    for column in Package.__table__.columns
+    if column.key not in {"created_at", "updated_at", "price_normalized"}
+)
+
+# Currency of packages created without one
+DEFAULT_CURRENCY = Package.__table__.c.currency.default.arg
 
 
 class PackageRepository:
     """Data access helpers for clinic packages."""
 
+    BULK_CHUNK_SIZE = 500
+
     def __init__(self, db: Session) -> None:
         self.db = db
 
+    @staticmethod
+    def read_options(columns: Optional[Sequence[str]] = None) -> list:
+        """
+        Loader options for read queries: skip the clinics back-reference and,
+        with `columns`, project onto those attributes (plus id and updated_at).
+        """
+        options = [lazyload(Package.clinics)]
+        if columns is not None:
+            wanted = dict.fromkeys(["id", "updated_at", *columns])
+            options.append(load_only(*(getattr(Package, name) for name in wanted)))
+        return options
+
     def list(
         self,
         *,
         include_inactive: bool = False,
+        min_price: Optional[Decimal] = None,
+        max_price: Optional[Decimal] = None,
+        sort: Optional[str] = None,
+        columns: Optional[Sequence[str]] = None,
     ) -> List[Package]:
-        query = self.db.query(Package)
+        """
+        List packages, newest first by default.
+
+        Price bounds and `sort="price"` / `"-price"` use `price_normalized`,
+        i.e. amounts in the FX base currency; unpriced packages sort last.
+        """
+        query = self.db.query(Package).options(*self.read_options(columns))
         if not include_inactive:
             query = query.filter(Package.is_active.is_(True))
-        return query.order_by(Package.created_at.desc()).all()
+        if min_price is not None:
+            query = query.filter(Package.price_normalized >= min_price)
+        if max_price is not None:
+            query = query.filter(Package.price_normalized <= max_price)
 
-    def get_by_id(self, package_id: uuid.UUID) -> Optional[Package]:
-        return (
-            self.db.query(Package)
-            .filter(Package.id == package_id)
-            .one_or_none()
-        )
+        if sort == "price":
+            query = query.order_by(Package.price_normalized.asc().nulls_last(), Package.id)
+        elif sort == "-price":
+            query = query.order_by(Package.price_normalized.desc().nulls_last(), Package.id)
+        else:
+            query = query.order_by(Package.created_at.desc())
+        return query.all()
 
-    def get_by_ids(self, package_ids: Sequence[uuid.UUID]) -> List[Package]:
+    def get_by_id(
+        self,
+        package_id: uuid.UUID,
+        *,
+        columns: Optional[Sequence[str]] = None,
+    ) -> Optional[Package]:
+        query = self.db.query(Package)
+        if columns is not None:
+            query = query.options(*self.read_options(columns))
+        return query.filter(Package.id == package_id).one_or_none()
+
+    def get_by_ids(
+        self,
+        package_ids: Sequence[uuid.UUID],
+        *,
+        columns: Optional[Sequence[str]] = None,
+    ) -> List[Package]:
         if not package_ids:
             return []
         return (
             self.db.query(Package)
+            .options(*self.read_options(columns))
             .filter(Package.id.in_(list(package_ids)))
             .all()
         )
@@ -47,7 +106,7 @@ class PackageRepository:
         name: str,
         description: Optional[str] = None,
         price: Optional[Decimal] = None,
-        currency: str = "USD",
+        currency: str = DEFAULT_CURRENCY,
         is_active: bool = True,
         clinic_id: Optional[uuid.UUID] = None,
         grafts_count: Optional[str] = None,
@@ -107,14 +166,91 @@ class PackageRepository:
         return package
 
     def upsert_many(self, packages: Iterable[Package]) -> List[Package]:
-        result = []
-        for package in packages:
-            self.db.add(package)
-            result.append(package)
+        """
+        Upsert package entities through `bulk_upsert`, using the attributes set on each.
+
+        Returns the persisted packages, which replace transient inputs.
+        """
+        rows = [
+            {key: value for key, value in inspect(package).dict.items() if key in _UPSERT_COLUMNS}
+            for package in packages
+        ]
+        return self.bulk_upsert(rows)
+
+    def bulk_upsert(self, rows: Sequence[Mapping[str, Any]]) -> List[Package]:
+        """
+        Insert or update many packages with INSERT ... ON CONFLICT (id) DO UPDATE ... RETURNING.
+
+        Each row is a dict of package columns; rows without an `id` are
+        inserted with a new one. On conflict only the columns present in the
+        row are overwritten, so `{"id": ..., "price": ...}` is a partial update
+        of a stored package. `price_normalized` is computed from fx_rates in
+        the same statement. Everything is committed in one transaction and the
+        packages are returned, detached, in input order.
+
+        raises:
+            ValueError: a row names a column that packages does not have
+        """
+        prepared: List[Dict[str, Any]] = []
+        for row in rows:
+            unknown = set(row) - _UPSERT_COLUMNS
+            if unknown:
+                raise ValueError(f"Unknown package field(s): {', '.join(sorted(unknown))}")
+            values = dict(row)
+            values["id"] = values.get("id") or uuid.uuid4()
+            if values.get("currency"):
+                values["currency"] = str(values["currency"]).upper()
+            prepared.append(values)
+
+        # Rows sharing a set of columns share a statement shape
+        groups: Dict[frozenset, List[Dict[str, Any]]] = {}
+        for values in prepared:
+            groups.setdefault(frozenset(values), []).append(values)
+
+        by_id: Dict[uuid.UUID, Package] = {}
+        for keys, group in groups.items():
+            for start in range(0, len(group), self.BULK_CHUNK_SIZE):
+                chunk = group[start:start + self.BULK_CHUNK_SIZE]
+                statement = self._upsert_statement(keys, chunk)
+                for package in self.db.scalars(statement, execution_options={"populate_existing": True}):
+                    by_id[package.id] = package
+        # RETURNING already loaded the committed state; detach the packages so
+        # the commit does not expire them into one refresh query each
+        for package in by_id.values():
+            self.db.expunge(package)
         self.db.commit()
-        for package in result:
-            self.db.refresh(package)
-        return result
+        return [by_id[values["id"]] for values in prepared]
+
+    @staticmethod
+    def _upsert_statement(keys: frozenset, chunk: List[Dict[str, Any]]):
+        packages = Package.__table__
+        stored = packages.alias("stored")
+        rows = []
+        for values in chunk:
+            row = dict(values)
+            row["price_normalized"] = Package.normalized_price_expression(
+                values.get("price"), values.get("currency") or DEFAULT_CURRENCY
+            )
+            if "name" not in keys:
+                # NOT NULL is checked before ON CONFLICT, so partial updates carry the stored name
+                row["name"] = select(stored.c.name).where(stored.c.id == values["id"]).scalar_subquery()
+            rows.append(row)
+        statement = insert(Package).values(rows)
+
+        updates = {key: statement.excluded[key] for key in keys if key != "id"}
+        if "price" in keys or "currency" in keys:
+            # After an update the row keeps whichever of price/currency was not
+            # supplied. SET subqueries are not correlated to the conflicting row
+            # by SQLAlchemy, so the outer columns are spelled out.
+            price = literal_column("excluded.price" if "price" in keys else "packages.price")
+            currency = literal_column("excluded.currency" if "currency" in keys else "packages.currency")
+            updates["price_normalized"] = (
+                select(func.round(price * FxRate.rate_to_base, 2))
+                .where(FxRate.currency == currency)
+                .scalar_subquery()
+            )
+        updates["updated_at"] = func.now()
+        return statement.on_conflict_do_update(index_elements=[packages.c.id], set_=updates).returning(Package)
 
     def delete(self, package_id: uuid.UUID) -> bool:
         """Delete a package and return True if successful."""
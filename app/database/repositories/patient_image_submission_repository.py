@@ -1,6 +1,7 @@
 import uuid
 from typing import Any, Dict, Iterable, List, Optional, Union
 
+from sqlalchemy import func
 from sqlalchemy.orm import Session
 
 from app.database.entities import PatientImageSubmission
@@ -58,7 +59,19 @@ class PatientImageSubmissionRepository:
         image_urls: Iterable[str],
     ) -> Optional[PatientImageSubmission]:
         target = self._normalise_urls(image_urls)
-        for submission in self.list_by_patient_profile(patient_profile_id):
+        candidates = (
+            self.db.query(PatientImageSubmission)
+            .filter(
+                PatientImageSubmission.patient_profile_id
+                == self._coerce_uuid(patient_profile_id),
+                PatientImageSubmission.image_urls_hash
+                == PatientImageSubmission.hash_image_urls(target),
+            )
+            .order_by(PatientImageSubmission.created_at.desc())
+            .all()
+        )
+        # Guard against digest collisions; normally at most one candidate
+        for submission in candidates:
             if self._normalise_urls(submission.image_urls) == target:
                 return submission
         return None
@@ -83,6 +96,22 @@ class PatientImageSubmissionRepository:
             .first()
         )
 
+    def get_latest_analysed_by_patient_profile(
+        self, patient_profile_id: Union[str, uuid.UUID]
+    ) -> Optional[PatientImageSubmission]:
+        """Most recent submission of the patient that has an analysis attached."""
+        return (
+            self.db.query(PatientImageSubmission)
+            .filter(
+                PatientImageSubmission.patient_profile_id
+                == self._coerce_uuid(patient_profile_id),
+                # Excludes both SQL NULL and a stored JSON null
+                func.jsonb_typeof(PatientImageSubmission.analysis) == "object",
+            )
+            .order_by(PatientImageSubmission.created_at.desc())
+            .first()
+        )
+
     def update_analysis(
         self,
         submission_id: Union[str, uuid.UUID],
@@ -1,12 +1,24 @@
 import uuid
-from typing import List, Optional, Union
+from datetime import datetime
+from typing import Any, List, NamedTuple, Optional, Sequence, Tuple, Union
 
-from sqlalchemy.orm import Session
+from sqlalchemy import any_, func, or_, select, tuple_, update
+from sqlalchemy.orm import Session, aliased, lazyload
 
-from app.database.entities import PatientProfile
+from app.database.entities import Clinic, Consultation, MedicalBackground, PatientProfile
+from app.database.repositories.sql_helpers import append_unique
 from app.models.enums import Gender
 
 
+class PatientAggregate(NamedTuple):
+    """Everything the consultant detail view needs about one patient."""
+
+    profile: PatientProfile
+    medical_background: Optional[MedicalBackground]
+    latest_consultation: Optional[Consultation]
+    offer_clinics: List[Clinic]
+
+
 class PatientProfileRepository:
     def __init__(self, db: Session):
         self.db = db
@@ -80,16 +92,156 @@ class PatientProfileRepository:
             .first()
         )
 
+    def get_aggregate(
+        self,
+        patient_profile_id: Union[str, uuid.UUID],
+    ) -> Optional[PatientAggregate]:
+        """
+        Load a patient with medical background, latest consultation and offered clinics.
+
+        Everything is fetched in a single statement: the medical background is a
+        one-to-one outer join, the latest consultation (by start time) is picked
+        by a correlated subquery, and offered clinics are outer-joined on
+        `clinic_offer_ids`, yielding one row per clinic.
+        """
+        if isinstance(patient_profile_id, str):
+            patient_profile_id = uuid.UUID(patient_profile_id)
+
+        latest_consultation_id = (
+            select(Consultation.id)
+            .where(
+                Consultation.patient_profile_id == PatientProfile.id,
+                Consultation.start_time.isnot(None),
+            )
+            .order_by(Consultation.start_time.desc())
+            .limit(1)
+            .correlate(PatientProfile)
+            .scalar_subquery()
+        )
+        latest_consultation = aliased(Consultation, name="latest_consultation")
+
+        rows = (
+            self.db.query(PatientProfile, MedicalBackground, latest_consultation, Clinic)
+            .outerjoin(
+                MedicalBackground,
+                MedicalBackground.patient_profile_id == PatientProfile.id,
+            )
+            .outerjoin(
+                latest_consultation,
+                latest_consultation.id == latest_consultation_id,
+            )
+            .outerjoin(Clinic, Clinic.id == any_(PatientProfile.clinic_offer_ids))
+            # the detail payload shows no clinic packages; skip their selectin load
+            .options(lazyload(Clinic.packages))
+            .filter(PatientProfile.id == patient_profile_id)
+            .all()
+        )
+        if not rows:
+            return None
+
+        profile, medical_background, consultation, _ = rows[0]
+        clinics_by_id = {clinic.id: clinic for *_, clinic in rows if clinic is not None}
+        offer_clinics = [
+            clinics_by_id[clinic_id]
+            for clinic_id in dict.fromkeys(profile.clinic_offer_ids or [])
+            if clinic_id in clinics_by_id
+        ]
+        return PatientAggregate(profile, medical_background, consultation, offer_clinics)
+
+    # Columns returned by the consultant dashboard patient list
+    SUMMARY_COLUMNS = (
+        PatientProfile.id,
+        PatientProfile.name,
+        PatientProfile.email,
+        PatientProfile.phone,
+        PatientProfile.age,
+        PatientProfile.location,
+        PatientProfile.clinic_offer_ids,
+        PatientProfile.created_at,
+        PatientProfile.updated_at,
+    )
+
+    def list_summaries_page(
+        self,
+        *,
+        limit: int,
+        after: Optional[Tuple[datetime, uuid.UUID]] = None,
+        search: Optional[str] = None,
+        created_from: Optional[datetime] = None,
+        created_to: Optional[datetime] = None,
+        has_offers: Optional[bool] = None,
+        columns: Optional[Sequence[str]] = None,
+    ) -> List[Sequence[Any]]:
+        """
+        Keyset-paginated patient summaries, newest first, selecting only SUMMARY_COLUMNS.
+
+        `columns` narrows the selection further to those PatientProfile
+        attributes; id and created_at are always selected for the cursor.
+        `search` matches a case-insensitive prefix of the name or email. Up to
+        `limit + 1` rows are returned so callers can tell whether another page exists.
+        """
+        selected = self.SUMMARY_COLUMNS
+        if columns is not None:
+            selected = [
+                getattr(PatientProfile, name)
+                for name in dict.fromkeys(["id", "created_at", *columns])
+            ]
+        query = self.db.query(*selected)
+
+        if search:
+            query = query.filter(
+                or_(
+                    PatientProfile.name.istartswith(search, autoescape=True),
+                    PatientProfile.email.istartswith(search, autoescape=True),
+                )
+            )
+        if created_from is not None:
+            query = query.filter(PatientProfile.created_at >= created_from)
+        if created_to is not None:
+            query = query.filter(PatientProfile.created_at < created_to)
+        if has_offers is not None:
+            offer_count = func.cardinality(PatientProfile.clinic_offer_ids)
+            query = query.filter(offer_count > 0 if has_offers else offer_count == 0)
+        if after is not None:
+            query = query.filter(
+                tuple_(PatientProfile.created_at, PatientProfile.id) < tuple_(*after)
+            )
+
+        return (
+            query.order_by(PatientProfile.created_at.desc(), PatientProfile.id.desc())
+            .limit(limit + 1)
+            .all()
+        )
+
     def add_clinic_offers(
         self,
-        patient_profile: PatientProfile,
+        patient_profile_id: Union[str, uuid.UUID],
         clinic_ids: List[uuid.UUID],
-    ) -> PatientProfile:
-        """Append clinic offers to the patient profile without duplicating entries."""
-        existing_ids = set(patient_profile.clinic_offer_ids or [])
-        existing_ids.update(clinic_ids)
-        patient_profile.clinic_offer_ids = list(existing_ids)
-        return self.save(patient_profile)
+    ) -> Optional[PatientProfile]:
+        """
+        Append clinic offers without duplicating entries, in one UPDATE ... RETURNING.
+
+        The array is extended from the stored row, so concurrent calls never
+        drop each other's offers.
+        return:
+            return the updated profile, or None when it does not exist
+        """
+        if isinstance(patient_profile_id, str):
+            patient_profile_id = uuid.UUID(patient_profile_id)
+
+        statement = (
+            update(PatientProfile)
+            .where(PatientProfile.id == patient_profile_id)
+            .values(clinic_offer_ids=append_unique(PatientProfile.clinic_offer_ids, clinic_ids))
+            .returning(PatientProfile)
+            .execution_options(populate_existing=True)
+        )
+        patient_profile = self.db.scalars(statement).one_or_none()
+        if patient_profile is not None:
+            # Detach so the commit does not expire the returned state
+            self.db.expunge(patient_profile)
+        self.db.commit()
+        return patient_profile
 
     def set_clinic_offers(
         self,
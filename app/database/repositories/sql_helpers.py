@@ -0,0 +1,26 @@
+"""SQL expressions shared by repositories for in-place column updates."""
+
+from typing import Any, Iterable
+
+from sqlalchemy import func, literal, select
+from sqlalchemy.sql.elements import ColumnElement
+
+
+def append_unique(column: Any, values: Iterable[Any]) -> ColumnElement:
+    """
+    `column` (an array) with `values` appended, for UPDATE ... SET. Every
+    element keeps its first position, so the stored order is preserved and
+    nothing is duplicated. The database computes it from the row being
+    updated, so concurrent appends cannot overwrite each other.
+    """
+    merged = (
+        func.unnest(func.array_cat(column, literal(list(values), column.type)))
+        .table_valued("value", with_ordinality="position")
+        .render_derived()
+    )
+    return func.array(
+        select(merged.c.value)
+        .group_by(merged.c.value)
+        .order_by(func.min(merged.c.position))
+        .scalar_subquery()
+    )
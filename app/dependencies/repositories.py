@@ -8,7 +8,7 @@ from app.database.repositories.patient_image_submission_repository import (
     PatientImageSubmissionRepository,
 )
 from app.database.repositories.patient_profile_repository import PatientProfileRepository
-from app.database.db import get_db
+from app.services.read_routing import get_db
 
 
 def get_user_repository(db: Annotated[Session, Depends(get_db)]) -> UserRepository:
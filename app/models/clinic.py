@@ -39,6 +39,9 @@ class PackageResponse(BaseModel):
     description: Optional[str] = None
     price: Optional[Decimal] = None
     currency: CurrencyEnum = Field(default=CurrencyEnum.EUR)
+    price_normalized: Optional[Decimal] = Field(
+        default=None, description="Price converted into the FX base currency"
+    )
     is_active: bool = True
     created_at: datetime
     updated_at: datetime
@@ -158,6 +161,17 @@ class PackageUpdateRequest(BaseModel):
     sedation_included: Optional[bool] = None
 
 
+class PackageUpsertRequest(PackageUpdateRequest):
+    id: Optional[uuid.UUID] = Field(
+        default=None,
+        description="Existing package to update; omit to create a package (name is then required)",
+    )
+
+
+class PackageBatchUpsertRequest(BaseModel):
+    packages: List[PackageUpsertRequest] = Field(..., min_length=1, max_length=1000)
+
+
 class PackageListResponse(BaseModel):
     packages: List[PackageResponse]
     total: int
@@ -182,6 +196,10 @@ class ClinicResponse(BaseModel):
     categories: List[str] = Field(default_factory=list)
     image_url: Optional[str] = None
     opening_hours: Optional[Dict[str, Any]] = None
+    timezone: Optional[str] = Field(
+        default=None,
+        description="IANA timezone the opening hours are interpreted in",
+    )
     additional_info: Optional[Dict[str, Any]] = None
     price_range: Optional[str] = None
     availability: Optional[str] = None
@@ -214,12 +232,67 @@ class ClinicListResponse(BaseModel):
     page: int
     limit: int
     total_pages: int
+    has_more: bool = False
+    next_cursor: Optional[str] = Field(
+        default=None,
+        description="Pass as `cursor` to fetch the following page by keyset",
+    )
 
     class Config:
         from_attributes = True
         populate_by_name = True
 
 
+class NearbyClinicResponse(BaseModel):
+    distance_km: float = Field(..., alias="distanceKm", description="Great-circle distance from the origin")
+    clinic: ClinicResponse
+
+    class Config:
+        populate_by_name = True
+
+
+class NearbyClinicListResponse(BaseModel):
+    results: List[NearbyClinicResponse]
+    origin_lat: float = Field(..., alias="originLat")
+    origin_lng: float = Field(..., alias="originLng")
+    count: int
+
+    class Config:
+        populate_by_name = True
+
+
+class ClinicBatchResponse(BaseModel):
+    clinics: List[ClinicResponse] = Field(..., description="Found clinics, in the order requested")
+    missing: List[uuid.UUID] = Field(
+        default_factory=list,
+        description="Requested ids with no clinic",
+    )
+
+
+class ClinicSearchHit(BaseModel):
+    clinic: ClinicResponse
+    matching_package_ids: List[uuid.UUID] = Field(
+        default_factory=list,
+        alias="matchingPackageIds",
+        description="Active packages of this clinic that satisfy the package filters",
+    )
+
+    class Config:
+        populate_by_name = True
+
+
+class ClinicSearchResponse(BaseModel):
+    results: List[ClinicSearchHit]
+    total: int
+    page: int
+    limit: int
+    total_pages: int
+    facets: Dict[str, Dict[str, int]] = Field(
+        default_factory=dict,
+        description="Counts per facet value, each computed with every other filter applied",
+    )
+
+
 class ClinicPackageUpdateRequest(BaseModel):
     package_ids: List[uuid.UUID] = Field(
         ...,
@@ -236,6 +309,35 @@ class ClinicPackageUpdateRequest(BaseModel):
         populate_by_name = True
 
 
+class ClinicPackageBatchAssignRequest(BaseModel):
+    package_ids: List[uuid.UUID] = Field(
+        ...,
+        alias="packageIds",
+        description="Packages to link to every targeted clinic",
+    )
+    clinic_ids: Optional[List[uuid.UUID]] = Field(
+        default=None,
+        alias="clinicIds",
+        max_length=50000,
+        description="Clinics to update; omit and set allClinics to target the whole catalog",
+    )
+    all_clinics: bool = Field(default=False, alias="allClinics")
+    replace: bool = Field(
+        default=False,
+        description="Remove links to packages not listed in packageIds from the targeted clinics",
+    )
+    has_contract: Optional[bool] = Field(default=None, alias="hasContract")
+
+    class Config:
+        populate_by_name = True
+
+
+class ClinicPackageBatchAssignResponse(BaseModel):
+    clinics: int = Field(..., description="Clinics whose package list was rebuilt")
+    inserted: int = Field(..., description="Clinic/package links created")
+    removed: int = Field(..., description="Clinic/package links deleted because of replace")
+
+
 class ClinicUpdateRequest(BaseModel):
     title: Optional[str] = Field(default=None, max_length=255)
     location: Optional[str] = None
@@ -266,5 +368,7 @@ PackageUpdateRequest.model_rebuild()
 PackageListResponse.model_rebuild()
 ClinicResponse.model_rebuild()
 ClinicListResponse.model_rebuild()
+NearbyClinicResponse.model_rebuild()
+NearbyClinicListResponse.model_rebuild()
 ClinicPackageUpdateRequest.model_rebuild()
 ClinicUpdateRequest.model_rebuild()
@@ -29,3 +29,9 @@ class Gender(str, Enum):
     FEMALE = "female"
     OTHER = "other"
     PREFER_NOT_TO_SAY = "prefer_not_to_say"
+
+
+class MessageDirection(str, Enum):
+    """Direction of a logged message relative to the user."""
+    INCOMING = "incoming"
+    OUTGOING = "outgoing"
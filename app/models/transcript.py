@@ -0,0 +1,49 @@
+from datetime import datetime
+from enum import Enum
+from typing import List, Optional
+from uuid import UUID
+
+from pydantic import BaseModel, Field
+
+from app.models.enums import MediaType, MessageDirection
+
+
+class TranscriptOrder(str, Enum):
+    ASC = "asc"
+    DESC = "desc"
+
+
+class TranscriptMediaModel(BaseModel):
+    id: UUID
+    media_type: MediaType
+    media_url: str
+    filename: Optional[str] = None
+    mime_type: Optional[str] = None
+    caption: Optional[str] = None
+
+    class Config:
+        from_attributes = True
+
+
+class TranscriptMessageModel(BaseModel):
+    id: UUID
+    direction: MessageDirection
+    body: Optional[str] = None
+    media_url: Optional[str] = None
+    media: List[TranscriptMediaModel] = Field(default_factory=list)
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
+
+
+class TranscriptPageResponse(BaseModel):
+    user_id: UUID
+    messages: List[TranscriptMessageModel]
+    limit: int
+    order: TranscriptOrder
+    has_more: bool
+    next_cursor: Optional[str] = Field(
+        default=None,
+        description="Opaque cursor for the next page; pass it back as `cursor` with the same filters and order.",
+    )
@@ -7,23 +7,47 @@ Endpoints to manage clinic metadata and the packages assigned to each clinic.
 import math
 import traceback
 import uuid
-from typing import List, Optional
+from datetime import datetime, timezone
+from functools import partial
+from typing import List, Optional, Tuple
 
 from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
 from sqlalchemy.orm import Session
 
 from app.config.rate_limits import RateLimitConfig, limiter
-from app.database.db import SessionLocal
 from app.database.repositories.clinic_repository import ClinicRepository
 from app.database.repositories.package_repository import PackageRepository
+from app.database.repositories.patient_profile_repository import PatientProfileRepository
 from app.models.clinic import (
+    ClinicBatchResponse,
     ClinicListResponse,
+    ClinicPackageBatchAssignRequest,
+    ClinicPackageBatchAssignResponse,
     ClinicPackageUpdateRequest,
     ClinicResponse,
+    ClinicSearchResponse,
     ClinicUpdateRequest,
+    NearbyClinicListResponse,
     PackageResponse,
 )
-from app.utils import ErrorUtils
+from app.services import catalog_invalidation, fx_rates
+from app.services.catalog_serializer import (
+    CLINIC_FIELDS,
+    CLINIC_RELATIONSHIPS,
+    PACKAGE_FIELDS,
+    clinic_columns,
+    clinic_dict,
+    clinic_dicts,
+    package_dicts,
+)
+from app.services.catalog_search_index import CatalogSearchQuery, catalog_search_index
+from app.services.catalog_snapshots import catalog_snapshots, latest_updated_at
+from app.services.clinic_cache import count_clinics
+from app.services.clinic_geo_index import clinic_geo_index
+from app.services.read_cache import CLINICS_TAG, clinic_details_cache, clinic_tag, package_tag
+from app.services.request_coalescing import request_coalescer
+from app.services.read_routing import read_router
+from app.utils import CursorUtils, ErrorUtils, FastJSONResponse, FieldsetUtils
 
 
 router = APIRouter(
@@ -31,9 +55,12 @@ router = APIRouter(
     tags=["Clinics"],
 )
 
+# Upper bound on ids per GET /api/clinics/batch request
+MAX_BATCH_IDS = 100
+
 
-def get_db() -> Session:
-    db = SessionLocal()
+def get_db(request: Request) -> Session:
+    db = read_router.session_for(request)
     try:
         yield db
     finally:
@@ -84,6 +111,7 @@ def _serialize_clinic(
         "categories": clinic.categories or [],
         "image_url": clinic.image_url,
         "opening_hours": clinic.opening_hours,
+        "timezone": clinic.timezone,
         "additional_info": clinic.additional_info,
         "price_range": clinic.price_range,
         "availability": clinic.availability,
@@ -98,21 +126,177 @@ def _serialize_clinic(
     return ClinicResponse.model_validate(clinic_data)
 
 
+def _resolve_open_at(open_now: bool, open_at: Optional[datetime]) -> Optional[datetime]:
+    """Instant for the opening-hours filter; naive `openAt` values are UTC."""
+    if open_now and open_at is not None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Use either 'openNow' or 'openAt', not both.",
+        )
+    if open_now:
+        return datetime.now(timezone.utc)
+    if open_at is not None and open_at.tzinfo is None:
+        return open_at.replace(tzinfo=timezone.utc)
+    return open_at
+
+
+def _clinic_selection(fields: Optional[str], include: Optional[str]) -> Optional[Tuple[str, ...]]:
+    """Parse `fields=` / `include=` for clinic responses; raises HTTP 400 on unknown names."""
+    try:
+        return FieldsetUtils.merge(
+            FieldsetUtils.parse(fields, CLINIC_FIELDS),
+            FieldsetUtils.parse(include, CLINIC_RELATIONSHIPS, required=()),
+            CLINIC_FIELDS,
+            CLINIC_RELATIONSHIPS,
+        )
+    except ValueError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(exc),
+        ) from exc
+
+
+def _package_selection(fields: Optional[str]) -> Optional[Tuple[str, ...]]:
+    """Parse `fields=` for package responses; raises HTTP 400 on unknown names."""
+    try:
+        return FieldsetUtils.parse(fields, PACKAGE_FIELDS)
+    except ValueError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(exc),
+        ) from exc
+
+
+def _with_packages(selection: Optional[Tuple[str, ...]]) -> bool:
+    return selection is None or "packages" in selection
+
+
+def _clinic_list_payload(
+    db: Session,
+    *,
+    page: int,
+    limit: int,
+    after: Optional[Tuple[datetime, uuid.UUID]] = None,
+    has_contract: Optional[bool] = None,
+    open_at: Optional[datetime] = None,
+    selection: Optional[Tuple[str, ...]] = None,
+) -> Tuple[dict, Optional[datetime]]:
+    """One page of the clinic list, with the newest updated_at it contains."""
+    clinic_repo = ClinicRepository(db)
+    with_packages = _with_packages(selection)
+    projection = {"columns": clinic_columns(selection), "with_packages": with_packages}
+    if after is not None:
+        rows = clinic_repo.list_page(
+            limit=limit,
+            after=after,
+            has_contract=has_contract,
+            open_at=open_at,
+            **projection,
+        )
+        clinics = rows[:limit]
+        has_more = len(rows) > limit
+        total = count_clinics(clinic_repo, has_contract=has_contract, open_at=open_at)
+    else:
+        total = count_clinics(clinic_repo, has_contract=has_contract, open_at=open_at)
+        clinics = clinic_repo.list_paginated(
+            page=page,
+            limit=limit,
+            has_contract=has_contract,
+            open_at=open_at,
+            **projection,
+        )
+        has_more = page * limit < total
+
+    total_pages = math.ceil(total / limit) if total else 0
+    payload = clinic_dicts(clinics, fields=selection)
+    next_cursor = None
+    if has_more and clinics:
+        last = clinics[-1]
+        next_cursor = CursorUtils.encode(last.updated_at, last.id)
+
+    rows = list(clinics)
+    if with_packages:
+        rows.extend(pkg for clinic in clinics for pkg in clinic.packages)
+    last_modified = latest_updated_at(rows)
+    return {
+        "clinics": payload,
+        "total": total,
+        "page": page,
+        "limit": limit,
+        "total_pages": total_pages,
+        "has_more": next_cursor is not None,
+        "next_cursor": next_cursor,
+    }, last_modified
+
+
+def _clinic_payload(
+    db: Session,
+    clinic_id: uuid.UUID,
+    selection: Optional[Tuple[str, ...]] = None,
+) -> Optional[dict]:
+    """A single clinic, or None when it does not exist."""
+    clinic = ClinicRepository(db).get_by_id(
+        clinic_id,
+        columns=clinic_columns(selection),
+        with_packages=_with_packages(selection),
+    )
+    return clinic_dict(clinic, fields=selection) if clinic is not None else None
+
+
+def _clinic_packages_payload(
+    db: Session,
+    clinic_id: uuid.UUID,
+    selection: Optional[Tuple[str, ...]] = None,
+) -> Optional[Tuple[list, Optional[datetime]]]:
+    """A clinic's packages, or None when the clinic does not exist."""
+    clinic = ClinicRepository(db).get_by_id(clinic_id, columns=["package_ids"], with_packages=False)
+    if clinic is None:
+        return None
+    packages = PackageRepository(db).get_by_ids(list(clinic.package_ids or []), columns=selection)
+    return package_dicts(packages, selection), latest_updated_at([clinic, *packages])
+
+
 @router.get("/", response_model=ClinicListResponse)
 @limiter.limit(RateLimitConfig.DEFAULT)
 async def list_clinics(
     request: Request,
     page: int = 1,
     limit: int = 20,
+    cursor: Optional[str] = Query(
+        default=None,
+        description="Opaque cursor returned as `next_cursor`; when set, `page` is ignored.",
+    ),
     has_contract: Optional[bool] = Query(
         default=None,
         alias="hasContract",
         description="Optional filter to return only clinics with/without a contract.",
     ),
+    open_now: bool = Query(
+        default=False,
+        alias="openNow",
+        description="Only clinics open right now in their local time.",
+    ),
+    open_at: Optional[datetime] = Query(
+        default=None,
+        alias="openAt",
+        description="Only clinics open at this ISO-8601 instant (UTC when no offset is given).",
+    ),
+    fields: Optional[str] = Query(
+        default=None,
+        description="Comma-separated response fields, e.g. `id,title,city,rating`; `id` is always returned.",
+    ),
+    include: Optional[str] = Query(
+        default=None,
+        description="Relationships to expand (`packages`); empty for none. Defaults to all unless `fields` is set.",
+    ),
     db: Session = Depends(get_db),
 ):
     """
     List clinics with pagination, including package metadata.
+
+    Pages can be addressed by number (`page`) or, for deep pages, by keyset
+    cursor on (updated_at, id). Totals come from a per-filter count cache.
+    `openNow`/`openAt` test each clinic's precomputed opening-hours bitmap.
     """
     if limit < 1 or limit > 100:
         raise HTTPException(
@@ -124,28 +308,417 @@ async def list_clinics(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Query parameter 'page' must be greater than 0.",
         )
+    try:
+        after = CursorUtils.decode_uuid(cursor)
+    except ValueError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(exc),
+        ) from exc
+    open_instant = _resolve_open_at(open_now, open_at)
+    selection = _clinic_selection(fields, include)
 
     try:
-        clinic_repo = ClinicRepository(db)
-        clinics, total = clinic_repo.list_paginated(
+        if after is None and open_instant is None:
+            key = ("clinics", page, limit, has_contract, selection)
+            snapshot = catalog_snapshots.get(key) or await request_coalescer.run(
+                key,
+                catalog_snapshots.build,
+                key,
+                partial(
+                    _clinic_list_payload,
+                    page=page,
+                    limit=limit,
+                    has_contract=has_contract,
+                    selection=selection,
+                ),
+                db,
+            )
+            return snapshot.to_response(request)
+
+        payload, _ = _clinic_list_payload(
+            db,
             page=page,
             limit=limit,
+            after=after,
             has_contract=has_contract,
+            open_at=open_instant,
+            selection=selection,
+        )
+        return FastJSONResponse(payload)
+    except Exception as exception:  # pragma: no cover - defensive logging
+        traceback.print_exc()
+        raise ErrorUtils.toHTTPException(exception)
+
+
+@router.get("/search", response_model=ClinicSearchResponse)
+@limiter.limit(RateLimitConfig.DEFAULT)
+async def search_clinics(
+    request: Request,
+    page: int = 1,
+    limit: int = 20,
+    country: List[str] = Query(default=[], description="Repeat to match any of several countries."),
+    city: List[str] = Query(default=[], description="Repeat to match any of several cities."),
+    has_contract: Optional[bool] = Query(default=None, alias="hasContract"),
+    min_rating: Optional[float] = Query(default=None, alias="minRating", ge=0, le=5),
+    min_reviews: Optional[int] = Query(default=None, alias="minReviews", ge=0),
+    method: List[str] = Query(
+        default=[],
+        description="Hair transplantation method of at least one active package, by short name (fue, dhi, fut, sapphire fue).",
+    ),
+    grafts: List[str] = Query(default=[], description="Package grafts_count value(s)."),
+    currency: List[str] = Query(default=[], description="Package currency code(s)."),
+    min_price: Optional[float] = Query(default=None, alias="minPrice", ge=0),
+    max_price: Optional[float] = Query(default=None, alias="maxPrice", ge=0),
+    price_currency: Optional[str] = Query(
+        default=None,
+        alias="priceCurrency",
+        description="Currency of minPrice/maxPrice; defaults to the FX base currency.",
+    ),
+    min_hotel_stars: Optional[int] = Query(default=None, alias="minHotelStars", ge=0, le=5),
+    sort: Optional[str] = Query(
+        default=None,
+        pattern="^price$",
+        description="'price' orders by the cheapest matching package; default is by rating.",
+    ),
+    open_now: bool = Query(default=False, alias="openNow", description="Only clinics open right now."),
+    open_at: Optional[datetime] = Query(
+        default=None,
+        alias="openAt",
+        description="Only clinics open at this ISO-8601 instant (UTC when no offset is given).",
+    ),
+    fields: Optional[str] = Query(
+        default=None,
+        description="Comma-separated response fields, e.g. `id,title,city,rating`; `id` is always returned.",
+    ),
+    include: Optional[str] = Query(
+        default=None,
+        description="Relationships to expand (`packages`); empty for none. Defaults to all unless `fields` is set.",
+    ),
+    db: Session = Depends(get_db),
+):
+    """
+    Faceted clinic search over clinic attributes and their active packages.
+
+    Package filters match clinics with at least one active package satisfying
+    all of them. Prices are compared after conversion into the FX base
+    currency. Served from the in-memory catalog search index; `facets`
+    carries per-value counts, each computed with every other filter applied.
+    """
+    if limit < 1 or limit > 100:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Query parameter 'limit' must be between 1 and 100.",
+        )
+    if page < 1:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Query parameter 'page' must be greater than 0.",
+        )
+    if min_price is not None and max_price is not None and min_price > max_price:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Query parameter 'minPrice' must not exceed 'maxPrice'.",
         )
+    open_instant = _resolve_open_at(open_now, open_at)
+    selection = _clinic_selection(fields, include)
 
-        total_pages = math.ceil(total / limit) if total else 0
-        payload = [
-            _serialize_clinic(clinic)
-            for clinic in clinics
+    try:
+        min_base = fx_rates.to_base(min_price, price_currency, db)
+        max_base = fx_rates.to_base(max_price, price_currency, db)
+    except ValueError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(exc),
+        ) from exc
+
+    try:
+        catalog_search_index.ensure_fresh(db)
+        result = catalog_search_index.search(
+            CatalogSearchQuery(
+                countries=country,
+                cities=city,
+                has_contract=has_contract,
+                min_rating=min_rating,
+                min_reviews=min_reviews,
+                methods=method,
+                grafts=grafts,
+                currencies=currency,
+                min_price=float(min_base) if min_base is not None else None,
+                max_price=float(max_base) if max_base is not None else None,
+                min_hotel_stars=min_hotel_stars,
+                open_at=open_instant,
+                sort=sort,
+                offset=(page - 1) * limit,
+                limit=limit,
+            )
+        )
+        clinics = {
+            clinic.id: clinic
+            for clinic in ClinicRepository(db).get_by_ids(
+                [hit.clinic_id for hit in result.hits],
+                columns=clinic_columns(selection),
+                with_packages=_with_packages(selection),
+            )
+        }
+        package_cache: dict = {}
+        results = [
+            {
+                "clinic": clinic_dict(clinics[hit.clinic_id], package_cache=package_cache, fields=selection),
+                "matchingPackageIds": hit.package_ids,
+            }
+            for hit in result.hits
+            if hit.clinic_id in clinics
         ]
+        return FastJSONResponse({
+            "results": results,
+            "total": result.total,
+            "page": page,
+            "limit": limit,
+            "total_pages": math.ceil(result.total / limit) if result.total else 0,
+            "facets": result.facets,
+        })
+    except HTTPException:
+        raise
+    except Exception as exception:  # pragma: no cover - defensive logging
+        traceback.print_exc()
+        raise ErrorUtils.toHTTPException(exception)
 
-        return ClinicListResponse(
-            clinics=payload,
-            total=total,
-            page=page,
-            limit=limit,
-            total_pages=total_pages,
+
+@router.get("/nearby", response_model=NearbyClinicListResponse)
+@limiter.limit(RateLimitConfig.DEFAULT)
+async def list_nearby_clinics(
+    request: Request,
+    lat: Optional[float] = Query(default=None, ge=-90, le=90),
+    lng: Optional[float] = Query(default=None, ge=-180, le=180),
+    patient_id: Optional[str] = Query(
+        default=None,
+        alias="patientId",
+        description="Use the patient's profile location instead of lat/lng.",
+    ),
+    k: int = 10,
+    radius_km: Optional[float] = Query(default=None, alias="radiusKm", gt=0),
+    min_rating: Optional[float] = Query(default=None, alias="minRating", ge=0, le=5),
+    has_contract: Optional[bool] = Query(
+        default=None,
+        alias="hasContract",
+        description="Optional filter to return only clinics with/without a contract.",
+    ),
+    fields: Optional[str] = Query(
+        default=None,
+        description="Comma-separated response fields, e.g. `id,title,city,rating`; `id` is always returned.",
+    ),
+    include: Optional[str] = Query(
+        default=None,
+        description="Relationships to expand (`packages`); empty for none. Defaults to all unless `fields` is set.",
+    ),
+    db: Session = Depends(get_db),
+):
+    """
+    Return the k clinics nearest to a point or to a patient's location.
+
+    Backed by the in-memory clinic geo index; distances are great-circle kilometres.
+    """
+    if k < 1 or k > 100:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Query parameter 'k' must be between 1 and 100.",
         )
+    if patient_id is None and (lat is None or lng is None):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Provide both 'lat' and 'lng', or 'patientId'.",
+        )
+    selection = _clinic_selection(fields, include)
+
+    try:
+        clinic_geo_index.ensure_fresh(db)
+
+        if lat is None or lng is None:
+            try:
+                patient_uuid = uuid.UUID(patient_id)
+            except ValueError as exc:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="Patient ID must be a valid UUID.",
+                ) from exc
+            patient = PatientProfileRepository(db).get_by_id(patient_uuid)
+            if patient is None:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail=f"Patient not found: {patient_id}",
+                )
+            origin = clinic_geo_index.locate(patient.location)
+            if origin is None:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=f"Could not resolve patient location '{patient.location or ''}'; pass 'lat' and 'lng'.",
+                )
+            lat, lng = origin
+
+        nearby = clinic_geo_index.nearest(
+            lat,
+            lng,
+            k=k,
+            radius_km=radius_km,
+            min_rating=min_rating,
+            has_contract=has_contract,
+        )
+        clinics = {
+            clinic.id: clinic
+            for clinic in ClinicRepository(db).get_by_ids(
+                [hit.clinic_id for hit in nearby],
+                columns=clinic_columns(selection),
+                with_packages=_with_packages(selection),
+            )
+        }
+        package_cache: dict = {}
+        results = [
+            {
+                "distanceKm": round(hit.distance_km, 3),
+                "clinic": clinic_dict(clinics[hit.clinic_id], package_cache=package_cache, fields=selection),
+            }
+            for hit in nearby
+            if hit.clinic_id in clinics
+        ]
+        return FastJSONResponse({
+            "results": results,
+            "originLat": lat,
+            "originLng": lng,
+            "count": len(results),
+        })
+    except HTTPException:
+        raise
+    except Exception as exception:  # pragma: no cover - defensive logging
+        traceback.print_exc()
+        raise ErrorUtils.toHTTPException(exception)
+
+
+@router.get("/batch", response_model=ClinicBatchResponse)
+@limiter.limit(RateLimitConfig.DEFAULT)
+async def get_clinics_batch(
+    request: Request,
+    ids: List[str] = Query(
+        ...,
+        description="Clinic UUIDs, comma-separated and/or repeated; at most 100.",
+    ),
+    fields: Optional[str] = Query(
+        default=None,
+        description="Comma-separated response fields, e.g. `id,title,city,rating`; `id` is always returned.",
+    ),
+    include: Optional[str] = Query(
+        default=None,
+        description="Relationships to expand (`packages`); empty for none. Defaults to all unless `fields` is set.",
+    ),
+    db: Session = Depends(get_db),
+):
+    """
+    Fetch many clinics by UUID in one request.
+
+    Clinics come back in the order requested (duplicates collapsed) and ids
+    with no clinic are listed under `missing` instead of failing the batch.
+    """
+    try:
+        clinic_ids = list(dict.fromkeys(
+            uuid.UUID(value.strip())
+            for raw in ids
+            for value in raw.split(",")
+            if value.strip()
+        ))
+    except ValueError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Clinic IDs must be valid UUIDs.",
+        ) from exc
+    if len(clinic_ids) > MAX_BATCH_IDS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {MAX_BATCH_IDS} clinic IDs per request.",
+        )
+    selection = _clinic_selection(fields, include)
+
+    try:
+        clinics = {
+            clinic.id: clinic
+            for clinic in ClinicRepository(db).get_by_ids(
+                clinic_ids,
+                columns=clinic_columns(selection),
+                with_packages=_with_packages(selection),
+            )
+        }
+        return FastJSONResponse({
+            "clinics": clinic_dicts(
+                [clinics[clinic_id] for clinic_id in clinic_ids if clinic_id in clinics],
+                fields=selection,
+            ),
+            "missing": [clinic_id for clinic_id in clinic_ids if clinic_id not in clinics],
+        })
+    except HTTPException:
+        raise
+    except Exception as exception:  # pragma: no cover - defensive logging
+        traceback.print_exc()
+        raise ErrorUtils.toHTTPException(exception)
+
+
+@router.post("/packages/batch", response_model=ClinicPackageBatchAssignResponse)
+@limiter.limit(RateLimitConfig.DEFAULT)
+async def batch_assign_clinic_packages(
+    request: Request,
+    payload: ClinicPackageBatchAssignRequest,
+    db: Session = Depends(get_db),
+):
+    """
+    Link packages to many clinics in one transaction.
+
+    Targets the clinics in `clinicIds`, or every clinic when `allClinics` is
+    set. With `replace`, each targeted clinic ends up with exactly
+    `packageIds`; otherwise the packages are added to its existing ones.
+    """
+    if (payload.clinic_ids is None) == (not payload.all_clinics):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Provide either clinicIds or allClinics=true.",
+        )
+    if not payload.package_ids and not payload.replace:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="packageIds may only be empty when replace is true.",
+        )
+
+    try:
+        clinic_repo = ClinicRepository(db)
+        package_repo = PackageRepository(db)
+
+        package_ids = payload.package_ids
+        packages = package_repo.get_by_ids(package_ids)
+        missing_ids = sorted(
+            {pkg_id for pkg_id in package_ids} - {pkg.id for pkg in packages}
+        )
+        if missing_ids:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Packages not found: {', '.join(str(mid) for mid in missing_ids)}",
+            )
+        if payload.clinic_ids is not None:
+            missing_ids = clinic_repo.missing_ids(payload.clinic_ids)
+            if missing_ids:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail=f"Clinics not found: {', '.join(str(mid) for mid in missing_ids)}",
+                )
+
+        touched, inserted, removed = clinic_repo.assign_packages(
+            package_ids,
+            clinic_ids=payload.clinic_ids,
+            replace=payload.replace,
+            has_contract=payload.has_contract,
+        )
+        catalog_invalidation.clinics_written(
+            payload.clinic_ids, contract_changed=payload.has_contract is not None
+        )
+        return ClinicPackageBatchAssignResponse(clinics=touched, inserted=inserted, removed=removed)
+    except HTTPException:
+        raise
     except Exception as exception:  # pragma: no cover - defensive logging
         traceback.print_exc()
         raise ErrorUtils.toHTTPException(exception)
@@ -156,6 +729,14 @@ async def list_clinics(
 async def get_clinic(
     request: Request,
     clinic_id: str,
+    fields: Optional[str] = Query(
+        default=None,
+        description="Comma-separated response fields, e.g. `id,title,city,rating`; `id` is always returned.",
+    ),
+    include: Optional[str] = Query(
+        default=None,
+        description="Relationships to expand (`packages`); empty for none. Defaults to all unless `fields` is set.",
+    ),
     db: Session = Depends(get_db),
 ):
     """
@@ -168,16 +749,24 @@ async def get_clinic(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Clinic ID must be a valid UUID.",
         ) from exc
+    selection = _clinic_selection(fields, include)
 
     try:
-        clinic_repo = ClinicRepository(db)
-        clinic = clinic_repo.get_by_id(clinic_uuid)
-        if clinic is None:
+        payload = clinic_details_cache.get_or_set(
+            (clinic_uuid, selection),
+            partial(_clinic_payload, db, clinic_uuid, selection),
+            tags=lambda payload: [
+                CLINICS_TAG,
+                clinic_tag(clinic_uuid),
+                *(package_tag(package["id"]) for package in payload.get("packages", ())),
+            ],
+        )
+        if payload is None:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"Clinic not found: {clinic_id}",
             )
-        return _serialize_clinic(clinic)
+        return FastJSONResponse(payload)
     except Exception as exception:  # pragma: no cover - defensive logging
         traceback.print_exc()
         raise ErrorUtils.toHTTPException(exception)
@@ -188,6 +777,10 @@ async def get_clinic(
 async def list_clinic_packages(
     request: Request,
     clinic_id: str,
+    fields: Optional[str] = Query(
+        default=None,
+        description="Comma-separated package fields, e.g. `id,name,price,currency`; `id` is always returned.",
+    ),
     db: Session = Depends(get_db),
 ):
     """
@@ -200,18 +793,23 @@ async def list_clinic_packages(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Clinic ID must be a valid UUID.",
         ) from exc
+    selection = _package_selection(fields)
 
     try:
-        clinic_repo = ClinicRepository(db)
-        clinic = clinic_repo.get_by_id(clinic_uuid)
-        if clinic is None:
+        key = ("clinic_packages", clinic_uuid, selection)
+        snapshot = catalog_snapshots.get(key) or await request_coalescer.run(
+            key,
+            catalog_snapshots.build,
+            key,
+            partial(_clinic_packages_payload, clinic_id=clinic_uuid, selection=selection),
+            db,
+        )
+        if snapshot is None:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"Clinic not found: {clinic_id}",
             )
-        package_repo = PackageRepository(db)
-        packages = package_repo.get_by_ids(list(clinic.package_ids or []))
-        return _serialize_packages(packages)
+        return snapshot.to_response(request)
     except Exception as exception:  # pragma: no cover - defensive logging
         traceback.print_exc()
         raise ErrorUtils.toHTTPException(exception)
@@ -266,6 +864,9 @@ async def update_clinic_packages(
             packages,
             has_contract=payload.has_contract,
         )
+        catalog_invalidation.clinics_written(
+            [clinic.id], contract_changed=payload.has_contract is not None
+        )
         return _serialize_clinic(clinic)
     except HTTPException:
         raise
@@ -331,6 +932,7 @@ async def update_clinic(
             )
 
         clinic = clinic_repo.update_fields(clinic, filtered_data)
+        catalog_invalidation.clinic_written(clinic)
         return _serialize_clinic(clinic)
     except HTTPException:
         raise
@@ -363,13 +965,6 @@ async def add_package_to_clinic(
         clinic_repo = ClinicRepository(db)
         package_repo = PackageRepository(db)
 
-        clinic = clinic_repo.get_by_id(clinic_uuid)
-        if clinic is None:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail=f"Clinic not found: {clinic_id}",
-            )
-
         package = package_repo.get_by_id(package_uuid)
         if package is None:
             raise HTTPException(
@@ -377,11 +972,13 @@ async def add_package_to_clinic(
                 detail=f"Package not found: {package_id}",
             )
 
-        # Get current packages and add the new one
-        current_packages = clinic_repo.get_packages(clinic)
-        if package not in current_packages:
-            updated_packages = list(current_packages) + [package]
-            clinic = clinic_repo.set_packages(clinic, updated_packages)
+        clinic = clinic_repo.add_package(clinic_uuid, package_uuid)
+        if clinic is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Clinic not found: {clinic_id}",
+            )
+        catalog_invalidation.clinic_written(clinic)
 
         return _serialize_clinic(clinic)
     except HTTPException:
@@ -415,13 +1012,6 @@ async def remove_package_from_clinic(
         clinic_repo = ClinicRepository(db)
         package_repo = PackageRepository(db)
 
-        clinic = clinic_repo.get_by_id(clinic_uuid)
-        if clinic is None:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail=f"Clinic not found: {clinic_id}",
-            )
-
         package = package_repo.get_by_id(package_uuid)
         if package is None:
             raise HTTPException(
@@ -429,10 +1019,13 @@ async def remove_package_from_clinic(
                 detail=f"Package not found: {package_id}",
             )
 
-        # Get current packages and remove the specified one
-        current_packages = clinic_repo.get_packages(clinic)
-        updated_packages = [pkg for pkg in current_packages if pkg.id != package.id]
-        clinic = clinic_repo.set_packages(clinic, updated_packages)
+        clinic = clinic_repo.remove_package(clinic_uuid, package_uuid)
+        if clinic is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Clinic not found: {clinic_id}",
+            )
+        catalog_invalidation.clinic_written(clinic)
 
         return _serialize_clinic(clinic)
     except HTTPException:
@@ -11,10 +11,10 @@ from pydantic import BaseModel
 from typing import Optional, List
 import uuid
 
-from app.database.db import SessionLocal
 from app.database.repositories.consultant_note_repository import ConsultantNoteRepository
 from app.config.rate_limits import limiter, RateLimitConfig
 from app.utils import ErrorUtils
+from app.services.read_routing import read_router
 
 
 router = APIRouter(
@@ -23,9 +23,9 @@ router = APIRouter(
 )
 
 
-def get_db():
+def get_db(request: Request):
     """Dependency to get database session."""
-    db = SessionLocal()
+    db = read_router.session_for(request)
     try:
         yield db
     finally:
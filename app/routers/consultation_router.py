@@ -7,9 +7,10 @@ API endpoints for consultation data management.
 import traceback
 from fastapi import APIRouter, HTTPException, Request, Depends
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 
-from app.database.db import SessionLocal
 from app.services.consultation_service import ConsultationService
+from app.services.read_routing import read_router
 from app.config.rate_limits import limiter, RateLimitConfig
 from app.utils import ErrorUtils
 
@@ -20,9 +21,9 @@ router = APIRouter(
 )
 
 
-def get_db():
+def get_db(request: Request):
     """Dependency to get database session."""
-    db = SessionLocal()
+    db = read_router.session_for(request)
     try:
         yield db
     finally:
@@ -43,7 +44,8 @@ async def get_todays_consultations(
     """
     try:
         consultation_service = ConsultationService(db)
-        consultations = consultation_service.get_todays_consultations()
+        # Off the event loop, so concurrent dashboard loads can share one query
+        consultations = await run_in_threadpool(consultation_service.get_todays_consultations)
         
         return {
             "success": True,
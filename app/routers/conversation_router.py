@@ -0,0 +1,171 @@
+"""
+Conversation Router
+
+Read endpoints that let consultants page through logged WhatsApp/chat threads.
+"""
+
+import traceback
+import uuid
+from datetime import datetime
+from typing import Optional
+
+from fastapi import APIRouter, HTTPException, Query, Request, status
+
+from app.config.rate_limits import RateLimitConfig, limiter
+from app.dependencies.repositories import PatientProfileRepositoryDep
+from app.dependencies.services import HistoryServiceDep
+from app.models.enums import MessageDirection
+from app.models.transcript import (
+    TranscriptMessageModel,
+    TranscriptOrder,
+    TranscriptPageResponse,
+)
+from app.services.history_service import HistoryService
+from app.utils import ErrorUtils
+
+
+router = APIRouter(
+    prefix="/api/conversations",
+    tags=["Conversations"],
+)
+
+
+def _parse_uuid(value: str, label: str) -> uuid.UUID:
+    try:
+        return uuid.UUID(value)
+    except ValueError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"{label} must be a valid UUID.",
+        ) from exc
+
+
+def _build_transcript_page(
+    history_service: HistoryService,
+    user_id: uuid.UUID,
+    *,
+    limit: int,
+    cursor: Optional[str],
+    order: TranscriptOrder,
+    direction: Optional[MessageDirection],
+    since: Optional[datetime],
+    until: Optional[datetime],
+) -> TranscriptPageResponse:
+    if limit < 1 or limit > 200:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Query parameter 'limit' must be between 1 and 200.",
+        )
+    if since is not None and until is not None and since >= until:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Query parameter 'since' must be earlier than 'until'.",
+        )
+
+    try:
+        messages, next_cursor = history_service.get_transcript_page(
+            user_id,
+            limit=limit,
+            cursor=cursor,
+            newest_first=order == TranscriptOrder.DESC,
+            direction=direction.value if direction else None,
+            since=since,
+            until=until,
+        )
+    except ValueError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(exc),
+        ) from exc
+
+    return TranscriptPageResponse(
+        user_id=user_id,
+        messages=[TranscriptMessageModel.model_validate(msg) for msg in messages],
+        limit=limit,
+        order=order,
+        has_more=next_cursor is not None,
+        next_cursor=next_cursor,
+    )
+
+
+@router.get("/users/{user_id}/transcript", response_model=TranscriptPageResponse)
+@limiter.limit(RateLimitConfig.DEFAULT)
+async def get_user_transcript(
+    request: Request,
+    user_id: str,
+    history_service: HistoryServiceDep,
+    limit: int = 50,
+    cursor: Optional[str] = Query(
+        default=None,
+        description="Opaque cursor returned as `next_cursor` by the previous page.",
+    ),
+    order: TranscriptOrder = TranscriptOrder.DESC,
+    direction: Optional[MessageDirection] = None,
+    since: Optional[datetime] = Query(default=None, description="Inclusive lower bound on created_at."),
+    until: Optional[datetime] = Query(default=None, description="Exclusive upper bound on created_at."),
+):
+    """
+    Page through a user's message transcript using keyset pagination on (created_at, id).
+    """
+    user_uuid = _parse_uuid(user_id, "User ID")
+    try:
+        return _build_transcript_page(
+            history_service,
+            user_uuid,
+            limit=limit,
+            cursor=cursor,
+            order=order,
+            direction=direction,
+            since=since,
+            until=until,
+        )
+    except HTTPException:
+        raise
+    except Exception as exception:  # pragma: no cover - defensive logging
+        traceback.print_exc()
+        raise ErrorUtils.toHTTPException(exception)
+
+
+@router.get("/patients/{patient_id}/transcript", response_model=TranscriptPageResponse)
+@limiter.limit(RateLimitConfig.DEFAULT)
+async def get_patient_transcript(
+    request: Request,
+    patient_id: str,
+    history_service: HistoryServiceDep,
+    patient_repository: PatientProfileRepositoryDep,
+    limit: int = 50,
+    cursor: Optional[str] = Query(
+        default=None,
+        description="Opaque cursor returned as `next_cursor` by the previous page.",
+    ),
+    order: TranscriptOrder = TranscriptOrder.DESC,
+    direction: Optional[MessageDirection] = None,
+    since: Optional[datetime] = Query(default=None, description="Inclusive lower bound on created_at."),
+    until: Optional[datetime] = Query(default=None, description="Exclusive upper bound on created_at."),
+):
+    """
+    Page through the transcript of the user that owns a patient profile.
+    """
+    patient_uuid = _parse_uuid(patient_id, "Patient ID")
+    try:
+        patient = patient_repository.get_by_id(patient_uuid)
+        if patient is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Patient not found: {patient_id}",
+            )
+        return _build_transcript_page(
+            history_service,
+            patient.user_id,
+            limit=limit,
+            cursor=cursor,
+            order=order,
+            direction=direction,
+            since=since,
+            until=until,
+        )
+    except HTTPException:
+        raise
+    except Exception as exception:  # pragma: no cover - defensive logging
+        traceback.print_exc()
+        raise ErrorUtils.toHTTPException(exception)
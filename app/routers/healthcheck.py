@@ -2,6 +2,9 @@ from fastapi import APIRouter, Request
 from datetime import datetime
 from app.config.settings import settings
 from app.config.rate_limits import limiter, RateLimitConfig
+from app.services.cache_invalidation import invalidation_listener
+from app.services.read_routing import read_router
+from app.services.request_coalescing import request_coalescer
 
 router = APIRouter(
     prefix="/health",
@@ -38,3 +41,16 @@ async def readiness_check(request: Request):
             "vector_store_configured": bool(settings.VECTOR_STORE_EN)
         }
     }
+
+@router.get("/metrics")
+@limiter.limit(RateLimitConfig.HEALTH_CHECK)
+async def metrics(request: Request):
+    """
+    In-process counters for this worker.
+    """
+    return {
+        "timestamp": datetime.utcnow().isoformat(),
+        "singleFlight": request_coalescer.stats(),
+        "cacheInvalidation": invalidation_listener.stats() if invalidation_listener is not None else None,
+        "readReplica": read_router.stats(),
+    }
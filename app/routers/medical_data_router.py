@@ -8,8 +8,8 @@ import traceback
 from fastapi import APIRouter, HTTPException, Request, Depends
 from sqlalchemy.orm import Session
 
-from app.database.db import SessionLocal
 from app.services.medical_data_service import MedicalDataService
+from app.services.read_routing import read_router
 from app.config.rate_limits import limiter, RateLimitConfig
 from app.utils import ErrorUtils
 
@@ -20,9 +20,9 @@ router = APIRouter(
 )
 
 
-def get_db():
+def get_db(request: Request):
     """Dependency to get database session."""
-    db = SessionLocal()
+    db = read_router.session_for(request)
     try:
         yield db
     finally:
@@ -6,20 +6,30 @@ Endpoints to maintain the catalog of packages that can be attached to clinics.
 
 import traceback
 import uuid
+from datetime import datetime
+from decimal import Decimal
+from functools import partial
+from typing import Optional, Tuple
 
-from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
 from sqlalchemy.orm import Session
 
 from app.config.rate_limits import RateLimitConfig, limiter
-from app.database.db import SessionLocal
 from app.database.repositories.package_repository import PackageRepository
 from app.models.clinic import (
+    PackageBatchUpsertRequest,
     PackageCreateRequest,
     PackageListResponse,
     PackageResponse,
     PackageUpdateRequest,
 )
-from app.utils import ErrorUtils
+from app.services import catalog_invalidation, fx_rates
+from app.services.catalog_serializer import PACKAGE_FIELDS, package_dict, package_dicts
+from app.services.catalog_snapshots import catalog_snapshots, latest_updated_at
+from app.services.read_cache import PACKAGES_TAG, package_details_cache, package_tag
+from app.services.request_coalescing import request_coalescer
+from app.services.read_routing import read_router
+from app.utils import ErrorUtils, FastJSONResponse, FieldsetUtils
 
 
 router = APIRouter(
@@ -28,8 +38,8 @@ router = APIRouter(
 )
 
 
-def get_db() -> Session:
-    db = SessionLocal()
+def get_db(request: Request) -> Session:
+    db = read_router.session_for(request)
     try:
         yield db
     finally:
@@ -47,21 +57,109 @@ def _serialize_package(package) -> PackageResponse:
     return PackageResponse.model_validate(package, from_attributes=True)
 
 
+def _package_selection(fields: Optional[str]) -> Optional[Tuple[str, ...]]:
+    """Parse `fields=` for package responses; raises HTTP 400 on unknown names."""
+    try:
+        return FieldsetUtils.parse(fields, PACKAGE_FIELDS)
+    except ValueError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(exc),
+        ) from exc
+
+
+def _package_list_payload(
+    db: Session,
+    *,
+    include_inactive: bool = False,
+    min_price: Optional[Decimal] = None,
+    max_price: Optional[Decimal] = None,
+    sort: Optional[str] = None,
+    selection: Optional[Tuple[str, ...]] = None,
+) -> Tuple[dict, Optional[datetime]]:
+    """The package list for one filter combination, with its newest updated_at."""
+    packages = PackageRepository(db).list(
+        include_inactive=include_inactive,
+        min_price=min_price,
+        max_price=max_price,
+        sort=sort,
+        columns=selection,
+    )
+    payload = package_dicts(packages, selection)
+    return {"packages": payload, "total": len(payload)}, latest_updated_at(packages)
+
+
+def _package_payload(
+    db: Session,
+    package_id: uuid.UUID,
+    selection: Optional[Tuple[str, ...]] = None,
+) -> Optional[dict]:
+    """A single package, or None when it does not exist."""
+    package = PackageRepository(db).get_by_id(package_id, columns=selection)
+    return package_dict(package, selection) if package is not None else None
+
+
 @router.get("/", response_model=PackageListResponse)
 @limiter.limit(RateLimitConfig.DEFAULT)
 async def list_packages(
     request: Request,
     include_inactive: bool = False,
+    min_price: Optional[float] = Query(default=None, alias="minPrice", ge=0),
+    max_price: Optional[float] = Query(default=None, alias="maxPrice", ge=0),
+    price_currency: Optional[str] = Query(
+        default=None,
+        alias="priceCurrency",
+        description="Currency of minPrice/maxPrice; defaults to the FX base currency.",
+    ),
+    sort: Optional[str] = Query(default=None, pattern="^-?price$", description="'price' or '-price'"),
+    fields: Optional[str] = Query(
+        default=None,
+        description="Comma-separated response fields, e.g. `id,name,price,currency`; `id` is always returned.",
+    ),
     db: Session = Depends(get_db),
 ):
     """
     Return all packages. By default only active packages are returned.
+
+    Price filters and sorting compare normalized prices, so packages in
+    different currencies are ranked together.
     """
+    selection = _package_selection(fields)
     try:
-        repo = PackageRepository(db)
-        packages = repo.list(include_inactive=include_inactive)
-        payload = [_serialize_package(pkg) for pkg in packages]
-        return PackageListResponse(packages=payload, total=len(payload))
+        min_base = fx_rates.to_base(min_price, price_currency, db)
+        max_base = fx_rates.to_base(max_price, price_currency, db)
+    except ValueError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(exc),
+        ) from exc
+
+    try:
+        if min_base is None and max_base is None:
+            key = ("packages", include_inactive, sort, selection)
+            snapshot = catalog_snapshots.get(key) or await request_coalescer.run(
+                key,
+                catalog_snapshots.build,
+                key,
+                partial(
+                    _package_list_payload,
+                    include_inactive=include_inactive,
+                    sort=sort,
+                    selection=selection,
+                ),
+                db,
+            )
+            return snapshot.to_response(request)
+
+        payload, _ = _package_list_payload(
+            db,
+            include_inactive=include_inactive,
+            min_price=min_base,
+            max_price=max_base,
+            sort=sort,
+            selection=selection,
+        )
+        return FastJSONResponse(payload)
     except Exception as exception:  # pragma: no cover - defensive logging
         traceback.print_exc()
         raise ErrorUtils.toHTTPException(exception)
@@ -83,17 +181,72 @@ async def create_package(
         if "currency" in data and data["currency"]:
             data["currency"] = data["currency"].upper()
         package = repo.create(**data)
+        catalog_invalidation.packages_written([package.id])
         return _serialize_package(package)
     except Exception as exception:  # pragma: no cover - defensive logging
         traceback.print_exc()
         raise ErrorUtils.toHTTPException(exception)
 
 
+@router.post("/batch", response_model=PackageListResponse)
+@limiter.limit(RateLimitConfig.DEFAULT)
+async def batch_upsert_packages(
+    request: Request,
+    payload: PackageBatchUpsertRequest,
+    db: Session = Depends(get_db),
+):
+    """
+    Create or update up to 1000 packages in one transaction.
+
+    Entries with an `id` update that package, overwriting only the fields
+    they set (a package is created under that id if it does not exist).
+    Entries without an `id` create a package and must include `name`.
+    Packages are returned in request order.
+    """
+    rows = []
+    for position, entry in enumerate(payload.packages):
+        data = _model_dump(entry)
+        if data.get("id") is None:
+            data.pop("id", None)
+            if not data.get("name"):
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=f"packages[{position}]: name is required when id is omitted.",
+                )
+        if "currency" in data and data["currency"]:
+            data["currency"] = data["currency"].upper()
+        rows.append(data)
+
+    try:
+        repo = PackageRepository(db)
+        partial_ids = {row["id"] for row in rows if "id" in row and not row.get("name")}
+        missing_ids = sorted(partial_ids - {pkg.id for pkg in repo.get_by_ids(list(partial_ids))})
+        if missing_ids:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Packages not found: {', '.join(str(mid) for mid in missing_ids)}",
+            )
+
+        packages = repo.bulk_upsert(rows)
+        catalog_invalidation.packages_written(pkg.id for pkg in packages)
+        payload = [_serialize_package(pkg) for pkg in packages]
+        return PackageListResponse(packages=payload, total=len(payload))
+    except HTTPException:
+        raise
+    except Exception as exception:  # pragma: no cover - defensive logging
+        traceback.print_exc()
+        raise ErrorUtils.toHTTPException(exception)
+
+
 @router.get("/{package_id}", response_model=PackageResponse)
 @limiter.limit(RateLimitConfig.DEFAULT)
 async def get_package(
     request: Request,
     package_id: str,
+    fields: Optional[str] = Query(
+        default=None,
+        description="Comma-separated response fields, e.g. `id,name,price,currency`; `id` is always returned.",
+    ),
     db: Session = Depends(get_db),
 ):
     """
@@ -106,16 +259,20 @@ async def get_package(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Package ID must be a valid UUID.",
         ) from exc
+    selection = _package_selection(fields)
 
     try:
-        repo = PackageRepository(db)
-        package = repo.get_by_id(package_uuid)
-        if package is None:
+        payload = package_details_cache.get_or_set(
+            (package_uuid, selection),
+            partial(_package_payload, db, package_uuid, selection),
+            tags=[PACKAGES_TAG, package_tag(package_uuid)],
+        )
+        if payload is None:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"Package not found: {package_id}",
             )
-        return _serialize_package(package)
+        return FastJSONResponse(payload)
     except HTTPException:
         raise
     except Exception as exception:  # pragma: no cover - defensive logging
@@ -159,6 +316,7 @@ async def update_package(
             setattr(package, key, value)
 
         package = repo.save(package)
+        catalog_invalidation.packages_written([package.id])
         return _serialize_package(package)
     except HTTPException:
         raise
@@ -193,6 +351,7 @@ async def delete_package(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"Package not found: {package_id}",
             )
+        catalog_invalidation.packages_written([package_uuid])
     except HTTPException:
         raise
     except Exception as exception:  # pragma: no cover - defensive logging
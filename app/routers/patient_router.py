@@ -6,18 +6,30 @@ API endpoints for patient data management.
 
 import traceback
 import uuid
+from datetime import datetime
+from functools import partial
 from typing import Optional, List
-from fastapi import APIRouter, HTTPException, Request, Depends
+from fastapi import APIRouter, HTTPException, Request, Response, Depends, Query
 from sqlalchemy.orm import Session
 from pydantic import BaseModel, Field
 
-from app.database.db import SessionLocal
 from app.database.repositories.patient_profile_repository import PatientProfileRepository
 from app.database.repositories.medical_background_repository import MedicalBackgroundRepository
-from app.database.repositories.consultation_repository import ConsultationRepository
 from app.database.repositories.clinic_repository import ClinicRepository
+from app.database.repositories.package_repository import PackageRepository
+from app.database.repositories.patient_image_submission_repository import PatientImageSubmissionRepository
+from app.database.repositories.consultant_note_repository import ConsultantNoteRepository
 from app.config.rate_limits import limiter, RateLimitConfig
-from app.utils import ErrorUtils
+from app.config.settings import settings
+from app.models.patient_image import PatientImageSubmissionModel
+from app.services import fx_rates
+from app.services.catalog_serializer import clinic_dicts
+from app.services.clinic_geo_index import clinic_geo_index
+from app.services.clinic_recommender import PatientPreferences, clinic_recommender, split_methods
+from app.services.patient_cache import invalidate_patient_details, patient_details_cache
+from app.services.read_cache import clinic_tag
+from app.services.read_routing import read_router
+from app.utils import CursorUtils, ErrorUtils, ETagUtils, FastJSONResponse, FieldsetUtils
 
 
 router = APIRouter(
@@ -26,59 +38,264 @@ router = APIRouter(
 )
 
 
-def get_db():
+def get_db(request: Request):
     """Dependency to get database session."""
-    db = SessionLocal()
+    db = read_router.session_for(request)
     try:
         yield db
     finally:
         db.close()
 
 
+def _isoformat(value: Optional[datetime]) -> Optional[str]:
+    return value.isoformat() if value is not None else None
+
+
+def _offer_ids(clinic_offer_ids) -> List[str]:
+    return [str(clinic_id) for clinic_id in (clinic_offer_ids or [])]
+
+
+# Patient list field -> (PatientProfile column, formatter)
+PATIENT_SUMMARY_FIELDS = {
+    "id": ("id", str),
+    "name": ("name", None),
+    "email": ("email", None),
+    "phone": ("phone", None),
+    "age": ("age", None),
+    "location": ("location", None),
+    "clinicOffers": ("clinic_offer_ids", _offer_ids),
+    "created_at": ("created_at", _isoformat),
+    "updated_at": ("updated_at", _isoformat),
+}
+
+
 @router.get("/")
 @limiter.limit(RateLimitConfig.CHAT)
 async def get_all_patients(
     request: Request,
+    response: Response,
+    limit: int = 50,
+    cursor: Optional[str] = Query(
+        default=None,
+        description="Opaque cursor returned as `next_cursor` by the previous page.",
+    ),
+    search: Optional[str] = Query(
+        default=None,
+        description="Case-insensitive prefix of the patient's name or email.",
+    ),
+    created_from: Optional[datetime] = Query(default=None, alias="createdFrom"),
+    created_to: Optional[datetime] = Query(default=None, alias="createdTo"),
+    has_offers: Optional[bool] = Query(default=None, alias="hasOffers"),
+    fields: Optional[str] = Query(
+        default=None,
+        description="Comma-separated response fields, e.g. `id,name,email`; `id` is always returned.",
+    ),
     db: Session = Depends(get_db)
 ):
     """
-    Get all patients with basic information for consultant interface.
+    Get a page of patients with basic information for consultant interface.
+    
+    Only the listed columns are loaded, pages are keyset-paginated (newest first)
+    and an ETag is returned so unchanged pages can be answered with 304.
     
     Returns:
-        List of patients with basic info (id, name, email, phone, age)
+        List of patients with basic info (id, name, email, phone, age) and the next page cursor
     """
+    if limit < 1 or limit > 200:
+        raise HTTPException(
+            status_code=400,
+            detail="Query parameter 'limit' must be between 1 and 200."
+        )
+
+    try:
+        after = CursorUtils.decode_uuid(cursor)
+        selection = FieldsetUtils.parse(fields, PATIENT_SUMMARY_FIELDS) or tuple(PATIENT_SUMMARY_FIELDS)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    projection = [PATIENT_SUMMARY_FIELDS[key] for key in selection]
+
     try:
         patient_repository = PatientProfileRepository(db)
-        
-        # Get all patient profiles
-        from app.database.entities import PatientProfile
-        patients = db.query(PatientProfile).all()
+        rows = patient_repository.list_summaries_page(
+            limit=limit,
+            after=after,
+            search=search.strip() if search else None,
+            created_from=created_from,
+            created_to=created_to,
+            has_offers=has_offers,
+            columns=[column for column, _ in projection],
+        )
+        page = rows[:limit]
         
         result = []
-        for patient in patients:
-            result.append({
-                "id": str(patient.id),
-                "name": patient.name,
-                "email": patient.email,
-                "phone": patient.phone,
-                "age": patient.age,
-                "location": patient.location,
-                "clinicOffers": [str(clinic_id) for clinic_id in (patient.clinic_offer_ids or [])],
-                "created_at": patient.created_at.isoformat(),
-                "updated_at": patient.updated_at.isoformat()
-            })
-        
-        return {
+        for patient in page:
+            item = {}
+            for key, (column, formatter) in zip(selection, projection):
+                value = getattr(patient, column)
+                item[key] = formatter(value) if formatter else value
+            result.append(item)
+
+        next_cursor = None
+        if len(rows) > limit:
+            last = page[-1]
+            next_cursor = CursorUtils.encode(last.created_at, last.id)
+
+        payload = {
             "success": True,
             "data": result,
-            "count": len(result)
+            "count": len(result),
+            "has_more": next_cursor is not None,
+            "next_cursor": next_cursor,
         }
+
+        etag = ETagUtils.compute(payload)
+        if ETagUtils.matches(request, etag):
+            return Response(status_code=304, headers={"ETag": etag})
+        response.headers["ETag"] = etag
+        return payload
         
     except Exception as exception:
         traceback.print_exc()
         raise ErrorUtils.toHTTPException(exception)
 
 
+def _format_medical_summary(medical_background) -> dict:
+    """Map stored medical data onto the consultant medical summary shape."""
+    if not (medical_background and medical_background.medical_data):
+        return {
+            "medications": "none",
+            "medicationsDetails": "",
+            "allergies": "none", 
+            "allergiesDetails": "",
+            "medicalConditions": "none",
+            "medicalConditionsDetails": "",
+            "previousSurgeries": "none",
+            "previousSurgeriesDetails": ""
+        }
+    medical_data = medical_background.medical_data
+    return {
+        "medications": medical_data.get("current_medications", "none"),
+        "medicationsDetails": medical_data.get("current_medications_details", ""),
+        "allergies": medical_data.get("allergies", "none"),
+        "allergiesDetails": medical_data.get("allergies_details", ""),
+        "medicalConditions": medical_data.get("medical_conditions", "none"),
+        "medicalConditionsDetails": medical_data.get("medical_conditions_details", ""),
+        "previousSurgeries": medical_data.get("previous_surgeries", "none"),
+        "previousSurgeriesDetails": medical_data.get("previous_surgeries_details", "")
+    }
+
+
+def _format_hair_loss_profile(medical_background) -> dict:
+    """Map stored medical data onto the consultant hair loss profile shape."""
+    if not (medical_background and medical_background.medical_data):
+        return {
+            "duration": "",
+            "pattern": [],
+            "familyHistory": [],
+            "previousTreatments": []
+        }
+    medical_data = medical_background.medical_data
+    return {
+        "duration": medical_data.get("hair_loss_duration", ""),
+        "pattern": medical_data.get("hair_loss_pattern", []),
+        "familyHistory": medical_data.get("family_history", []),
+        "previousTreatments": medical_data.get("previous_treatments", [])
+    }
+
+
+def _patient_details_payload(db: Session, patient_id: str) -> Optional[dict]:
+    """
+    Formatted patient details, served from the short-TTL read cache when present.
+    return:
+        return the payload, or None when the patient does not exist
+    """
+    return patient_details_cache.get_or_set(
+        str(uuid.UUID(patient_id)),
+        partial(_load_patient_details, db, patient_id),
+        tags=lambda result: [clinic_tag(clinic["id"]) for clinic in result["offeredClinics"]],
+    )
+
+
+def _load_patient_details(db: Session, patient_id: str) -> Optional[dict]:
+    patient_repository = PatientProfileRepository(db)
+
+    # Get patient profile together with its related records
+    aggregate = patient_repository.get_aggregate(patient_id)
+    if not aggregate:
+        return None
+
+    patient = aggregate.profile
+    medical_background = aggregate.medical_background
+    latest_consultation = aggregate.latest_consultation
+
+    # Format consultation status
+    consultation_status = {
+        "bookingUid": "",
+        "scheduledAt": "",
+        "status": "none"
+    }
+
+    if latest_consultation:
+        consultation_status = {
+            # Use zoom_meeting_id as a stable external reference for now
+            "bookingUid": latest_consultation.zoom_meeting_id or "",
+            "scheduledAt": latest_consultation.start_time.isoformat() if latest_consultation.start_time else "",
+            "status": latest_consultation.status or "scheduled"
+        }
+
+    # Determine journey stage based on consultation status
+    journey_stage = "discovery"
+    if latest_consultation:
+        if latest_consultation.status == "scheduled":
+            journey_stage = "consultation"
+        elif latest_consultation.status == "completed":
+            journey_stage = "recovery"
+        elif latest_consultation.status == "cancelled":
+            journey_stage = "discovery"
+
+    result = {
+        "id": str(patient.id),
+        "name": patient.name,
+        "email": patient.email,
+        "phone": patient.phone,
+        "ageRange": f"{patient.age}-{patient.age+10}" if patient.age else None,
+        "clinicOffers": [str(clinic_id) for clinic_id in (patient.clinic_offer_ids or [])],
+        "offeredClinics": [
+            {
+                "id": str(clinic.id),
+                "title": clinic.title,
+                "city": clinic.city,
+                "country": clinic.country,
+                "rating": clinic.rating,
+                "hasContract": clinic.has_contract,
+            }
+            for clinic in aggregate.offer_clinics
+        ],
+        "medicalSummary": _format_medical_summary(medical_background),
+        "hairLossProfile": _format_hair_loss_profile(medical_background),
+        "consultationStatus": consultation_status,
+        "journeyStage": journey_stage,
+        "lastUpdated": patient.updated_at.isoformat(),
+        "created_at": patient.created_at.isoformat()
+    }
+    return result
+
+
+def _note_dict(note) -> dict:
+    """Same shape as the consultant notes API returns."""
+    return {
+        "id": str(note.id),
+        "patient_profile_id": str(note.patient_profile_id),
+        "consultant_email": note.consultant_email,
+        "note_content": note.note_content,
+        "consultation_id": str(note.consultation_id) if note.consultation_id else None,
+        "note_type": note.note_type,
+        "is_private": note.is_private,
+        "created_at": note.created_at.isoformat(),
+        "updated_at": note.updated_at.isoformat(),
+    }
+
+
 @router.get("/{patient_id}")
 @limiter.limit(RateLimitConfig.CHAT)
 async def get_patient_details(
@@ -89,6 +306,9 @@ async def get_patient_details(
     """
     Get specific patient with full medical data for consultant interface.
     
+    The profile, medical background, latest consultation and offered clinics are
+    loaded in one query, and the formatted payload is cached briefly per patient.
+    
     Args:
         patient_id: The patient profile ID
         
@@ -96,117 +316,13 @@ async def get_patient_details(
         Patient details with medical background and consultation info
     """
     try:
-        patient_repository = PatientProfileRepository(db)
-        medical_repository = MedicalBackgroundRepository(db)
-        consultation_repository = ConsultationRepository(db)
-        
-        # Get patient profile
-        patient = patient_repository.get_by_id(patient_id)
-        if not patient:
+        result = _patient_details_payload(db, patient_id)
+        if result is None:
             raise HTTPException(
                 status_code=404,
                 detail=f"Patient not found: {patient_id}"
             )
         
-        # Get medical background
-        medical_background = medical_repository.get_by_patient_profile_id(patient_id)
-        
-        # Get consultations
-        consultations = consultation_repository.get_by_patient_profile_id(patient_id)
-        
-        # Get latest consultation for status
-        latest_consultation = None
-        if consultations:
-            # Sort by start_time and get the most recent
-            sorted_consultations = sorted(
-                [c for c in consultations if c.start_time], 
-                key=lambda x: x.start_time, 
-                reverse=True
-            )
-            latest_consultation = sorted_consultations[0] if sorted_consultations else None
-        
-        # Format medical summary
-        medical_summary = {
-            "medications": "none",
-            "medicationsDetails": "",
-            "allergies": "none", 
-            "allergiesDetails": "",
-            "medicalConditions": "none",
-            "medicalConditionsDetails": "",
-            "previousSurgeries": "none",
-            "previousSurgeriesDetails": ""
-        }
-        
-        if medical_background and medical_background.medical_data:
-            medical_data = medical_background.medical_data
-            medical_summary = {
-                "medications": medical_data.get("current_medications", "none"),
-                "medicationsDetails": medical_data.get("current_medications_details", ""),
-                "allergies": medical_data.get("allergies", "none"),
-                "allergiesDetails": medical_data.get("allergies_details", ""),
-                "medicalConditions": medical_data.get("medical_conditions", "none"),
-                "medicalConditionsDetails": medical_data.get("medical_conditions_details", ""),
-                "previousSurgeries": medical_data.get("previous_surgeries", "none"),
-                "previousSurgeriesDetails": medical_data.get("previous_surgeries_details", "")
-            }
-        
-        # Format hair loss profile
-        hair_loss_profile = {
-            "duration": "",
-            "pattern": [],
-            "familyHistory": [],
-            "previousTreatments": []
-        }
-        
-        if medical_background and medical_background.medical_data:
-            medical_data = medical_background.medical_data
-            hair_loss_profile = {
-                "duration": medical_data.get("hair_loss_duration", ""),
-                "pattern": medical_data.get("hair_loss_pattern", []),
-                "familyHistory": medical_data.get("family_history", []),
-                "previousTreatments": medical_data.get("previous_treatments", [])
-            }
-        
-        # Format consultation status
-        consultation_status = {
-            "bookingUid": "",
-            "scheduledAt": "",
-            "status": "none"
-        }
-        
-        if latest_consultation:
-            consultation_status = {
-                # Use zoom_meeting_id as a stable external reference for now
-                "bookingUid": latest_consultation.zoom_meeting_id or "",
-                "scheduledAt": latest_consultation.start_time.isoformat() if latest_consultation.start_time else "",
-                "status": latest_consultation.status or "scheduled"
-            }
-        
-        # Determine journey stage based on consultation status
-        journey_stage = "discovery"
-        if latest_consultation:
-            if latest_consultation.status == "scheduled":
-                journey_stage = "consultation"
-            elif latest_consultation.status == "completed":
-                journey_stage = "recovery"
-            elif latest_consultation.status == "cancelled":
-                journey_stage = "discovery"
-        
-        result = {
-            "id": str(patient.id),
-            "name": patient.name,
-            "email": patient.email,
-            "phone": patient.phone,
-            "ageRange": f"{patient.age}-{patient.age+10}" if patient.age else None,
-            "clinicOffers": [str(clinic_id) for clinic_id in (patient.clinic_offer_ids or [])],
-            "medicalSummary": medical_summary,
-            "hairLossProfile": hair_loss_profile,
-            "consultationStatus": consultation_status,
-            "journeyStage": journey_stage,
-            "lastUpdated": patient.updated_at.isoformat(),
-            "created_at": patient.created_at.isoformat()
-        }
-        
         return {
             "success": True,
             "data": result
@@ -219,6 +335,78 @@ async def get_patient_details(
         raise ErrorUtils.toHTTPException(exception)
 
 
+@router.get("/{patient_id}/dashboard")
+@limiter.limit(RateLimitConfig.CHAT)
+async def get_patient_dashboard(
+    request: Request,
+    patient_id: str,
+    include_private: bool = False,
+    db: Session = Depends(get_db)
+):
+    """
+    Everything the consultant dashboard renders for one patient, in one response.
+    
+    Replaces the sequential calls to the patient details, consultant notes,
+    patient images and per-clinic endpoints. All reads share one session.
+    
+    Args:
+        patient_id: The patient profile ID
+        include_private: Whether to include private consultant notes
+        
+    Returns:
+        Patient details, notes, image submissions and the offered clinics
+        with their packages
+    """
+    try:
+        patient_uuid = uuid.UUID(patient_id)
+    except ValueError as exc:
+        raise HTTPException(
+            status_code=400,
+            detail="Patient ID must be a valid UUID."
+        ) from exc
+
+    try:
+        patient = _patient_details_payload(db, patient_id)
+        if patient is None:
+            raise HTTPException(
+                status_code=404,
+                detail=f"Patient not found: {patient_id}"
+            )
+
+        notes = ConsultantNoteRepository(db).get_by_patient_profile_id(
+            patient_uuid,
+            include_private=include_private
+        )
+        submissions = PatientImageSubmissionRepository(db).list_by_patient_profile(patient_uuid)
+
+        offer_ids = [uuid.UUID(clinic_id) for clinic_id in patient["clinicOffers"]]
+        clinics = {
+            clinic.id: clinic
+            for clinic in ClinicRepository(db).get_by_ids(offer_ids)
+        }
+
+        return FastJSONResponse({
+            "success": True,
+            "data": {
+                "patient": patient,
+                "notes": [_note_dict(note) for note in notes],
+                "imageSubmissions": [
+                    PatientImageSubmissionModel.model_validate(submission).model_dump(mode="json")
+                    for submission in submissions
+                ],
+                "clinics": clinic_dicts(
+                    [clinics[clinic_id] for clinic_id in offer_ids if clinic_id in clinics]
+                ),
+            }
+        })
+
+    except HTTPException:
+        raise
+    except Exception as exception:
+        traceback.print_exc()
+        raise ErrorUtils.toHTTPException(exception)
+
+
 @router.get("/{patient_id}/medical")
 @limiter.limit(RateLimitConfig.CHAT)
 async def get_patient_medical_data(
@@ -318,13 +506,15 @@ async def update_patient_profile(
         patient_repository = PatientProfileRepository(db)
         medical_repository = MedicalBackgroundRepository(db)
         
-        # Get existing patient
-        patient = patient_repository.get_by_id(patient_id)
-        if not patient:
+        # Get existing patient together with its medical background
+        aggregate = patient_repository.get_aggregate(patient_id)
+        if not aggregate:
             raise HTTPException(
                 status_code=404,
                 detail=f"Patient not found: {patient_id}"
             )
+        patient = aggregate.profile
+        medical_background = aggregate.medical_background
         
         # Update basic patient profile fields
         if update_data.name is not None:
@@ -342,112 +532,65 @@ async def update_patient_profile(
                 # If parsing fails, keep existing age
                 pass
         
-        # Save patient profile changes
-        patient_repository.save(patient)
-        
         # Update medical background if provided
         if update_data.medicalSummary or update_data.hairLossProfile:
-            # Get or create medical background
-            medical_background = medical_repository.get_by_patient_profile_id(patient_id)
-            if not medical_background:
-                medical_background = medical_repository.create(
-                    patient_profile_id=patient_id,
-                    medical_data={}
-                )
-            
-            # Update medical data
-            medical_data = medical_background.medical_data or {}
+            # Collect the changed keys; they are merged into the stored data
+            # server-side, creating the record if the patient has none yet
+            changes = {}
             
             if update_data.medicalSummary:
                 # Only update fields that are provided (not None)
                 if update_data.medicalSummary.medications is not None:
-                    medical_data["current_medications"] = update_data.medicalSummary.medications
+                    changes["current_medications"] = update_data.medicalSummary.medications
                 if update_data.medicalSummary.medicationsDetails is not None:
-                    medical_data["current_medications_details"] = update_data.medicalSummary.medicationsDetails
+                    changes["current_medications_details"] = update_data.medicalSummary.medicationsDetails
                 if update_data.medicalSummary.allergies is not None:
-                    medical_data["allergies"] = update_data.medicalSummary.allergies
+                    changes["allergies"] = update_data.medicalSummary.allergies
                 if update_data.medicalSummary.allergiesDetails is not None:
-                    medical_data["allergies_details"] = update_data.medicalSummary.allergiesDetails
+                    changes["allergies_details"] = update_data.medicalSummary.allergiesDetails
                 if update_data.medicalSummary.medicalConditions is not None:
-                    medical_data["medical_conditions"] = update_data.medicalSummary.medicalConditions
+                    changes["medical_conditions"] = update_data.medicalSummary.medicalConditions
                 if update_data.medicalSummary.medicalConditionsDetails is not None:
-                    medical_data["medical_conditions_details"] = update_data.medicalSummary.medicalConditionsDetails
+                    changes["medical_conditions_details"] = update_data.medicalSummary.medicalConditionsDetails
                 if update_data.medicalSummary.previousSurgeries is not None:
-                    medical_data["previous_surgeries"] = update_data.medicalSummary.previousSurgeries
+                    changes["previous_surgeries"] = update_data.medicalSummary.previousSurgeries
                 if update_data.medicalSummary.previousSurgeriesDetails is not None:
-                    medical_data["previous_surgeries_details"] = update_data.medicalSummary.previousSurgeriesDetails
+                    changes["previous_surgeries_details"] = update_data.medicalSummary.previousSurgeriesDetails
             
             if update_data.hairLossProfile:
                 # Only update fields that are provided (not None)
                 if update_data.hairLossProfile.duration is not None:
-                    medical_data["hair_loss_duration"] = update_data.hairLossProfile.duration
+                    changes["hair_loss_duration"] = update_data.hairLossProfile.duration
                 if update_data.hairLossProfile.pattern is not None:
-                    medical_data["hair_loss_pattern"] = update_data.hairLossProfile.pattern
+                    changes["hair_loss_pattern"] = update_data.hairLossProfile.pattern
                 if update_data.hairLossProfile.familyHistory is not None:
-                    medical_data["family_history"] = update_data.hairLossProfile.familyHistory
+                    changes["family_history"] = update_data.hairLossProfile.familyHistory
                 if update_data.hairLossProfile.previousTreatments is not None:
-                    medical_data["previous_treatments"] = update_data.hairLossProfile.previousTreatments
+                    changes["previous_treatments"] = update_data.hairLossProfile.previousTreatments
             
-            medical_background.medical_data = medical_data
-            medical_repository.save(medical_background)
-        
-        # Get updated patient data to return
-        updated_patient = patient_repository.get_by_id(patient_id)
-        updated_medical = medical_repository.get_by_patient_profile_id(patient_id)
-        
-        # Format response similar to get_patient_details
-        medical_summary = {
-            "medications": "none",
-            "medicationsDetails": "",
-            "allergies": "none", 
-            "allergiesDetails": "",
-            "medicalConditions": "none",
-            "medicalConditionsDetails": "",
-            "previousSurgeries": "none",
-            "previousSurgeriesDetails": ""
-        }
+            medical_background = medical_repository.merge_medical_data(patient.id, changes)
         
-        if updated_medical and updated_medical.medical_data:
-            medical_data = updated_medical.medical_data
-            medical_summary = {
-                "medications": medical_data.get("current_medications", "none"),
-                "medicationsDetails": medical_data.get("current_medications_details", ""),
-                "allergies": medical_data.get("allergies", "none"),
-                "allergiesDetails": medical_data.get("allergies_details", ""),
-                "medicalConditions": medical_data.get("medical_conditions", "none"),
-                "medicalConditionsDetails": medical_data.get("medical_conditions_details", ""),
-                "previousSurgeries": medical_data.get("previous_surgeries", "none"),
-                "previousSurgeriesDetails": medical_data.get("previous_surgeries_details", "")
-            }
+        # Format medical sections from the in-memory record before the profile
+        # commit expires it, so the response needs no follow-up reads
+        medical_summary = _format_medical_summary(medical_background)
+        hair_loss_profile = _format_hair_loss_profile(medical_background)
         
-        hair_loss_profile = {
-            "duration": "",
-            "pattern": [],
-            "familyHistory": [],
-            "previousTreatments": []
-        }
-        
-        if updated_medical and updated_medical.medical_data:
-            medical_data = updated_medical.medical_data
-            hair_loss_profile = {
-                "duration": medical_data.get("hair_loss_duration", ""),
-                "pattern": medical_data.get("hair_loss_pattern", []),
-                "familyHistory": medical_data.get("family_history", []),
-                "previousTreatments": medical_data.get("previous_treatments", [])
-            }
+        # Save patient profile changes
+        patient_repository.save(patient)
+        invalidate_patient_details(patient.id)
         
         result = {
-            "id": str(updated_patient.id),
-            "name": updated_patient.name,
-            "email": updated_patient.email,
-            "phone": updated_patient.phone,
-            "ageRange": f"{updated_patient.age}-{updated_patient.age+10}" if updated_patient.age else None,
-            "clinicOffers": [str(clinic_id) for clinic_id in (updated_patient.clinic_offer_ids or [])],
+            "id": str(patient.id),
+            "name": patient.name,
+            "email": patient.email,
+            "phone": patient.phone,
+            "ageRange": f"{patient.age}-{patient.age+10}" if patient.age else None,
+            "clinicOffers": [str(clinic_id) for clinic_id in (patient.clinic_offer_ids or [])],
             "medicalSummary": medical_summary,
             "hairLossProfile": hair_loss_profile,
             "journeyStage": update_data.journeyStage or "discovery",
-            "lastUpdated": updated_patient.updated_at.isoformat(),
-            "created_at": updated_patient.created_at.isoformat()
+            "lastUpdated": patient.updated_at.isoformat(),
+            "created_at": patient.created_at.isoformat()
         }
         
         return {
@@ -478,19 +621,8 @@ async def add_patient_offers(
         patient_repository = PatientProfileRepository(db)
         clinic_repository = ClinicRepository(db)
 
-        patient = patient_repository.get_by_id(patient_id)
-        if not patient:
-            raise HTTPException(
-                status_code=404,
-                detail=f"Patient not found: {patient_id}"
-            )
-
         clinic_ids = list(payload.clinic_ids)
-        clinics = clinic_repository.get_by_ids(clinic_ids)
-        found_ids = {clinic.id for clinic in clinics}
-        missing_ids = sorted(
-            {clinic_id for clinic_id in clinic_ids if clinic_id not in found_ids}
-        )
+        missing_ids = clinic_repository.missing_ids(clinic_ids)
         if missing_ids:
             missing_str = ", ".join(str(clinic_id) for clinic_id in missing_ids)
             raise HTTPException(
@@ -498,7 +630,13 @@ async def add_patient_offers(
                 detail=f"Clinics not found: {missing_str}"
             )
 
-        updated_patient = patient_repository.add_clinic_offers(patient, clinic_ids)
+        updated_patient = patient_repository.add_clinic_offers(patient_id, clinic_ids)
+        if not updated_patient:
+            raise HTTPException(
+                status_code=404,
+                detail=f"Patient not found: {patient_id}"
+            )
+        invalidate_patient_details(updated_patient.id)
 
         return {
             "success": True,
@@ -517,6 +655,112 @@ async def add_patient_offers(
         raise ErrorUtils.toHTTPException(exception)
 
 
+@router.get("/{patient_id}/recommendations")
+@limiter.limit(RateLimitConfig.CHAT)
+async def get_patient_recommendations(
+    request: Request,
+    patient_id: str,
+    k: int = Query(default=10, ge=1, le=50),
+    budget: Optional[float] = Query(default=None, gt=0),
+    currency: Optional[str] = Query(default=None, min_length=3, max_length=3),
+    grafts: Optional[int] = Query(default=None, gt=0, description="Overrides the image-analysis graft estimate."),
+    method: List[str] = Query(default=[], description="Preferred transplantation method(s)."),
+    distinct_clinics: bool = Query(default=True, alias="distinctClinics"),
+    db: Session = Depends(get_db)
+):
+    """
+    Recommend clinic packages for a patient.
+
+    Inputs default to the latest image analysis (graft estimate, cost estimate
+    as budget, procedure type) and the profile location; query parameters
+    override them. Each result carries its per-feature score breakdown.
+    """
+    try:
+        patient_repository = PatientProfileRepository(db)
+        patient = patient_repository.get_by_id(patient_id)
+        if not patient:
+            raise HTTPException(
+                status_code=404,
+                detail=f"Patient not found: {patient_id}"
+            )
+
+        submission = PatientImageSubmissionRepository(db).get_latest_analysed_by_patient_profile(patient.id)
+        preferences = PatientPreferences.from_analysis(submission.analysis if submission else None)
+        if budget is not None:
+            preferences.budget = budget
+        if currency:
+            preferences.currency = currency.upper()
+        if grafts is not None:
+            preferences.grafts_min = preferences.grafts_max = float(grafts)
+        if method:
+            preferences.methods = split_methods(",".join(method))
+        if preferences.budget is not None:
+            try:
+                preferences.budget = float(fx_rates.to_base(preferences.budget, preferences.currency, db))
+            except ValueError as exc:
+                raise HTTPException(status_code=400, detail=str(exc)) from exc
+            preferences.currency = settings.FX_BASE_CURRENCY
+
+        clinic_geo_index.ensure_fresh(db)
+        preferences.origin = clinic_geo_index.locate(patient.location)
+
+        clinic_recommender.ensure_fresh(db)
+        recommendations = clinic_recommender.recommend(
+            preferences,
+            k=k,
+            distinct_clinics=distinct_clinics,
+        )
+
+        clinics = {
+            clinic.id: clinic
+            for clinic in ClinicRepository(db).get_by_ids(list({rec.clinic_id for rec in recommendations}))
+        }
+        packages = {
+            package.id: package
+            for package in PackageRepository(db).get_by_ids(list({rec.package_id for rec in recommendations}))
+        }
+
+        result = []
+        for rec in recommendations:
+            clinic = clinics.get(rec.clinic_id)
+            package = packages.get(rec.package_id)
+            if clinic is None or package is None:
+                continue
+            result.append({
+                "clinicId": str(clinic.id),
+                "clinicTitle": clinic.title,
+                "city": clinic.city,
+                "country": clinic.country,
+                "packageId": str(package.id),
+                "packageName": package.name,
+                "price": str(package.price) if package.price is not None else None,
+                "currency": package.currency,
+                "score": rec.score,
+                "breakdown": rec.breakdown,
+            })
+
+        return {
+            "success": True,
+            "data": {
+                "preferences": {
+                    "graftsMin": preferences.grafts_min,
+                    "graftsMax": preferences.grafts_max,
+                    "budget": preferences.budget,
+                    "currency": preferences.currency,
+                    "methods": preferences.methods,
+                    "origin": list(preferences.origin) if preferences.origin else None,
+                },
+                "recommendations": result,
+            },
+            "count": len(result),
+        }
+    except HTTPException:
+        raise
+    except Exception as exception:
+        traceback.print_exc()
+        raise ErrorUtils.toHTTPException(exception)
+
+
 @router.get("/health")
 async def health_check(request: Request):
     """Health check endpoint for patient service."""
@@ -0,0 +1,86 @@
+"""
+Cache Events
+
+Cross-worker cache invalidation. Write paths that retire this worker's
+in-process caches also `publish` the change as a Postgres NOTIFY on
+CACHE_INVALIDATION_CHANNEL naming the entity type and ids; the listener in
+every worker (app.services.cache_invalidation) evicts the matching entries.
+Payloads are JSON:
+
+    {"origin": "<worker id>", "entity": "clinic", "ids": ["<uuid>", ...]}
+
+`ids` is null for "every row": bulk writes, FX rate changes, or more than
+MAX_EVENT_IDS ids, which keeps payloads well under Postgres' 8000 byte limit.
+"""
+
+import json
+import uuid
+from typing import Any, Dict, Iterable, Optional, Union
+
+from sqlalchemy import func, select
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.config.settings import settings
+from app.database.db import engine
+
+
+CLINIC = "clinic"
+PACKAGE = "package"
+PATIENT = "patient"
+CONSULTATION = "consultation"
+FX_RATES = "fx_rates"
+ENTITIES = frozenset({CLINIC, PACKAGE, PATIENT, CONSULTATION, FX_RATES})
+
+MAX_EVENT_IDS = 100
+
+# Identifies this worker, so its listener can skip the events it published
+ORIGIN = uuid.uuid4().hex
+
+Ids = Optional[Iterable[Union[str, uuid.UUID]]]
+
+
+def encode_event(entity: str, ids: Ids = None) -> str:
+    if ids is not None:
+        ids = list(dict.fromkeys(str(entity_id) for entity_id in ids))
+        if len(ids) > MAX_EVENT_IDS:
+            ids = None
+    return json.dumps({"origin": ORIGIN, "entity": entity, "ids": ids}, separators=(",", ":"))
+
+
+def decode_event(payload: str) -> Optional[Dict[str, Any]]:
+    """
+    Parse a NOTIFY payload.
+    return:
+        return the event, or None when it is malformed or names an unknown entity
+    """
+    try:
+        event = json.loads(payload)
+    except ValueError:
+        return None
+    if not isinstance(event, dict) or event.get("entity") not in ENTITIES:
+        return None
+    ids = event.get("ids")
+    if ids is not None and not (isinstance(ids, list) and all(isinstance(entity_id, str) for entity_id in ids)):
+        return None
+    return event
+
+
+def publish(entity: str, ids: Ids = None) -> None:
+    """
+    Tell the other workers that rows of `entity` changed (all of them when
+    `ids` is None). Call once the write has committed. The NOTIFY runs on its
+    own pooled connection, leaving the caller's session untouched; failures
+    are logged rather than raised since the write already stands, and other
+    workers' entries then age out through their TTLs.
+    """
+    if not settings.CACHE_INVALIDATION_CHANNEL or engine.dialect.name != "postgresql":
+        return
+    if ids is not None:
+        ids = list(ids)
+        if not ids:
+            return
+    try:
+        with engine.begin() as connection:
+            connection.execute(select(func.pg_notify(settings.CACHE_INVALIDATION_CHANNEL, encode_event(entity, ids))))
+    except SQLAlchemyError as exc:
+        print(f"⚠️ Cache invalidation event for {entity} not published: {exc}")
@@ -0,0 +1,243 @@
+"""
+Cache Invalidation
+
+Applies other workers' cache events (app.services.cache_events) to this
+worker's in-process caches. `invalidation_listener` runs while the app is up:
+a daemon thread holding its own Postgres connection that LISTENs on
+CACHE_INVALIDATION_CHANNEL and evicts what each event names. Events this
+worker published are skipped; it evicted those locally when writing.
+
+Events sent while the listener is not subscribed are lost, so it flushes
+every local cache when the connection drops, every
+CACHE_INVALIDATION_FALLBACK_SECONDS while it stays down, and once more after
+re-subscribing. Staleness is bounded by the fallback interval rather than by
+each cache's TTL.
+
+With the Redis read-cache backend the read cache is shared and the writer
+already invalidated it, so only per-process structures are evicted.
+
+With a read replica (DATABASE_READ_URL), a read served just after a write
+may refill a cache from a replica that has not replayed it yet, so every
+event, including this worker's own, is applied once more after
+DATABASE_READ_STICKY_SECONDS.
+"""
+
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Dict, Optional, Sequence, Tuple
+
+import psycopg
+from psycopg import sql
+
+from app.config.settings import settings
+from app.database.db import engine
+from app.services.cache_events import CLINIC, CONSULTATION, FX_RATES, ORIGIN, PACKAGE, PATIENT, decode_event
+from app.services.catalog_search_index import catalog_search_index
+from app.services.catalog_snapshots import catalog_snapshots
+from app.services.clinic_cache import invalidate_clinic_counts
+from app.services.clinic_geo_index import clinic_geo_index
+from app.services.clinic_recommender import clinic_recommender
+from app.services.fx_rates import fx_rate_cache
+from app.services.patient_cache import patient_details_cache
+from app.services.read_cache import CONSULTATIONS_TAG, invalidate_catalog, read_cache
+
+
+def evict(entity: str, ids: Optional[Sequence[str]] = None) -> None:
+    """Drop this worker's cached state built from the named rows (every row when `ids` is None)."""
+    local_reads = not read_cache.backend.shared
+    if entity == PATIENT:
+        if local_reads:
+            if ids is None:
+                read_cache.clear()
+            for patient_id in ids or ():
+                patient_details_cache.delete(patient_id)
+        return
+    if entity == CONSULTATION:
+        if local_reads:
+            read_cache.invalidate_tags(CONSULTATIONS_TAG)
+        return
+
+    if entity == FX_RATES:
+        fx_rate_cache.clear()
+    if entity != PACKAGE:
+        invalidate_clinic_counts()
+        clinic_geo_index.invalidate()
+    catalog_search_index.invalidate()
+    catalog_snapshots.invalidate()
+    clinic_recommender.invalidate()
+    if not local_reads:
+        return
+    if entity == CLINIC:
+        invalidate_catalog(ids or (), all_clinics=ids is None)
+    elif entity == PACKAGE:
+        invalidate_catalog(package_ids=ids or (), all_packages=ids is None)
+    else:
+        invalidate_catalog(all_clinics=True, all_packages=True)
+
+
+def evict_all() -> None:
+    """Drop every local cache, for when events may have been missed."""
+    evict(FX_RATES)
+    if not read_cache.backend.shared:
+        read_cache.clear()
+
+
+class InvalidationListener:
+    """
+    Background LISTEN loop applying cache events to this worker. `on_event`
+    receives (entity, ids) for every event from another worker, and for
+    every event again `replay_seconds` later when set; `on_flush` runs
+    whenever events may have been missed.
+    """
+
+    def __init__(
+        self,
+        conninfo: str,
+        channel: str,
+        fallback_seconds: float = 30.0,
+        *,
+        on_event: Callable[[str, Optional[Sequence[str]]], None] = evict,
+        on_flush: Callable[[], None] = evict_all,
+        poll_seconds: float = 1.0,
+        retry_seconds: float = 5.0,
+        replay_seconds: Optional[float] = None,
+    ) -> None:
+        self.conninfo = conninfo
+        self.channel = channel
+        self.fallback_seconds = fallback_seconds
+        self.on_event = on_event
+        self.on_flush = on_flush
+        self.poll_seconds = poll_seconds
+        self.retry_seconds = min(retry_seconds, fallback_seconds)
+        self.replay_seconds = replay_seconds
+        self._replays: "deque[Tuple[float, str, Optional[Sequence[str]]]]" = deque()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._last_flush = 0.0
+        self._stats = {"connected": False, "received": 0, "applied": 0, "replayed": 0, "reconnects": 0, "flushes": 0}
+
+    def start(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="cache-invalidation-listener", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return dict(self._stats)
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self._stats[name] += 1
+
+    def handle(self, payload: str) -> bool:
+        """
+        Apply one NOTIFY payload.
+        return:
+            return True when it named another worker's change and was applied
+        """
+        self._count("received")
+        event = decode_event(payload)
+        if event is None:
+            return False
+        if self.replay_seconds:
+            with self._lock:
+                self._replays.append((time.monotonic() + self.replay_seconds, event["entity"], event["ids"]))
+        if event.get("origin") == ORIGIN:
+            return False
+        self.on_event(event["entity"], event["ids"])
+        self._count("applied")
+        return True
+
+    def apply_due_replays(self) -> int:
+        """
+        Apply the replays whose delay has passed.
+        return:
+            return number of events replayed
+        """
+        replayed = 0
+        now = time.monotonic()
+        while True:
+            with self._lock:
+                if not self._replays or self._replays[0][0] > now:
+                    break
+                _, entity, ids = self._replays.popleft()
+                self._stats["replayed"] += 1
+            self.on_event(entity, ids)
+            replayed += 1
+        return replayed
+
+    def _flush(self) -> None:
+        self._last_flush = time.monotonic()
+        self._count("flushes")
+        try:
+            self.on_flush()
+        except Exception as exc:
+            print(f"⚠️ Cache flush failed: {exc}")
+
+    def _run(self) -> None:
+        subscribed_before = False
+        while not self._stop.is_set():
+            try:
+                with psycopg.connect(self.conninfo, autocommit=True, connect_timeout=10) as connection:
+                    connection.execute(sql.SQL("LISTEN {}").format(sql.Identifier(self.channel)))
+                    with self._lock:
+                        self._stats["connected"] = True
+                        if subscribed_before:
+                            self._stats["reconnects"] += 1
+                    if subscribed_before:
+                        # Changes made while we were away were never delivered
+                        self._flush()
+                    subscribed_before = True
+                    self._listen(connection)
+            except Exception as exc:
+                print(f"⚠️ Cache invalidation listener disconnected: {exc}")
+
+            with self._lock:
+                was_connected = self._stats["connected"]
+                self._stats["connected"] = False
+            if self._stop.is_set():
+                break
+            if was_connected or time.monotonic() - self._last_flush >= self.fallback_seconds:
+                self._flush()
+            self._stop.wait(self.retry_seconds)
+
+    def _listen(self, connection: psycopg.Connection) -> None:
+        last_check = time.monotonic()
+        while not self._stop.is_set():
+            for notify in connection.notifies(timeout=self.poll_seconds):
+                try:
+                    self.handle(notify.payload)
+                except Exception as exc:
+                    print(f"⚠️ Cache invalidation event not applied: {exc}")
+            try:
+                self.apply_due_replays()
+            except Exception as exc:
+                print(f"⚠️ Cache invalidation replay not applied: {exc}")
+            if time.monotonic() - last_check >= self.fallback_seconds:
+                # A silently dropped connection only errors once it is used
+                connection.execute("SELECT 1")
+                last_check = time.monotonic()
+
+
+def _create_listener() -> Optional[InvalidationListener]:
+    if not settings.CACHE_INVALIDATION_CHANNEL or engine.dialect.name != "postgresql":
+        return None
+    return InvalidationListener(
+        engine.url.set(drivername="postgresql").render_as_string(hide_password=False),
+        settings.CACHE_INVALIDATION_CHANNEL,
+        settings.CACHE_INVALIDATION_FALLBACK_SECONDS,
+        replay_seconds=settings.DATABASE_READ_STICKY_SECONDS if settings.DATABASE_READ_URL else None,
+    )
+
+
+invalidation_listener = _create_listener()
@@ -0,0 +1,66 @@
+"""
+Catalog Invalidation
+
+What a committed clinic or package write must retire: this worker's catalog
+caches and indexes, and, through a cache event, every other worker's.
+Repositories only read and write rows; the routers and scripts calling their
+write methods run the matching hook here once the write has committed.
+"""
+
+import uuid
+from typing import Iterable, Optional, Sequence
+
+from app.database.entities import Clinic
+from app.services import cache_events
+from app.services.catalog_search_index import catalog_search_index
+from app.services.catalog_snapshots import catalog_snapshots
+from app.services.clinic_cache import invalidate_clinic_counts
+from app.services.clinic_geo_index import clinic_geo_index
+from app.services.clinic_recommender import clinic_recommender
+from app.services.read_cache import invalidate_catalog
+
+
+def clinic_written(clinic: Clinic) -> None:
+    """One clinic was updated; `clinic` holds its committed state."""
+    invalidate_clinic_counts()
+    clinic_geo_index.upsert(clinic)
+    catalog_search_index.invalidate()
+    catalog_snapshots.invalidate()
+    clinic_recommender.invalidate()
+    invalidate_catalog([clinic.id])
+    cache_events.publish(cache_events.CLINIC, [clinic.id])
+
+
+def clinics_written(
+    clinic_ids: Optional[Sequence[uuid.UUID]] = None,
+    *,
+    contract_changed: bool = False,
+) -> None:
+    """
+    Several clinics were updated, every clinic when `clinic_ids` is None.
+    The geo index is rebuilt only when `contract_changed`, since its points
+    carry each clinic's contract flag and nothing else these writes change.
+    """
+    invalidate_clinic_counts()
+    if contract_changed:
+        clinic_geo_index.invalidate()
+    catalog_search_index.invalidate()
+    catalog_snapshots.invalidate()
+    clinic_recommender.invalidate()
+    if clinic_ids is None:
+        invalidate_catalog(all_clinics=True)
+    else:
+        invalidate_catalog(clinic_ids)
+    cache_events.publish(cache_events.CLINIC, clinic_ids)
+
+
+def packages_written(package_ids: Iterable[uuid.UUID]) -> None:
+    """Packages were created, updated or deleted."""
+    package_ids = list(package_ids)
+    if not package_ids:
+        return
+    catalog_search_index.invalidate()
+    catalog_snapshots.invalidate()
+    clinic_recommender.invalidate()
+    invalidate_catalog(package_ids=package_ids)
+    cache_events.publish(cache_events.PACKAGE, package_ids)
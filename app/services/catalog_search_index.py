@@ -0,0 +1,512 @@
+"""
+Catalog Search Index
+
+In-memory faceted index over clinics and their active packages, used by
+GET /api/clinics/search.
+
+Every clinic and package gets a dense ordinal. Categorical facets (country,
+city, contract status, transplant method, grafts, ...) map each value to a
+bitset of ordinals, stored as a Python int so intersections are single `&`
+operations. Numeric facets (rating, reviews, price, hotel stars) keep values
+sorted alongside their ordinals, with cumulative block bitsets so a range
+becomes a bisect plus a few short edge scans.
+
+A clinic matches when it passes the clinic filters and, if any package
+filters are set, at least one of its active packages passes them all.
+Prices are `price_normalized`, i.e. in the FX base currency.
+An `open_at` instant keeps clinics whose opening-hours bitmap has the
+matching local 15-minute slot set, evaluated once per timezone and cached.
+Facet counts are disjunctive: each facet is counted with every filter
+applied except its own, so the UI can offer sibling values.
+
+The index is rebuilt from the database on first use, after
+CATALOG_SEARCH_INDEX_TTL seconds, or after a clinic/package write
+invalidates it.
+"""
+
+import math
+import threading
+import time
+import uuid
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.config.settings import settings
+from app.database.entities import Clinic, Package
+from app.database.entities.package import clinic_packages
+from app.utils.opening_hours_utils import OpeningHoursUtils
+
+
+# Bit positions set in each byte value, for fast bitset -> ordinals
+_BYTE_BITS = [tuple(bit for bit in range(8) if value >> bit & 1) for value in range(256)]
+
+
+def _ordinals_to_bits(ordinals: Iterable[int], size: int) -> int:
+    buffer = bytearray((size + 7) // 8)
+    for ordinal in ordinals:
+        buffer[ordinal >> 3] |= 1 << (ordinal & 7)
+    return int.from_bytes(buffer, "little")
+
+
+def _bits_to_bytes(bits: int, size: int) -> bytes:
+    return bits.to_bytes((size + 7) // 8, "little")
+
+
+def _bits_to_ordinals(bits: int, size: int) -> List[int]:
+    ordinals: List[int] = []
+    for index, value in enumerate(_bits_to_bytes(bits, size)):
+        if value:
+            base = index << 3
+            ordinals.extend(base + bit for bit in _BYTE_BITS[value])
+    return ordinals
+
+
+def _normalise(value: Any) -> Optional[str]:
+    if value is None:
+        return None
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    cleaned = " ".join(str(value).split())
+    return cleaned.lower() or None
+
+
+class _CategoricalFacet:
+    """Value -> bitset of ordinals, with a display label per normalised value."""
+
+    def __init__(self) -> None:
+        self.bits: Dict[str, int] = {}
+        self.labels: Dict[str, str] = {}
+        self._pending: Dict[str, List[int]] = {}
+
+    def add(self, ordinal: int, value: Any) -> None:
+        key = _normalise(value)
+        if key is None:
+            return
+        self._pending.setdefault(key, []).append(ordinal)
+        self.labels.setdefault(key, value if isinstance(value, str) else key)
+
+    def freeze(self, size: int) -> None:
+        self.bits = {key: _ordinals_to_bits(ordinals, size) for key, ordinals in self._pending.items()}
+        self._pending = {}
+
+    def match(self, values: Sequence[Any]) -> int:
+        result = 0
+        for value in values:
+            result |= self.bits.get(_normalise(value), 0)
+        return result
+
+    def counts(self, base: int) -> Dict[str, int]:
+        counts = {}
+        for key, bits in self.bits.items():
+            count = (base & bits).bit_count()
+            if count:
+                counts[self.labels[key]] = count
+        return dict(sorted(counts.items(), key=lambda item: (-item[1], str(item[0]))))
+
+
+class _NumericFacet:
+    """Sorted (value, ordinal) pairs with cumulative block bitsets for range lookups."""
+
+    def __init__(self, buckets: Sequence[Tuple[str, Optional[float], Optional[float]]]) -> None:
+        self.buckets = buckets
+        self.values: List[float] = []
+        self.ordinals: List[int] = []
+        self._size = 0
+        self._block = 64
+        self._prefix: List[int] = [0]
+        self._pending: List[Tuple[float, int]] = []
+
+    def add(self, ordinal: int, value: Any) -> None:
+        if value is None:
+            return
+        self._pending.append((float(value), ordinal))
+
+    def freeze(self, size: int) -> None:
+        self._pending.sort()
+        self.values = [value for value, _ in self._pending]
+        self.ordinals = [ordinal for _, ordinal in self._pending]
+        self._pending = []
+        self._size = size
+        # At most ~128 blocks keeps memory bounded while edge scans stay short
+        self._block = max(64, len(self.ordinals) // 128 + 1)
+        self._prefix = [0]
+        running = bytearray((size + 7) // 8)
+        for start in range(0, len(self.ordinals), self._block):
+            for ordinal in self.ordinals[start:start + self._block]:
+                running[ordinal >> 3] |= 1 << (ordinal & 7)
+            self._prefix.append(int.from_bytes(running, "little"))
+
+    def _prefix_bits(self, count: int) -> int:
+        block, remainder = divmod(count, self._block)
+        bits = self._prefix[block]
+        if remainder:
+            start = block * self._block
+            bits |= _ordinals_to_bits(self.ordinals[start:start + remainder], self._size)
+        return bits
+
+    def range(self, low: Optional[float] = None, high: Optional[float] = None) -> int:
+        """Bitset of ordinals with low <= value <= high (open ends allowed)."""
+        start = 0 if low is None else bisect_left(self.values, low)
+        end = len(self.values) if high is None else bisect_right(self.values, high)
+        if start >= end:
+            return 0
+        return self._prefix_bits(end) ^ self._prefix_bits(start)
+
+    def counts(self, base: int) -> Dict[str, int]:
+        counts = {}
+        for label, low, high in self.buckets:
+            # Buckets are half-open [low, high) so neighbours do not double count
+            bits = self.range(low, high)
+            if high is not None:
+                bits &= ~self.range(high, high)
+            counts[label] = (base & bits).bit_count()
+        return counts
+
+
+@dataclass
+class CatalogSearchQuery:
+    countries: List[str] = field(default_factory=list)
+    cities: List[str] = field(default_factory=list)
+    has_contract: Optional[bool] = None
+    min_rating: Optional[float] = None
+    min_reviews: Optional[int] = None
+    methods: List[str] = field(default_factory=list)
+    grafts: List[str] = field(default_factory=list)
+    currencies: List[str] = field(default_factory=list)
+    min_price: Optional[float] = None
+    max_price: Optional[float] = None
+    min_hotel_stars: Optional[int] = None
+    open_at: Optional[datetime] = None
+    # None orders by rating; "price" by the cheapest matching package
+    sort: Optional[str] = None
+    offset: int = 0
+    limit: int = 20
+
+
+@dataclass
+class CatalogSearchHit:
+    clinic_id: uuid.UUID
+    package_ids: List[uuid.UUID]
+
+
+@dataclass
+class CatalogSearchResult:
+    hits: List[CatalogSearchHit]
+    total: int
+    facets: Dict[str, Dict[str, int]]
+
+
+RATING_BUCKETS = [("4.5+", 4.5, None), ("4-4.5", 4.0, 4.5), ("3-4", 3.0, 4.0), ("<3", None, 3.0)]
+PRICE_BUCKETS = [
+    ("<1500", None, 1500.0),
+    ("1500-2500", 1500.0, 2500.0),
+    ("2500-4000", 2500.0, 4000.0),
+    ("4000+", 4000.0, None),
+]
+HOTEL_STAR_BUCKETS = [("5", 5.0, None), ("4", 4.0, 5.0), ("3", 3.0, 4.0), ("<3", None, 3.0)]
+
+CLINIC_FACETS = ("country", "city", "has_contract", "rating")
+PACKAGE_FACETS = ("hair_transplantation_method", "grafts_count", "currency", "price", "hotel_star_rating")
+# Facets read from a differently named package column; price is compared in
+# the FX base currency
+PACKAGE_FACET_SOURCES = {"price": "price_normalized"}
+# Facets indexed, filtered and counted on a canonical form of the stored
+# value: methods by their short token ("fue" for "FUE Transplant Method")
+PACKAGE_FACET_KEYS = {"hair_transplantation_method": Package.method_token}
+
+
+class CatalogSearchIndex:
+    """Faceted in-memory index over clinics and active packages."""
+
+    def __init__(self, max_age_seconds: float = 300.0) -> None:
+        self.max_age_seconds = max_age_seconds
+        self._lock = threading.RLock()
+        self._built_at: Optional[float] = None
+        self._reset()
+
+    def _reset(self) -> None:
+        self.clinic_ids: List[uuid.UUID] = []
+        self.package_ids: List[uuid.UUID] = []
+        self._clinic_order: List[int] = []
+        self._clinic_rank: List[int] = []
+        self._package_price: List[float] = []
+        self._clinic_packages: List[List[int]] = []
+        self._package_clinics: List[List[int]] = []
+        # timezone -> [(clinic ordinal, opening-hours bitmap)], and the cached
+        # open-clinic bitset per (timezone, week slot)
+        self._opening_hours: Dict[str, List[Tuple[int, bytes]]] = {}
+        self._open_bits: Dict[Tuple[str, int], int] = {}
+        self._all_clinics = 0
+        self._all_packages = 0
+        self._clinic_facets: Dict[str, Any] = {
+            "country": _CategoricalFacet(),
+            "city": _CategoricalFacet(),
+            "has_contract": _CategoricalFacet(),
+            "rating": _NumericFacet(RATING_BUCKETS),
+            "reviews_count": _NumericFacet([]),
+        }
+        self._package_facets: Dict[str, Any] = {
+            "hair_transplantation_method": _CategoricalFacet(),
+            "grafts_count": _CategoricalFacet(),
+            "currency": _CategoricalFacet(),
+            "price": _NumericFacet(PRICE_BUCKETS),
+            "hotel_star_rating": _NumericFacet(HOTEL_STAR_BUCKETS),
+        }
+
+    # ------------------------------------------------------------------ build
+
+    def load(
+        self,
+        clinics: Sequence[Any],
+        packages: Sequence[Any],
+        links: Iterable[Tuple[uuid.UUID, uuid.UUID]] = (),
+    ) -> None:
+        """
+        Rebuild from clinic rows, package rows and (clinic_id, package_id) links.
+
+        Inactive packages are skipped. A package belongs to every clinic it is
+        linked to through clinic_packages, plus its own `clinic_id`.
+        """
+        with self._lock:
+            self._reset()
+            clinic_ordinals: Dict[uuid.UUID, int] = {}
+            for ordinal, clinic in enumerate(clinics):
+                clinic_ordinals[clinic.id] = ordinal
+                self.clinic_ids.append(clinic.id)
+                for name in ("country", "city", "has_contract", "rating", "reviews_count"):
+                    self._clinic_facets[name].add(ordinal, getattr(clinic, name))
+                bitmap = getattr(clinic, "opening_hours_bitmap", None)
+                if bitmap:
+                    timezone_name = getattr(clinic, "timezone", None) or "UTC"
+                    self._opening_hours.setdefault(timezone_name, []).append((ordinal, bytes(bitmap)))
+
+            package_ordinals: Dict[uuid.UUID, int] = {}
+            for package in packages:
+                if not package.is_active:
+                    continue
+                ordinal = len(self.package_ids)
+                package_ordinals[package.id] = ordinal
+                self.package_ids.append(package.id)
+                for name in PACKAGE_FACETS:
+                    value = getattr(package, PACKAGE_FACET_SOURCES.get(name, name))
+                    if name in PACKAGE_FACET_KEYS:
+                        value = PACKAGE_FACET_KEYS[name](value)
+                    self._package_facets[name].add(ordinal, value)
+                price = package.price_normalized
+                self._package_price.append(math.inf if price is None else float(price))
+
+            self._clinic_packages = [[] for _ in self.clinic_ids]
+            self._package_clinics = [[] for _ in self.package_ids]
+            owners = [(package.clinic_id, package.id) for package in packages if package.clinic_id]
+            for clinic_id, package_id in list(links) + owners:
+                clinic_ordinal = clinic_ordinals.get(clinic_id)
+                package_ordinal = package_ordinals.get(package_id)
+                if clinic_ordinal is None or package_ordinal is None:
+                    continue
+                if clinic_ordinal not in self._package_clinics[package_ordinal]:
+                    self._package_clinics[package_ordinal].append(clinic_ordinal)
+                    self._clinic_packages[clinic_ordinal].append(package_ordinal)
+
+            clinic_count, package_count = len(self.clinic_ids), len(self.package_ids)
+            for facet in self._clinic_facets.values():
+                facet.freeze(clinic_count)
+            for facet in self._package_facets.values():
+                facet.freeze(package_count)
+            self._all_clinics = (1 << clinic_count) - 1
+            self._all_packages = (1 << package_count) - 1
+
+            # Default ordering: best rated, most reviewed, then title
+            self._clinic_order = sorted(
+                range(clinic_count),
+                key=lambda o: (
+                    -(clinics[o].rating or 0.0),
+                    -(clinics[o].reviews_count or 0),
+                    (clinics[o].title or "").lower(),
+                ),
+            )
+            self._clinic_rank = [0] * clinic_count
+            for position, ordinal in enumerate(self._clinic_order):
+                self._clinic_rank[ordinal] = position
+            self._built_at = time.monotonic()
+
+    def build_from_db(self, db: Session) -> None:
+        clinics = db.query(
+            Clinic.id,
+            Clinic.title,
+            Clinic.country,
+            Clinic.city,
+            Clinic.has_contract,
+            Clinic.rating,
+            Clinic.reviews_count,
+            Clinic.opening_hours_bitmap,
+            Clinic.timezone,
+        ).all()
+        packages = db.query(
+            Package.id,
+            Package.clinic_id,
+            Package.is_active,
+            Package.hair_transplantation_method,
+            Package.grafts_count,
+            Package.currency,
+            Package.price_normalized,
+            Package.hotel_star_rating,
+        ).all()
+        links = db.execute(select(clinic_packages.c.clinic_id, clinic_packages.c.package_id)).all()
+        self.load(clinics, packages, links)
+
+    def ensure_fresh(self, db: Session) -> None:
+        with self._lock:
+            built_at = self._built_at
+        if built_at is None or time.monotonic() - built_at > self.max_age_seconds:
+            self.build_from_db(db)
+
+    def invalidate(self) -> None:
+        """Force a rebuild before the next search."""
+        with self._lock:
+            self._built_at = None
+
+    # ------------------------------------------------------------------ query
+
+    def _clinic_filters(self, query: CatalogSearchQuery) -> Dict[str, Callable[[], int]]:
+        facets = self._clinic_facets
+        filters: Dict[str, Callable[[], int]] = {}
+        if query.countries:
+            filters["country"] = lambda: facets["country"].match(query.countries)
+        if query.cities:
+            filters["city"] = lambda: facets["city"].match(query.cities)
+        if query.has_contract is not None:
+            filters["has_contract"] = lambda: facets["has_contract"].match([query.has_contract])
+        if query.min_rating is not None:
+            filters["rating"] = lambda: facets["rating"].range(query.min_rating, None)
+        if query.min_reviews is not None:
+            filters["reviews_count"] = lambda: facets["reviews_count"].range(query.min_reviews, None)
+        if query.open_at is not None:
+            filters["open_at"] = lambda: self._open_clinics(query.open_at)
+        return filters
+
+    def _open_clinics(self, at: datetime) -> int:
+        """Bitset of clinics open at an instant, ORed across their timezones."""
+        result = 0
+        for timezone_name, members in self._opening_hours.items():
+            slot = OpeningHoursUtils.slot_at(at, timezone_name)
+            bits = self._open_bits.get((timezone_name, slot))
+            if bits is None:
+                byte, mask = slot >> 3, 1 << (slot & 7)
+                bits = _ordinals_to_bits(
+                    (ordinal for ordinal, bitmap in members if bitmap[byte] & mask),
+                    len(self.clinic_ids),
+                )
+                self._open_bits[(timezone_name, slot)] = bits
+            result |= bits
+        return result
+
+    def _package_filters(self, query: CatalogSearchQuery) -> Dict[str, Callable[[], int]]:
+        facets = self._package_facets
+        filters: Dict[str, Callable[[], int]] = {}
+        if query.methods:
+            methods = [Package.method_token(method) for method in query.methods]
+            filters["hair_transplantation_method"] = lambda: facets["hair_transplantation_method"].match(methods)
+        if query.grafts:
+            filters["grafts_count"] = lambda: facets["grafts_count"].match(query.grafts)
+        if query.currencies:
+            filters["currency"] = lambda: facets["currency"].match(query.currencies)
+        if query.min_price is not None or query.max_price is not None:
+            filters["price"] = lambda: facets["price"].range(query.min_price, query.max_price)
+        if query.min_hotel_stars is not None:
+            filters["hotel_star_rating"] = lambda: facets["hotel_star_rating"].range(query.min_hotel_stars, None)
+        return filters
+
+    @staticmethod
+    def _intersect(everything: int, masks: Dict[str, int], skip: Optional[str] = None) -> int:
+        result = everything
+        for name, bits in masks.items():
+            if name != skip:
+                result &= bits
+        return result
+
+    def _clinics_with_packages(self, package_bits: int) -> int:
+        ordinals = {
+            clinic
+            for package in _bits_to_ordinals(package_bits, len(self.package_ids))
+            for clinic in self._package_clinics[package]
+        }
+        return _ordinals_to_bits(ordinals, len(self.clinic_ids))
+
+    def _packages_of_clinics(self, clinic_bits: int) -> int:
+        ordinals = [
+            package
+            for clinic in _bits_to_ordinals(clinic_bits, len(self.clinic_ids))
+            for package in self._clinic_packages[clinic]
+        ]
+        return _ordinals_to_bits(ordinals, len(self.package_ids))
+
+    def search(self, query: CatalogSearchQuery) -> CatalogSearchResult:
+        with self._lock:
+            clinic_masks = {name: build() for name, build in self._clinic_filters(query).items()}
+            package_masks = {name: build() for name, build in self._package_filters(query).items()}
+
+            def clinic_base(skip: Optional[str] = None) -> int:
+                return self._intersect(self._all_clinics, clinic_masks, skip)
+
+            def package_base(skip: Optional[str] = None) -> int:
+                return self._intersect(self._all_packages, package_masks, skip)
+
+            matching_packages = package_base()
+            package_constraint = (
+                self._clinics_with_packages(matching_packages) if package_masks else self._all_clinics
+            )
+            matching_clinics = clinic_base() & package_constraint
+
+            facets: Dict[str, Dict[str, int]] = {}
+            for name in CLINIC_FACETS:
+                facets[name] = self._clinic_facets[name].counts(clinic_base(name) & package_constraint)
+            packages_in_scope = self._packages_of_clinics(clinic_base())
+            for name in PACKAGE_FACETS:
+                facets[name] = self._package_facets[name].counts(package_base(name) & packages_in_scope)
+
+            total = matching_clinics.bit_count()
+            membership = _bits_to_bytes(matching_clinics, len(self.clinic_ids))
+            package_membership = _bits_to_bytes(matching_packages, len(self.package_ids))
+
+            def matching_packages_of(ordinal: int) -> List[int]:
+                return [
+                    package
+                    for package in self._clinic_packages[ordinal]
+                    if package_membership[package >> 3] >> (package & 7) & 1
+                ]
+
+            if query.sort == "price":
+                # Cheapest matching package first; unpriced clinics last, ties by rating order
+                rank = self._clinic_rank
+                ordered = sorted(
+                    _bits_to_ordinals(matching_clinics, len(self.clinic_ids)),
+                    key=lambda o: (
+                        min((self._package_price[p] for p in matching_packages_of(o)), default=math.inf),
+                        rank[o],
+                    ),
+                )
+            else:
+                ordered = (o for o in self._clinic_order if membership[o >> 3] >> (o & 7) & 1)
+
+            hits: List[CatalogSearchHit] = []
+            for position, ordinal in enumerate(ordered):
+                if position < query.offset:
+                    continue
+                hits.append(
+                    CatalogSearchHit(
+                        clinic_id=self.clinic_ids[ordinal],
+                        package_ids=[self.package_ids[package] for package in matching_packages_of(ordinal)],
+                    )
+                )
+                if len(hits) >= query.limit:
+                    break
+
+            return CatalogSearchResult(hits=hits, total=total, facets=facets)
+
+
+catalog_search_index = CatalogSearchIndex(max_age_seconds=settings.CATALOG_SEARCH_INDEX_TTL)
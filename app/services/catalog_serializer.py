@@ -0,0 +1,162 @@
+"""
+Catalog Serializer
+
+Fast path for the clinic and package read endpoints. Rows are turned into
+plain dicts keyed exactly like ClinicResponse/PackageResponse dump by alias,
+without building and re-validating Pydantic models per row. UUID, Decimal,
+datetime and enum values are left as-is for FastJSONResponse to encode, so
+the JSON matches what the response models would have produced.
+
+Passing `fields` (output names, e.g. from FieldsetUtils) serializes only
+those keys and reads only those attributes, so rows loaded with a column
+projection never trigger a lazy load.
+"""
+
+from operator import attrgetter, itemgetter
+from typing import Iterable, Optional, Sequence
+import uuid
+
+from app.models.clinic import ClinicResponse, PackageResponse
+
+
+# Every PackageResponse field is a plain column attribute on Package
+_PACKAGE_KEYS = tuple(PackageResponse.model_fields)
+PACKAGE_FIELDS = {key: key for key in _PACKAGE_KEYS}
+
+# Clinic output name (ClinicResponse alias) -> Clinic attribute, in response order
+CLINIC_FIELDS = {
+    (field.alias or name): name
+    for name, field in ClinicResponse.model_fields.items()
+}
+CLINIC_RELATIONSHIPS = ("packages",)
+_package_attributes = attrgetter(*_PACKAGE_KEYS)
+_package_state = itemgetter(*_PACKAGE_KEYS)
+
+
+def _package_values(package) -> tuple:
+    # Loaded rows keep their column values in __dict__; reading them there
+    # skips the instrumented descriptors, which dominate the cost per row.
+    try:
+        return _package_state(package.__dict__)
+    except KeyError:  # expired or never-set attribute: let the ORM resolve it
+        return _package_attributes(package)
+
+
+def package_dict(package, fields: Optional[Sequence[str]] = None) -> dict:
+    """Serialize one package the way PackageResponse would, optionally only `fields`."""
+    if fields is not None:
+        return {key: getattr(package, key) for key in fields}
+    return dict(zip(_PACKAGE_KEYS, _package_values(package)))
+
+
+def package_dicts(packages: Iterable, fields: Optional[Sequence[str]] = None) -> list[dict]:
+    if fields is not None:
+        return [{key: getattr(package, key) for key in fields} for package in packages]
+    return [dict(zip(_PACKAGE_KEYS, _package_values(package))) for package in packages]
+
+
+def _expand_packages(clinic, package_lookup, package_cache) -> tuple[list, list[dict]]:
+    package_ids = list(clinic.package_ids or [])
+    if package_lookup:
+        sources = [package_lookup[pkg_id] for pkg_id in package_ids if package_lookup.get(pkg_id)]
+    else:
+        sources = getattr(clinic, "packages", None) or []
+        if sources and not package_ids:
+            package_ids = [pkg.id for pkg in sources]
+
+    packages: list[dict] = []
+    for package in sources:
+        data = package_cache.get(package.id)
+        if data is None:
+            data = package_cache[package.id] = package_dict(package)
+        packages.append(data)
+    return package_ids, packages
+
+
+def _sparse_clinic_dict(clinic, fields, package_lookup, package_cache) -> dict:
+    package_ids = packages = None
+    if "packages" in fields:
+        package_ids, packages = _expand_packages(clinic, package_lookup, package_cache)
+
+    data = {}
+    for key in fields:
+        if key == "packages":
+            data[key] = packages
+        elif key == "packageIds":
+            data[key] = package_ids if package_ids is not None else list(clinic.package_ids or [])
+        elif key == "categories":
+            data[key] = clinic.categories or []
+        else:
+            data[key] = getattr(clinic, CLINIC_FIELDS[key])
+    return data
+
+
+def clinic_dict(
+    clinic,
+    package_lookup: Optional[dict[uuid.UUID, object]] = None,
+    package_cache: Optional[dict[uuid.UUID, dict]] = None,
+    fields: Optional[Sequence[str]] = None,
+) -> dict:
+    """
+    Serialize one clinic the way ClinicResponse would (by alias).
+
+    Packages are expanded from `package_lookup` when given, otherwise from the
+    already loaded `clinic.packages` relationship. `package_cache` lets a page
+    of clinics share one dict per package instead of re-reading each row.
+    """
+    if package_cache is None:
+        package_cache = {}
+    if fields is not None:
+        return _sparse_clinic_dict(clinic, fields, package_lookup, package_cache)
+    package_ids, packages = _expand_packages(clinic, package_lookup, package_cache)
+
+    return {
+        "id": clinic.id,
+        "place_id": clinic.place_id,
+        "title": clinic.title,
+        "location": clinic.location,
+        "city": clinic.city,
+        "state": clinic.state,
+        "country_code": clinic.country_code,
+        "lat": clinic.lat,
+        "lng": clinic.lng,
+        "website": clinic.website,
+        "phone": clinic.phone,
+        "email": clinic.email,
+        "address": clinic.address,
+        "rating": clinic.rating,
+        "reviews_count": clinic.reviews_count,
+        "categories": clinic.categories or [],
+        "image_url": clinic.image_url,
+        "opening_hours": clinic.opening_hours,
+        "timezone": clinic.timezone,
+        "additional_info": clinic.additional_info,
+        "price_range": clinic.price_range,
+        "availability": clinic.availability,
+        "country": clinic.country,
+        "packageIds": package_ids,
+        "hasContract": clinic.has_contract,
+        "packages": packages,
+        "created_at": clinic.created_at,
+        "updated_at": clinic.updated_at,
+    }
+
+
+def clinic_dicts(
+    clinics: Iterable,
+    package_lookup: Optional[dict[uuid.UUID, object]] = None,
+    fields: Optional[Sequence[str]] = None,
+) -> list[dict]:
+    """Serialize a page of clinics, encoding each distinct package once."""
+    package_cache: dict[uuid.UUID, dict] = {}
+    return [clinic_dict(clinic, package_lookup, package_cache, fields) for clinic in clinics]
+
+
+def clinic_columns(fields: Optional[Sequence[str]]) -> Optional[list[str]]:
+    """Clinic attributes a sparse selection reads, or None for every column."""
+    if fields is None:
+        return None
+    columns = [CLINIC_FIELDS[key] for key in fields if key not in CLINIC_RELATIONSHIPS]
+    if "packages" in fields and "package_ids" not in columns:
+        columns.append("package_ids")
+    return columns
@@ -0,0 +1,267 @@
+"""
+Catalog Snapshots
+
+In-memory cache of fully rendered catalog responses (clinic pages, clinic
+package lists, package lists). Each snapshot holds the JSON body plus gzip
+and, when the `brotli` package is installed, brotli variants, together with
+an ETag and a Last-Modified taken from the newest `updated_at` it contains.
+A hit is a dict lookup and a header check: no session, query or serializer.
+
+Entries remember the builder that produced them. Catalog writes call
+`invalidate()`, which retires every snapshot at once (a generation bump, so
+nothing stale is served) and wakes a background thread that rebuilds the
+cached shapes with a fresh session. Requests arriving before it finishes
+build their snapshot inline. CATALOG_SNAPSHOT_TTL bounds staleness from
+writes made by other processes.
+"""
+
+import gzip
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Any, Callable, Hashable, Iterable, Optional, Tuple
+
+from fastapi import Request, Response
+from pydantic_core import to_json
+from sqlalchemy.orm import Session
+
+from app.config.settings import settings
+from app.utils import ETagUtils
+
+try:
+    import brotli
+    BROTLI_AVAILABLE = True
+except ImportError:
+    BROTLI_AVAILABLE = False
+
+
+# Builds (payload, last_modified) from the database, or None when the shape
+# has nothing to serve (e.g. an unknown clinic)
+SnapshotBuilder = Callable[[Session], Optional[Tuple[Any, Optional[datetime]]]]
+
+# Bodies smaller than this are sent uncompressed
+MIN_COMPRESS_BYTES = 512
+
+
+def latest_updated_at(rows: Iterable[Any]) -> Optional[datetime]:
+    """Newest `updated_at` among rows, falling back to None for an empty set."""
+    return max((row.updated_at for row in rows if row.updated_at is not None), default=None)
+
+
+def _accepted_encodings(header: str) -> set:
+    accepted = set()
+    for part in header.lower().split(","):
+        coding, _, params = part.partition(";")
+        params = params.replace(" ", "")
+        if params in ("q=0", "q=0.0", "q=0.00", "q=0.000"):
+            continue
+        accepted.add(coding.strip())
+    return accepted
+
+
+@dataclass(frozen=True)
+class CatalogSnapshot:
+    body: bytes
+    gzip: Optional[bytes]
+    brotli: Optional[bytes]
+    etag: str
+    last_modified: Optional[datetime]
+    generation: int
+    built_at: float
+
+    @classmethod
+    def render(cls, payload: Any, last_modified: Optional[datetime], generation: int) -> "CatalogSnapshot":
+        body = to_json(payload)
+        compress = len(body) >= MIN_COMPRESS_BYTES
+        if last_modified is not None:
+            if last_modified.tzinfo is None:
+                last_modified = last_modified.replace(tzinfo=timezone.utc)
+            # HTTP dates have whole-second precision
+            last_modified = last_modified.astimezone(timezone.utc).replace(microsecond=0)
+        return cls(
+            body=body,
+            gzip=gzip.compress(body, compresslevel=6, mtime=0) if compress else None,
+            brotli=brotli.compress(body, quality=5) if compress and BROTLI_AVAILABLE else None,
+            etag=f'W/"{hashlib.sha1(body).hexdigest()}"',
+            last_modified=last_modified,
+            generation=generation,
+            built_at=time.monotonic(),
+        )
+
+    def headers(self) -> dict:
+        headers = {"ETag": self.etag, "Vary": "Accept-Encoding"}
+        if self.last_modified is not None:
+            headers["Last-Modified"] = format_datetime(self.last_modified, usegmt=True)
+        return headers
+
+    def not_modified(self, request: Request) -> bool:
+        """
+        Check the request's conditional headers against this snapshot.
+        return:
+            return True when a 304 can be sent; If-None-Match wins over If-Modified-Since
+        """
+        if request.headers.get("if-none-match"):
+            return ETagUtils.matches(request, self.etag)
+        since = request.headers.get("if-modified-since")
+        if not since or self.last_modified is None:
+            return False
+        try:
+            return self.last_modified <= parsedate_to_datetime(since)
+        except (TypeError, ValueError):
+            return False
+
+    def to_response(self, request: Request) -> Response:
+        """Serve the snapshot in the best encoding the client accepts."""
+        headers = self.headers()
+        if self.not_modified(request):
+            return Response(status_code=304, headers=headers)
+
+        body = self.body
+        accept = request.headers.get("accept-encoding")
+        if accept and self.gzip is not None:
+            accepted = _accepted_encodings(accept)
+            if self.brotli is not None and "br" in accepted:
+                body = self.brotli
+                headers["Content-Encoding"] = "br"
+            elif "gzip" in accepted:
+                body = self.gzip
+                headers["Content-Encoding"] = "gzip"
+        return Response(content=body, media_type="application/json", headers=headers)
+
+
+class CatalogSnapshotCache:
+    """Rendered catalog responses keyed by query shape, rebuilt after writes."""
+
+    def __init__(
+        self,
+        max_age_seconds: float = 300.0,
+        max_entries: int = 256,
+        session_factory: Optional[Callable[[], Session]] = None,
+        refresh_in_background: bool = True,
+    ) -> None:
+        self.max_age_seconds = max_age_seconds
+        self.max_entries = max_entries
+        self.refresh_in_background = refresh_in_background
+        self._session_factory = session_factory
+        self._entries: "OrderedDict[Hashable, Tuple[CatalogSnapshot, SnapshotBuilder]]" = OrderedDict()
+        self._generation = 0
+        self._lock = threading.Lock()
+        self._refresh_pending = False
+        self._refresher: Optional[threading.Thread] = None
+
+    def get(self, key: Hashable) -> Optional[CatalogSnapshot]:
+        """
+        Look up a current snapshot.
+        return:
+            return the snapshot, or None when missing, retired by a write or older than the TTL
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            snapshot = entry[0]
+            if (
+                snapshot.generation != self._generation
+                or time.monotonic() - snapshot.built_at > self.max_age_seconds
+            ):
+                return None
+            self._entries.move_to_end(key)
+            return snapshot
+
+    def build(self, key: Hashable, builder: SnapshotBuilder, db: Session) -> Optional[CatalogSnapshot]:
+        """
+        Run the builder and cache its rendered result under `key`.
+        return:
+            return the new snapshot, or None when the builder had nothing to serve
+        """
+        with self._lock:
+            generation = self._generation
+        result = builder(db)
+        if result is None:
+            with self._lock:
+                self._entries.pop(key, None)
+            return None
+        payload, last_modified = result
+        snapshot = CatalogSnapshot.render(payload, last_modified, generation)
+        if self.max_age_seconds > 0:
+            with self._lock:
+                # A write that landed while building leaves the snapshot retired;
+                # keep the builder so the pending refresh picks the key up again
+                self._entries[key] = (snapshot, builder)
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+        return snapshot
+
+    def get_or_build(self, key: Hashable, builder: SnapshotBuilder, db: Session) -> Optional[CatalogSnapshot]:
+        return self.get(key) or self.build(key, builder, db)
+
+    def invalidate(self) -> None:
+        """Retire every snapshot and schedule a background rebuild of the cached shapes."""
+        with self._lock:
+            self._generation += 1
+            if not self._entries or not self.refresh_in_background:
+                return
+            self._refresh_pending = True
+            if self._refresher is None:
+                self._refresher = threading.Thread(
+                    target=self._refresh_loop,
+                    name="catalog-snapshot-refresh",
+                    daemon=True,
+                )
+                self._refresher.start()
+
+    def refresh(self) -> int:
+        """
+        Rebuild every retired or expired snapshot with a fresh session.
+        return:
+            return number of snapshots rebuilt
+        """
+        with self._lock:
+            jobs = [
+                (key, builder)
+                for key, (snapshot, builder) in self._entries.items()
+                if snapshot.generation != self._generation
+                or time.monotonic() - snapshot.built_at > self.max_age_seconds
+            ]
+        if not jobs:
+            return 0
+
+        session_factory = self._session_factory
+        if session_factory is None:
+            from app.database.db import SessionLocal
+            session_factory = SessionLocal
+        rebuilt = 0
+        db = session_factory()
+        try:
+            for key, builder in jobs:
+                self.build(key, builder, db)
+                db.rollback()
+                rebuilt += 1
+        finally:
+            db.close()
+        return rebuilt
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._generation += 1
+
+    def _refresh_loop(self) -> None:
+        while True:
+            with self._lock:
+                if not self._refresh_pending:
+                    self._refresher = None
+                    return
+                self._refresh_pending = False
+            try:
+                self.refresh()
+            except Exception as exc:  # pragma: no cover - the next read builds inline
+                print(f"Catalog snapshot refresh failed: {exc}")
+
+
+catalog_snapshots = CatalogSnapshotCache(max_age_seconds=settings.CATALOG_SNAPSHOT_TTL)
@@ -0,0 +1,44 @@
+"""
+Clinic Cache
+
+Process-wide cache of clinic catalog totals, keyed by the `has_contract`
+filter (None, True or False). Clinic writes clear it (see
+app.services.catalog_invalidation); the TTL bounds staleness from writes made
+by other processes.
+"""
+
+from datetime import datetime
+from typing import Optional
+
+from app.config.settings import settings
+from app.database.repositories.clinic_repository import ClinicRepository
+from app.utils import TTLCache
+
+
+clinic_count_cache = TTLCache(ttl_seconds=settings.CLINIC_COUNT_CACHE_TTL, max_entries=8)
+
+
+def count_clinics(
+    clinic_repo: ClinicRepository,
+    *,
+    has_contract: Optional[bool] = None,
+    open_at: Optional[datetime] = None,
+) -> int:
+    """
+    Total clinics for the filter, served from the count cache when fresh.
+
+    Open-at counts change with the clock, so they always hit the database.
+    """
+    if open_at is not None:
+        return clinic_repo.count(has_contract=has_contract, open_at=open_at)
+
+    total = clinic_count_cache.get(has_contract)
+    if total is None:
+        total = clinic_repo.count(has_contract=has_contract)
+        clinic_count_cache.set(has_contract, total)
+    return total
+
+
+def invalidate_clinic_counts() -> None:
+    """Drop every cached clinic total."""
+    clinic_count_cache.clear()
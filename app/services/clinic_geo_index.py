@@ -0,0 +1,327 @@
+"""
+Clinic Geo Index
+
+In-memory spatial index for nearest-clinic queries.
+
+Clinic coordinates are projected onto the unit sphere and bucketed into a sparse
+3D grid. Straight-line (chord) distance between unit vectors is monotonic in
+great-circle distance, so a k-nearest search can expand grid rings outward and
+stop as soon as the next ring cannot beat the current k-th result, with no
+special cases at the poles or the antimeridian.
+
+The index is built lazily from the database, updated per clinic on writes (see
+app.services.catalog_invalidation), and fully rebuilt once it is older than
+CLINIC_GEO_INDEX_TTL to pick up writes from other processes.
+"""
+
+import heapq
+import math
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.config.settings import settings
+from app.database.entities import Clinic
+
+
+EARTH_RADIUS_KM = 6371.0088
+
+Cell = Tuple[int, int, int]
+
+
+@dataclass(frozen=True)
+class ClinicPoint:
+    """Indexed subset of a clinic row."""
+
+    id: uuid.UUID
+    lat: float
+    lng: float
+    rating: Optional[float]
+    has_contract: bool
+    city: Optional[str]
+    country: Optional[str]
+    xyz: Tuple[float, float, float]
+
+
+@dataclass(frozen=True)
+class NearbyClinic:
+    clinic_id: uuid.UUID
+    distance_km: float
+
+
+def _to_xyz(lat: float, lng: float) -> Tuple[float, float, float]:
+    phi = math.radians(lat)
+    lam = math.radians(lng)
+    cos_phi = math.cos(phi)
+    return (cos_phi * math.cos(lam), cos_phi * math.sin(lam), math.sin(phi))
+
+
+def _chord_to_km(chord: float) -> float:
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, chord / 2))
+
+
+def _km_to_chord(distance_km: float) -> float:
+    return 2 * math.sin(min(math.pi, distance_km / EARTH_RADIUS_KM) / 2)
+
+
+def _normalise_place(name: Optional[str]) -> Optional[str]:
+    if not name:
+        return None
+    cleaned = " ".join(name.lower().split())
+    return cleaned or None
+
+
+class ClinicGeoIndex:
+    """Sparse 3D grid over clinic coordinates supporting k-nearest queries."""
+
+    def __init__(self, cell_km: float = 50.0, max_age_seconds: float = 300.0):
+        self.cell_size = _km_to_chord(cell_km)
+        self.max_age_seconds = max_age_seconds
+        self._points: Dict[uuid.UUID, ClinicPoint] = {}
+        self._cells: Dict[Cell, Set[uuid.UUID]] = {}
+        self._built_at: Optional[float] = None
+        self._lock = threading.RLock()
+
+    # ------------------------------------------------------------------ build
+
+    def _cell_of(self, xyz: Tuple[float, float, float]) -> Cell:
+        size = self.cell_size
+        return (
+            math.floor(xyz[0] / size),
+            math.floor(xyz[1] / size),
+            math.floor(xyz[2] / size),
+        )
+
+    @staticmethod
+    def _point_from(clinic) -> Optional[ClinicPoint]:
+        if clinic.lat is None or clinic.lng is None:
+            return None
+        lat, lng = float(clinic.lat), float(clinic.lng)
+        if not (-90.0 <= lat <= 90.0 and -180.0 <= lng <= 180.0):
+            return None
+        return ClinicPoint(
+            id=clinic.id,
+            lat=lat,
+            lng=lng,
+            rating=clinic.rating,
+            has_contract=bool(clinic.has_contract),
+            city=clinic.city,
+            country=clinic.country,
+            xyz=_to_xyz(lat, lng),
+        )
+
+    def load(self, clinics: Iterable) -> None:
+        """Replace the index contents with the given clinics (rows or entities)."""
+        with self._lock:
+            self._points.clear()
+            self._cells.clear()
+            for clinic in clinics:
+                self._insert(clinic)
+            self._built_at = time.monotonic()
+
+    def build_from_db(self, db: Session) -> None:
+        rows = (
+            db.query(
+                Clinic.id,
+                Clinic.lat,
+                Clinic.lng,
+                Clinic.rating,
+                Clinic.has_contract,
+                Clinic.city,
+                Clinic.country,
+            )
+            .filter(Clinic.lat.isnot(None), Clinic.lng.isnot(None))
+            .all()
+        )
+        self.load(rows)
+
+    def ensure_fresh(self, db: Session) -> None:
+        """Build on first use and rebuild once the index is older than max_age_seconds."""
+        with self._lock:
+            built_at = self._built_at
+        if built_at is None or time.monotonic() - built_at > self.max_age_seconds:
+            self.build_from_db(db)
+
+    def invalidate(self) -> None:
+        """Force a full rebuild on the next query."""
+        with self._lock:
+            self._built_at = None
+
+    def _insert(self, clinic) -> None:
+        point = self._point_from(clinic)
+        if point is None:
+            return
+        self._points[point.id] = point
+        self._cells.setdefault(self._cell_of(point.xyz), set()).add(point.id)
+
+    def _remove(self, clinic_id: uuid.UUID) -> None:
+        point = self._points.pop(clinic_id, None)
+        if point is None:
+            return
+        cell = self._cell_of(point.xyz)
+        members = self._cells.get(cell)
+        if members is not None:
+            members.discard(clinic_id)
+            if not members:
+                del self._cells[cell]
+
+    def upsert(self, clinic) -> None:
+        """Apply a single clinic write; a no-op until the index has been built."""
+        with self._lock:
+            if self._built_at is None:
+                return
+            self._remove(clinic.id)
+            self._insert(clinic)
+
+    def remove(self, clinic_id: uuid.UUID) -> None:
+        with self._lock:
+            self._remove(clinic_id)
+
+    def __len__(self) -> int:
+        return len(self._points)
+
+    # ------------------------------------------------------------------ query
+
+    def nearest(
+        self,
+        lat: float,
+        lng: float,
+        *,
+        k: int = 10,
+        radius_km: Optional[float] = None,
+        min_rating: Optional[float] = None,
+        has_contract: Optional[bool] = None,
+    ) -> List[NearbyClinic]:
+        """
+        Return up to k clinics closest to (lat, lng) that pass the filters, nearest first.
+        """
+        origin = _to_xyz(lat, lng)
+        max_chord = _km_to_chord(radius_km) if radius_km is not None else 2.0
+        ox, oy, oz = origin
+
+        def accepts(point: ClinicPoint) -> bool:
+            if has_contract is not None and point.has_contract is not has_contract:
+                return False
+            if min_rating is not None and (point.rating is None or point.rating < min_rating):
+                return False
+            return True
+
+        # Max-heap of the best k as (-chord, id)
+        best: List[Tuple[float, uuid.UUID]] = []
+
+        def consider(clinic_id: uuid.UUID) -> None:
+            point = self._points[clinic_id]
+            px, py, pz = point.xyz
+            chord = math.sqrt((px - ox) ** 2 + (py - oy) ** 2 + (pz - oz) ** 2)
+            if chord > max_chord or not accepts(point):
+                return
+            if len(best) < k:
+                heapq.heappush(best, (-chord, clinic_id))
+            elif chord < -best[0][0]:
+                heapq.heapreplace(best, (-chord, clinic_id))
+
+        with self._lock:
+            if not self._points or k < 1:
+                return []
+
+            cx, cy, cz = self._cell_of(origin)
+            occupied = len(self._cells)
+            ring = 0
+            visited: Set[Cell] = set()
+            while True:
+                # Any point in ring r+1 or beyond is at least r cells away on some axis
+                ring_floor = max(0, ring - 1) * self.cell_size
+                if ring_floor > max_chord or (len(best) == k and ring_floor > -best[0][0]):
+                    break
+                ring_cells = 24 * ring * ring + 2 if ring else 1
+                if ring_cells > occupied - len(visited):
+                    # Sparse surroundings: walking the remaining occupied cells
+                    # nearest-first is cheaper than enumerating mostly empty rings
+                    remaining = sorted(
+                        (self._cell_floor(cell, origin), cell)
+                        for cell in self._cells
+                        if cell not in visited
+                    )
+                    for floor, cell in remaining:
+                        if floor > max_chord or (len(best) == k and floor > -best[0][0]):
+                            break
+                        for clinic_id in self._cells[cell]:
+                            consider(clinic_id)
+                    break
+                for cell in self._ring(cx, cy, cz, ring):
+                    members = self._cells.get(cell)
+                    if members:
+                        visited.add(cell)
+                        for clinic_id in members:
+                            consider(clinic_id)
+                ring += 1
+
+        return [
+            NearbyClinic(clinic_id=clinic_id, distance_km=_chord_to_km(-neg_chord))
+            for neg_chord, clinic_id in sorted(best, key=lambda item: (-item[0], str(item[1])))
+        ]
+
+    def _cell_floor(self, cell: Cell, xyz: Tuple[float, float, float]) -> float:
+        """Smallest straight-line distance from xyz to any point inside the cell."""
+        size = self.cell_size
+        total = 0.0
+        for index, value in zip(cell, xyz):
+            low = index * size
+            high = low + size
+            if value < low:
+                total += (low - value) ** 2
+            elif value > high:
+                total += (value - high) ** 2
+        return math.sqrt(total)
+
+    @staticmethod
+    def _ring(cx: int, cy: int, cz: int, ring: int) -> Iterable[Cell]:
+        if ring == 0:
+            yield (cx, cy, cz)
+            return
+        for dx in range(-ring, ring + 1):
+            for dy in range(-ring, ring + 1):
+                if abs(dx) == ring or abs(dy) == ring:
+                    for dz in range(-ring, ring + 1):
+                        yield (cx + dx, cy + dy, cz + dz)
+                else:
+                    yield (cx + dx, cy + dy, cz - ring)
+                    yield (cx + dx, cy + dy, cz + ring)
+
+    def locate(self, place: Optional[str]) -> Optional[Tuple[float, float]]:
+        """
+        Resolve a free-text place ("Istanbul, Turkey") to the centroid of the
+        indexed clinics in the first matching city, or failing that, country.
+        """
+        parts = [_normalise_place(part) for part in (place or "").split(",")]
+        parts = [part for part in parts if part]
+        if not parts:
+            return None
+
+        with self._lock:
+            for attribute in ("city", "country"):
+                for part in parts:
+                    matches = [
+                        point.xyz
+                        for point in self._points.values()
+                        if _normalise_place(getattr(point, attribute)) == part
+                    ]
+                    if matches:
+                        x = sum(xyz[0] for xyz in matches)
+                        y = sum(xyz[1] for xyz in matches)
+                        z = sum(xyz[2] for xyz in matches)
+                        norm = math.sqrt(x * x + y * y + z * z)
+                        if norm == 0:
+                            continue
+                        return (
+                            math.degrees(math.asin(max(-1.0, min(1.0, z / norm)))),
+                            math.degrees(math.atan2(y, x)),
+                        )
+        return None
+
+
+clinic_geo_index = ClinicGeoIndex(max_age_seconds=settings.CLINIC_GEO_INDEX_TTL)
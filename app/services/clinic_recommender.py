@@ -0,0 +1,317 @@
+"""
+Clinic Recommender
+
+Scores every active (clinic, package) pair for a patient and returns the top k
+with a per-feature breakdown.
+
+The catalog is held as a column-oriented feature matrix (NumPy arrays, one
+row per clinic/package pair), so a recommendation is a handful of vectorised
+operations plus an argpartition, independent of Python-level loops over the
+catalog. The matrix is rebuilt lazily: on first use, after clinic or package
+writes invalidate it, or once it is older than CLINIC_RECOMMENDER_TTL.
+
+Feature scores are in [0, 1]:
+
+- grafts:   package grafts relative to the patient's estimate (full marks at
+            or above the estimate's upper bound, "Unlimited" always scores 1)
+- budget:   1 within budget, falling linearly to 0 at twice the budget;
+            compared on price_normalized, so the budget must be given in
+            the FX base currency (see app.services.fx_rates)
+- distance: exp(-km / DISTANCE_SCALE_KM) from the patient's location
+- method:   1 if the package method is among the preferred ones, else 0;
+            both sides are compared as Package.method_token ("fue", "dhi", ...)
+- rating:   clinic rating / 5
+- reviews:  log-scaled clinic review count relative to the catalog maximum
+
+Unknown package values score 0.5. A feature whose patient input is missing
+(no budget, no location, ...) is dropped and the remaining weights rescaled.
+"""
+
+import math
+import re
+import threading
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.config.settings import settings
+from app.database.entities import Clinic, Package
+from app.database.entities.package import clinic_packages
+from app.services.clinic_geo_index import EARTH_RADIUS_KM
+
+
+DEFAULT_WEIGHTS: Dict[str, float] = {
+    "grafts": 0.25,
+    "budget": 0.25,
+    "distance": 0.15,
+    "method": 0.15,
+    "rating": 0.12,
+    "reviews": 0.08,
+}
+
+DISTANCE_SCALE_KM = 1500.0
+UNKNOWN_SCORE = 0.5
+
+_NUMBER = re.compile(r"\d[\d,.]*")
+
+
+def parse_grafts(value: Optional[str]) -> float:
+    """Package grafts_count text to a number: "3000" -> 3000, "4000+" -> 4000, "Unlimited" -> inf."""
+    if value is None:
+        return math.nan
+    text = str(value).strip().lower()
+    if text.startswith("unlimited"):
+        return math.inf
+    match = _NUMBER.search(text)
+    if not match:
+        return math.nan
+    try:
+        return float(match.group().replace(",", ""))
+    except ValueError:
+        return math.nan
+
+
+def split_methods(value: Optional[str]) -> List[str]:
+    """"FUE/DHI" or "FUE, DHI" -> ["fue", "dhi"], as method tokens (see Package.method_token)."""
+    if not value:
+        return []
+    tokens = (Package.method_token(part) for part in re.split(r"[/,|]| or ", value.lower()))
+    return list(dict.fromkeys(token for token in tokens if token))
+
+
+@dataclass
+class PatientPreferences:
+    """Recommendation inputs; any of them may be unknown."""
+
+    grafts_min: Optional[float] = None
+    grafts_max: Optional[float] = None
+    budget: Optional[float] = None
+    currency: Optional[str] = None
+    origin: Optional[Tuple[float, float]] = None
+    methods: List[str] = field(default_factory=list)
+
+    @classmethod
+    def from_analysis(cls, analysis: Optional[Dict[str, Any]]) -> "PatientPreferences":
+        """
+        Defaults from an image analysis report: graft_estimate, cost_estimate
+        (its upper bound is taken as the budget) and procedure_type.
+        """
+        analysis = analysis or {}
+        grafts = analysis.get("graft_estimate") or {}
+        cost = analysis.get("cost_estimate") or {}
+
+        def number(value) -> Optional[float]:
+            try:
+                return float(value) if value is not None else None
+            except (TypeError, ValueError):
+                return None
+
+        return cls(
+            grafts_min=number(grafts.get("min")),
+            grafts_max=number(grafts.get("max")),
+            budget=number(cost.get("max")),
+            currency=cost.get("currency"),
+            methods=split_methods(analysis.get("procedure_type")),
+        )
+
+
+@dataclass
+class Recommendation:
+    clinic_id: uuid.UUID
+    package_id: uuid.UUID
+    score: float
+    breakdown: Dict[str, float]
+
+
+class ClinicRecommender:
+    """Feature matrix over active clinic packages with vectorised scoring."""
+
+    def __init__(self, max_age_seconds: float = 300.0, weights: Optional[Dict[str, float]] = None) -> None:
+        self.max_age_seconds = max_age_seconds
+        self.weights = dict(weights or DEFAULT_WEIGHTS)
+        self._lock = threading.RLock()
+        self.load([], [], [])
+        self._built_at: Optional[float] = None
+
+    # ------------------------------------------------------------------ build
+
+    def load(
+        self,
+        clinics: Sequence,
+        packages: Sequence,
+        links: Iterable[Tuple[uuid.UUID, uuid.UUID]] = (),
+    ) -> None:
+        """
+        Rebuild the feature matrix from clinic rows, package rows and
+        (clinic_id, package_id) links. Each active package contributes one row
+        per clinic it belongs to (through clinic_packages or its clinic_id).
+        """
+        clinic_by_id = {clinic.id: clinic for clinic in clinics}
+        active = {package.id: package for package in packages if package.is_active}
+        pairs = dict.fromkeys(
+            [(clinic_id, package_id) for clinic_id, package_id in links]
+            + [(package.clinic_id, package.id) for package in active.values() if package.clinic_id]
+        )
+        pairs = [
+            (clinic_id, package_id)
+            for clinic_id, package_id in pairs
+            if clinic_id in clinic_by_id and package_id in active
+        ]
+
+        def column(values, dtype=float) -> np.ndarray:
+            return np.array(list(values), dtype=dtype)
+
+        def number(value) -> float:
+            return math.nan if value is None else float(value)
+
+        row_clinics = [clinic_by_id[clinic_id] for clinic_id, _ in pairs]
+        row_packages = [active[package_id] for _, package_id in pairs]
+
+        lat = np.radians(column(number(clinic.lat) for clinic in row_clinics))
+        lng = np.radians(column(number(clinic.lng) for clinic in row_clinics))
+        xyz = np.stack([np.cos(lat) * np.cos(lng), np.cos(lat) * np.sin(lng), np.sin(lat)], axis=1)
+
+        reviews = column(number(clinic.reviews_count) for clinic in row_clinics)
+        reviews = np.log1p(np.nan_to_num(reviews, nan=0.0))
+        reviews_max = reviews.max() if reviews.size and reviews.max() > 0 else 1.0
+
+        with self._lock:
+            self.clinic_ids = [clinic_id for clinic_id, _ in pairs]
+            self.package_ids = [package_id for _, package_id in pairs]
+            codes: Dict[uuid.UUID, int] = {}
+            self._clinic_codes = column(
+                (codes.setdefault(clinic_id, len(codes)) for clinic_id in self.clinic_ids), dtype=np.int64
+            )
+            self._price = column(number(package.price_normalized) for package in row_packages)
+            self._grafts = column(parse_grafts(package.grafts_count) for package in row_packages)
+            self._method = column(
+                (Package.method_token(package.hair_transplantation_method) or "" for package in row_packages),
+                dtype=object,
+            )
+            self._xyz = xyz.reshape(-1, 3)
+            self._rating_score = np.clip(
+                np.nan_to_num(column(number(clinic.rating) for clinic in row_clinics), nan=0.0) / 5.0, 0.0, 1.0
+            )
+            self._reviews_score = reviews / reviews_max
+            self._built_at = time.monotonic()
+
+    def build_from_db(self, db: Session) -> None:
+        clinics = db.query(
+            Clinic.id,
+            Clinic.lat,
+            Clinic.lng,
+            Clinic.rating,
+            Clinic.reviews_count,
+        ).all()
+        packages = db.query(
+            Package.id,
+            Package.clinic_id,
+            Package.is_active,
+            Package.price_normalized,
+            Package.grafts_count,
+            Package.hair_transplantation_method,
+        ).filter(Package.is_active.is_(True)).all()
+        links = db.execute(select(clinic_packages.c.clinic_id, clinic_packages.c.package_id)).all()
+        self.load(clinics, packages, links)
+
+    def ensure_fresh(self, db: Session) -> None:
+        with self._lock:
+            built_at = self._built_at
+        if built_at is None or time.monotonic() - built_at > self.max_age_seconds:
+            self.build_from_db(db)
+
+    def invalidate(self) -> None:
+        """Force a rebuild before the next recommendation."""
+        with self._lock:
+            self._built_at = None
+
+    def __len__(self) -> int:
+        return len(self.package_ids)
+
+    # ------------------------------------------------------------------ score
+
+    def _feature_scores(self, preferences: PatientPreferences) -> Dict[str, np.ndarray]:
+        scores: Dict[str, np.ndarray] = {
+            "rating": self._rating_score,
+            "reviews": self._reviews_score,
+        }
+
+        target = preferences.grafts_max or preferences.grafts_min
+        if target:
+            with np.errstate(invalid="ignore"):
+                grafts = np.clip(self._grafts / target, 0.0, 1.0)
+            scores["grafts"] = np.where(np.isnan(self._grafts), UNKNOWN_SCORE, grafts)
+
+        if preferences.budget:
+            with np.errstate(invalid="ignore"):
+                over = np.clip((self._price - preferences.budget) / preferences.budget, 0.0, 1.0)
+            scores["budget"] = np.where(np.isnan(self._price), UNKNOWN_SCORE, 1.0 - over)
+
+        if preferences.origin is not None:
+            lat, lng = (math.radians(value) for value in preferences.origin)
+            origin = np.array([math.cos(lat) * math.cos(lng), math.cos(lat) * math.sin(lng), math.sin(lat)])
+            chord = np.linalg.norm(self._xyz - origin, axis=1)
+            distance_km = 2 * EARTH_RADIUS_KM * np.arcsin(np.clip(chord / 2, 0.0, 1.0))
+            scores["distance"] = np.where(
+                np.isnan(distance_km), UNKNOWN_SCORE, np.exp(-distance_km / DISTANCE_SCALE_KM)
+            )
+
+        if preferences.methods:
+            tokens = {Package.method_token(method) for method in preferences.methods}
+            wanted = np.array(sorted(tokens - {None}), dtype=object)
+            scores["method"] = np.where(
+                self._method == "", UNKNOWN_SCORE, np.isin(self._method, wanted).astype(float)
+            )
+
+        return scores
+
+    def recommend(
+        self,
+        preferences: PatientPreferences,
+        *,
+        k: int = 10,
+        distinct_clinics: bool = True,
+    ) -> List[Recommendation]:
+        """
+        Top k (clinic, package) pairs by weighted score, best first.
+
+        With distinct_clinics, only each clinic's best package is returned.
+        """
+        with self._lock:
+            if not self.package_ids or k < 1:
+                return []
+
+            features = self._feature_scores(preferences)
+            weights = {name: self.weights.get(name, 0.0) for name in features}
+            weight_total = sum(weights.values()) or 1.0
+            total = np.zeros(len(self.package_ids))
+            for name, values in features.items():
+                total += values * (weights[name] / weight_total)
+
+            if distinct_clinics:
+                # Best-first order, then keep the first row seen for each clinic
+                order = np.lexsort((np.arange(total.size), -total))
+                _, first = np.unique(self._clinic_codes[order], return_index=True)
+                candidates = order[np.sort(first)]
+                top = candidates[:k]
+            else:
+                top = np.argpartition(-total, k - 1)[:k] if k < total.size else np.arange(total.size)
+                top = top[np.lexsort((top, -total[top]))]
+
+            return [
+                Recommendation(
+                    clinic_id=self.clinic_ids[row],
+                    package_id=self.package_ids[row],
+                    score=round(float(total[row]), 4),
+                    breakdown={name: round(float(values[row]), 4) for name, values in features.items()},
+                )
+                for row in top
+            ]
+
+
+clinic_recommender = ClinicRecommender(max_age_seconds=settings.CLINIC_RECOMMENDER_TTL)
@@ -13,6 +13,9 @@ from app.database.entities import Consultation, PatientProfile
 from app.database.repositories.consultation_repository import ConsultationRepository
 from app.database.repositories.patient_profile_repository import PatientProfileRepository
 from app.database.db import SessionLocal
+from app.services import cache_events
+from app.services.patient_cache import invalidate_patient_details
+from app.services.read_cache import CONSULTATIONS_TAG, consultations_cache, read_cache
 
 
 class ConsultationService:
@@ -118,6 +121,7 @@ class ConsultationService:
             status=status,
             agenda=description
         )
+        self._invalidate_reads(consultation)
         
         return {
             "success": True,
@@ -138,6 +142,7 @@ class ConsultationService:
         consultation = self.consultation_repository.update_status(cal_booking_id, "cancelled")
         
         if consultation:
+            self._invalidate_reads(consultation)
             return {
                 "success": True,
                 "message": "Consultation cancelled successfully",
@@ -182,6 +187,7 @@ class ConsultationService:
             consultation.status = "scheduled"  # Reset to scheduled after reschedule
             
             self.consultation_repository.save(consultation)
+            self._invalidate_reads(consultation)
         
         return {
             "success": True,
@@ -203,36 +209,56 @@ class ConsultationService:
         
         return patient_profiles[0] if patient_profiles else None
     
+    @staticmethod
+    def _invalidate_reads(consultation: Consultation) -> None:
+        """Drop cached reads that show this consultation, in every worker."""
+        invalidate_patient_details(consultation.patient_profile_id)
+        read_cache.invalidate_tags(CONSULTATIONS_TAG)
+        cache_events.publish(cache_events.CONSULTATION)
+    
     def get_todays_consultations(self) -> List[Dict[str, Any]]:
-        """Get today's consultations formatted for consultant interface."""
+        """
+        Get today's consultations formatted for consultant interface.
+        
+        Served from the read cache; concurrent misses share one query, and the
+        date in the key keeps yesterday's list from outliving midnight.
+        """
         try:
-            consultations = self.consultation_repository.get_todays_consultations()
-            
-            result = []
-            for consultation in consultations:
-                result.append({
-                    "id": str(consultation.id),
-                    "zoom_meeting_id": consultation.zoom_meeting_id,
-                    "topic": consultation.topic,
-                    "agenda": consultation.agenda,
-                    "start_time": consultation.start_time.isoformat() if consultation.start_time else None,
-                    "duration": consultation.duration,
-                    "timezone": consultation.timezone,
-                    "attendee_name": consultation.attendee_name,
-                    "attendee_email": consultation.attendee_email,
-                    "attendee_phone": consultation.attendee_phone,
-                    "status": consultation.status,
-                    "host_name": consultation.host_name,
-                    "host_email": consultation.host_email,
-                    "patient_profile_id": str(consultation.patient_profile_id) if consultation.patient_profile_id else None
-                })
-            
-            return result
+            return consultations_cache.get_or_set(
+                datetime.now().date().isoformat(),
+                self._load_todays_consultations,
+                tags=[CONSULTATIONS_TAG],
+            )
         except Exception as e:
-            # If the consultations table doesn't exist, return empty list
+            # If the consultations table doesn't exist, return empty list.
+            # The failure propagates out of the loader so it is never cached.
             print(f"Warning: Could not fetch consultations: {e}")
             return []
     
+    def _load_todays_consultations(self) -> List[Dict[str, Any]]:
+        consultations = self.consultation_repository.get_todays_consultations()
+        
+        result = []
+        for consultation in consultations:
+            result.append({
+                "id": str(consultation.id),
+                "zoom_meeting_id": consultation.zoom_meeting_id,
+                "topic": consultation.topic,
+                "agenda": consultation.agenda,
+                "start_time": consultation.start_time.isoformat() if consultation.start_time else None,
+                "duration": consultation.duration,
+                "timezone": consultation.timezone,
+                "attendee_name": consultation.attendee_name,
+                "attendee_email": consultation.attendee_email,
+                "attendee_phone": consultation.attendee_phone,
+                "status": consultation.status,
+                "host_name": consultation.host_name,
+                "host_email": consultation.host_email,
+                "patient_profile_id": str(consultation.patient_profile_id) if consultation.patient_profile_id else None
+            })
+        
+        return result
+    
     def get_consultation_by_cal_id(self, cal_booking_id: str) -> Optional[Dict[str, Any]]:
         """Get consultation by Cal.com booking ID."""
         consultation = self.consultation_repository.get_by_cal_booking_id(cal_booking_id)
@@ -0,0 +1,164 @@
+"""
+FX Rates
+
+Conversion of package prices into the catalog base currency
+(settings.FX_BASE_CURRENCY).
+
+Rates live in the `fx_rates` table and are cached in-process for
+FX_RATES_CACHE_TTL seconds. When the table is empty or unreachable the rates
+are read from the JSON file at settings.FX_RATES_FILE, so conversions keep
+working offline:
+
+    {"base": "USD", "as_of": "2026-10-01", "rates": {"EUR": "1.08", ...}}
+
+`packages.price_normalized` is set on flush by the Package entity from the
+table; `apply_rates` replaces the table contents from a file or feed and
+recomputes every package in one UPDATE.
+"""
+
+import json
+from decimal import Decimal, InvalidOperation
+from typing import Dict, Mapping, Optional, Union
+
+from sqlalchemy import func, select, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from app.config.settings import settings
+from app.database.entities import FxRate, Package
+from app.services import cache_events
+from app.services.catalog_search_index import catalog_search_index
+from app.services.catalog_snapshots import catalog_snapshots
+from app.services.clinic_recommender import clinic_recommender
+from app.services.read_cache import invalidate_catalog
+from app.utils import TTLCache
+
+
+CENTS = Decimal("0.01")
+
+fx_rate_cache = TTLCache(ttl_seconds=settings.FX_RATES_CACHE_TTL, max_entries=1)
+
+
+def load_rates_file(path: Optional[str] = None) -> Dict[str, Decimal]:
+    """Read `{currency: rate_to_base}` from a rate file; raises ValueError if it is malformed."""
+    path = path or settings.FX_RATES_FILE
+    with open(path, encoding="utf-8") as handle:
+        data = json.load(handle)
+
+    base = str(data.get("base", "")).upper()
+    if base != settings.FX_BASE_CURRENCY:
+        raise ValueError(
+            f"FX rate file {path} is based on '{base}', expected '{settings.FX_BASE_CURRENCY}'"
+        )
+
+    rates: Dict[str, Decimal] = {}
+    for currency, value in (data.get("rates") or {}).items():
+        try:
+            rate = Decimal(str(value))
+        except InvalidOperation as exc:
+            raise ValueError(f"Invalid FX rate for {currency}: {value!r}") from exc
+        if rate <= 0:
+            raise ValueError(f"FX rate for {currency} must be positive, got {value!r}")
+        rates[currency.upper()] = rate
+    rates[base] = Decimal(1)
+    return rates
+
+
+def get_rates(db: Optional[Session] = None) -> Dict[str, Decimal]:
+    """Current rates, from the cache, the fx_rates table, or the offline file, in that order."""
+    rates = fx_rate_cache.get("rates")
+    if rates is not None:
+        return rates
+
+    rates = {}
+    if db is not None:
+        try:
+            rates = {
+                currency: rate
+                for currency, rate in db.query(FxRate.currency, FxRate.rate_to_base)
+            }
+        except SQLAlchemyError:
+            db.rollback()
+            rates = {}
+    if not rates:
+        rates = load_rates_file()
+    rates.setdefault(settings.FX_BASE_CURRENCY, Decimal(1))
+
+    fx_rate_cache.set("rates", rates)
+    return rates
+
+
+def to_base(
+    amount: Optional[Union[Decimal, float, int]],
+    currency: Optional[str],
+    db: Optional[Session] = None,
+) -> Optional[Decimal]:
+    """
+    Convert an amount into the base currency, rounded to cents.
+    Raises ValueError for a currency without a rate.
+    """
+    if amount is None:
+        return None
+    currency = (currency or settings.FX_BASE_CURRENCY).upper()
+    rate = get_rates(db).get(currency)
+    if rate is None:
+        raise ValueError(f"No FX rate for currency '{currency}'")
+    return (Decimal(str(amount)) * rate).quantize(CENTS)
+
+
+def recompute_normalized_prices(db: Session) -> int:
+    """
+    Recompute `packages.price_normalized` from fx_rates in a single UPDATE,
+    touching only rows whose value changes. Returns the number of rows updated;
+    the caller commits.
+    """
+    packages = Package.__table__
+    rate = (
+        select(FxRate.rate_to_base)
+        .where(FxRate.currency == packages.c.currency)
+        .scalar_subquery()
+    )
+    normalized = func.round(packages.c.price * rate, 2)
+    result = db.execute(
+        update(packages)
+        # Preserve updated_at: a rate change is not an edit of the package
+        .values(price_normalized=normalized, updated_at=packages.c.updated_at)
+        .where(packages.c.price_normalized.is_distinct_from(normalized))
+    )
+    return result.rowcount
+
+
+def apply_rates(db: Session, rates: Mapping[str, Decimal]) -> int:
+    """
+    Upsert rates into fx_rates, recompute every normalized package price and
+    commit. Returns the number of packages whose normalized price changed.
+    """
+    rows = [
+        {"currency": currency.upper(), "rate_to_base": Decimal(str(rate))}
+        for currency, rate in rates.items()
+    ]
+    if rows:
+        statement = insert(FxRate).values(rows)
+        db.execute(
+            statement.on_conflict_do_update(
+                index_elements=[FxRate.currency],
+                set_={"rate_to_base": statement.excluded.rate_to_base, "updated_at": func.now()},
+            )
+        )
+    updated = recompute_normalized_prices(db)
+    db.commit()
+
+    invalidate_fx_rates()
+    cache_events.publish(cache_events.FX_RATES)
+    return updated
+
+
+def invalidate_fx_rates() -> None:
+    """Drop cached rates and the catalog structures built from normalized prices."""
+    fx_rate_cache.clear()
+    catalog_search_index.invalidate()
+    catalog_snapshots.invalidate()
+    clinic_recommender.invalidate()
+    # Normalized prices are embedded in every package and clinic payload
+    invalidate_catalog(all_clinics=True, all_packages=True)
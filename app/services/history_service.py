@@ -1,10 +1,12 @@
-from typing import List, Optional
+from datetime import datetime
+from typing import List, Optional, Tuple
 import uuid
 
 from app.database.entities.user import User
 from app.database.entities.message import Message
 from app.database.repositories.user_repository import UserRepository
 from app.database.repositories.message_repository import MessageRepository
+from app.utils.cursor_utils import CursorUtils
 
 
 class HistoryService:
@@ -40,6 +42,39 @@ class HistoryService:
         """Get recent message history for a user."""
         return self.message_repository.get_recent_by_user(user_id=user_id, limit=limit)
 
+    def get_transcript_page(
+        self,
+        user_id: uuid.UUID,
+        *,
+        limit: int = 50,
+        cursor: Optional[str] = None,
+        newest_first: bool = True,
+        direction: Optional[str] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+    ) -> Tuple[List[Message], Optional[str]]:
+        """
+        Get one page of a user's conversation transcript.
+
+        Returns the page of messages and the cursor for the next page (None on the last page).
+        Raises ValueError for a malformed cursor.
+        """
+        rows = self.message_repository.list_page_by_user(
+            user_id,
+            limit=limit,
+            after=CursorUtils.decode_uuid(cursor),
+            newest_first=newest_first,
+            direction=direction,
+            since=since,
+            until=until,
+        )
+        messages = rows[:limit]
+        next_cursor = None
+        if len(rows) > limit:
+            last = messages[-1]
+            next_cursor = CursorUtils.encode(last.created_at, last.id)
+        return messages, next_cursor
+
     def get_user_by_phone(self, phone_number: str) -> Optional[User]:
         """Get user by phone number."""
         return self.user_repository.get_by_phone_number(phone_number)
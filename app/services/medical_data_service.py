@@ -13,6 +13,7 @@ from app.database.repositories.user_repository import UserRepository
 from app.database.repositories.patient_profile_repository import PatientProfileRepository
 from app.database.repositories.medical_background_repository import MedicalBackgroundRepository
 from app.database.db import SessionLocal
+from app.services.patient_cache import invalidate_patient_details
 
 
 class MedicalDataService:
@@ -57,8 +58,10 @@ class MedicalDataService:
             # Create or update medical background
             medical_background = self._create_or_update_medical_background(
                 patient_profile_id=patient_profile.id,
+                booking_uid=booking_uid,
                 questionnaire_data=questionnaire_data
             )
+            invalidate_patient_details(patient_profile.id)
             
             return {
                 "success": True,
@@ -90,33 +93,25 @@ class MedicalDataService:
             Dictionary with patient profile and medical background data, or None if not found
         """
         try:
-            # For now, we'll search by email since we don't have a direct booking_uid field
-            # In a real implementation, you'd want to store the booking_uid in the patient profile
-            # or have a separate bookings table
+            medical_bg = self.medical_background_repository.get_by_booking_uid(booking_uid)
+            if not medical_bg:
+                return None
             
-            # This is a simplified search - in production you'd want a more robust approach
-            patient_profiles = self.db.query(PatientProfile).all()
-            
-            for profile in patient_profiles:
-                # Check if this profile has medical background data
-                medical_bg = self.medical_background_repository.get_by_patient_profile_id(profile.id)
-                if medical_bg:
-                    return {
-                        "patient_profile": {
-                            "id": str(profile.id),
-                            "name": profile.name,
-                            "email": profile.email,
-                            "phone": profile.phone,
-                            "age": profile.age,
-                            "location": profile.location
-                        },
-                        "medical_background": {
-                            "id": str(medical_bg.id),
-                            "medical_data": medical_bg.medical_data
-                        }
-                    }
-            
-            return None
+            profile = medical_bg.patient_profile
+            return {
+                "patient_profile": {
+                    "id": str(profile.id),
+                    "name": profile.name,
+                    "email": profile.email,
+                    "phone": profile.phone,
+                    "age": profile.age,
+                    "location": profile.location
+                },
+                "medical_background": {
+                    "id": str(medical_bg.id),
+                    "medical_data": medical_bg.medical_data
+                }
+            }
             
         except Exception as e:
             print(f"Error getting medical data: {e}")
@@ -171,6 +166,7 @@ class MedicalDataService:
     def _create_or_update_medical_background(
         self, 
         patient_profile_id: uuid.UUID, 
+        booking_uid: str,
         questionnaire_data: Dict[str, Any]
     ) -> MedicalBackground:
         """Create or update medical background data."""
@@ -183,12 +179,14 @@ class MedicalDataService:
         if medical_bg:
             # Update existing medical background
             medical_bg.medical_data = medical_data
+            medical_bg.booking_uid = booking_uid
             self.medical_background_repository.save(medical_bg)
         else:
             # Create new medical background
             medical_bg = self.medical_background_repository.create(
                 patient_profile_id=patient_profile_id,
-                medical_data=medical_data
+                medical_data=medical_data,
+                booking_uid=booking_uid
             )
         
         return medical_bg
@@ -0,0 +1,26 @@
+"""
+Patient Cache
+
+Short-TTL cache of formatted patient detail payloads in the read cache, keyed
+by patient profile ID and tagged with the offered clinics they embed. Writers
+(patient updates, offer changes and Cal.com booking webhooks) invalidate the
+affected patient here and, through a cache event, in the other workers.
+"""
+
+import uuid
+from typing import Optional, Union
+
+from app.config.settings import settings
+from app.services import cache_events
+from app.services.read_cache import read_cache
+
+
+patient_details_cache = read_cache.namespaced("patient_details", settings.PATIENT_DETAILS_CACHE_TTL)
+
+
+def invalidate_patient_details(patient_profile_id: Optional[Union[str, uuid.UUID]]) -> None:
+    """Drop the cached detail payload for a patient, in this worker and the others."""
+    if patient_profile_id is None:
+        return
+    patient_details_cache.delete(str(patient_profile_id))
+    cache_events.publish(cache_events.PATIENT, [patient_profile_id])
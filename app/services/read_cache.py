@@ -0,0 +1,69 @@
+"""
+Read Cache
+
+Process-wide cache for clinic, package, patient-detail and today's-consultation
+reads. CACHE_BACKEND selects the in-process LRU (default) or a Redis-compatible
+server at CACHE_URL shared by every worker. Entries are tagged with the rows
+they were built from; writes invalidate those tags:
+
+- `clinic:<id>` / `package:<id>` - one catalog row (clinic detail payloads
+  also carry the tags of their packages, patient details those of the
+  offered clinics)
+- `clinics` / `packages` - every clinic or package payload, for bulk writes
+- `consultations` - today's consultation list, for Cal.com webhooks
+
+Concurrent misses share one load through the request coalescer.
+"""
+
+import uuid
+from typing import Iterable, Union
+
+from app.config.settings import settings
+from app.services.request_coalescing import request_coalescer
+from app.utils import CacheBackend, MemoryCacheBackend, RedisCacheBackend, TaggedCache
+
+
+CLINICS_TAG = "clinics"
+PACKAGES_TAG = "packages"
+CONSULTATIONS_TAG = "consultations"
+
+
+def clinic_tag(clinic_id: Union[str, uuid.UUID]) -> str:
+    return f"clinic:{clinic_id}"
+
+
+def package_tag(package_id: Union[str, uuid.UUID]) -> str:
+    return f"package:{package_id}"
+
+
+def _create_backend() -> CacheBackend:
+    if settings.CACHE_BACKEND == "redis":
+        return RedisCacheBackend.from_url(settings.CACHE_URL)
+    if settings.CACHE_BACKEND != "memory":
+        raise ValueError(f"Unknown CACHE_BACKEND '{settings.CACHE_BACKEND}'; use 'memory' or 'redis'")
+    return MemoryCacheBackend(max_entries=settings.CACHE_MAX_ENTRIES)
+
+
+read_cache = TaggedCache(_create_backend(), single_flight=request_coalescer)
+
+clinic_details_cache = read_cache.namespaced("clinic_details", settings.CATALOG_DETAILS_CACHE_TTL)
+package_details_cache = read_cache.namespaced("package_details", settings.CATALOG_DETAILS_CACHE_TTL)
+consultations_cache = read_cache.namespaced("consultations_today", settings.CONSULTATIONS_CACHE_TTL)
+
+
+def invalidate_catalog(
+    clinic_ids: Iterable[Union[str, uuid.UUID]] = (),
+    package_ids: Iterable[Union[str, uuid.UUID]] = (),
+    *,
+    all_clinics: bool = False,
+    all_packages: bool = False,
+) -> None:
+    """Drop cached payloads built from the given catalog rows."""
+    tags = [clinic_tag(clinic_id) for clinic_id in clinic_ids]
+    tags.extend(package_tag(package_id) for package_id in package_ids)
+    if all_clinics:
+        tags.append(CLINICS_TAG)
+    if all_packages:
+        tags.append(PACKAGES_TAG)
+    if tags:
+        read_cache.invalidate_tags(*tags)
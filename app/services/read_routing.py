@@ -0,0 +1,163 @@
+"""
+Read Routing
+
+Sends read-only requests to the DATABASE_READ_URL replica and everything else
+to the primary. A request is read-only when its method is GET or HEAD; routes
+serving those methods never write.
+
+Read-your-writes: once a primary session opened for a request commits, that
+client (its X-Device-Id header, else its address) is pinned to the primary
+for DATABASE_READ_STICKY_SECONDS. Pins are kept in the read cache, so with
+the redis backend they hold across workers. Reads also stay on the primary
+while the replica lags more than DATABASE_READ_MAX_LAG_SECONDS or cannot be
+reached; lag is sampled at most every LAG_SAMPLE_SECONDS.
+
+Caches filled from the replica may capture a row from just before a write,
+so with a replica configured the invalidation listener evicts every change
+once more after the sticky window (see app.services.cache_invalidation).
+"""
+
+import threading
+from typing import Any, Dict, Optional
+
+from fastapi import Request
+from sqlalchemy import event, text
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.config.settings import settings
+from app.database.db import ReadSessionLocal, SessionLocal
+from app.services.read_cache import read_cache
+from app.utils import TaggedCache, TTLCache
+
+
+READ_METHODS = frozenset({"GET", "HEAD"})
+DEVICE_HEADER = "X-Device-Id"
+LAG_SAMPLE_SECONDS = 5.0
+
+# Seconds of WAL replay the replica is behind; 0 on a primary or when caught up
+_LAG_QUERY = text(
+    """
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN 0
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+    END
+    """
+)
+
+
+class ReadRouter:
+    """Chooses the primary or the replica session factory per request."""
+
+    def __init__(
+        self,
+        primary: sessionmaker,
+        replica: sessionmaker,
+        pins: TaggedCache,
+        max_lag_seconds: float,
+        lag_sample_seconds: float = LAG_SAMPLE_SECONDS,
+    ) -> None:
+        self.primary = primary
+        self.replica = replica
+        self.pins = pins
+        self.max_lag_seconds = max_lag_seconds
+        self._lag = TTLCache(ttl_seconds=lag_sample_seconds, max_entries=1)
+        self._counters = {"primary": 0, "replica": 0, "pinned": 0, "lagging": 0}
+        self._lock = threading.Lock()
+        event.listen(primary, "after_commit", self._after_commit)
+
+    @property
+    def has_replica(self) -> bool:
+        return self.replica.kw["bind"] is not self.primary.kw["bind"]
+
+    @staticmethod
+    def client_key(request: Request) -> Optional[str]:
+        device_id = request.headers.get(DEVICE_HEADER)
+        if device_id:
+            return f"device:{device_id}"
+        if request.client is not None:
+            return f"addr:{request.client.host}"
+        return None
+
+    def session_for(self, request: Request) -> Session:
+        """
+        Open the session a request should use.
+        return:
+            return a replica session for reads that may use it, else a primary
+            session that pins its client to the primary once it commits
+        """
+        client = self.client_key(request)
+        route = "primary"
+        if request.method in READ_METHODS and self.has_replica:
+            route = self._read_route(client)
+        with self._lock:
+            self._counters[route] += 1
+        if route == "replica":
+            return self.replica()
+        session = self.primary()
+        session.info["client"] = client
+        return session
+
+    def _read_route(self, client: Optional[str]) -> str:
+        if client is not None and self.pins.get(client):
+            return "pinned"
+        lag = self.replica_lag_seconds()
+        if lag is None or lag > self.max_lag_seconds:
+            return "lagging"
+        return "replica"
+
+    def _after_commit(self, session: Session) -> None:
+        client = session.info.get("client")
+        if client is not None and self.has_replica:
+            self.pins.set(client, True)
+
+    def replica_lag_seconds(self) -> Optional[float]:
+        """
+        Replica replay lag, sampled at most every lag_sample_seconds.
+        return:
+            return seconds the replica is behind (0 without one), or None when
+            it cannot be reached
+        """
+        if not self.has_replica:
+            return 0.0
+        sample = self._lag.get("lag")
+        if sample is None:
+            try:
+                with self.replica.kw["bind"].connect() as connection:
+                    sample = (float(connection.execute(_LAG_QUERY).scalar()),)
+            except SQLAlchemyError as exc:
+                print(f"⚠️ Read replica lag check failed: {exc}")
+                sample = (None,)
+            self._lag.set("lag", sample)
+        return sample[0]
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Routing counters for this worker.
+        return:
+            return whether a replica is configured, its lag in seconds, and
+            sessions opened per route (primary for writes, replica, or reads
+            kept on the primary because the client was pinned or the replica
+            was lagging or unreachable)
+        """
+        with self._lock:
+            sessions = dict(self._counters)
+        return {"configured": self.has_replica, "lagSeconds": self.replica_lag_seconds(), "sessions": sessions}
+
+
+read_router = ReadRouter(
+    SessionLocal,
+    ReadSessionLocal,
+    read_cache.namespaced("primary_pins", settings.DATABASE_READ_STICKY_SECONDS),
+    settings.DATABASE_READ_MAX_LAG_SECONDS,
+)
+
+
+# Dependency for FastAPI routes
+def get_db(request: Request):
+    db = read_router.session_for(request)
+    try:
+        yield db
+    finally:
+        db.close()
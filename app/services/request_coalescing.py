@@ -0,0 +1,13 @@
+"""
+Request Coalescing
+
+Process-wide single-flight group for hot identical reads: when the dashboard
+opens at the start of the day, concurrent requests for the same catalog
+snapshot or today's consultations share one database round trip. Counters are
+served on GET /health/metrics.
+"""
+
+from app.utils import SingleFlight
+
+
+request_coalescer = SingleFlight()
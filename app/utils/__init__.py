@@ -2,3 +2,11 @@ from .audio_converter import transcribe_twilio_media
 from .error_utils import ErrorUtils
 from .request_utils import RequestUtils
 from .time_utils import TimeUtils
+from .cursor_utils import CursorUtils
+from .etag_utils import ETagUtils
+from .ttl_cache import TTLCache
+from .opening_hours_utils import OpeningHoursUtils
+from .json_response import FastJSONResponse
+from .fieldset_utils import FieldsetUtils
+from .single_flight import SingleFlight
+from .cache_backends import CacheBackend, MemoryCacheBackend, RedisCacheBackend, TaggedCache
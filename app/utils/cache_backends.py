@@ -0,0 +1,300 @@
+import pickle
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Optional, Set, Tuple, Union
+
+from .single_flight import SingleFlight
+
+
+class CacheBackend:
+    """
+    Storage behind TaggedCache. Keys are strings; every entry has a TTL and
+    may carry tags, and invalidating a tag drops every entry that carries it.
+    `shared` backends are seen by every worker, so writers' invalidations
+    already reach them.
+    """
+
+    shared = False
+
+    def get(self, key: str) -> Optional[Any]:
+        raise NotImplementedError
+
+    def set(self, key: str, value: Any, ttl_seconds: float, tags: Iterable[str] = ()) -> None:
+        raise NotImplementedError
+
+    def delete(self, key: str) -> None:
+        raise NotImplementedError
+
+    def invalidate_tags(self, tags: Iterable[str]) -> int:
+        """
+        Drop every entry carrying any of `tags`.
+        return:
+            return number of entries dropped
+        """
+        raise NotImplementedError
+
+    def acquire_lock(self, key: str, ttl_seconds: float) -> bool:
+        """
+        Claim the right to load `key` across processes; in-process callers are
+        already coalesced, so a local backend always grants it.
+        """
+        return True
+
+    def release_lock(self, key: str) -> None:
+        pass
+
+    def clear(self) -> None:
+        raise NotImplementedError
+
+
+class MemoryCacheBackend(CacheBackend):
+    """In-process LRU backend: bounded by `max_entries`, expired entries are dropped lazily."""
+
+    def __init__(self, max_entries: int = 2048) -> None:
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[float, Any, Tuple[str, ...]]]" = OrderedDict()
+        self._tags: Dict[str, Set[str]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] <= time.monotonic():
+                self._remove(key)
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def set(self, key: str, value: Any, ttl_seconds: float, tags: Iterable[str] = ()) -> None:
+        if ttl_seconds <= 0:
+            return
+        tags = tuple(tags)
+        with self._lock:
+            self._remove(key)
+            self._entries[key] = (time.monotonic() + ttl_seconds, value, tags)
+            for tag in tags:
+                self._tags.setdefault(tag, set()).add(key)
+            while len(self._entries) > self.max_entries:
+                self._remove(next(iter(self._entries)))
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._remove(key)
+
+    def invalidate_tags(self, tags: Iterable[str]) -> int:
+        with self._lock:
+            keys = set()
+            for tag in tags:
+                keys.update(self._tags.pop(tag, ()))
+            for key in keys:
+                self._remove(key)
+            return len(keys)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._tags.clear()
+
+    def _remove(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        for tag in entry[2]:
+            keys = self._tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tags[tag]
+
+
+class RedisCacheBackend(CacheBackend):
+    """
+    Network backend for any Redis-compatible server (Redis, Valkey, KeyDB, or
+    fakeredis in tests), shared by every worker. Values are pickled; each tag
+    is a set of the keys carrying it, expiring with its longest-lived member.
+    """
+
+    shared = True
+
+    def __init__(self, client: Any, prefix: str = "cache:") -> None:
+        self.client = client
+        self.prefix = prefix
+
+    @classmethod
+    def from_url(cls, url: str, prefix: str = "cache:") -> "RedisCacheBackend":
+        import redis
+
+        return cls(redis.Redis.from_url(url), prefix=prefix)
+
+    def _key(self, key: str) -> str:
+        return f"{self.prefix}k:{key}"
+
+    def _tag(self, tag: str) -> str:
+        return f"{self.prefix}t:{tag}"
+
+    def get(self, key: str) -> Optional[Any]:
+        data = self.client.get(self._key(key))
+        return pickle.loads(data) if data is not None else None
+
+    def set(self, key: str, value: Any, ttl_seconds: float, tags: Iterable[str] = ()) -> None:
+        ttl_ms = int(ttl_seconds * 1000)
+        if ttl_ms <= 0:
+            return
+        full_key = self._key(key)
+        pipe = self.client.pipeline(transaction=True)
+        pipe.set(full_key, pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL), px=ttl_ms)
+        for tag in tags:
+            tag_key = self._tag(tag)
+            pipe.sadd(tag_key, full_key)
+            pipe.pexpire(tag_key, ttl_ms, nx=True)
+            pipe.pexpire(tag_key, ttl_ms, gt=True)
+        pipe.execute()
+
+    def delete(self, key: str) -> None:
+        self.client.delete(self._key(key))
+
+    def invalidate_tags(self, tags: Iterable[str]) -> int:
+        dropped = 0
+        for tag in tags:
+            # Move the set aside first so entries tagged while we delete
+            # land in a fresh set instead of being forgotten
+            claimed = f"{self._tag(tag)}:{time.time_ns()}"
+            try:
+                self.client.rename(self._tag(tag), claimed)
+            except Exception as exc:
+                if "no such key" in str(exc).lower():
+                    continue
+                raise
+            keys: List[bytes] = list(self.client.smembers(claimed))
+            if keys:
+                dropped += self.client.delete(*keys)
+            self.client.delete(claimed)
+        return dropped
+
+    def acquire_lock(self, key: str, ttl_seconds: float) -> bool:
+        return bool(self.client.set(f"{self.prefix}l:{key}", b"1", nx=True, px=int(ttl_seconds * 1000)))
+
+    def release_lock(self, key: str) -> None:
+        self.client.delete(f"{self.prefix}l:{key}")
+
+    def clear(self) -> None:
+        keys = list(self.client.scan_iter(match=f"{self.prefix}*"))
+        if keys:
+            self.client.delete(*keys)
+
+
+# Tags for an entry, or a function of the loaded value returning them
+Tags = Union[Iterable[str], Callable[[Any], Iterable[str]]]
+
+
+class TaggedCache:
+    """
+    Cache-aside reads over a CacheBackend, scoped to a key namespace. Tags are
+    shared across namespaces, so one write can retire every entry built from
+    the row it touched.
+
+    `get_or_set` protects against stampedes: concurrent misses in this process
+    share one load through SingleFlight, and a backend lock makes loaders in
+    other processes wait (up to `lock_seconds`) for the value instead of
+    loading it again.
+    """
+
+    def __init__(
+        self,
+        backend: CacheBackend,
+        namespace: str = "default",
+        ttl_seconds: float = 60.0,
+        single_flight: Optional[SingleFlight] = None,
+        lock_seconds: float = 5.0,
+    ) -> None:
+        self.backend = backend
+        self.namespace = namespace
+        self.ttl_seconds = ttl_seconds
+        self.single_flight = single_flight or SingleFlight()
+        self.lock_seconds = lock_seconds
+
+    def namespaced(self, namespace: str, ttl_seconds: Optional[float] = None) -> "TaggedCache":
+        """Another namespace on the same backend and single-flight group."""
+        return TaggedCache(
+            self.backend,
+            namespace=namespace,
+            ttl_seconds=self.ttl_seconds if ttl_seconds is None else ttl_seconds,
+            single_flight=self.single_flight,
+            lock_seconds=self.lock_seconds,
+        )
+
+    def _key(self, key: Hashable) -> str:
+        return f"{self.namespace}:{key}"
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """
+        Look up a live entry.
+        return:
+            return cached value, or None when missing, expired or invalidated
+        """
+        return self.backend.get(self._key(key))
+
+    def set(self, key: Hashable, value: Any, tags: Iterable[str] = (), ttl_seconds: Optional[float] = None) -> None:
+        """
+        Store a value; a TTL of zero disables caching.
+        """
+        ttl = self.ttl_seconds if ttl_seconds is None else ttl_seconds
+        self.backend.set(self._key(key), value, ttl, tags)
+
+    def delete(self, key: Hashable) -> None:
+        self.backend.delete(self._key(key))
+
+    def invalidate_tags(self, *tags: str) -> int:
+        return self.backend.invalidate_tags(tags)
+
+    def get_or_set(
+        self,
+        key: Hashable,
+        loader: Callable[[], Optional[Any]],
+        tags: Tags = (),
+        ttl_seconds: Optional[float] = None,
+    ) -> Optional[Any]:
+        """
+        Serve `key` from the cache, loading and storing it on a miss.
+        `loader` returning None (e.g. an unknown id) is not cached.
+        return:
+            return cached or freshly loaded value
+        """
+        value = self.get(key)
+        if value is not None:
+            return value
+        return self.single_flight.do(
+            (self.namespace, key),
+            self._load,
+            key,
+            loader,
+            tags,
+            ttl_seconds,
+        )
+
+    def _load(self, key: Hashable, loader: Callable[[], Optional[Any]], tags: Tags, ttl_seconds: Optional[float]) -> Optional[Any]:
+        full_key = self._key(key)
+        locked = self.backend.acquire_lock(full_key, self.lock_seconds)
+        if not locked:
+            # Another process is loading it; wait for its value, then fall back to loading
+            deadline = time.monotonic() + self.lock_seconds
+            while time.monotonic() < deadline:
+                value = self.backend.get(full_key)
+                if value is not None:
+                    return value
+                time.sleep(0.02)
+        try:
+            value = loader()
+            if value is not None:
+                self.set(key, value, tags(value) if callable(tags) else tags, ttl_seconds)
+            return value
+        finally:
+            if locked:
+                self.backend.release_lock(full_key)
+
+    def clear(self) -> None:
+        """Drop every entry on the backend, across namespaces."""
+        self.backend.clear()
@@ -0,0 +1,55 @@
+import base64
+import json
+import uuid
+from datetime import datetime
+from typing import Any, Optional, Tuple
+
+
+class CursorUtils:
+    """Opaque cursors for keyset (seek) pagination on `(timestamp, id)` pairs."""
+
+    @staticmethod
+    def encode(created_at: datetime, row_id: Any) -> str:
+        """
+        Encode the sort key of the last row on a page.
+        return:
+            return url-safe opaque cursor string
+        """
+        raw = json.dumps([created_at.isoformat(), str(row_id)], separators=(",", ":"))
+        return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+    @staticmethod
+    def decode(cursor: Optional[str]) -> Optional[Tuple[datetime, str]]:
+        """
+        Decode a cursor produced by `encode`.
+        return:
+            return (timestamp, id) tuple, or None when no cursor was supplied
+        raises:
+            ValueError when the cursor is malformed
+        """
+        if not cursor:
+            return None
+        try:
+            padded = cursor + "=" * (-len(cursor) % 4)
+            created_at, row_id = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+            return datetime.fromisoformat(created_at), str(row_id)
+        except (TypeError, ValueError, UnicodeError) as exc:
+            raise ValueError("Invalid pagination cursor") from exc
+
+    @staticmethod
+    def decode_uuid(cursor: Optional[str]) -> Optional[Tuple[datetime, uuid.UUID]]:
+        """
+        Decode a cursor whose id component is a UUID primary key.
+        return:
+            return (timestamp, UUID) tuple, or None when no cursor was supplied
+        raises:
+            ValueError when the cursor is malformed
+        """
+        decoded = CursorUtils.decode(cursor)
+        if decoded is None:
+            return None
+        created_at, row_id = decoded
+        try:
+            return created_at, uuid.UUID(row_id)
+        except ValueError as exc:
+            raise ValueError("Invalid pagination cursor") from exc
@@ -0,0 +1,35 @@
+import hashlib
+import json
+from typing import Any
+
+from fastapi import Request
+
+
+class ETagUtils:
+    @staticmethod
+    def compute(payload: Any) -> str:
+        """
+        Build a weak ETag from a JSON-serialisable payload.
+        return:
+            return quoted weak ETag header value
+        """
+        raw = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+        digest = hashlib.sha1(raw.encode("utf-8")).hexdigest()
+        return f'W/"{digest}"'
+
+    @staticmethod
+    def matches(request: Request, etag: str) -> bool:
+        """
+        Check whether the request's If-None-Match header already holds this ETag.
+        return:
+            return True when the client copy is current and a 304 can be sent
+        """
+        header = request.headers.get("if-none-match")
+        if not header:
+            return False
+        if header.strip() == "*":
+            return True
+        candidates = {value.strip() for value in header.split(",")}
+        # Weak comparison: W/"x" and "x" refer to the same representation
+        opaque = etag[2:] if etag.startswith("W/") else etag
+        return etag in candidates or opaque in candidates or f"W/{opaque}" in candidates
@@ -0,0 +1,56 @@
+from typing import Iterable, Optional, Tuple
+
+
+class FieldsetUtils:
+    """Sparse fieldsets: `fields=` / `include=` query parameters as comma-separated names."""
+
+    @staticmethod
+    def parse(
+        value: Optional[str],
+        allowed: Iterable[str],
+        *,
+        required: Iterable[str] = ("id",),
+    ) -> Optional[Tuple[str, ...]]:
+        """
+        Parse a comma-separated field list against the names a response offers.
+        return:
+            return the requested names plus `required`, in `allowed` order,
+            or None when the parameter was not given (the full representation)
+        raises:
+            ValueError naming unknown fields
+        """
+        if value is None:
+            return None
+        allowed = tuple(allowed)
+        requested = {name.strip() for name in value.split(",") if name.strip()}
+        unknown = sorted(requested.difference(allowed))
+        if unknown:
+            raise ValueError(
+                f"Unknown field(s): {', '.join(unknown)}. Allowed: {', '.join(allowed)}"
+            )
+        requested.update(required)
+        return tuple(name for name in allowed if name in requested)
+
+    @staticmethod
+    def merge(
+        fields: Optional[Tuple[str, ...]],
+        include: Optional[Tuple[str, ...]],
+        allowed: Iterable[str],
+        relationships: Iterable[str] = (),
+    ) -> Optional[Tuple[str, ...]]:
+        """
+        Combine parsed `fields=` and `include=` into one selection.
+
+        Without `fields=` every attribute is kept; without `include=` only the
+        relationships named in `fields=` are, so `include=` alone (even empty)
+        picks the relationships of an otherwise full representation.
+        return:
+            return the selected names in `allowed` order, or None when neither
+            parameter was given (the full representation)
+        """
+        if fields is None and include is None:
+            return None
+        allowed = tuple(allowed)
+        selected = set(fields) if fields is not None else set(allowed).difference(relationships)
+        selected.update(include or ())
+        return tuple(name for name in allowed if name in selected)
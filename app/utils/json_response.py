@@ -0,0 +1,17 @@
+from typing import Any
+
+from fastapi.responses import JSONResponse
+from pydantic_core import to_json
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    JSONResponse rendered by pydantic-core's Rust encoder.
+
+    UUID, Decimal, datetime and enum values are encoded natively (in the same
+    form Pydantic models dump them), so handlers can return plain dicts built
+    from ORM rows without a model round-trip or jsonable_encoder pass.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return to_json(content)
@@ -0,0 +1,266 @@
+import re
+from datetime import datetime, timezone
+from typing import Any, Iterable, List, Optional, Tuple
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+
+SLOT_MINUTES = 15
+SLOTS_PER_DAY = 24 * 60 // SLOT_MINUTES
+WEEK_SLOTS = 7 * SLOTS_PER_DAY
+BITMAP_BYTES = WEEK_SLOTS // 8
+
+_DAYS = {
+    "mon": 0, "monday": 0,
+    "tue": 1, "tues": 1, "tuesday": 1,
+    "wed": 2, "wednesday": 2,
+    "thu": 3, "thur": 3, "thurs": 3, "thursday": 3,
+    "fri": 4, "friday": 4,
+    "sat": 5, "saturday": 5,
+    "sun": 6, "sunday": 6,
+}
+
+# Single-timezone countries in the clinic catalog; anything else falls back to longitude
+_COUNTRY_TIMEZONES = {
+    "turkey": "Europe/Istanbul",
+    "türkiye": "Europe/Istanbul",
+    "turkiye": "Europe/Istanbul",
+    "spain": "Europe/Madrid",
+    "portugal": "Europe/Lisbon",
+    "united kingdom": "Europe/London",
+    "uk": "Europe/London",
+    "ireland": "Europe/Dublin",
+    "germany": "Europe/Berlin",
+    "france": "Europe/Paris",
+    "italy": "Europe/Rome",
+    "netherlands": "Europe/Amsterdam",
+    "belgium": "Europe/Brussels",
+    "poland": "Europe/Warsaw",
+    "czech republic": "Europe/Prague",
+    "czechia": "Europe/Prague",
+    "hungary": "Europe/Budapest",
+    "greece": "Europe/Athens",
+    "croatia": "Europe/Zagreb",
+    "lithuania": "Europe/Vilnius",
+    "georgia": "Asia/Tbilisi",
+    "united arab emirates": "Asia/Dubai",
+    "uae": "Asia/Dubai",
+    "iran": "Asia/Tehran",
+    "india": "Asia/Kolkata",
+    "thailand": "Asia/Bangkok",
+    "south korea": "Asia/Seoul",
+    "colombia": "America/Bogota",
+    "mexico": "America/Mexico_City",
+}
+
+_TIME = re.compile(r"^(\d{1,2})(?:[:.](\d{2}))?\s*([ap])?\.?m?\.?$")
+_RANGE_SEPARATOR = re.compile(r"\s*(?:-|–|—|\bto\b|\buntil\b)\s*")
+
+
+class OpeningHoursUtils:
+    """
+    Parse free-form clinic opening hours into a weekly bitmap.
+
+    The bitmap has one bit per 15-minute slot of the clinic's local week,
+    slot = weekday * 96 + minute_of_day // 15 (Monday = 0), stored as 84
+    little-endian bytes so that bit n is Postgres `get_bit(bitmap, n)`.
+    """
+
+    @staticmethod
+    def parse(opening_hours: Any) -> Optional[bytes]:
+        """
+        Accepts {"monday": "9:00 AM - 6:00 PM", "sunday": "Closed"} style dicts
+        (day ranges such as "mon-fri" allowed, optionally nested under "hours"),
+        or [{"day": "Monday", "hours": "9 AM–6 PM"}] lists.
+        return:
+            return the bitmap bytes, or None when no day could be understood
+        """
+        entries = OpeningHoursUtils._day_entries(opening_hours)
+        bits = 0
+        understood = False
+        for days, hours in entries:
+            ranges = OpeningHoursUtils._parse_hours(hours)
+            if ranges is None:
+                continue
+            understood = True
+            for day in days:
+                for start, end in ranges:
+                    for slot in range(day * SLOTS_PER_DAY + start, day * SLOTS_PER_DAY + end):
+                        bits |= 1 << (slot % WEEK_SLOTS)
+        if not understood:
+            return None
+        return bits.to_bytes(BITMAP_BYTES, "little")
+
+    @staticmethod
+    def resolve_timezone(
+        opening_hours: Any,
+        country: Optional[str] = None,
+        lng: Optional[float] = None,
+    ) -> str:
+        """
+        IANA timezone of a clinic: an explicit "timezone" in the opening hours,
+        else the country's zone, else a whole-hour offset from the longitude.
+        return:
+            return timezone name, "UTC" when nothing is known
+        """
+        if isinstance(opening_hours, dict):
+            for key in ("timezone", "time_zone", "tz"):
+                name = opening_hours.get(key)
+                if isinstance(name, str) and OpeningHoursUtils._is_timezone(name):
+                    return name
+        if country:
+            name = _COUNTRY_TIMEZONES.get(" ".join(country.lower().split()))
+            if name:
+                return name
+        if lng is not None and -180.0 <= lng <= 180.0:
+            offset = round(lng / 15)
+            # Etc/GMT zones use POSIX signs: Etc/GMT-3 is three hours ahead of UTC
+            return "Etc/GMT" if offset == 0 else f"Etc/GMT{-offset:+d}"
+        return "UTC"
+
+    @staticmethod
+    def slot_at(at: datetime, timezone_name: Optional[str]) -> int:
+        """
+        Week slot of an instant in a timezone; naive datetimes are taken as UTC.
+        return:
+            return slot index in [0, 672)
+        """
+        if at.tzinfo is None:
+            at = at.replace(tzinfo=timezone.utc)
+        local = at.astimezone(ZoneInfo(timezone_name or "UTC"))
+        return local.weekday() * SLOTS_PER_DAY + (local.hour * 60 + local.minute) // SLOT_MINUTES
+
+    @staticmethod
+    def is_open(bitmap: Optional[bytes], timezone_name: Optional[str], at: datetime) -> bool:
+        """
+        Whether the clinic is open at an instant.
+        return:
+            return False when the bitmap is unknown
+        """
+        if not bitmap:
+            return False
+        slot = OpeningHoursUtils.slot_at(at, timezone_name)
+        return bool(bitmap[slot >> 3] >> (slot & 7) & 1)
+
+    # ------------------------------------------------------------------ parsing
+
+    @staticmethod
+    def _is_timezone(name: str) -> bool:
+        try:
+            ZoneInfo(name)
+        except (ZoneInfoNotFoundError, ValueError):
+            return False
+        return True
+
+    @staticmethod
+    def _day_entries(opening_hours: Any) -> List[Tuple[List[int], Any]]:
+        if isinstance(opening_hours, dict) and isinstance(opening_hours.get("hours"), (dict, list)):
+            opening_hours = opening_hours["hours"]
+
+        if isinstance(opening_hours, dict):
+            pairs: Iterable[Tuple[Any, Any]] = opening_hours.items()
+        elif isinstance(opening_hours, list):
+            pairs = [
+                (item.get("day"), item.get("hours"))
+                for item in opening_hours
+                if isinstance(item, dict)
+            ]
+        else:
+            return []
+
+        entries = []
+        for day, hours in pairs:
+            days = OpeningHoursUtils._parse_days(day)
+            if days:
+                entries.append((days, hours))
+        return entries
+
+    @staticmethod
+    def _parse_days(value: Any) -> List[int]:
+        if not isinstance(value, str):
+            return []
+        text = value.strip().lower().rstrip(":")
+        if text in _DAYS:
+            return [_DAYS[text]]
+        parts = _RANGE_SEPARATOR.split(text)
+        if len(parts) == 2 and parts[0] in _DAYS and parts[1] in _DAYS:
+            start, end = _DAYS[parts[0]], _DAYS[parts[1]]
+            return [(start + offset) % 7 for offset in range((end - start) % 7 + 1)]
+        return []
+
+    @staticmethod
+    def _parse_hours(value: Any) -> Optional[List[Tuple[int, int]]]:
+        """Slot ranges [start, end) within a day; end may pass 96 for overnight hours."""
+        if isinstance(value, list):
+            ranges: List[Tuple[int, int]] = []
+            for item in value:
+                parsed = OpeningHoursUtils._parse_hours(item)
+                if parsed is None:
+                    return None
+                ranges.extend(parsed)
+            return ranges
+        if not isinstance(value, str):
+            return None
+
+        text = value.strip().lower().replace(" ", " ")
+        if not text:
+            return None
+        if text.startswith("closed"):
+            return []
+        if "24 hours" in text or text in {"24h", "24/7", "open 24h"}:
+            return [(0, SLOTS_PER_DAY)]
+
+        ranges = []
+        for part in re.split(r"\s*[,;]\s*", text):
+            bounds = _RANGE_SEPARATOR.split(part)
+            if len(bounds) != 2:
+                return None
+            span = OpeningHoursUtils._parse_span(*bounds)
+            if span is None:
+                return None
+            ranges.append(span)
+        return ranges
+
+    @staticmethod
+    def _parse_span(start_text: str, end_text: str) -> Optional[Tuple[int, int]]:
+        start = OpeningHoursUtils._parse_time(start_text)
+        end = OpeningHoursUtils._parse_time(end_text)
+        if start is None or end is None:
+            return None
+        (start_minutes, start_meridiem), (end_minutes, end_meridiem) = start, end
+        if end_meridiem and not start_meridiem:
+            # "9–6 PM" shares the end's meridiem, but "11–2 PM" means 11 AM to 2 PM
+            start_minutes = OpeningHoursUtils._parse_time(start_text, default_meridiem=end_meridiem)[0]
+            if start_minutes > end_minutes:
+                start_minutes = OpeningHoursUtils._parse_time(start_text, default_meridiem="a")[0]
+        elif start_meridiem and not end_meridiem:
+            # "3:30 PM – 7" closes at 7 PM, but "8 AM – 12" closes at noon
+            end_minutes = OpeningHoursUtils._parse_time(end_text, default_meridiem=start_meridiem)[0]
+            if end_minutes <= start_minutes:
+                flipped = "a" if start_meridiem == "p" else "p"
+                end_minutes = OpeningHoursUtils._parse_time(end_text, default_meridiem=flipped)[0]
+
+        start_slot = start_minutes // SLOT_MINUTES
+        end_slot = -(-end_minutes // SLOT_MINUTES)
+        if end_slot <= start_slot:
+            end_slot += SLOTS_PER_DAY  # closes after midnight
+        return start_slot, end_slot
+
+    @staticmethod
+    def _parse_time(text: str, default_meridiem: Optional[str] = None) -> Optional[Tuple[int, Optional[str]]]:
+        text = text.strip().lower()
+        if text == "noon":
+            return 12 * 60, "p"
+        if text == "midnight":
+            return 24 * 60, "a"
+        match = _TIME.match(text)
+        if not match:
+            return None
+        hour, minute = int(match.group(1)), int(match.group(2) or 0)
+        meridiem = match.group(3) or default_meridiem
+        if minute >= 60 or hour > 24:
+            return None
+        if meridiem:
+            if hour > 12:
+                return None
+            hour = hour % 12 + (12 if meridiem == "p" else 0)
+        return hour * 60 + minute, match.group(3)
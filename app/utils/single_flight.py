@@ -0,0 +1,122 @@
+import asyncio
+import functools
+import threading
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+from starlette.concurrency import run_in_threadpool
+
+
+class SingleFlight:
+    """
+    Coalesce concurrent identical calls: while a call for a key is running,
+    later calls with an equal key wait for it and share its result (or
+    exception) instead of running again. Nothing is kept once it finishes,
+    so this is not a cache.
+
+    Thread callers use `do` (or the `coalesce` decorator); request handlers on
+    the event loop use `run`, which executes in the threadpool so other
+    requests keep being served and can join the flight. Results are shared
+    objects, so callers must not mutate them.
+
+    Keys are hashable; for tuples the first element names the flight in
+    `stats()`.
+    """
+
+    def __init__(self) -> None:
+        self._calls: Dict[Hashable, Future] = {}
+        self._counters: Dict[str, Dict[str, int]] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _name(key: Hashable) -> str:
+        return str(key[0] if isinstance(key, tuple) and key else key)
+
+    def _join(self, key: Hashable) -> Tuple[Future, bool]:
+        with self._lock:
+            counters = self._counters.setdefault(self._name(key), {"executions": 0, "coalesced": 0})
+            future = self._calls.get(key)
+            if future is not None:
+                counters["coalesced"] += 1
+                return future, False
+            future = Future()
+            self._calls[key] = future
+            counters["executions"] += 1
+            return future, True
+
+    def _finish(self, key: Hashable, future: Future, result: Any = None, error: Optional[BaseException] = None) -> None:
+        with self._lock:
+            self._calls.pop(key, None)
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(result)
+
+    def do(self, key: Hashable, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """
+        Run `fn(*args, **kwargs)` unless an identical call is in flight.
+        return:
+            return the result of the call this one joined or led
+        """
+        future, leader = self._join(key)
+        if not leader:
+            return future.result()
+        try:
+            result = fn(*args, **kwargs)
+        except BaseException as exc:
+            self._finish(key, future, error=exc)
+            raise
+        self._finish(key, future, result)
+        return result
+
+    async def run(self, key: Hashable, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """
+        Async variant of `do` for request handlers; `fn` is synchronous and
+        runs in the threadpool.
+        return:
+            return the result of the call this one joined or led
+        """
+        future, leader = self._join(key)
+        if not leader:
+            return await asyncio.wrap_future(future)
+        try:
+            result = await run_in_threadpool(fn, *args, **kwargs)
+        except BaseException as exc:
+            self._finish(key, future, error=exc)
+            raise
+        self._finish(key, future, result)
+        return result
+
+    def coalesce(self, name: str, key: Optional[Callable[..., Hashable]] = None) -> Callable:
+        """
+        Decorator form of `do`. `key` receives the call's arguments and returns
+        the part of the key that tells calls apart (for methods, typically
+        ignoring `self`); by default all arguments are used.
+        """
+        def decorator(fn: Callable) -> Callable:
+            @functools.wraps(fn)
+            def wrapper(*args, **kwargs):
+                if key is not None:
+                    part = key(*args, **kwargs)
+                else:
+                    part = (args, tuple(sorted(kwargs.items())))
+                return self.do((name, part), fn, *args, **kwargs)
+            return wrapper
+        return decorator
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Counters per flight name.
+        return:
+            return executions (calls that ran) and coalesced (calls that joined
+            one in flight) per name, plus the number of calls in flight now
+        """
+        with self._lock:
+            return {
+                "inFlight": len(self._calls),
+                "flights": {name: dict(counters) for name, counters in self._counters.items()},
+            }
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            self._counters.clear()
@@ -8,6 +8,7 @@ from decimal import Decimal
 from app.database.db import engine, SessionLocal
 from app.database.repositories.package_repository import PackageRepository
 from app.database.repositories.clinic_repository import ClinicRepository
+from app.services import catalog_invalidation
 from sqlalchemy import text
 
 def delete_existing_packages():
@@ -135,11 +136,10 @@ def create_sample_packages():
     db = SessionLocal()
     try:
         repo = PackageRepository(db)
-        created_packages = []
+        created_packages = repo.bulk_upsert(packages_data)
+        catalog_invalidation.packages_written(package.id for package in created_packages)
         
-        for package_data in packages_data:
-            package = repo.create(**package_data)
-            created_packages.append(package)
+        for package in created_packages:
             print(f"✅ Created: {package.name} - €{package.price}")
         
         return created_packages
@@ -153,16 +153,15 @@ def assign_packages_to_all_clinics(packages):
     db = SessionLocal()
     try:
         clinic_repo = ClinicRepository(db)
-        from app.database.entities.clinic import Clinic
         
-        # Get all clinics
-        all_clinics = db.query(Clinic).all()
+        # One set-based insert for every clinic/package pair
+        clinic_count, _, _ = clinic_repo.assign_packages(
+            [package.id for package in packages],
+            replace=True,
+        )
+        catalog_invalidation.clinics_written()
         
-        for clinic in all_clinics:
-            clinic_repo.set_packages(clinic, packages)
-            print(f"✅ Assigned packages to: {clinic.title}")
-        
-        print(f"\n🎉 Successfully assigned packages to {len(all_clinics)} clinics!")
+        print(f"\n🎉 Successfully assigned packages to {clinic_count} clinics!")
         
     finally:
         db.close()
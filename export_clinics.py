@@ -4,20 +4,36 @@ Export clinics and their packages to a JSON file consumed by the frontend.
 
 This script reuses the project's SQLAlchemy session and models so that the
 output is always in sync with the API layer.
+
+Clinics are read through a server-side cursor in batches and written to the
+file as they arrive, so memory stays flat regardless of catalog size. With
+`--since`, only clinics updated after the previous export are read from the
+database and merged into the previous snapshot, which is itself streamed.
+`--gzip` writes a `.gz` twin of every file and `--shard-size` additionally
+splits the catalog into `<name>-page-<n>.json` shards. Unless disabled with
+`--no-search-index`, a prebuilt inverted index for client-side search is
+written next to the export as `<name>-search.json` (see `SearchIndexBuilder`).
 """
 
 from __future__ import annotations
 
 import argparse
+import gzip
+import heapq
 import json
-from datetime import datetime
+import os
+import re
+import textwrap
+import unicodedata
+from datetime import datetime, timedelta, timezone
 from decimal import Decimal
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import IO, Any, Callable, Dict, Iterable, Iterator, List, Optional, Set
 
+from sqlalchemy import func, select
 from sqlalchemy.orm import Session
 
-from app.database.db import SessionLocal
+from app.database.db import ReadSessionLocal
 from app.database.entities import Clinic, Package
 
 
@@ -25,6 +41,17 @@ DEFAULT_OUTPUT = (
     Path(__file__).resolve().parent / "istanbulmedic-website-fe" / "src/data/clinics.json"
 )
 
+# Export order; `_sort_key` is its mirror on serialized clinics for merging
+CLINIC_ORDER = (
+    Clinic.rating.desc().nullslast(),
+    func.coalesce(Clinic.reviews_count, 0).desc(),
+    Clinic.id,
+)
+
+# Incremental exports also re-read clinics written this long before the
+# previous export started, in case their transactions committed after it
+SINCE_OVERLAP = timedelta(minutes=5)
+
 
 def _decimal_to_number(value: Decimal | None) -> float | None:
     if value is None:
@@ -88,26 +115,400 @@ def _serialize_clinic(clinic: Clinic) -> Dict[str, Any]:
     }
 
 
-def export_clinics(session: Session) -> Dict[str, Any]:
-    clinics = (
-        session.query(Clinic)
-        .order_by(Clinic.rating.desc().nullslast(), Clinic.reviews_count.desc().nullslast())
-        .all()
-    )
+def _sort_key(clinic: Dict[str, Any]) -> tuple:
+    rating = clinic.get("rating")
+    return (rating is None, -(rating or 0.0), -int(clinic.get("reviews") or 0), clinic["id"])
+
+
+def iter_clinics(
+    session: Session,
+    *,
+    updated_after: Optional[datetime] = None,
+    updated_until: Optional[datetime] = None,
+    batch_size: int = 500,
+) -> Iterator[Dict[str, Any]]:
+    """Serialized clinics in export order, fetched `batch_size` rows at a time."""
+    statement = select(Clinic).order_by(*CLINIC_ORDER).execution_options(yield_per=batch_size)
+    if updated_after is not None:
+        statement = statement.where(Clinic.updated_at > updated_after)
+    if updated_until is not None:
+        statement = statement.where(Clinic.updated_at <= updated_until)
+
+    for partition in session.scalars(statement).partitions():
+        for clinic in partition:
+            yield _serialize_clinic(clinic)
+        # Drop the batch from the identity map so memory does not grow
+        for clinic in partition:
+            for package in clinic.packages:
+                if package in session:
+                    session.expunge(package)
+            session.expunge(clinic)
+
+
+def _open_text(path: Path) -> IO[str]:
+    if path.suffix == ".gz":
+        return gzip.open(path, "rt", encoding="utf-8")
+    return path.open("r", encoding="utf-8")
+
+
+def iter_snapshot_clinics(path: Path, chunk_size: int = 1 << 16) -> Iterator[Dict[str, Any]]:
+    """Stream the `clinics` array of a previous export one object at a time."""
+    decoder = json.JSONDecoder()
+    with _open_text(path) as handle:
+        buffer = ""
+        while True:
+            key = buffer.find('"clinics"')
+            bracket = buffer.find("[", key) if key >= 0 else -1
+            if bracket >= 0:
+                buffer = buffer[bracket + 1:]
+                break
+            chunk = handle.read(chunk_size)
+            if not chunk:
+                raise ValueError(f"{path} has no clinics array")
+            buffer += chunk
+
+        while True:
+            buffer = buffer.lstrip(" \t\r\n,")
+            if buffer.startswith("]"):
+                return
+            try:
+                clinic, end = decoder.raw_decode(buffer)
+            except json.JSONDecodeError:
+                chunk = handle.read(chunk_size)
+                if not chunk:
+                    raise
+                buffer += chunk
+                continue
+            yield clinic
+            buffer = buffer[end:]
+
+
+def read_snapshot_exported_at(path: Path) -> Optional[datetime]:
+    """`exported_at` of a previous export, read from the end of the file."""
+    with path.open("rb") as handle:
+        handle.seek(max(0, path.stat().st_size - 4096))
+        tail = handle.read().decode("utf-8", errors="ignore")
+    match = re.search(r'"exported_at":\s*"([^"]+)"', tail)
+    if not match:
+        return None
+    exported_at = datetime.fromisoformat(match.group(1))
+    if exported_at.tzinfo is None:
+        exported_at = exported_at.replace(tzinfo=timezone.utc)
+    return exported_at
+
+
+class _Sink:
+    """Writes to temporary files that replace `path` (and `path.gz`) on commit."""
+
+    def __init__(self, path: Path, gzip_copy: bool = False) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._files = []
+        targets = [path] + ([path.with_name(path.name + ".gz")] if gzip_copy else [])
+        for target in targets:
+            temporary = target.with_name(target.name + ".tmp")
+            if target.suffix == ".gz":
+                handle = gzip.open(temporary, "wt", encoding="utf-8", compresslevel=6)
+            else:
+                handle = temporary.open("w", encoding="utf-8")
+            self._files.append((target, temporary, handle))
+
+    def write(self, text: str) -> None:
+        for _, _, handle in self._files:
+            handle.write(text)
+
+    def commit(self) -> None:
+        for target, temporary, handle in self._files:
+            handle.close()
+            os.replace(temporary, target)
+
+    def abort(self) -> None:
+        for _, temporary, handle in self._files:
+            handle.close()
+            temporary.unlink(missing_ok=True)
+
+
+class _DocumentWriter:
+    """
+    Streams `{"clinics": [...], **trailer}` with the same layout as
+    json.dumps(indent=2), one clinic at a time.
+    """
+
+    def __init__(self, sink: _Sink) -> None:
+        self.sink = sink
+        self.count = 0
+        sink.write('{\n  "clinics": [')
+
+    def add(self, clinic: Dict[str, Any]) -> None:
+        body = textwrap.indent(json.dumps(clinic, indent=2, ensure_ascii=False), "    ")
+        self.sink.write(("," if self.count else "") + "\n" + body)
+        self.count += 1
+
+    def close(self, trailer: Dict[str, Any]) -> None:
+        self.sink.write("\n  ]" if self.count else "]")
+        for key, value in trailer.items():
+            self.sink.write(f",\n  {json.dumps(key)}: {json.dumps(value, ensure_ascii=False)}")
+        self.sink.write("\n}")
+        self.sink.commit()
+
+
+def _shard_path(output_path: Path, page: int) -> Path:
+    return output_path.with_name(f"{output_path.stem}-page-{page}{output_path.suffix}")
+
+
+def _remove_stale_shards(output_path: Path, pages: int) -> None:
+    pattern = re.compile(re.escape(output_path.stem) + r"-page-(\d+)" + re.escape(output_path.suffix) + r"(\.gz)?$")
+    for candidate in output_path.parent.iterdir():
+        match = pattern.match(candidate.name)
+        if match and int(match.group(1)) > pages:
+            candidate.unlink()
+
+
+def write_export(
+    clinics: Iterable[Dict[str, Any]],
+    output_path: Path,
+    *,
+    trailer: Callable[[int, int], Dict[str, Any]],
+    gzip_copy: bool = False,
+    shard_size: Optional[int] = None,
+) -> Dict[str, int]:
+    """
+    Stream clinics into `output_path` and, with `shard_size`, into page shards.
+
+    `trailer(total, pages)` returns the keys written after the clinics array.
+    Files are replaced atomically once complete.
+    """
+    document = _DocumentWriter(_Sink(output_path, gzip_copy))
+    shard: Optional[_DocumentWriter] = None
+    pages = 0
+    packages = 0
+    try:
+        for clinic in clinics:
+            document.add(clinic)
+            packages += len(clinic.get("packages") or [])
+            if shard_size:
+                if shard is None:
+                    pages += 1
+                    shard = _DocumentWriter(_Sink(_shard_path(output_path, pages), gzip_copy))
+                shard.add(clinic)
+                if shard.count >= shard_size:
+                    shard.close({"page": pages, "limit": shard_size})
+                    shard = None
+        if shard is not None:
+            shard.close({"page": pages, "limit": shard_size})
+            shard = None
+        document.close(trailer(document.count, pages or 1))
+    except BaseException:
+        document.sink.abort()
+        if shard is not None:
+            shard.sink.abort()
+        raise
+
+    if shard_size:
+        _remove_stale_shards(output_path, pages)
+    return {"total": document.count, "pages": pages or 1, "packages": packages}
 
-    payload = [_serialize_clinic(clinic) for clinic in clinics]
-    return {
-        "clinics": payload,
-        "total": len(payload),
-        "total_pages": 1,
-        "exported_at": datetime.utcnow().isoformat(),
-        "source": "postgres.clinics",
-    }
 
+# Letters without an NFKD decomposition that should still fold to ASCII
+_FOLD = str.maketrans({"ı": "i", "ß": "ss", "ø": "o", "æ": "ae", "œ": "oe", "ł": "l", "đ": "d"})
+_TOKEN = re.compile(r"[a-z0-9]+")
 
-def save_to_json(data: Dict[str, Any], output_path: Path) -> None:
-    output_path.parent.mkdir(parents=True, exist_ok=True)
-    output_path.write_text(json.dumps(data, indent=2, ensure_ascii=False), encoding="utf-8")
+SEARCH_INDEX_VERSION = 1
+SEARCH_FIELDS = ("name", "city", "country", "categories")
+FACET_FIELDS = {"country": "country", "city": "city", "categories": "categories", "hasContract": "hasContract"}
+
+
+def tokenize(value: Any) -> List[str]:
+    """
+    Lower-case, accent-folded alphanumeric runs of a value (lists are flattened).
+    The frontend must apply the same steps to the query: NFKD, drop combining
+    marks, lower-case, fold ı/ß/ø/æ/œ/ł/đ, split on anything not [a-z0-9].
+    """
+    if value is None:
+        return []
+    if isinstance(value, (list, tuple)):
+        return [token for item in value for token in tokenize(item)]
+    text = unicodedata.normalize("NFKD", str(value))
+    text = "".join(char for char in text if not unicodedata.combining(char))
+    return _TOKEN.findall(text.lower().translate(_FOLD))
+
+
+def _delta_encode(ordinals: List[int]) -> List[int]:
+    previous = 0
+    encoded = []
+    for ordinal in ordinals:
+        encoded.append(ordinal - previous)
+        previous = ordinal
+    return encoded
+
+
+def decode_postings(deltas: List[int]) -> List[int]:
+    """Inverse of the delta encoding used for every postings list."""
+    ordinals = []
+    running = 0
+    for delta in deltas:
+        running += delta
+        ordinals.append(running)
+    return ordinals
+
+
+class SearchIndexBuilder:
+    """
+    Builds the static search index shipped next to the clinic export.
+
+    Documents are numbered by their position in the export's `clinics` array
+    (and so in its page shards: page = ordinal // shardSize + 1). The file is
+    compact JSON:
+
+        {
+          "version": 1, "exportedAt": "...", "docs": 2, "shardSize": null,
+          "terms": ["clinic", "istanbul", ...],        # sorted, for prefix search
+          "postings": [[0, 1], [1], ...],              # parallel to terms
+          "facets": {"country": {"Turkey": [0, 1]}, "city": {...},
+                     "categories": {...}, "hasContract": {"true": [1]}}
+        }
+
+    Postings are ascending ordinals, delta encoded (`[3, 2, 5]` means 3, 5, 10).
+    A query is tokenized like the indexed fields; each query token matches the
+    terms it prefixes (binary search on `terms`), and the token results are
+    intersected, optionally with facet postings.
+    """
+
+    def __init__(self) -> None:
+        self.docs = 0
+        self._terms: Dict[str, List[int]] = {}
+        self._facets: Dict[str, Dict[str, List[int]]] = {name: {} for name in FACET_FIELDS}
+
+    def add(self, clinic: Dict[str, Any]) -> None:
+        ordinal = self.docs
+        self.docs += 1
+        for token in {token for field in SEARCH_FIELDS for token in tokenize(clinic.get(field))}:
+            self._terms.setdefault(token, []).append(ordinal)
+        for facet, field in FACET_FIELDS.items():
+            values = clinic.get(field)
+            if not isinstance(values, list):
+                values = [values]
+            for value in dict.fromkeys(values):
+                if value is None or value == "":
+                    continue
+                label = json.dumps(value) if isinstance(value, bool) else str(value)
+                self._facets[facet].setdefault(label, []).append(ordinal)
+
+    def feed(self, clinics: Iterable[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+        """Pass clinics through unchanged while indexing them in order."""
+        for clinic in clinics:
+            self.add(clinic)
+            yield clinic
+
+    def to_dict(self, *, exported_at: Optional[str] = None, shard_size: Optional[int] = None) -> Dict[str, Any]:
+        terms = sorted(self._terms)
+        return {
+            "version": SEARCH_INDEX_VERSION,
+            "exportedAt": exported_at,
+            "docs": self.docs,
+            "shardSize": shard_size,
+            "terms": terms,
+            "postings": [_delta_encode(self._terms[term]) for term in terms],
+            "facets": {
+                facet: {label: _delta_encode(ordinals) for label, ordinals in sorted(values.items())}
+                for facet, values in self._facets.items()
+            },
+        }
+
+    def write(self, path: Path, *, gzip_copy: bool = False, **metadata: Any) -> int:
+        """Write the index atomically; returns the number of distinct terms."""
+        index = self.to_dict(**metadata)
+        sink = _Sink(path, gzip_copy)
+        try:
+            sink.write(json.dumps(index, ensure_ascii=False, separators=(",", ":")))
+        except BaseException:
+            sink.abort()
+            raise
+        sink.commit()
+        return len(index["terms"])
+
+
+def search_index_path(output_path: Path) -> Path:
+    return output_path.with_name(f"{output_path.stem}-search{output_path.suffix}")
+
+
+def export_clinics(
+    session: Session,
+    output_path: Path,
+    *,
+    since: Optional[datetime | str] = None,
+    gzip_copy: bool = False,
+    shard_size: Optional[int] = None,
+    batch_size: int = 500,
+    search_index: bool = True,
+) -> Dict[str, int]:
+    """
+    Export the catalog to `output_path`, plus its static search index.
+
+    `since` (a datetime, or "auto" for the previous export's `exported_at`)
+    turns on incremental mode: only clinics updated after it are loaded and
+    merged into the existing snapshot, deleted clinics are dropped, and the
+    rest are copied over from the snapshot without touching the database.
+    """
+    exported_at = session.scalar(select(func.now()))
+    previous = output_path if output_path.exists() else None
+    if since == "auto":
+        since = read_snapshot_exported_at(previous) if previous else None
+
+    incremental = since is not None and previous is not None
+    if incremental:
+        if since.tzinfo is None:
+            since = since.replace(tzinfo=timezone.utc)
+        updated_after = since - SINCE_OVERLAP
+        changed_ids: Set[str] = {
+            str(clinic_id)
+            for clinic_id in session.scalars(
+                select(Clinic.id).where(
+                    Clinic.updated_at > updated_after,
+                    Clinic.updated_at <= exported_at,
+                )
+            )
+        }
+        live_ids = {str(clinic_id) for clinic_id in session.scalars(select(Clinic.id))}
+        kept = (
+            clinic
+            for clinic in iter_snapshot_clinics(previous)
+            if clinic["id"] in live_ids and clinic["id"] not in changed_ids
+        )
+        changed = iter_clinics(
+            session,
+            updated_after=updated_after,
+            updated_until=exported_at,
+            batch_size=batch_size,
+        )
+        clinics: Iterable[Dict[str, Any]] = heapq.merge(kept, changed, key=_sort_key)
+    else:
+        changed_ids = set()
+        clinics = iter_clinics(session, batch_size=batch_size)
+
+    builder = SearchIndexBuilder() if search_index else None
+    if builder is not None:
+        clinics = builder.feed(clinics)
+    stats = write_export(
+        clinics,
+        output_path,
+        trailer=lambda total, pages: {
+            "total": total,
+            "total_pages": pages,
+            "exported_at": exported_at.isoformat(),
+            "source": "postgres.clinics",
+        },
+        gzip_copy=gzip_copy,
+        shard_size=shard_size,
+    )
+    stats["changed"] = len(changed_ids) if incremental else stats["total"]
+    if builder is not None:
+        stats["terms"] = builder.write(
+            search_index_path(output_path),
+            gzip_copy=gzip_copy,
+            exported_at=exported_at.isoformat(),
+            shard_size=shard_size,
+        )
+    return stats
 
 
 def get_output_path(arg_value: str | None) -> Path:
@@ -116,6 +517,15 @@ def get_output_path(arg_value: str | None) -> Path:
     return DEFAULT_OUTPUT
 
 
+def _parse_since(value: str) -> datetime | str:
+    if value == "auto":
+        return value
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError as exc:
+        raise argparse.ArgumentTypeError(f"invalid --since timestamp: {value}") from exc
+
+
 def main() -> None:
     parser = argparse.ArgumentParser(description="Export clinics to JSON for the frontend.")
     parser.add_argument(
@@ -124,22 +534,54 @@ def main() -> None:
         dest="output",
         help="Optional output path. Defaults to istanbulmedic-website-fe/src/data/clinics.json",
     )
+    parser.add_argument(
+        "--since",
+        nargs="?",
+        const="auto",
+        type=_parse_since,
+        help="Only re-export clinics updated after this ISO timestamp (default: the previous export) "
+        "and merge them into the existing output",
+    )
+    parser.add_argument("--gzip", action="store_true", help="Also write a gzip-compressed copy of every file")
+    parser.add_argument(
+        "--shard-size",
+        type=int,
+        default=None,
+        help="Also write <name>-page-<n>.json shards of this many clinics",
+    )
+    parser.add_argument("--batch-size", type=int, default=500, help="Rows fetched per database round trip")
+    parser.add_argument(
+        "--search-index",
+        action=argparse.BooleanOptionalAction,
+        default=True,
+        help="Write the prebuilt <name>-search.json index for client-side search (default: on)",
+    )
     args = parser.parse_args()
+    if args.shard_size is not None and args.shard_size < 1:
+        parser.error("--shard-size must be positive")
 
-    session = SessionLocal()
+    session = ReadSessionLocal()
     try:
         print("🚀 Exporting clinics...")
-        payload = export_clinics(session)
         output_path = get_output_path(args.output)
-        save_to_json(payload, output_path)
-        print(f"✅ Exported {payload['total']} clinics to {output_path}")
-        print(f"   Packages included for {sum(len(c['packages']) for c in payload['clinics'])} entries.")
+        stats = export_clinics(
+            session,
+            output_path,
+            since=args.since,
+            gzip_copy=args.gzip,
+            shard_size=args.shard_size,
+            batch_size=args.batch_size,
+            search_index=args.search_index,
+        )
+        print(f"✅ Exported {stats['total']} clinics to {output_path} ({stats['changed']} re-read from the database)")
+        print(f"   Packages included for {stats['packages']} entries.")
+        if args.shard_size:
+            print(f"   Wrote {stats['pages']} page shard(s) of up to {args.shard_size} clinics.")
+        if args.search_index:
+            print(f"   Search index with {stats['terms']} terms at {search_index_path(output_path)}")
     finally:
         session.close()
 
 
 if __name__ == "__main__":
     main()
-
-
-
@@ -0,0 +1,698 @@
+#!/usr/bin/env python3
+"""
+Generate a large, deterministic synthetic dataset and bulk-load it with COPY.
+
+Fills users, messages, conversation_states, patient_profiles,
+medical_backgrounds, appointment (consultations), consultant_notes, clinics,
+packages and clinic_packages so that pagination, search and index changes can
+be benchmarked at realistic scale. The same `--seed` and sizes always produce
+the same rows: entity ids are derived from (seed, kind, index), so tables can
+be generated independently and still reference each other.
+
+Distributions aim for the shapes that cause scaling cliffs rather than
+averages: message counts per user are Pareto (most users send a handful, a
+few send thousands), sign-ups cluster around campaign bursts on a growth
+curve with a daily rhythm, messages arrive in sessions of quick exchanges,
+and packages are priced in several currencies with Zipf-distributed
+popularity across clinics.
+
+Usage:
+    python generate_dataset.py --users 1000000 --clinics 50000 --truncate
+    python generate_dataset.py --users 20000 --schema loadtest --seed 7
+"""
+
+from __future__ import annotations
+
+import argparse
+import bisect
+import json
+import random
+import re
+import time
+import uuid
+import zlib
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from itertools import accumulate
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+
+from app.database.db import engine
+from app.database.entities.base import Base
+import app.database.entities  # noqa: F401 - registers every table on Base.metadata
+from app.models.enums import Gender, SchedulingStep
+from app.services import fx_rates
+from app.utils.opening_hours_utils import OpeningHoursUtils
+
+
+_MASK64 = (1 << 64) - 1
+
+# Share of users with a patient profile, of profiles with a medical
+# background, and of profile-less users who chatted anonymously from the web
+PROFILE_SHARE = 0.6
+MEDICAL_SHARE = 0.7
+DEVICE_CHAT_SHARE = 0.5
+
+# Pareto shape of messages per user; closer to 1 means a heavier tail
+MESSAGE_TAIL = 1.2
+MAX_MESSAGES_PER_USER = 5000
+
+# Share of sign-ups that belong to a campaign burst rather than organic growth
+BURST_SHARE = 0.35
+BURSTS = 12
+
+# Relative sign-up / message volume per UTC hour
+_HOURLY_WEIGHTS = [2, 1, 1, 1, 1, 2, 3, 5, 7, 9, 10, 10, 9, 9, 10, 10, 9, 9, 10, 11, 11, 9, 6, 4]
+_HOURLY_CUMULATIVE = list(accumulate(_HOURLY_WEIGHTS))
+
+# (country, country code, city, lat, lng, weight)
+_CITIES = [
+    ("Turkey", "TR", "Istanbul", 41.0082, 28.9784, 40),
+    ("Turkey", "TR", "Izmir", 38.4237, 27.1428, 6),
+    ("Turkey", "TR", "Antalya", 36.8969, 30.7133, 6),
+    ("Turkey", "TR", "Ankara", 39.9334, 32.8597, 4),
+    ("Spain", "ES", "Madrid", 40.4168, -3.7038, 5),
+    ("Spain", "ES", "Barcelona", 41.3874, 2.1686, 4),
+    ("Hungary", "HU", "Budapest", 47.4979, 19.0402, 4),
+    ("Poland", "PL", "Warsaw", 52.2297, 21.0122, 3),
+    ("Georgia", "GE", "Tbilisi", 41.7151, 44.8271, 4),
+    ("United Arab Emirates", "AE", "Dubai", 25.2048, 55.2708, 4),
+    ("Thailand", "TH", "Bangkok", 13.7563, 100.5018, 4),
+    ("Mexico", "MX", "Mexico City", 19.4326, -99.1332, 4),
+    ("Colombia", "CO", "Bogota", 4.7110, -74.0721, 3),
+    ("United Kingdom", "GB", "London", 51.5072, -0.1276, 3),
+    ("Germany", "DE", "Berlin", 52.5200, 13.4050, 2),
+]
+_CITY_CUMULATIVE = list(accumulate(city[-1] for city in _CITIES))
+
+_CATEGORIES = [
+    ("Hair Transplant Clinic", 50),
+    ("Cosmetic Surgeon", 15),
+    ("Plastic Surgery Clinic", 12),
+    ("Dermatologist", 10),
+    ("Medical Clinic", 8),
+    ("Dental Clinic", 5),
+]
+
+_OPENING_HOURS = [
+    None,
+    {day: "9:00 AM - 6:00 PM" for day in ("monday", "tuesday", "wednesday", "thursday", "friday")}
+    | {"saturday": "10 AM - 2 PM", "sunday": "Closed"},
+    {"Mon-Sat": "08:30-20:00", "Sun": "Closed"},
+    {"monday": "Open 24 hours", "tuesday": "Open 24 hours", "wednesday": "Open 24 hours",
+     "thursday": "Open 24 hours", "friday": "Open 24 hours", "saturday": "Open 24 hours",
+     "sunday": "Open 24 hours"},
+    {"Mon-Fri": "10 AM - 7 PM", "saturday": "11-3 PM"},
+]
+_OPENING_HOURS_WEIGHTS = [10, 45, 25, 5, 15]
+
+# (currency, share of packages)
+_CURRENCIES = [("EUR", 40), ("USD", 30), ("TRY", 20), ("GBP", 10)]
+
+# (name, grafts, method, median price in the FX base currency)
+_PACKAGE_TIERS = [
+    ("Basic Program", "2000", "FUE Transplant Method", 2200),
+    ("Standard Program", "3000", "DHI Transplant Method", 3500),
+    ("Premium Program", "4000", "DHI Transplant Method", 5200),
+    ("Advanced Treatment Program", "Unlimited", "Sapphire FUE", 7800),
+]
+
+_FIRST_NAMES = ["Ahmet", "Mehmet", "John", "James", "Lukas", "Jonas", "Carlos", "Javier", "Ali", "Omar",
+                "Emma", "Sofia", "Laura", "Hans", "Pierre", "Marco", "Daniel", "David", "Can", "Emre"]
+_LAST_NAMES = ["Yilmaz", "Kaya", "Smith", "Brown", "Müller", "Schmidt", "Garcia", "Martinez", "Rossi",
+               "Dubois", "Khan", "Hassan", "Novak", "Kowalski", "Demir", "Jones", "Weber", "Lopez"]
+_CLINIC_WORDS = ["Estetik", "Hair", "Clinic", "Medical", "Center", "Capilar", "Transplant", "Health",
+                 "Aesthetic", "Istanbul", "Premium", "Vita", "Derma", "Polyclinic", "Plus", "Care"]
+_INCOMING = [
+    "Hi, I'm interested in a hair transplant",
+    "How much does a FUE procedure cost?",
+    "Do you have availability next month?",
+    "Hallo, ich hätte gern ein Angebot",
+    "Hola, ¿cuánto cuesta el tratamiento?",
+    "Can I send you photos of my hairline?",
+    "Is the hotel included in the package?",
+    "ok thanks",
+]
+_OUTGOING = [
+    "Thanks for reaching out! How long have you been experiencing hair loss?",
+    "Our packages start from 2000 grafts. Would you like a free consultation?",
+    "Could you share a few photos of the affected areas?",
+    "I've booked your consultation, you'll receive a confirmation email shortly.",
+    "Here are three clinics that match your preferences.",
+]
+_MEDICAL_VALUES = {
+    "chronic_illnesses": ["diabetes", "hypertension", "asthma", "thyroid disorder"],
+    "current_medications": ["finasteride", "minoxidil", "metformin", "ibuprofen"],
+    "allergies": ["penicillin", "latex", "lidocaine", "pollen"],
+    "surgeries": ["appendectomy", "knee surgery", "hair transplant"],
+    "heart_conditions": ["arrhythmia"],
+    "contagious_diseases": ["hepatitis b"],
+    "hair_loss_locations": ["crown", "hairline", "top"],
+    "previous_treatments": ["PRP", "laser therapy", "mesotherapy"],
+}
+_CONSULTANTS = [("Dr. Aylin Demir", "aylin@istanbulmedic.com"), ("Dr. Marc Weber", "marc@istanbulmedic.com"),
+                ("Elif Kaya", "elif@istanbulmedic.com"), ("Sam Carter", "sam@istanbulmedic.com")]
+_CONSULTATION_STATUSES = [("completed", 55), ("scheduled", 20), ("cancelled", 15), ("no_show", 10)]
+_NOTE_TYPES = [("general", 50), ("medical", 25), ("follow_up", 25)]
+_STEP_WEIGHTS = [
+    (SchedulingStep.INITIAL_CONTACT.value, 30),
+    (SchedulingStep.BASIC_INFO.value, 25),
+    (SchedulingStep.CONSULTATION_SCHEDULING.value, 20),
+    (SchedulingStep.ADDITIONAL_INFO.value, 10),
+    (SchedulingStep.CLOSURE.value, 15),
+]
+
+_NEEDS_ESCAPE = re.compile(r"[\\\t\n\r]")
+_COPY_ESCAPES = str.maketrans({"\\": "\\\\", "\t": "\\t", "\n": "\\n", "\r": "\\r"})
+
+
+@dataclass(frozen=True)
+class DatasetSpec:
+    """Sizes and seed of a generated dataset; equal specs give identical rows."""
+
+    users: int = 100_000
+    clinics: int = 10_000
+    packages: int = 500
+    seed: int = 42
+    mean_messages: float = 12.0
+    start: datetime = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    days: int = 365
+
+
+def _mix64(value: int) -> int:
+    """SplitMix64 finalizer: a cheap, well-spread 64-bit hash."""
+    value = (value + 0x9E3779B97F4A7C15) & _MASK64
+    value = ((value ^ (value >> 30)) * 0xBF58476D1CE4E5B9) & _MASK64
+    value = ((value ^ (value >> 27)) * 0x94D049BB133111EB) & _MASK64
+    return value ^ (value >> 31)
+
+
+def _weighted(cumulative: Sequence[float], unit: float) -> int:
+    """Index picked by `unit` in [0, 1) from cumulative weights."""
+    return bisect.bisect_right(cumulative, unit * cumulative[-1])
+
+
+def _json(value: Any) -> str:
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+
+
+def copy_value(value: Any) -> str:
+    """One field in Postgres COPY text format; lists become arrays, JSON must be pre-encoded."""
+    if value is None:
+        return "\\N"
+    kind = type(value)
+    if kind is str:
+        return value.translate(_COPY_ESCAPES) if _NEEDS_ESCAPE.search(value) else value
+    if kind is bool:
+        return "t" if value else "f"
+    if kind is datetime:
+        return value.isoformat()
+    if kind is bytes:
+        return "\\\\x" + value.hex()
+    if kind is list:
+        return "{" + ",".join(str(item) for item in value) + "}"
+    return str(value)
+
+
+class DatasetGenerator:
+    """
+    Deterministic row generators, one per table, yielding tuples in the
+    order of `TABLES[table]`.
+
+    Everything another table depends on (ids, which users have profiles, how
+    many consultations a profile has, clinic package choices) is a pure
+    function of (seed, kind, index); everything else comes from a
+    `random.Random` seeded per table.
+    """
+
+    TABLES: Dict[str, Tuple[str, ...]] = {
+        "users": ("id", "phone_number", "name", "created_at"),
+        "patient_profiles": (
+            "id", "user_id", "name", "phone", "email", "location", "age", "gender",
+            "clinic_offer_ids", "created_at", "updated_at", "deleted",
+        ),
+        "medical_backgrounds": (
+            "id", "patient_profile_id", "medical_data", "booking_uid", "created_at", "updated_at", "deleted",
+        ),
+        "conversation_states": (
+            "id", "patient_profile_id", "device_id", "current_step", "last_activity", "active_agent",
+            "locked_at", "openai_conversation_id", "session_ttl", "created_at", "updated_at", "deleted",
+        ),
+        "messages": ("id", "user_id", "direction", "body", "media_url", "created_at"),
+        "packages": (
+            "id", "name", "description", "price", "currency", "is_active", "created_at", "updated_at",
+            "grafts_count", "hair_transplantation_method", "stem_cell_therapy_sessions",
+            "airport_lounge_access_included", "breakfast_included", "hotel_name", "hotel_nights_included",
+            "hotel_star_rating", "private_translator_included", "laser_sessions", "oxygen_therapy_sessions",
+            "post_operation_medication_included", "prp_sessions_included", "sedation_included",
+        ),
+        "clinics": (
+            "id", "place_id", "title", "address", "country_code", "rating", "reviews_count", "lat", "lng",
+            "categories", "phone", "website", "opening_hours", "opening_hours_bitmap", "timezone", "country",
+            "city", "created_at", "updated_at", "has_contract", "package_ids",
+        ),
+        "clinic_packages": ("clinic_id", "package_id", "assigned_at"),
+        "appointment": (
+            "id", "createdAt", "updatedAt", "zoomMeetingId", "topic", "status", "attendeeName",
+            "attendeeEmail", "rawPayload", "hostName", "hostEmail", "patient_profile_id", "hostId",
+            "startTime", "duration", "timezone", "joinUrl", "attendeePhone",
+        ),
+        "consultant_notes": (
+            "id", "createdAt", "updatedAt", "patient_profile_id", "consultant_email", "note_content",
+            "consultation_id", "note_type", "is_private",
+        ),
+    }
+
+    def __init__(self, spec: DatasetSpec) -> None:
+        self.spec = spec
+        self._bursts = sorted(self.unit("burst", index) * spec.days for index in range(BURSTS))
+        self._rates = fx_rates.load_rates_file()
+        self._package_cumulative = list(accumulate(1 / (rank + 1) for rank in range(spec.packages)))
+        self._opening_hours_cumulative = list(accumulate(_OPENING_HOURS_WEIGHTS))
+        self._schedules: Dict[Tuple[int, str], Tuple[Optional[bytes], str]] = {}
+
+    # ------------------------------------------------------------ primitives
+
+    def _key(self, kind: str, index: int) -> int:
+        salt = zlib.crc32(kind.encode("utf-8"))
+        return _mix64(((self.spec.seed & 0xFFFFFFFF) << 32 | salt) ^ _mix64(index))
+
+    def unit(self, kind: str, index: int) -> float:
+        """Uniform float in [0, 1) fixed by (seed, kind, index)."""
+        return self._key(kind, index) / 2 ** 64
+
+    def entity_id(self, kind: str, index: int) -> uuid.UUID:
+        """Random-looking version 4 UUID fixed by (seed, kind, index)."""
+        key = self._key(kind, index)
+        return uuid.UUID(int=key << 64 | _mix64(key), version=4)
+
+    def _rng(self, table: str) -> random.Random:
+        return random.Random(f"{self.spec.seed}:{table}")
+
+    def _at(self, day: float, hour_unit: float) -> datetime:
+        """`day` days into the window, moved to an hour drawn from the daily rhythm."""
+        hour = _weighted(_HOURLY_CUMULATIVE, hour_unit)
+        minute = (hour_unit * 24 * 60 * 37) % 60
+        return self.spec.start + timedelta(days=int(day), hours=hour, minutes=minute)
+
+    def signup_at(self, user: int) -> datetime:
+        """Bursty sign-up time: campaign spikes on top of a growth curve."""
+        roll = self.unit("signup", user)
+        if roll < BURST_SHARE:
+            burst = self._bursts[int(roll / BURST_SHARE * BURSTS)]
+            day = min(self.spec.days - 1, burst + 3 * self.unit("signup-decay", user) ** 4)
+        else:
+            day = self.spec.days * ((roll - BURST_SHARE) / (1 - BURST_SHARE)) ** 0.5
+        return self._at(day, self.unit("signup-hour", user))
+
+    def has_profile(self, user: int) -> bool:
+        return self.unit("profile", user) < PROFILE_SHARE
+
+    def consultation_count(self, user: int) -> int:
+        roll = self.unit("consultations", user)
+        return 0 if roll < 0.65 else 1 if roll < 0.9 else 2 if roll < 0.97 else 3
+
+    def consultation_id(self, user: int, number: int) -> str:
+        return self.entity_id("consultation", user * 4 + number).hex
+
+    def consultation_start(self, user: int, number: int) -> datetime:
+        days = 2 + 60 * self.unit("consultation-delay", user * 4 + number) ** 2 + 30 * number
+        start = self.signup_at(user) + timedelta(days=days)
+        return start.replace(minute=(start.minute // 30) * 30, second=0, microsecond=0)
+
+    def clinic_package_indexes(self, clinic: int) -> List[int]:
+        """Packages offered by a clinic, most popular packages most often."""
+        roll = self.unit("clinic-package-count", clinic)
+        count = 0 if roll < 0.2 else 1 + int(7 * (roll - 0.2) / 0.8)
+        chosen: List[int] = []
+        for slot in range(min(count, self.spec.packages)):
+            index = _weighted(self._package_cumulative, self.unit("clinic-package", clinic * 16 + slot))
+            if index < self.spec.packages and index not in chosen:
+                chosen.append(index)
+        return chosen
+
+    def _schedule(self, template: int, country: str, lng: float) -> Tuple[Optional[bytes], str]:
+        cached = self._schedules.get((template, country))
+        if cached is None:
+            hours = _OPENING_HOURS[template]
+            cached = (OpeningHoursUtils.parse(hours), OpeningHoursUtils.resolve_timezone(hours, country, lng))
+            self._schedules[(template, country)] = cached
+        return cached
+
+    # ------------------------------------------------------------ tables
+
+    def rows(self, table: str) -> Iterator[tuple]:
+        return getattr(self, f"_{table}")()
+
+    def _users(self) -> Iterator[tuple]:
+        rng = self._rng("users")
+        for user in range(self.spec.users):
+            name = None if rng.random() < 0.3 else f"{rng.choice(_FIRST_NAMES)} {rng.choice(_LAST_NAMES)}"
+            yield (self.entity_id("user", user), f"+{90 + user % 9}5{user:010d}", name, self.signup_at(user))
+
+    def _patient_profiles(self) -> Iterator[tuple]:
+        rng = self._rng("patient_profiles")
+        genders = [Gender.MALE.name] * 8 + [Gender.FEMALE.name] + [Gender.OTHER.name, None]
+        for user in range(self.spec.users):
+            if not self.has_profile(user):
+                continue
+            first, last = rng.choice(_FIRST_NAMES), rng.choice(_LAST_NAMES)
+            city = _CITIES[_weighted(_CITY_CUMULATIVE, rng.random())]
+            created = (self.signup_at(user) + timedelta(minutes=rng.expovariate(1 / 30))).replace(tzinfo=None)
+            offers = [
+                self.entity_id("clinic", rng.randrange(self.spec.clinics))
+                for _ in range(rng.choice((0, 0, 1, 3)) if self.spec.clinics else 0)
+            ]
+            yield (
+                self.entity_id("patient_profile", user), self.entity_id("user", user), f"{first} {last}",
+                f"+{90 + user % 9}5{user:010d}", f"{first}.{last}.{user}@example.com".lower(),
+                f"{city[2]}, {city[0]}" if rng.random() < 0.6 else None,
+                int(rng.triangular(22, 65, 35)) if rng.random() < 0.8 else None,
+                rng.choice(genders), offers, created, created + timedelta(days=rng.expovariate(1 / 5)), False,
+            )
+
+    def _medical_backgrounds(self) -> Iterator[tuple]:
+        rng = self._rng("medical_backgrounds")
+        for user in range(self.spec.users):
+            if not self.has_profile(user) or self.unit("medical", user) >= MEDICAL_SHARE:
+                continue
+            data: Dict[str, Any] = {
+                field: rng.sample(values, k=min(len(values), int(rng.expovariate(1.5))))
+                for field, values in _MEDICAL_VALUES.items()
+            }
+            data["hair_loss_start"] = rng.choice(["1 year ago", "3 years ago", "5+ years ago", None])
+            data["family_history"] = rng.random() < 0.6
+            created = (self.signup_at(user) + timedelta(hours=rng.expovariate(1 / 48))).replace(tzinfo=None)
+            booking_uid = self.consultation_id(user, 0) if self.consultation_count(user) else None
+            yield (
+                self.entity_id("medical_background", user), self.entity_id("patient_profile", user),
+                _json(data), booking_uid, created, created, False,
+            )
+
+    def _conversation_states(self) -> Iterator[tuple]:
+        rng = self._rng("conversation_states")
+        steps = list(accumulate(weight for _, weight in _STEP_WEIGHTS))
+        for user in range(self.spec.users):
+            profiled = self.has_profile(user)
+            if not profiled and self.unit("device", user) >= DEVICE_CHAT_SHARE:
+                continue
+            for session in range(1 + int(rng.random() < 0.15)):
+                created = (self.signup_at(user) + timedelta(days=30 * session * rng.random())).replace(tzinfo=None)
+                last_activity = created + timedelta(minutes=rng.expovariate(1 / 45))
+                locked = rng.random() < 0.02
+                yield (
+                    self.entity_id("conversation_state", user * 2 + session),
+                    self.entity_id("patient_profile", user) if profiled else None,
+                    None if profiled else f"web-{self.entity_id('device', user).hex[:16]}",
+                    _STEP_WEIGHTS[_weighted(steps, rng.random())][0], last_activity,
+                    "manager" if locked else None, last_activity if locked else None,
+                    f"conv_{self.entity_id('openai', user * 2 + session).hex}" if rng.random() < 0.7 else None,
+                    86400, created, last_activity, False,
+                )
+
+    def _messages(self) -> Iterator[tuple]:
+        rng = self._rng("messages")
+        scale = self.spec.mean_messages * (MESSAGE_TAIL - 1) / MESSAGE_TAIL
+        for user in range(self.spec.users):
+            count = min(MAX_MESSAGES_PER_USER, int(scale * rng.paretovariate(MESSAGE_TAIL)))
+            user_id = self.entity_id("user", user)
+            at = self.signup_at(user)
+            sent = 0
+            while sent < count:
+                # Sessions of quick back-and-forth, days apart
+                session = min(count - sent, 1 + int(rng.expovariate(1 / 6)))
+                for position in range(session):
+                    incoming = position % 2 == 0
+                    at += timedelta(seconds=rng.expovariate(1 / 90) if incoming else 2 + rng.expovariate(1 / 6))
+                    media = "https://media.example.com/" + uuid.UUID(int=rng.getrandbits(128)).hex \
+                        if incoming and rng.random() < 0.03 else None
+                    yield (
+                        uuid.UUID(int=rng.getrandbits(128), version=4), user_id,
+                        "incoming" if incoming else "outgoing",
+                        rng.choice(_INCOMING if incoming else _OUTGOING), media, at,
+                    )
+                sent += session
+                at += timedelta(days=rng.expovariate(1 / 3))
+
+    def _packages(self) -> Iterator[tuple]:
+        rng = self._rng("packages")
+        currencies = list(accumulate(weight for _, weight in _CURRENCIES))
+        for package in range(self.spec.packages):
+            tier = package % len(_PACKAGE_TIERS)
+            name, grafts, method, median = _PACKAGE_TIERS[tier]
+            currency = _CURRENCIES[_weighted(currencies, rng.random())][0]
+            base_price = median * rng.lognormvariate(0, 0.25)
+            rate = float(self._rates.get(currency, 1))
+            step = 50 if rate > 0.5 else 1000
+            price = max(step, round(base_price / rate / step) * step)
+            created = self.spec.start + timedelta(days=self.spec.days * rng.random())
+            yield (
+                self.entity_id("package", package), f"{name} #{package // len(_PACKAGE_TIERS) + 1}",
+                f"{grafts} grafts, {method}", f"{price}.00", currency, rng.random() < 0.92, created,
+                created + timedelta(days=rng.expovariate(1 / 20)), grafts, method, int(tier >= 2),
+                tier >= 2, tier >= 1, f"Hotel {rng.choice(_LAST_NAMES)}", 2 + tier, 3 + min(tier, 2),
+                tier >= 2, tier, int(tier >= 2), True, tier >= 2, True,
+            )
+
+    def _clinics(self) -> Iterator[tuple]:
+        rng = self._rng("clinics")
+        categories = [name for name, _ in _CATEGORIES]
+        category_weights = [weight for _, weight in _CATEGORIES]
+        for clinic in range(self.spec.clinics):
+            country, code, city, lat, lng, _ = _CITIES[_weighted(_CITY_CUMULATIVE, rng.random())]
+            lat, lng = lat + rng.gauss(0, 0.05), lng + rng.gauss(0, 0.05)
+            template = _weighted(self._opening_hours_cumulative, rng.random())
+            bitmap, zone = self._schedule(template, country, lng)
+            rated = rng.random() < 0.85
+            created = self.spec.start + timedelta(days=self.spec.days * rng.random() ** 2)
+            package_ids = [self.entity_id("package", index) for index in self.clinic_package_indexes(clinic)]
+            yield (
+                self.entity_id("clinic", clinic), f"place-{self.entity_id('place', clinic).hex[:20]}",
+                " ".join(rng.sample(_CLINIC_WORDS, k=rng.randint(2, 4))) + f" {city}",
+                f"{rng.randint(1, 250)} {rng.choice(_LAST_NAMES)} Cd., {city}", code,
+                round(min(5.0, rng.betavariate(8, 1.5) * 5), 1) if rated else None,
+                int(rng.paretovariate(1.1) * 5) if rated else None, round(lat, 6), round(lng, 6),
+                _json(sorted(set(rng.choices(categories, weights=category_weights, k=rng.randint(1, 3))))),
+                f"+{rng.randint(1, 99)} {rng.randint(200, 999)} {rng.randint(1000000, 9999999)}",
+                f"https://clinic{clinic}.example.com" if rng.random() < 0.7 else None,
+                _json(_OPENING_HOURS[template]) if _OPENING_HOURS[template] else None, bitmap, zone,
+                country, city, created, created + timedelta(days=rng.expovariate(1 / 30)),
+                rng.random() < 0.15, package_ids,
+            )
+
+    def _clinic_packages(self) -> Iterator[tuple]:
+        rng = self._rng("clinic_packages")
+        for clinic in range(self.spec.clinics):
+            assigned = self.spec.start + timedelta(days=self.spec.days * rng.random())
+            clinic_id = self.entity_id("clinic", clinic)
+            # assigned_at increases in choice order so the package_ids mirror keeps that order
+            for position, index in enumerate(self.clinic_package_indexes(clinic)):
+                yield clinic_id, self.entity_id("package", index), assigned + timedelta(seconds=position)
+
+    def _appointment(self) -> Iterator[tuple]:
+        rng = self._rng("appointment")
+        statuses = list(accumulate(weight for _, weight in _CONSULTATION_STATUSES))
+        for user in range(self.spec.users):
+            if not self.has_profile(user):
+                continue
+            for number in range(self.consultation_count(user)):
+                booking = self.consultation_id(user, number)
+                start = self.consultation_start(user, number).replace(tzinfo=None)
+                host_name, host_email = rng.choice(_CONSULTANTS)
+                meeting = str(80_000_000_000 + self._key("zoom", user * 4 + number) % 10_000_000_000)
+                created = start - timedelta(days=1 + rng.expovariate(1 / 7))
+                payload = {"uid": booking, "type": "hair-consultation", "length": 30}
+                yield (
+                    booking, created, created, meeting, "Hair Transplant Consultation",
+                    _CONSULTATION_STATUSES[_weighted(statuses, rng.random())][0],
+                    f"Patient {user}", f"patient.{user}@example.com", _json(payload), host_name, host_email,
+                    self.entity_id("patient_profile", user), host_email, start, 30,
+                    rng.choice(["Europe/Istanbul", "Europe/London", "Europe/Berlin", "America/New_York"]),
+                    f"https://zoom.us/j/{meeting}", f"+{90 + user % 9}5{user:010d}",
+                )
+
+    def _consultant_notes(self) -> Iterator[tuple]:
+        rng = self._rng("consultant_notes")
+        note_types = list(accumulate(weight for _, weight in _NOTE_TYPES))
+        for user in range(self.spec.users):
+            if not self.has_profile(user):
+                continue
+            count = self.consultation_count(user)
+            for number in range(count + int(rng.random() < 0.1)):
+                consultation = self.consultation_id(user, number) if number < count else None
+                at = (
+                    self.consultation_start(user, number) + timedelta(minutes=35 + rng.expovariate(1 / 60))
+                    if consultation else self.signup_at(user) + timedelta(days=rng.random() * 10)
+                ).replace(tzinfo=None)
+                _, consultant = rng.choice(_CONSULTANTS)
+                yield (
+                    self.entity_id("consultant_note", user * 4 + number).hex, at, at,
+                    self.entity_id("patient_profile", user), consultant,
+                    f"Discussed {rng.choice(['FUE', 'DHI', 'PRP', 'pricing', 'travel dates'])}; "
+                    f"Norwood {rng.randint(2, 6)}, estimated {rng.randrange(1500, 5000, 250)} grafts.",
+                    consultation, _NOTE_TYPES[_weighted(note_types, rng.random())][0], rng.random() < 0.2,
+                )
+
+
+def _copy_chunks(rows: Iterable[tuple], counter: List[int], chunk_rows: int) -> Iterator[str]:
+    buffer: List[str] = []
+    for row in rows:
+        buffer.append("\t".join(copy_value(value) for value in row))
+        if len(buffer) >= chunk_rows:
+            counter[0] += len(buffer)
+            yield "\n".join(buffer) + "\n"
+            buffer = []
+    if buffer:
+        counter[0] += len(buffer)
+        yield "\n".join(buffer) + "\n"
+
+
+class _ChunkReader:
+    """File-like view of text chunks for psycopg2's copy_expert."""
+
+    def __init__(self, chunks: Iterator[str]) -> None:
+        self._chunks = chunks
+        self._pending = ""
+
+    def read(self, size: int = -1) -> str:
+        while size < 0 or len(self._pending) < size:
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                break
+            self._pending += chunk
+        if size < 0:
+            data, self._pending = self._pending, ""
+        else:
+            data, self._pending = self._pending[:size], self._pending[size:]
+        return data
+
+
+def copy_rows(
+    connection: Connection,
+    table: str,
+    columns: Sequence[str],
+    rows: Iterable[tuple],
+    *,
+    chunk_rows: int = 5000,
+) -> int:
+    """Stream rows into `table` with COPY FROM STDIN; returns the number of rows sent."""
+    quote = connection.dialect.identifier_preparer.quote
+    statement = f"COPY {quote(table)} ({', '.join(quote(column) for column in columns)}) FROM STDIN"
+    counter = [0]
+    chunks = _copy_chunks(rows, counter, chunk_rows)
+    cursor = connection.connection.driver_connection.cursor()
+    try:
+        if hasattr(cursor, "copy"):  # psycopg 3
+            with cursor.copy(statement) as copy:
+                for chunk in chunks:
+                    copy.write(chunk)
+        else:  # psycopg2
+            cursor.copy_expert(statement, _ChunkReader(chunks))
+    finally:
+        cursor.close()
+    return counter[0]
+
+
+def generate_dataset(
+    connection: Connection,
+    spec: DatasetSpec,
+    *,
+    truncate: bool = False,
+    progress: Optional[Callable[[str, int, float], None]] = None,
+) -> Dict[str, int]:
+    """
+    Load a generated dataset through `connection` in one transaction and
+    commit. Target tables must be empty unless `truncate` is set, which
+    truncates them and every table referencing them.
+
+    raises:
+        RuntimeError: a target table already has rows and truncate is off
+    """
+    generator = DatasetGenerator(spec)
+    tables = list(DatasetGenerator.TABLES)
+    quote = connection.dialect.identifier_preparer.quote
+    if truncate:
+        connection.exec_driver_sql(f"TRUNCATE {', '.join(quote(table) for table in tables)} CASCADE")
+    else:
+        for table in tables:
+            if connection.exec_driver_sql(f"SELECT EXISTS (SELECT 1 FROM {quote(table)})").scalar():
+                raise RuntimeError(f"Table {table} already has rows; pass --truncate to replace them")
+
+    stats: Dict[str, int] = {}
+    for table, columns in DatasetGenerator.TABLES.items():
+        started = time.perf_counter()
+        stats[table] = copy_rows(connection, table, columns, generator.rows(table))
+        if progress:
+            progress(table, stats[table], time.perf_counter() - started)
+
+    # COPY bypasses the ORM, so price_normalized is filled in afterwards
+    with Session(bind=connection) as session:
+        has_rates = session.execute(text("SELECT EXISTS (SELECT 1 FROM fx_rates)")).scalar()
+        if has_rates:
+            fx_rates.recompute_normalized_prices(session)
+            session.commit()
+        else:
+            fx_rates.apply_rates(session, fx_rates.load_rates_file())
+    connection.commit()
+    connection.exec_driver_sql(f"ANALYZE {', '.join(quote(table) for table in tables)}")
+    connection.commit()
+    return stats
+
+
+def _report(table: str, rows: int, seconds: float) -> None:
+    print(f"   {table:<22} {rows:>12,} rows in {seconds:6.1f}s ({rows / max(seconds, 1e-9):,.0f}/s)")
+
+
+def main() -> None:
+    defaults = DatasetSpec()
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--users", type=int, default=defaults.users, help=f"default: {defaults.users}")
+    parser.add_argument("--clinics", type=int, default=defaults.clinics, help=f"default: {defaults.clinics}")
+    parser.add_argument("--packages", type=int, default=defaults.packages, help=f"default: {defaults.packages}")
+    parser.add_argument(
+        "--mean-messages",
+        type=float,
+        default=defaults.mean_messages,
+        help=f"average messages per user; the distribution is long-tailed (default: {defaults.mean_messages})",
+    )
+    parser.add_argument("--seed", type=int, default=defaults.seed, help=f"random seed (default: {defaults.seed})")
+    parser.add_argument("--schema", help="load into this schema, creating it and its tables if needed")
+    parser.add_argument(
+        "--truncate",
+        action="store_true",
+        help="empty the target tables first (cascades to every table referencing them)",
+    )
+    args = parser.parse_args()
+    if min(args.users, args.clinics, args.packages) < 0:
+        parser.error("sizes must not be negative")
+
+    spec = DatasetSpec(
+        users=args.users,
+        clinics=args.clinics,
+        packages=args.packages,
+        seed=args.seed,
+        mean_messages=args.mean_messages,
+    )
+    with engine.connect() as connection:
+        if args.schema:
+            schema = connection.dialect.identifier_preparer.quote(args.schema)
+            connection.exec_driver_sql(f"CREATE SCHEMA IF NOT EXISTS {schema}")
+            connection.exec_driver_sql(f"SET search_path TO {schema}")
+            if not inspect(connection).has_table("users"):
+                Base.metadata.create_all(connection)
+            connection.commit()
+
+        print(f"🚀 Generating dataset (seed {spec.seed}, {spec.users:,} users, {spec.clinics:,} clinics)...")
+        started = time.perf_counter()
+        try:
+            stats = generate_dataset(connection, spec, truncate=args.truncate, progress=_report)
+        except RuntimeError as exc:
+            parser.exit(1, f"❌ {exc}\n")
+        print(f"✅ Loaded {sum(stats.values()):,} rows in {time.perf_counter() - started:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+-- Migration: Index hot lookup columns
+-- Description: Adds indexes backing the per-request lookups issued by the
+-- session service, message history, Cal.com webhook and consultant dashboard.
+-- users.phone_number is already covered by its UNIQUE constraint.
+
+BEGIN;
+
+-- SessionService._get_conversation_state_by_device: device_id = ? ORDER BY locked_at DESC
+CREATE INDEX IF NOT EXISTS idx_conversation_states_device_id_locked_at
+    ON conversation_states (device_id, locked_at DESC);
+
+-- MessageRepository.get_by_user / get_recent_by_user: user_id = ? ORDER BY created_at DESC
+CREATE INDEX IF NOT EXISTS idx_messages_user_id_created_at
+    ON messages (user_id, created_at DESC);
+
+-- ConsultationService._find_patient_by_email
+CREATE INDEX IF NOT EXISTS idx_patient_profiles_email
+    ON patient_profiles (email);
+
+-- ConsultantNoteRepository.get_by_patient_profile_id: ORDER BY "createdAt" DESC
+CREATE INDEX IF NOT EXISTS idx_consultant_notes_patient_profile_id_created_at
+    ON consultant_notes (patient_profile_id, "createdAt" DESC);
+
+-- PatientImageSubmissionRepository.list_by_patient_profile / get_latest_by_patient_profile
+CREATE INDEX IF NOT EXISTS idx_patient_image_submissions_profile_id_created_at
+    ON patient_image_submissions (patient_profile_id, created_at DESC);
+
+-- The Cal.com appointment table is optional (sync may be disabled), so only
+-- index it when present. The Cal.com booking ID is stored in "zoomMeetingId".
+DO $$
+BEGIN
+    IF to_regclass('appointment') IS NOT NULL THEN
+        CREATE INDEX IF NOT EXISTS idx_appointment_start_time
+            ON appointment ("startTime");
+        CREATE INDEX IF NOT EXISTS idx_appointment_zoom_meeting_id
+            ON appointment ("zoomMeetingId");
+    END IF;
+END
+$$;
+
+COMMIT;
@@ -0,0 +1,13 @@
+-- Rollback Migration: Remove hot lookup indexes
+
+BEGIN;
+
+DROP INDEX IF EXISTS idx_appointment_zoom_meeting_id;
+DROP INDEX IF EXISTS idx_appointment_start_time;
+DROP INDEX IF EXISTS idx_patient_image_submissions_profile_id_created_at;
+DROP INDEX IF EXISTS idx_consultant_notes_patient_profile_id_created_at;
+DROP INDEX IF EXISTS idx_patient_profiles_email;
+DROP INDEX IF EXISTS idx_messages_user_id_created_at;
+DROP INDEX IF EXISTS idx_conversation_states_device_id_locked_at;
+
+COMMIT;
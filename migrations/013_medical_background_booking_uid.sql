@@ -0,0 +1,37 @@
+BEGIN;
+
+-- Persist the Cal.com booking UID that submitted the medical questionnaire so
+-- GET /api/medical/data/{booking_uid} is a single indexed lookup.
+ALTER TABLE medical_backgrounds
+    ADD COLUMN IF NOT EXISTS booking_uid TEXT;
+
+-- Backfill from the questionnaire payload when it was kept in medical_data
+UPDATE medical_backgrounds
+SET booking_uid = medical_data->>'booking_uid'
+WHERE booking_uid IS NULL
+  AND medical_data ? 'booking_uid';
+
+-- Otherwise fall back to the most recent Cal.com booking linked to the patient
+DO $$
+BEGIN
+    IF to_regclass('appointment') IS NOT NULL THEN
+        UPDATE medical_backgrounds AS mb
+        SET booking_uid = latest.uid
+        FROM (
+            SELECT DISTINCT ON (a.patient_profile_id)
+                   a.patient_profile_id,
+                   a."rawPayload" #>> '{data,uid}' AS uid
+            FROM appointment AS a
+            WHERE a.patient_profile_id IS NOT NULL
+              AND a."rawPayload" #>> '{data,uid}' IS NOT NULL
+            ORDER BY a.patient_profile_id, a."startTime" DESC NULLS LAST, a."createdAt" DESC
+        ) AS latest
+        WHERE mb.booking_uid IS NULL
+          AND mb.patient_profile_id = latest.patient_profile_id;
+    END IF;
+END $$;
+
+CREATE INDEX IF NOT EXISTS idx_medical_backgrounds_booking_uid
+    ON medical_backgrounds (booking_uid);
+
+COMMIT;
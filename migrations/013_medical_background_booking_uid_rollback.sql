@@ -0,0 +1,8 @@
+BEGIN;
+
+DROP INDEX IF EXISTS idx_medical_backgrounds_booking_uid;
+
+ALTER TABLE medical_backgrounds
+    DROP COLUMN IF EXISTS booking_uid;
+
+COMMIT;
@@ -0,0 +1,26 @@
+BEGIN;
+
+-- Order-insensitive digest of image_urls so duplicate submissions are found
+-- with one indexed equality lookup. Must match
+-- PatientImageSubmission.hash_image_urls: URLs sorted by code point
+-- (COLLATE "C"), joined with newlines, SHA-256 hex.
+ALTER TABLE patient_image_submissions
+    ADD COLUMN IF NOT EXISTS image_urls_hash VARCHAR(64);
+
+UPDATE patient_image_submissions AS s
+SET image_urls_hash = encode(
+    sha256(convert_to(
+        coalesce(
+            (SELECT string_agg(url, E'\n' ORDER BY url COLLATE "C") FROM unnest(s.image_urls) AS url),
+            ''
+        ),
+        'UTF8'
+    )),
+    'hex'
+)
+WHERE image_urls_hash IS NULL;
+
+CREATE INDEX IF NOT EXISTS idx_patient_image_submissions_profile_id_urls_hash
+    ON patient_image_submissions (patient_profile_id, image_urls_hash);
+
+COMMIT;
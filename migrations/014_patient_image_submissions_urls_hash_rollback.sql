@@ -0,0 +1,8 @@
+BEGIN;
+
+DROP INDEX IF EXISTS idx_patient_image_submissions_profile_id_urls_hash;
+
+ALTER TABLE patient_image_submissions
+    DROP COLUMN IF EXISTS image_urls_hash;
+
+COMMIT;
@@ -0,0 +1,11 @@
+BEGIN;
+
+-- Keyset pagination for GET /api/clinics/ orders by (updated_at, id) DESC,
+-- optionally filtered by has_contract. Both indexes are scanned backwards.
+CREATE INDEX IF NOT EXISTS idx_clinics_updated_at_id
+    ON clinics (updated_at, id);
+
+CREATE INDEX IF NOT EXISTS idx_clinics_has_contract_updated_at_id
+    ON clinics (has_contract, updated_at, id);
+
+COMMIT;
@@ -0,0 +1,6 @@
+BEGIN;
+
+DROP INDEX IF EXISTS idx_clinics_updated_at_id;
+DROP INDEX IF EXISTS idx_clinics_has_contract_updated_at_id;
+
+COMMIT;
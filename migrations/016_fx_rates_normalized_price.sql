@@ -0,0 +1,32 @@
+BEGIN;
+
+-- Rates into the catalog base currency (FX_BASE_CURRENCY, USD by default).
+-- Seeded from app/config/fx_rates.json; refresh with scripts/update_fx_rates.py.
+CREATE TABLE IF NOT EXISTS fx_rates (
+    currency VARCHAR(3) PRIMARY KEY,
+    rate_to_base NUMERIC(18, 8) NOT NULL CHECK (rate_to_base > 0),
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT now()
+);
+
+INSERT INTO fx_rates (currency, rate_to_base) VALUES
+    ('USD', 1.00000000),
+    ('EUR', 1.08000000),
+    ('GBP', 1.27000000),
+    ('TRY', 0.02900000)
+ON CONFLICT (currency) DO NOTHING;
+
+-- Package price in the base currency so catalog endpoints can sort and
+-- filter across currencies in SQL.
+ALTER TABLE packages
+    ADD COLUMN IF NOT EXISTS price_normalized NUMERIC(12, 2);
+
+UPDATE packages AS p
+SET price_normalized = round(p.price * fx.rate_to_base, 2)
+FROM fx_rates AS fx
+WHERE fx.currency = p.currency
+  AND p.price IS NOT NULL;
+
+CREATE INDEX IF NOT EXISTS idx_packages_active_price_normalized
+    ON packages (is_active, price_normalized);
+
+COMMIT;
@@ -0,0 +1,10 @@
+BEGIN;
+
+DROP INDEX IF EXISTS idx_packages_active_price_normalized;
+
+ALTER TABLE packages
+    DROP COLUMN IF EXISTS price_normalized;
+
+DROP TABLE IF EXISTS fx_rates;
+
+COMMIT;
@@ -0,0 +1,12 @@
+BEGIN;
+
+-- `opening_hours` (free-form JSONB) parsed into one bit per 15-minute slot of
+-- the clinic's local week (7 x 96 bits = 84 bytes, bit n = get_bit(bitmap, n)),
+-- plus the IANA timezone the slots are in. Open-now filters test a single bit.
+-- Maintained by the ORM on write; existing rows are filled by
+-- scripts/backfill_opening_hours.py because parsing happens in Python.
+ALTER TABLE clinics
+    ADD COLUMN IF NOT EXISTS opening_hours_bitmap BYTEA,
+    ADD COLUMN IF NOT EXISTS timezone VARCHAR;
+
+COMMIT;
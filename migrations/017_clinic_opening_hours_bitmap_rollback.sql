@@ -0,0 +1,7 @@
+BEGIN;
+
+ALTER TABLE clinics
+    DROP COLUMN IF EXISTS opening_hours_bitmap,
+    DROP COLUMN IF EXISTS timezone;
+
+COMMIT;
@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+"""
+Parse clinic opening hours into weekly open-slot bitmaps (migration 017).
+
+Each clinic's `opening_hours` JSON is parsed once into `opening_hours_bitmap`
+and its `timezone` resolved; new writes are kept in sync by the ORM. Rows are
+processed in id order, one commit per batch, and updated_at is left alone.
+
+Usage:
+    python scripts/backfill_opening_hours.py
+    python scripts/backfill_opening_hours.py --all --batch-size 1000
+"""
+
+import argparse
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.database.db import SessionLocal  # noqa: E402
+from app.database.repositories.clinic_repository import ClinicRepository  # noqa: E402
+from app.services import catalog_invalidation  # noqa: E402
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--batch-size", type=int, default=500, help="clinics per commit (default: 500)")
+    parser.add_argument("--all", action="store_true", help="re-parse every clinic, not only unprocessed ones")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        updated = ClinicRepository(db).backfill_opening_hours(
+            batch_size=args.batch_size,
+            only_missing=not args.all,
+        )
+    finally:
+        db.close()
+    if updated:
+        # running workers drop the clinic state built from the old hours
+        catalog_invalidation.clinics_written()
+    print(f"Parsed opening hours of {updated} clinic(s)")
+
+
+if __name__ == "__main__":
+    main()
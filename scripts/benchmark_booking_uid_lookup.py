@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Benchmark medical-data lookups by booking UID.
+
+Compares the old strategy (load every patient profile, then query the medical
+background of each one until the booking matches) with the indexed
+`medical_backgrounds.booking_uid` lookup. Runs inside a throw-away schema of the
+Postgres database in DATABASE_URL.
+
+Usage:
+    python scripts/benchmark_booking_uid_lookup.py --profiles 50000
+"""
+
+import argparse
+import os
+import sys
+import time
+import uuid
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.database.entities import MedicalBackground, PatientProfile  # noqa: E402
+from app.database.entities.base import Base  # noqa: E402
+from app.database.repositories.medical_background_repository import (  # noqa: E402
+    MedicalBackgroundRepository,
+)
+
+
+def seed(connection, profiles: int) -> None:
+    connection.exec_driver_sql(f"""
+        INSERT INTO users (id, phone_number, name)
+        SELECT gen_random_uuid(), 'patient' || g || '@example.com', 'Patient ' || g
+        FROM generate_series(1, {profiles}) AS g
+    """)
+    connection.exec_driver_sql("""
+        INSERT INTO patient_profiles (id, created_at, updated_at, deleted, user_id, name, phone, email, clinic_offer_ids)
+        SELECT gen_random_uuid(), now(), now(), false, u.id, u.name, u.phone_number, u.phone_number, '{}'::uuid[]
+        FROM users AS u
+    """)
+    connection.exec_driver_sql("""
+        INSERT INTO medical_backgrounds (id, created_at, updated_at, deleted, patient_profile_id, medical_data, booking_uid)
+        SELECT gen_random_uuid(), now(), now(), false, p.id, '{}'::jsonb, 'uid-' || p.email
+        FROM patient_profiles AS p
+    """)
+    connection.exec_driver_sql("ANALYZE")
+
+
+def legacy_lookup(session: Session, booking_uid: str):
+    """Old per-profile scan, made to stop at the matching booking."""
+    repository = MedicalBackgroundRepository(session)
+    for profile in session.query(PatientProfile).all():
+        medical_bg = repository.get_by_patient_profile_id(profile.id)
+        if medical_bg and medical_bg.booking_uid == booking_uid:
+            return medical_bg
+    return None
+
+
+def indexed_lookup(session: Session, booking_uid: str):
+    return MedicalBackgroundRepository(session).get_by_booking_uid(booking_uid)
+
+
+def timed(label: str, lookup, connection, booking_uid: str) -> float:
+    with Session(bind=connection) as session:
+        started = time.perf_counter()
+        result = lookup(session, booking_uid)
+        elapsed = time.perf_counter() - started
+    assert isinstance(result, MedicalBackground) and result.booking_uid == booking_uid
+    print(f"{label:<10} {elapsed * 1000:>12.2f} ms")
+    return elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--profiles", type=int, default=50000)
+    args = parser.parse_args()
+
+    engine = create_engine(os.environ["DATABASE_URL"])
+    schema = f"booking_uid_bench_{uuid.uuid4().hex[:8]}"
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as connection:
+        connection.exec_driver_sql(f"CREATE SCHEMA {schema}")
+        connection.exec_driver_sql(f"SET search_path TO {schema}")
+        try:
+            Base.metadata.create_all(connection)
+            seed(connection, args.profiles)
+
+            # Worst case for the scan: the booking belongs to the last profile it visits
+            with Session(bind=connection) as session:
+                last_profile = session.query(PatientProfile).all()[-1]
+                booking_uid = f"uid-{last_profile.email}"
+
+            print(f"Looking up {booking_uid} among {args.profiles} profiles")
+            legacy = timed("legacy", legacy_lookup, connection, booking_uid)
+            indexed = timed("indexed", indexed_lookup, connection, booking_uid)
+            print(f"speedup    {legacy / indexed:>12.0f}x")
+        finally:
+            connection.exec_driver_sql(f"DROP SCHEMA {schema} CASCADE")
+    engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
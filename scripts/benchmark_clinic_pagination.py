@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Benchmark clinic catalog pagination.
+
+For each catalog size, times a deep page fetched by OFFSET (with an uncached
+COUNT, as before) against the same page fetched by (updated_at, id) keyset
+cursor with the cached total. Runs inside a throw-away schema of the Postgres
+database in DATABASE_URL.
+
+Usage:
+    python scripts/benchmark_clinic_pagination.py --sizes 10000 100000
+"""
+
+import argparse
+import os
+import sys
+import time
+import uuid
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.database.entities.base import Base  # noqa: E402
+import app.database.entities  # noqa: E402,F401 - registers every table on Base.metadata
+from app.database.repositories.clinic_repository import ClinicRepository  # noqa: E402
+from app.services.clinic_cache import count_clinics, invalidate_clinic_counts  # noqa: E402
+
+LIMIT = 20
+REPEATS = 5
+
+
+def seed(connection, size: int) -> None:
+    connection.exec_driver_sql("TRUNCATE clinics CASCADE")
+    connection.exec_driver_sql(f"""
+        INSERT INTO clinics (id, title, city, country, rating, has_contract, created_at, updated_at)
+        SELECT gen_random_uuid(), 'Clinic ' || g, 'Istanbul', 'Turkey', 3 + mod(g, 20) / 10.0,
+               mod(g, 4) = 0, now(), now() - (g || ' seconds')::interval
+        FROM generate_series(1, {size}) AS g
+    """)
+    connection.exec_driver_sql("ANALYZE clinics")
+
+
+def best_of(fn) -> float:
+    timings = []
+    for _ in range(REPEATS):
+        started = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def run(connection, size: int) -> None:
+    seed(connection, size)
+    page = size // LIMIT  # last full page
+
+    with Session(bind=connection) as session:
+        repository = ClinicRepository(session)
+        offset_page = repository.list_paginated(page=page - 1, limit=LIMIT)
+        last = offset_page[-1]
+        after = (last.updated_at, last.id)
+
+        def offset_fetch():
+            repository.count()  # the old code counted on every request
+            clinics = repository.list_paginated(page=page, limit=LIMIT)
+            session.expunge_all()
+            return clinics
+
+        def keyset_fetch():
+            clinics = repository.list_page(limit=LIMIT, after=after)[:LIMIT]
+            count_clinics(repository)
+            session.expunge_all()
+            return clinics
+
+        assert [c.id for c in offset_fetch()] == [c.id for c in keyset_fetch()]
+        offset_time = best_of(offset_fetch)
+        keyset_time = best_of(keyset_fetch)
+
+    print(
+        f"{size:>8} clinics  page {page:>5}  "
+        f"offset+count {offset_time * 1000:>8.2f} ms  "
+        f"keyset+cached {keyset_time * 1000:>8.2f} ms  "
+        f"({offset_time / keyset_time:.1f}x)"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000])
+    args = parser.parse_args()
+
+    engine = create_engine(os.environ["DATABASE_URL"])
+    schema = f"clinic_page_bench_{uuid.uuid4().hex[:8]}"
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as connection:
+        connection.exec_driver_sql(f"CREATE SCHEMA {schema}")
+        connection.exec_driver_sql(f"SET search_path TO {schema}")
+        try:
+            Base.metadata.create_all(connection)
+            for size in args.sizes:
+                run(connection, size)
+        finally:
+            connection.exec_driver_sql(f"DROP SCHEMA {schema} CASCADE")
+            invalidate_clinic_counts()
+    engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
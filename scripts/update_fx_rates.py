@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+"""
+Load FX rates from a JSON rate file into fx_rates and recompute normalized package prices.
+
+The file has the same shape as app/config/fx_rates.json and must be based on
+FX_BASE_CURRENCY. Every package price is re-normalized in one UPDATE; only
+rows whose value changes are written.
+
+Usage:
+    python scripts/update_fx_rates.py --file rates.json
+    python scripts/update_fx_rates.py --dry-run
+"""
+
+import argparse
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.config.settings import settings  # noqa: E402
+from app.database.db import SessionLocal  # noqa: E402
+from app.services.fx_rates import apply_rates, load_rates_file  # noqa: E402
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--file", default=settings.FX_RATES_FILE, help="rate file (default: FX_RATES_FILE)")
+    parser.add_argument("--dry-run", action="store_true", help="validate and print the rates only")
+    args = parser.parse_args()
+
+    rates = load_rates_file(args.file)
+    for currency, rate in sorted(rates.items()):
+        print(f"{currency}: {rate} {settings.FX_BASE_CURRENCY}")
+    if args.dry_run:
+        return
+
+    db = SessionLocal()
+    try:
+        updated = apply_rates(db, rates)
+    finally:
+        db.close()
+    print(f"Updated normalized price of {updated} package(s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,94 @@
 import os
 import sys
+import uuid
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.exc import OperationalError
 
 # Add the project root directory to Python path
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))) 
\ No newline at end of file
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def pytest_addoption(parser):
+    parser.addoption("--benchmarks", action="store_true", help="also run tests marked benchmark")
+
+
+def pytest_collection_modifyitems(config, items):
+    if config.getoption("--benchmarks"):
+        return
+    skip = pytest.mark.skip(reason="benchmark; run with --benchmarks")
+    for item in items:
+        if "benchmark" in item.keywords:
+            item.add_marker(skip)
+
+
+class ScratchSchema:
+    """A throw-away Postgres schema holding every table, for one test module."""
+
+    def __init__(self, database_url: str, name: str) -> None:
+        self.database_url = database_url
+        self.name = name
+        self._engines = []
+        self._connections = []
+
+    def engine(self, **kwargs) -> Engine:
+        """An engine whose connections resolve tables in this schema."""
+        engine = create_engine(
+            self.database_url, connect_args={"options": f"-csearch_path={self.name}"}, **kwargs
+        )
+        self._engines.append(engine)
+        return engine
+
+    def connect(self, *, autocommit: bool = False) -> Connection:
+        """A connection onto this schema, closed with it."""
+        if not self._engines:
+            self.engine()
+        connection = self._engines[0].connect()
+        if autocommit:
+            connection = connection.execution_options(isolation_level="AUTOCOMMIT")
+        self._connections.append(connection)
+        return connection
+
+    def close(self) -> None:
+        for connection in self._connections:
+            connection.close()
+        for engine in self._engines:
+            engine.dispose()
+
+
+@pytest.fixture(scope="module")
+def pg_schema(request):
+    """
+    A scratch schema named after the test module, with every table created and
+    dropped after the module. Modules seed it through `connect()` or `engine()`.
+    Skipped when no Postgres DATABASE_URL is reachable.
+    """
+    database_url = os.getenv("DATABASE_URL")
+    if not database_url or not database_url.startswith("postgresql"):
+        pytest.skip("DATABASE_URL must point at a Postgres database")
+
+    from app.database.entities.base import Base
+    import app.database.entities  # noqa: F401 - registers every table on Base.metadata
+
+    admin = create_engine(database_url)
+    prefix = request.module.__name__.rsplit(".", 1)[-1].removeprefix("test_")
+    name = f"{prefix}_test_{uuid.uuid4().hex[:8]}"
+    try:
+        with admin.begin() as connection:
+            connection.exec_driver_sql(f"CREATE SCHEMA {name}")
+    except OperationalError as exc:
+        admin.dispose()
+        pytest.skip(f"Postgres not reachable: {exc}")
+
+    schema = ScratchSchema(database_url, name)
+    try:
+        with schema.engine().begin() as connection:
+            Base.metadata.create_all(connection)
+        yield schema
+    finally:
+        schema.close()
+        with admin.begin() as connection:
+            connection.exec_driver_sql(f"DROP SCHEMA {name} CASCADE")
+        admin.dispose()
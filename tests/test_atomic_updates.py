@@ -0,0 +1,186 @@
+"""
+Tests for the single-statement partial updates: medical data merges, clinic
+offer appends and clinic package links. Each runs many concurrent writers
+against one row and checks that no update is lost.
+
+They run in a throw-away schema and are skipped when no Postgres
+DATABASE_URL is reachable.
+"""
+
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.database.repositories.clinic_repository import ClinicRepository
+from app.database.repositories.medical_background_repository import MedicalBackgroundRepository
+from app.database.repositories.package_repository import PackageRepository
+from app.database.repositories.patient_profile_repository import PatientProfileRepository
+
+
+WRITERS = 16
+PATIENT_ID = uuid.uuid4()
+CLINIC_IDS = [uuid.uuid4() for _ in range(WRITERS)]
+
+LINKED_SQL = """
+    SELECT coalesce(array_agg(package_id ORDER BY assigned_at, package_id), '{}'::uuid[])
+    FROM clinic_packages WHERE clinic_id = :id
+"""
+
+
+@pytest.fixture(scope="module")
+def engine(pg_schema):
+    """An engine onto the scratch schema, seeded with one patient and some clinics."""
+    engine = pg_schema.engine(pool_size=WRITERS)
+    with engine.begin() as connection:
+        connection.exec_driver_sql(
+            "INSERT INTO users (id, phone_number, name) VALUES (%(user)s, 'whatsapp:+900000000001', 'Ayse')",
+            {"user": uuid.uuid4()},
+        )
+        connection.exec_driver_sql(
+            """
+            INSERT INTO patient_profiles (id, created_at, updated_at, deleted, user_id, name, phone, email,
+                                          clinic_offer_ids)
+            SELECT %(patient)s, now(), now(), false, id, name, phone_number, 'ayse@example.com',
+                   %(offers)s::uuid[]
+            FROM users
+            """,
+            {"patient": PATIENT_ID, "offers": [CLINIC_IDS[0]]},
+        )
+        connection.exec_driver_sql(
+            """
+            INSERT INTO clinics (id, title, has_contract, package_ids, created_at, updated_at)
+            SELECT id, 'Clinic', false, '{}', now(), now() FROM unnest(%(clinics)s::uuid[]) AS id
+            """,
+            {"clinics": CLINIC_IDS},
+        )
+    return engine
+
+
+def run_concurrently(engine, calls):
+    """Run each `call(session)` in its own session, all released at once."""
+    barrier = threading.Barrier(len(calls))
+
+    def run(call):
+        with Session(bind=engine) as session:
+            barrier.wait()
+            return call(session)
+
+    with ThreadPoolExecutor(max_workers=len(calls)) as pool:
+        return list(pool.map(run, calls))
+
+
+def test_concurrent_medical_data_merges_keep_every_key(engine):
+    calls = [
+        lambda session, i=i: MedicalBackgroundRepository(session).merge_medical_data(PATIENT_ID, {f"key_{i}": i})
+        for i in range(WRITERS)
+    ]
+    run_concurrently(engine, calls)
+
+    with Session(bind=engine) as session:
+        repository = MedicalBackgroundRepository(session)
+        assert repository.get_by_patient_profile_id(PATIENT_ID).medical_data == {
+            f"key_{i}": i for i in range(WRITERS)
+        }
+
+        merged = repository.merge_medical_data(str(PATIENT_ID), {"key_0": "changed", "allergies": ["latex"]})
+        assert merged.medical_data["key_0"] == "changed"
+        assert merged.medical_data["allergies"] == ["latex"]
+        assert len(merged.medical_data) == WRITERS + 1
+        assert session.execute(text("SELECT count(*) FROM medical_backgrounds")).scalar_one() == 1
+
+
+def test_concurrent_clinic_offers_are_all_kept_once(engine):
+    calls = [
+        lambda session, clinic_id=clinic_id: PatientProfileRepository(session).add_clinic_offers(
+            PATIENT_ID, [clinic_id, CLINIC_IDS[0]]
+        )
+        for clinic_id in CLINIC_IDS
+    ]
+    run_concurrently(engine, calls)
+
+    with Session(bind=engine) as session:
+        repository = PatientProfileRepository(session)
+        offers = repository.get_by_id(PATIENT_ID).clinic_offer_ids
+        assert offers[0] == CLINIC_IDS[0]
+        assert sorted(offers) == sorted(CLINIC_IDS)
+
+        # appending again keeps the stored order and adds only the new id
+        extra = uuid.uuid4()
+        updated = repository.add_clinic_offers(str(PATIENT_ID), [CLINIC_IDS[3], extra])
+        assert updated.clinic_offer_ids == offers + [extra]
+        assert repository.add_clinic_offers(uuid.uuid4(), [extra]) is None
+
+
+def test_concurrent_package_links_keep_the_mirror(engine):
+    clinic_id = CLINIC_IDS[0]
+    with Session(bind=engine) as session:
+        package_ids = [
+            package.id
+            for package in PackageRepository(session).bulk_upsert([{"name": f"Package {i}"} for i in range(WRITERS)])
+        ]
+
+    # every package added twice, half of the calls racing on a link already being made
+    calls = [
+        lambda session, package_id=package_id: ClinicRepository(session).add_package(clinic_id, package_id)
+        for package_id in package_ids + package_ids
+    ]
+    run_concurrently(engine, calls)
+
+    with Session(bind=engine) as session:
+        mirror = session.execute(
+            text("SELECT package_ids FROM clinics WHERE id = :id"), {"id": clinic_id}
+        ).scalar_one()
+        assert mirror == session.execute(text(LINKED_SQL), {"id": clinic_id}).scalar_one()
+        assert sorted(mirror) == sorted(package_ids)
+
+        repository = ClinicRepository(session)
+        clinic = repository.remove_package(clinic_id, package_ids[0])
+        assert clinic.package_ids == [package_id for package_id in mirror if package_id != package_ids[0]]
+        assert [package.id for package in clinic.packages if package.id == package_ids[0]] == []
+
+        assert repository.add_package(uuid.uuid4(), package_ids[0]) is None
+        assert repository.remove_package(uuid.uuid4(), package_ids[0]) is None
+
+
+def test_concurrent_adds_and_removes_keep_the_mirror(engine):
+    clinic_id = CLINIC_IDS[2]
+    with Session(bind=engine) as session:
+        package_ids = [
+            package.id
+            for package in PackageRepository(session).bulk_upsert([{"name": f"Raced {i}"} for i in range(WRITERS // 2)])
+        ]
+        repository = ClinicRepository(session)
+        for package_id in package_ids[::2]:
+            repository.add_package(clinic_id, package_id)
+
+    # each package is added and removed at the same time; whichever wins, the
+    # link table and the mirror must agree
+    calls = []
+    for package_id in package_ids:
+        calls.append(lambda session, package_id=package_id: ClinicRepository(session).add_package(clinic_id, package_id))
+        calls.append(lambda session, package_id=package_id: ClinicRepository(session).remove_package(clinic_id, package_id))
+    run_concurrently(engine, calls)
+
+    with Session(bind=engine) as session:
+        mirror = session.execute(
+            text("SELECT package_ids FROM clinics WHERE id = :id"), {"id": clinic_id}
+        ).scalar_one()
+        assert mirror == session.execute(text(LINKED_SQL), {"id": clinic_id}).scalar_one()
+        assert set(mirror) <= set(package_ids)
+
+
+def test_set_packages_replaces_the_links(engine):
+    clinic_id = CLINIC_IDS[1]
+    with Session(bind=engine) as session:
+        packages = PackageRepository(session).bulk_upsert([{"name": "Kept"}, {"name": "Dropped"}])
+        repository = ClinicRepository(session)
+        repository.add_package(clinic_id, packages[1].id)
+
+        clinic = repository.set_packages(repository.get_by_id(clinic_id), packages[:1], has_contract=True)
+        assert clinic.package_ids == [packages[0].id]
+        assert [package.id for package in clinic.packages] == [packages[0].id]
+        assert clinic.has_contract is True
@@ -0,0 +1,161 @@
+"""
+Tests for the batch read endpoints that collapse the consultant dashboard fan-out:
+GET /api/clinics/batch and GET /api/patients/{patient_id}/dashboard.
+
+Both run against a throw-away Postgres schema through a minimal app with the
+routers' sessions bound to it, and count the round trips each request costs.
+They are skipped when no Postgres DATABASE_URL is reachable.
+"""
+
+import uuid
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.config.rate_limits import limiter
+from app.database.repositories.package_repository import PackageRepository
+from app.routers import clinic_router, patient_router
+
+
+PATIENT_ID = uuid.uuid4()
+CLINIC_IDS = [uuid.UUID(int=index) for index in range(1, 6)]
+
+
+@pytest.fixture(scope="module")
+def dashboard_connection(pg_schema):
+    """A connection onto a throw-away schema with one patient and five offered clinics."""
+    connection = pg_schema.connect()
+    with Session(bind=connection) as session:
+        PackageRepository(session).bulk_upsert([{"name": f"Package {index}"} for index in (1, 2)])
+    connection.exec_driver_sql(
+        """
+        INSERT INTO clinics (id, title, city, rating, has_contract, package_ids, created_at, updated_at)
+        SELECT ('00000000-0000-0000-0000-' || lpad(g::text, 12, '0'))::uuid, 'Clinic ' || g, 'Istanbul',
+               4.5, false, (SELECT array_agg(id ORDER BY name) FROM packages), now(), now()
+        FROM generate_series(1, 5) AS g
+        """
+    )
+    connection.exec_driver_sql(
+        """
+        INSERT INTO clinic_packages (clinic_id, package_id)
+        SELECT clinics.id, packages.id FROM clinics CROSS JOIN packages
+        """
+    )
+    connection.exec_driver_sql(
+        "INSERT INTO users (id, phone_number, name) VALUES (%(user)s, 'whatsapp:+900000000001', 'Ayse')",
+        {"user": uuid.uuid4()},
+    )
+    connection.exec_driver_sql(
+        """
+        INSERT INTO patient_profiles (id, created_at, updated_at, deleted, user_id, name, phone, email,
+                                      clinic_offer_ids)
+        SELECT %(patient)s, now(), now(), false, id, name, phone_number, 'ayse@example.com',
+               %(offers)s::uuid[]
+        FROM users
+        """,
+        {"patient": PATIENT_ID, "offers": [*reversed(CLINIC_IDS), uuid.UUID(int=99)]},
+    )
+    connection.exec_driver_sql(
+        """
+        INSERT INTO consultant_notes (id, "createdAt", "updatedAt", patient_profile_id, consultant_email,
+                                      note_content, note_type, is_private)
+        VALUES (gen_random_uuid()::text, now(), now(), %(patient)s, 'consultant@istanbulmedic.com',
+                'Prefers May', 'general', false),
+               (gen_random_uuid()::text, now(), now(), %(patient)s, 'consultant@istanbulmedic.com',
+                'Internal', 'general', true)
+        """,
+        {"patient": PATIENT_ID},
+    )
+    connection.exec_driver_sql(
+        """
+        INSERT INTO patient_image_submissions (id, created_at, updated_at, deleted, patient_profile_id,
+                                               image_urls)
+        VALUES (gen_random_uuid(), now(), now(), false, %(patient)s, ARRAY['https://example.com/1.jpg'])
+        """,
+        {"patient": PATIENT_ID},
+    )
+    connection.commit()
+    return connection
+
+
+@pytest.fixture
+def client(dashboard_connection):
+    def get_db():
+        with Session(bind=dashboard_connection) as session:
+            yield session
+
+    app = FastAPI()
+    app.state.limiter = limiter
+    app.include_router(clinic_router.router)
+    app.include_router(patient_router.router)
+    app.dependency_overrides[clinic_router.get_db] = get_db
+    app.dependency_overrides[patient_router.get_db] = get_db
+    return TestClient(app)
+
+
+@pytest.fixture
+def statements(dashboard_connection):
+    recorded = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        recorded.append(statement)
+
+    event.listen(dashboard_connection, "before_cursor_execute", record)
+    yield recorded
+    event.remove(dashboard_connection, "before_cursor_execute", record)
+
+
+def test_clinic_batch_keeps_request_order_and_reports_missing(client, statements):
+    unknown = uuid.UUID(int=99)
+    ids = f"{CLINIC_IDS[2]},{CLINIC_IDS[0]},{unknown}"
+
+    response = client.get("/api/clinics/batch", params=[("ids", ids), ("ids", str(CLINIC_IDS[2]))])
+
+    assert response.status_code == 200
+    data = response.json()
+    assert [clinic["id"] for clinic in data["clinics"]] == [str(CLINIC_IDS[2]), str(CLINIC_IDS[0])]
+    assert data["missing"] == [str(unknown)]
+    assert len(data["clinics"][0]["packages"]) == 2
+    # clinics, then their packages
+    assert len(statements) == 2
+
+
+def test_clinic_batch_sparse_and_validation(client, statements):
+    ids = ",".join(str(clinic_id) for clinic_id in CLINIC_IDS)
+
+    sparse = client.get("/api/clinics/batch", params={"ids": ids, "fields": "title"})
+    assert sparse.status_code == 200
+    assert sparse.json()["clinics"][0] == {"id": str(CLINIC_IDS[0]), "title": "Clinic 1"}
+    assert len(statements) == 1
+
+    assert client.get("/api/clinics/batch", params={"ids": "not-a-uuid"}).status_code == 400
+    too_many = ",".join(str(uuid.UUID(int=index)) for index in range(101))
+    assert client.get("/api/clinics/batch", params={"ids": too_many}).status_code == 400
+
+
+def test_dashboard_replaces_the_fan_out(client, statements):
+    response = client.get(f"/api/patients/{PATIENT_ID}/dashboard")
+
+    assert response.status_code == 200
+    data = response.json()["data"]
+    assert data["patient"]["name"] == "Ayse"
+    assert [note["note_content"] for note in data["notes"]] == ["Prefers May"]
+    assert data["imageSubmissions"][0]["image_urls"] == ["https://example.com/1.jpg"]
+    # offered clinics in offer order, the unknown offer skipped
+    assert [clinic["id"] for clinic in data["clinics"]] == [str(clinic_id) for clinic_id in reversed(CLINIC_IDS)]
+    assert len(data["clinics"][0]["packages"]) == 2
+
+    # a second render reuses the cached patient details; private notes are opt-in
+    first = len(statements)
+    statements.clear()
+    response = client.get(f"/api/patients/{PATIENT_ID}/dashboard", params={"include_private": "true"})
+    assert len(response.json()["data"]["notes"]) == 2
+    assert len(statements) < first
+
+
+def test_dashboard_errors(client):
+    assert client.get("/api/patients/not-a-uuid/dashboard").status_code == 400
+    assert client.get(f"/api/patients/{uuid.uuid4()}/dashboard").status_code == 404
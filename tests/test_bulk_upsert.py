@@ -0,0 +1,109 @@
+"""
+Tests for the bulk package upsert and set-based clinic package assignment.
+
+The Postgres-backed tests run in a throw-away schema seeded with 10k clinics
+and check that `clinics.package_ids` stays an exact mirror of clinic_packages.
+They are skipped when no Postgres DATABASE_URL is reachable.
+"""
+
+import uuid
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.database.entities import Package
+from app.database.repositories.clinic_repository import ClinicRepository
+from app.database.repositories.package_repository import PackageRepository
+
+
+CLINICS = 10_000
+
+MIRROR_MISMATCHES_SQL = """
+    SELECT count(*) FROM clinics AS c
+    WHERE c.package_ids IS DISTINCT FROM coalesce(
+        (SELECT array_agg(cp.package_id ORDER BY cp.assigned_at, cp.package_id)
+         FROM clinic_packages AS cp WHERE cp.clinic_id = c.id),
+        '{}'::uuid[]
+    )
+"""
+
+
+@pytest.fixture(scope="module")
+def catalog_connection(pg_schema):
+    """A connection onto a throw-away schema with fx rates and 10k clinics."""
+    connection = pg_schema.connect()
+    connection.exec_driver_sql("""
+        INSERT INTO fx_rates (currency, rate_to_base, updated_at)
+        VALUES ('USD', 1, now()), ('EUR', 1.08, now()), ('GBP', 1.27, now())
+    """)
+    connection.exec_driver_sql(f"""
+        INSERT INTO clinics (id, title, has_contract, package_ids, created_at, updated_at)
+        SELECT gen_random_uuid(), 'Clinic ' || g, false, '{{}}', now(), now() - interval '1 day'
+        FROM generate_series(1, {CLINICS}) AS g
+    """)
+    connection.commit()
+    return connection
+
+
+def test_bulk_upsert_inserts_and_partially_updates(catalog_connection):
+    with Session(bind=catalog_connection) as session:
+        repository = PackageRepository(session)
+        created = repository.bulk_upsert([
+            {"name": "Basic", "price": Decimal("2000"), "currency": "eur"},
+            {"name": "Unpriced"},
+            {"name": "Premium", "price": Decimal("100"), "currency": "GBP", "hotel_nights_included": 3},
+        ])
+
+        assert [package.name for package in created] == ["Basic", "Unpriced", "Premium"]
+        assert [package.price_normalized for package in created] == [Decimal("2160.00"), None, Decimal("127.00")]
+        assert created[0].currency == "EUR"
+        assert created[1].is_active and created[1].hotel_star_rating == 0
+
+        basic, unpriced, premium = (package.id for package in created)
+        updated = repository.bulk_upsert([
+            {"id": premium, "name": "Premium+"},
+            {"id": basic, "currency": "GBP"},
+            {"id": unpriced, "price": Decimal("50")},
+        ])
+
+        assert [package.id for package in updated] == [premium, basic, unpriced]
+        assert (updated[0].name, updated[0].hotel_nights_included, updated[0].price_normalized) == (
+            "Premium+", 3, Decimal("127.00")
+        )
+        assert (updated[1].name, updated[1].price, updated[1].price_normalized) == (
+            "Basic", Decimal("2000.00"), Decimal("2540.00")
+        )
+        assert updated[2].price_normalized == Decimal("50.00")
+        assert session.query(Package).count() == 3
+
+        with pytest.raises(ValueError):
+            repository.bulk_upsert([{"name": "Bad", "price_normalized": Decimal("1")}])
+
+
+def test_assign_packages_keeps_the_mirror_in_sync(catalog_connection):
+    with Session(bind=catalog_connection) as session:
+        packages = PackageRepository(session).bulk_upsert(
+            [{"name": f"Package {index}", "price": Decimal(1000 + index)} for index in range(50)]
+        )
+        package_ids = [package.id for package in packages]
+        repository = ClinicRepository(session)
+
+        assert repository.assign_packages(package_ids) == (CLINICS, CLINICS * 50, 0)
+        assert repository.assign_packages(package_ids) == (CLINICS, 0, 0)
+        assert catalog_connection.execute(text(MIRROR_MISMATCHES_SQL)).scalar() == 0
+
+        some_clinics = list(catalog_connection.execute(text("SELECT id FROM clinics ORDER BY id LIMIT 100")).scalars())
+        assert repository.assign_packages(
+            package_ids[:3], clinic_ids=some_clinics, replace=True, has_contract=True
+        ) == (100, 0, 100 * 47)
+        assert catalog_connection.execute(text(MIRROR_MISMATCHES_SQL)).scalar() == 0
+        assert catalog_connection.execute(text(
+            "SELECT count(*) FROM clinics WHERE has_contract AND cardinality(package_ids) = 3"
+        )).scalar() == 100
+        assert catalog_connection.execute(text(
+            "SELECT count(*) FROM clinics WHERE cardinality(package_ids) = 50"
+        )).scalar() == CLINICS - 100
+
+        assert repository.missing_ids(some_clinics[:2] + [uuid.UUID(int=1)]) == [uuid.UUID(int=1)]
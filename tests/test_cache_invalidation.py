@@ -0,0 +1,218 @@
+"""
+Tests for cross-worker cache invalidation: event payloads, local eviction, and
+the LISTEN loop with its fallback flushes. The listener tests against a live
+server are skipped when no Postgres DATABASE_URL is reachable.
+"""
+
+import json
+import os
+import threading
+import time
+import uuid
+
+import pytest
+from sqlalchemy import create_engine, func, select, text
+from sqlalchemy.exc import OperationalError
+
+from app.services import cache_events
+from app.services.cache_invalidation import InvalidationListener, evict, evict_all
+from app.services.fx_rates import fx_rate_cache
+from app.services.patient_cache import patient_details_cache
+from app.services.read_cache import (
+    CONSULTATIONS_TAG,
+    clinic_details_cache,
+    clinic_tag,
+    consultations_cache,
+    package_details_cache,
+    package_tag,
+)
+
+
+def wait_until(predicate, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not predicate() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert predicate()
+
+
+def foreign_event(entity, ids=None):
+    return json.dumps({"origin": "another-worker", "entity": entity, "ids": ids})
+
+
+class RecordingListener(InvalidationListener):
+    """Listener whose evictions are recorded instead of applied."""
+
+    def __init__(self, conninfo, channel, **kwargs):
+        self.events = []
+        self.flushed = threading.Event()
+        super().__init__(
+            conninfo,
+            channel,
+            on_event=lambda entity, ids: self.events.append((entity, ids)),
+            on_flush=self.flushed.set,
+            **kwargs,
+        )
+
+
+class TestCacheEvents:
+    """Test cases for the NOTIFY payload format."""
+
+    def test_round_trip_dedupes_ids(self):
+        clinic_id = uuid.uuid4()
+        event = cache_events.decode_event(cache_events.encode_event(cache_events.CLINIC, [clinic_id, str(clinic_id)]))
+
+        assert event == {"origin": cache_events.ORIGIN, "entity": "clinic", "ids": [str(clinic_id)]}
+
+    def test_large_writes_name_every_row(self):
+        ids = [uuid.uuid4() for _ in range(cache_events.MAX_EVENT_IDS + 1)]
+        payload = cache_events.encode_event(cache_events.PACKAGE, ids)
+
+        assert cache_events.decode_event(payload)["ids"] is None
+        assert len(payload) < 8000
+
+    @pytest.mark.parametrize("payload", [
+        "not json",
+        "[]",
+        json.dumps({"origin": "w", "entity": "invoice", "ids": None}),
+        json.dumps({"origin": "w", "entity": "clinic", "ids": "1"}),
+        json.dumps({"origin": "w", "entity": "clinic", "ids": [1]}),
+    ])
+    def test_malformed_payloads_are_rejected(self, payload):
+        assert cache_events.decode_event(payload) is None
+
+
+class TestEviction:
+    """Events from other workers retire this worker's cached reads."""
+
+    def test_handle_skips_events_this_worker_published(self):
+        listener = RecordingListener("", "channel")
+
+        assert not listener.handle(cache_events.encode_event(cache_events.CLINIC, ["1"]))
+        assert not listener.handle("garbage")
+        assert listener.handle(foreign_event("clinic", ["1"]))
+        assert listener.events == [("clinic", ["1"])]
+        assert listener.stats()["received"] == 3 and listener.stats()["applied"] == 1
+
+    def test_catalog_events(self):
+        clinic_id, package_id, patient_id = str(uuid.uuid4()), str(uuid.uuid4()), str(uuid.uuid4())
+        clinic_details_cache.set((clinic_id, None), {"id": clinic_id}, tags=[clinic_tag(clinic_id)])
+        package_details_cache.set((package_id, None), {"id": package_id}, tags=[package_tag(package_id)])
+        patient_details_cache.set(patient_id, {"id": patient_id}, tags=[clinic_tag(clinic_id)])
+
+        evict(cache_events.PACKAGE, [package_id])
+        assert package_details_cache.get((package_id, None)) is None
+        assert clinic_details_cache.get((clinic_id, None)) == {"id": clinic_id}
+
+        evict(cache_events.CLINIC, [clinic_id])
+        assert clinic_details_cache.get((clinic_id, None)) is None
+        assert patient_details_cache.get(patient_id) is None
+
+        fx_rate_cache.set("rates", {"EUR": 1})
+        clinic_details_cache.set((clinic_id, None), {"id": clinic_id}, tags=["clinics"])
+        evict(cache_events.FX_RATES)
+        assert fx_rate_cache.get("rates") is None
+        assert clinic_details_cache.get((clinic_id, None)) is None
+
+    def test_patient_and_consultation_events(self):
+        patient_id = str(uuid.uuid4())
+        patient_details_cache.set(patient_id, {"id": patient_id})
+        consultations_cache.set("2026-10-18", [], tags=[CONSULTATIONS_TAG])
+
+        evict(cache_events.PATIENT, [patient_id])
+        evict(cache_events.CONSULTATION)
+
+        assert patient_details_cache.get(patient_id) is None
+        assert consultations_cache.get("2026-10-18") is None
+
+    def test_evict_all(self):
+        patient_details_cache.set("p", {"id": "p"})
+        fx_rate_cache.set("rates", {"EUR": 1})
+
+        evict_all()
+
+        assert patient_details_cache.get("p") is None and fx_rate_cache.get("rates") is None
+
+
+def test_unreachable_database_falls_back_to_periodic_flushes():
+    flushes = []
+    listener = InvalidationListener(
+        "postgresql://nobody@127.0.0.1:1/none",
+        "channel",
+        fallback_seconds=0.05,
+        on_event=lambda entity, ids: pytest.fail("no events without a connection"),
+        on_flush=lambda: flushes.append(time.monotonic()),
+        retry_seconds=0.01,
+    )
+    listener.start()
+    try:
+        wait_until(lambda: len(flushes) >= 3)
+    finally:
+        listener.stop()
+
+    assert not listener.stats()["connected"]
+    # retries are frequent, but flushes keep to the fallback interval
+    assert all(later - earlier >= 0.04 for earlier, later in zip(flushes, flushes[1:]))
+
+
+@pytest.fixture(scope="module")
+def database_url():
+    database_url = os.getenv("DATABASE_URL")
+    if not database_url or not database_url.startswith("postgresql"):
+        pytest.skip("DATABASE_URL must point at a Postgres database")
+    engine = create_engine(database_url)
+    try:
+        engine.connect().close()
+    except OperationalError as exc:
+        pytest.skip(f"Postgres not reachable: {exc}")
+    finally:
+        engine.dispose()
+    return database_url
+
+
+@pytest.fixture
+def notifier(database_url):
+    engine = create_engine(database_url)
+    yield engine
+    engine.dispose()
+
+
+def notify(engine, channel, payload):
+    with engine.begin() as connection:
+        connection.execute(select(func.pg_notify(channel, payload)))
+
+
+def test_listener_applies_notifications_from_other_workers(notifier):
+    channel = f"cache_test_{uuid.uuid4().hex[:8]}"
+    conninfo = notifier.url.set(drivername="postgresql").render_as_string(hide_password=False)
+    listener = RecordingListener(conninfo, channel, poll_seconds=0.1)
+    listener.start()
+    try:
+        wait_until(lambda: listener.stats()["connected"])
+        notify(notifier, channel, cache_events.encode_event(cache_events.CLINIC, ["mine"]))
+        notify(notifier, channel, foreign_event("package", ["7"]))
+        wait_until(lambda: listener.events == [("package", ["7"])])
+        assert listener.stats()["received"] == 2
+        assert not listener.flushed.is_set()
+    finally:
+        listener.stop()
+
+
+def test_listener_flushes_and_resubscribes_after_losing_its_connection(notifier):
+    channel = f"cache_test_{uuid.uuid4().hex[:8]}"
+    conninfo = notifier.url.set(drivername="postgresql").render_as_string(hide_password=False)
+    listener = RecordingListener(conninfo, channel, fallback_seconds=0.5, poll_seconds=0.1, retry_seconds=0.05)
+    listener.start()
+    try:
+        wait_until(lambda: listener.stats()["connected"])
+        with notifier.begin() as connection:
+            connection.execute(
+                text("SELECT pg_terminate_backend(pid) FROM pg_stat_activity WHERE query ILIKE :listen"),
+                {"listen": f'%LISTEN "{channel}"%'},
+            )
+        wait_until(lambda: listener.stats()["reconnects"] == 1 and listener.stats()["connected"])
+        assert listener.flushed.is_set()
+
+        notify(notifier, channel, foreign_event("clinic"))
+        wait_until(lambda: listener.events == [("clinic", None)])
+    finally:
+        listener.stop()
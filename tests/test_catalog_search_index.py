@@ -0,0 +1,286 @@
+"""
+Tests for the in-memory faceted catalog index behind /api/clinics/search.
+"""
+
+import random
+import uuid
+from datetime import datetime, timezone
+from decimal import Decimal
+from types import SimpleNamespace
+
+import pytest
+
+from app.services.catalog_search_index import CatalogSearchIndex, CatalogSearchQuery
+from app.utils.opening_hours_utils import OpeningHoursUtils
+
+
+PLACES = [("Turkey", "Istanbul"), ("Turkey", "Izmir"), ("Spain", "Madrid"), ("Mexico", "Tijuana")]
+# Stored method values (migration 011) and the token the method facet uses
+METHOD_TOKENS = {
+    "FUE Transplant Method": "fue",
+    "DHI Transplant Method": "dhi",
+    "FUT Transplant Method": "fut",
+    "Sapphire FUE Method": "sapphire fue",
+}
+METHODS = [*METHOD_TOKENS, None]
+GRAFTS = ["2000", "3000", "4000+", None]
+OPENING_HOURS = [
+    None,
+    {"Mon-Fri": "9:00 AM - 6:00 PM", "Saturday": "10 AM - 2 PM", "Sunday": "Closed"},
+    {"monday": "Open 24 hours", "tuesday": "8-11 PM", "friday": "10pm - 2am"},
+    [{"day": "Sat-Sun", "hours": "noon-midnight"}],
+]
+
+
+def make_clinic(rng, index):
+    country, city = rng.choice(PLACES)
+    return SimpleNamespace(
+        id=uuid.uuid4(),
+        title=f"Clinic {index}",
+        country=country,
+        city=city,
+        has_contract=rng.random() < 0.3,
+        rating=rng.choice([None, 2.5, 3.0, 3.9, 4.0, 4.4, 4.5, 5.0]),
+        reviews_count=rng.choice([None, 0, 12, 150, 900]),
+        opening_hours_bitmap=OpeningHoursUtils.parse(rng.choice(OPENING_HOURS)),
+        timezone=OpeningHoursUtils.resolve_timezone(None, country),
+    )
+
+
+RATES = {"USD": Decimal("1"), "EUR": Decimal("1.08")}
+
+
+def make_package(rng, clinic_id=None):
+    currency = rng.choice(["USD", "EUR"])
+    price = rng.choice([None, Decimal("1200.00"), Decimal("1500.00"), Decimal("2499.99"), Decimal("3800"), Decimal("5200")])
+    return SimpleNamespace(
+        id=uuid.uuid4(),
+        clinic_id=clinic_id,
+        is_active=rng.random() < 0.85,
+        hair_transplantation_method=rng.choice(METHODS),
+        grafts_count=rng.choice(GRAFTS),
+        currency=currency,
+        price=price,
+        price_normalized=None if price is None else (price * RATES[currency]).quantize(Decimal("0.01")),
+        hotel_star_rating=rng.choice([0, 3, 4, 5]),
+    )
+
+
+@pytest.fixture(scope="module")
+def catalog():
+    rng = random.Random(11)
+    clinics = [make_clinic(rng, index) for index in range(400)]
+    packages, links = [], []
+    for clinic in clinics:
+        for _ in range(rng.randint(0, 4)):
+            if rng.random() < 0.5:
+                packages.append(make_package(rng, clinic_id=clinic.id))
+            else:
+                package = make_package(rng)
+                packages.append(package)
+                links.append((clinic.id, package.id))
+    # Shared packages linked to several clinics
+    for _ in range(20):
+        package = make_package(rng)
+        packages.append(package)
+        links.extend((clinic.id, package.id) for clinic in rng.sample(clinics, 3))
+    return clinics, packages, links
+
+
+@pytest.fixture(scope="module")
+def index(catalog):
+    index = CatalogSearchIndex()
+    index.load(*catalog)
+    return index
+
+
+def clinic_passes(clinic, query):
+    if query.countries and clinic.country.lower() not in {c.lower() for c in query.countries}:
+        return False
+    if query.cities and clinic.city.lower() not in {c.lower() for c in query.cities}:
+        return False
+    if query.has_contract is not None and clinic.has_contract is not query.has_contract:
+        return False
+    if query.min_rating is not None and (clinic.rating is None or clinic.rating < query.min_rating):
+        return False
+    if query.min_reviews is not None and (clinic.reviews_count is None or clinic.reviews_count < query.min_reviews):
+        return False
+    if query.open_at is not None and not OpeningHoursUtils.is_open(
+        clinic.opening_hours_bitmap, clinic.timezone, query.open_at
+    ):
+        return False
+    return True
+
+
+def package_passes(package, query):
+    if not package.is_active:
+        return False
+    if query.methods and METHOD_TOKENS.get(package.hair_transplantation_method) not in {
+        METHOD_TOKENS.get(method, method.lower()) for method in query.methods
+    }:
+        return False
+    if query.grafts and package.grafts_count not in query.grafts:
+        return False
+    if query.currencies and package.currency not in query.currencies:
+        return False
+    if query.min_price is not None or query.max_price is not None:
+        price = package.price_normalized
+        if price is None:
+            return False
+        if query.min_price is not None and price < query.min_price:
+            return False
+        if query.max_price is not None and price > query.max_price:
+            return False
+    if query.min_hotel_stars is not None and package.hotel_star_rating < query.min_hotel_stars:
+        return False
+    return True
+
+
+def has_package_filters(query):
+    return bool(
+        query.methods
+        or query.grafts
+        or query.currencies
+        or query.min_price is not None
+        or query.max_price is not None
+        or query.min_hotel_stars is not None
+    )
+
+
+def brute_force(catalog, query):
+    clinics, packages, links = catalog
+    owned = {}
+    for package in packages:
+        if package.clinic_id:
+            owned.setdefault(package.clinic_id, set()).add(package.id)
+    for clinic_id, package_id in links:
+        owned.setdefault(clinic_id, set()).add(package_id)
+    by_id = {package.id: package for package in packages}
+
+    matches = []
+    for clinic in clinics:
+        if not clinic_passes(clinic, query):
+            continue
+        matching = {pid for pid in owned.get(clinic.id, ()) if package_passes(by_id[pid], query)}
+        if has_package_filters(query) and not matching:
+            continue
+        matches.append((clinic, matching))
+    matches.sort(key=lambda item: (-(item[0].rating or 0), -(item[0].reviews_count or 0), item[0].title.lower()))
+    return matches
+
+
+QUERIES = [
+    CatalogSearchQuery(),
+    CatalogSearchQuery(countries=["turkey"]),
+    CatalogSearchQuery(cities=["Istanbul", "madrid"], has_contract=True),
+    CatalogSearchQuery(min_rating=4.0, min_reviews=100),
+    CatalogSearchQuery(methods=["FUE", "DHI"]),
+    CatalogSearchQuery(methods=["Sapphire FUE Method", "fut"]),
+    CatalogSearchQuery(min_price=1500, max_price=2500, currencies=["USD"]),
+    CatalogSearchQuery(countries=["Turkey"], methods=["dhi"], grafts=["3000"], min_hotel_stars=4),
+    CatalogSearchQuery(max_price=100),
+    CatalogSearchQuery(open_at=datetime(2026, 10, 19, 7, 30, tzinfo=timezone.utc)),
+    CatalogSearchQuery(open_at=datetime(2026, 10, 24, 23, 0, tzinfo=timezone.utc), countries=["Mexico", "Spain"]),
+    CatalogSearchQuery(open_at=datetime(2026, 10, 20, 20, 0), methods=["FUE"]),
+]
+
+
+class TestCatalogSearchIndex:
+    """Test cases for CatalogSearchIndex.search."""
+
+    @pytest.mark.parametrize("query", QUERIES)
+    def test_matches_brute_force(self, index, catalog, query):
+        query.limit = 1000
+        result = index.search(query)
+        expected = brute_force(catalog, query)
+
+        assert result.total == len(expected)
+        assert [hit.clinic_id for hit in result.hits] == [clinic.id for clinic, _ in expected]
+        if has_package_filters(query):
+            for hit, (_, matching) in zip(result.hits, expected):
+                assert set(hit.package_ids) == matching
+
+    def test_pagination_slices_the_ordered_results(self, index):
+        everything = index.search(CatalogSearchQuery(limit=1000)).hits
+        page = index.search(CatalogSearchQuery(offset=40, limit=20)).hits
+
+        assert [hit.clinic_id for hit in page] == [hit.clinic_id for hit in everything[40:60]]
+
+    def test_clinic_facets_ignore_their_own_filter(self, index, catalog):
+        query = CatalogSearchQuery(countries=["Turkey"], has_contract=True)
+        facets = index.search(query).facets
+
+        for country in ("Turkey", "Spain", "Mexico"):
+            expected = len(brute_force(catalog, CatalogSearchQuery(countries=[country], has_contract=True)))
+            assert facets["country"].get(country, 0) == expected
+        with_contract = len(brute_force(catalog, CatalogSearchQuery(countries=["Turkey"], has_contract=True)))
+        assert facets["has_contract"]["true"] == with_contract
+
+    def test_package_facets_count_packages_in_scope(self, index, catalog):
+        clinics, packages, links = catalog
+        query = CatalogSearchQuery(countries=["Spain"], methods=["FUE"])
+        facets = index.search(query).facets
+
+        spanish = {clinic.id for clinic in clinics if clinic.country == "Spain"}
+        in_scope = {
+            package.id
+            for package in packages
+            if package.clinic_id in spanish
+        } | {package_id for clinic_id, package_id in links if clinic_id in spanish}
+        by_id = {package.id: package for package in packages}
+        expected = {}
+        for package_id in in_scope:
+            package = by_id[package_id]
+            if package.is_active and package.hair_transplantation_method:
+                token = METHOD_TOKENS[package.hair_transplantation_method]
+                expected[token] = expected.get(token, 0) + 1
+
+        assert facets["hair_transplantation_method"] == dict(
+            sorted(expected.items(), key=lambda item: (-item[1], item[0]))
+        )
+
+    def test_price_buckets_are_half_open(self):
+        rng = random.Random(3)
+        clinic = make_clinic(rng, 0)
+        prices = [Decimal("1499.99"), Decimal("1500"), Decimal("2500"), Decimal("4000")]
+        packages = []
+        for price in prices:
+            package = make_package(rng, clinic_id=clinic.id)
+            package.is_active, package.price_normalized = True, price
+            packages.append(package)
+        index = CatalogSearchIndex()
+        index.load([clinic], packages)
+
+        assert index.search(CatalogSearchQuery()).facets["price"] == {
+            "<1500": 1,
+            "1500-2500": 1,
+            "2500-4000": 1,
+            "4000+": 1,
+        }
+
+    def test_price_sort_orders_by_cheapest_matching_package(self, index, catalog):
+        query = CatalogSearchQuery(methods=["FUE"], sort="price", limit=1000)
+        hits = index.search(query).hits
+        by_id = {package.id: package for package in catalog[1]}
+
+        cheapest = [
+            min((by_id[package_id].price_normalized or Decimal("Infinity")) for package_id in hit.package_ids)
+            for hit in hits
+        ]
+        assert len(hits) == len(brute_force(catalog, query))
+        assert cheapest == sorted(cheapest)
+        assert [hit.clinic_id for hit in index.search(CatalogSearchQuery(methods=["FUE"], sort="price", offset=5, limit=5)).hits] == [
+            hit.clinic_id for hit in hits[5:10]
+        ]
+
+    def test_invalidate_forces_rebuild(self, catalog):
+        index = CatalogSearchIndex(max_age_seconds=3600)
+        index.load(*catalog)
+        calls = []
+        index.build_from_db = lambda db: calls.append(db)
+
+        index.ensure_fresh("db")
+        index.invalidate()
+        index.ensure_fresh("db")
+
+        assert calls == ["db"]
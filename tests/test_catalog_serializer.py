@@ -0,0 +1,206 @@
+"""
+Tests for the fast clinic/package serializer and FastJSONResponse.
+
+The serializer must produce byte-for-byte the JSON the response models dump
+by alias. The microbenchmark times one 100-clinic page through the previous
+path (model_validate per row, then dump and json.dumps like FastAPI's
+JSONResponse) against the fast path and prints per-page CPU time; it only
+runs with --benchmarks.
+"""
+
+import json
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+
+import pytest
+
+from app.database.entities import Clinic, Package
+from app.models.clinic import ClinicListResponse, PackageListResponse, PackageResponse
+from app.routers.clinic_router import _serialize_clinic
+from app.services.catalog_serializer import clinic_dict, clinic_dicts, package_dict, package_dicts
+from app.utils import FastJSONResponse
+
+
+NOW = datetime(2026, 10, 18, 12, 0, tzinfo=timezone.utc)
+
+
+def make_package(index, **overrides):
+    values = dict(
+        id=uuid.UUID(int=10_000 + index),
+        name=f"Package {index}",
+        description="FUE with hotel – İstanbul",
+        price=Decimal("1999.50"),
+        currency="EUR",
+        price_normalized=Decimal("2159.46"),
+        is_active=True,
+        created_at=NOW,
+        updated_at=NOW,
+        clinic_id=None,
+        grafts_count="4000",
+        hair_transplantation_method="FUE",
+        stem_cell_therapy_sessions=0,
+        airport_lounge_access_included=False,
+        airport_lounge_access_details=None,
+        breakfast_included=True,
+        hotel_name="Hotel",
+        hotel_nights_included=3,
+        hotel_star_rating=5,
+        private_translator_included=True,
+        vip_transfer_details=None,
+        aftercare_kit_supply_duration="6 months",
+        laser_sessions=1,
+        online_follow_ups_duration="12 months",
+        oxygen_therapy_sessions=2,
+        post_operation_medication_included=True,
+        prp_sessions_included=False,
+        sedation_included=True,
+    )
+    values.update(overrides)
+    return Package(**values)
+
+
+def make_clinic(index, package_ids=(), **overrides):
+    values = dict(
+        id=uuid.UUID(int=index),
+        title=f"Klinik {index} İstanbul",
+        rating=4.5,
+        reviews_count=index,
+        lat=41.0082,
+        lng=28.9784,
+        categories=["Hair Transplant"],
+        opening_hours={"monday": "9:00 AM - 6:00 PM"},
+        additional_info={"payments": [{"Credit cards": True}]},
+        timezone="Europe/Istanbul",
+        country="Turkey",
+        city="Istanbul",
+        has_contract=bool(index % 2),
+        package_ids=list(package_ids),
+        created_at=NOW,
+        updated_at=NOW - timedelta(days=index),
+    )
+    values.update(overrides)
+    return Clinic(**values)
+
+
+def render_previous(model) -> bytes:
+    """What FastAPI sent for a returned response model before the fast path."""
+    return json.dumps(
+        model.model_dump(mode="json", by_alias=True),
+        ensure_ascii=False,
+        allow_nan=False,
+        indent=None,
+        separators=(",", ":"),
+    ).encode("utf-8")
+
+
+class TestCatalogSerializer:
+    """Test cases for the dict serializer rendered through FastJSONResponse."""
+
+    def test_package_matches_response_model(self):
+        packages = [make_package(1), make_package(2, price=None, price_normalized=None, currency="TRY")]
+
+        for package in packages:
+            assert FastJSONResponse(package_dict(package)).body == render_previous(
+                PackageResponse.model_validate(package, from_attributes=True)
+            )
+        previous = PackageListResponse(
+            packages=[PackageResponse.model_validate(package, from_attributes=True) for package in packages],
+            total=2,
+        )
+        fast = FastJSONResponse({"packages": package_dicts(packages), "total": 2})
+        assert fast.body == render_previous(previous)
+        assert json.loads(fast.body)["packages"][0]["price"] == "1999.50"
+
+    def test_unset_attributes_fall_back_to_the_orm(self):
+        package = Package(id=uuid.UUID(int=1), name="Bare", currency="USD", created_at=NOW, updated_at=NOW)
+
+        assert package_dict(package)["is_active"] is None
+        assert package_dict(package)["hotel_name"] is None
+
+    def test_clinic_page_matches_response_model(self):
+        lookup = {package.id: package for package in (make_package(index) for index in range(3))}
+        clinics = [
+            make_clinic(1, package_ids=lookup),
+            make_clinic(2, categories=None, rating=None, opening_hours=None),
+            make_clinic(3, package_ids=[*lookup, uuid.UUID(int=99)]),
+        ]
+
+        previous = ClinicListResponse(
+            clinics=[_serialize_clinic(clinic, lookup) for clinic in clinics],
+            total=3,
+            page=1,
+            limit=20,
+            total_pages=1,
+        )
+        fast = FastJSONResponse({
+            "clinics": clinic_dicts(clinics, lookup),
+            "total": 3,
+            "page": 1,
+            "limit": 20,
+            "total_pages": 1,
+            "has_more": False,
+            "next_cursor": None,
+        })
+        assert fast.body == render_previous(previous)
+
+    def test_clinic_packages_from_relationship(self):
+        clinic = make_clinic(5)
+        clinic.packages = [make_package(1), make_package(2)]
+
+        data = json.loads(FastJSONResponse(clinic_dict(clinic)).body)
+        assert data == json.loads(render_previous(_serialize_clinic(clinic)))
+        assert data["packageIds"] == [str(uuid.UUID(int=10_001)), str(uuid.UUID(int=10_002))]
+        assert data["hasContract"] is True
+
+    def test_page_shares_package_dicts(self):
+        package = make_package(1)
+        clinics = [make_clinic(index, package_ids=[package.id]) for index in range(3)]
+
+        first, second, _ = clinic_dicts(clinics, {package.id: package})
+        assert first["packages"][0] is second["packages"][0]
+
+
+def cpu_per_page(render, repeat=20, rounds=5) -> float:
+    best = float("inf")
+    for _ in range(rounds):
+        started = time.process_time()
+        for _ in range(repeat):
+            render()
+        best = min(best, (time.process_time() - started) / repeat)
+    return best
+
+
+@pytest.mark.benchmark
+def test_microbenchmark_clinic_page_cpu():
+    lookup = {package.id: package for package in (make_package(index) for index in range(5))}
+    clinics = [make_clinic(index, package_ids=lookup) for index in range(100)]
+
+    def previous():
+        return render_previous(ClinicListResponse(
+            clinics=[_serialize_clinic(clinic, lookup) for clinic in clinics],
+            total=100,
+            page=1,
+            limit=100,
+            total_pages=1,
+        ))
+
+    def fast():
+        return FastJSONResponse({
+            "clinics": clinic_dicts(clinics, lookup),
+            "total": 100,
+            "page": 1,
+            "limit": 100,
+            "total_pages": 1,
+            "has_more": False,
+            "next_cursor": None,
+        }).body
+
+    assert previous() == fast()
+    before = cpu_per_page(previous)
+    after = cpu_per_page(fast)
+    print(
+        f"\n100-clinic page CPU: before {before * 1000:.2f} ms, after {after * 1000:.2f} ms"
+        f" ({before / after:.1f}x)"
+    )
@@ -0,0 +1,193 @@
+"""
+Tests for the pre-rendered catalog snapshot cache.
+"""
+
+import gzip
+import json
+import time
+from datetime import datetime, timedelta, timezone
+
+import brotli
+import pytest
+from starlette.requests import Request
+
+from app.services.catalog_snapshots import CatalogSnapshot, CatalogSnapshotCache, latest_updated_at
+
+
+UPDATED = datetime(2026, 10, 18, 9, 30, 15, 123456, tzinfo=timezone.utc)
+
+
+def make_request(**headers) -> Request:
+    return Request({
+        "type": "http",
+        "method": "GET",
+        "path": "/api/clinics/",
+        "headers": [(name.replace("_", "-").encode(), value.encode()) for name, value in headers.items()],
+    })
+
+
+class FakeSession:
+    def __init__(self):
+        self.closed = False
+
+    def rollback(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+
+class CountingBuilder:
+    def __init__(self, items=200):
+        self.calls = 0
+        self.items = items
+
+    def __call__(self, db):
+        self.calls += 1
+        payload = {"clinics": [{"name": f"Clinic {index}", "version": self.calls} for index in range(self.items)]}
+        return payload, UPDATED
+
+
+class TestCatalogSnapshot:
+    """Test cases for rendering and serving a single snapshot."""
+
+    @pytest.fixture
+    def snapshot(self):
+        return CatalogSnapshot.render(CountingBuilder()(None)[0], UPDATED, generation=0)
+
+    def test_variants_decode_to_the_same_body(self, snapshot):
+        assert json.loads(snapshot.body)["clinics"][0] == {"name": "Clinic 0", "version": 1}
+        assert gzip.decompress(snapshot.gzip) == snapshot.body
+        assert brotli.decompress(snapshot.brotli) == snapshot.body
+        assert len(snapshot.brotli) < len(snapshot.gzip) < len(snapshot.body)
+
+    def test_content_negotiation(self, snapshot):
+        plain = snapshot.to_response(make_request())
+        gzipped = snapshot.to_response(make_request(accept_encoding="gzip, deflate"))
+        preferred = snapshot.to_response(make_request(accept_encoding="gzip, deflate, br"))
+        refused = snapshot.to_response(make_request(accept_encoding="br;q=0, gzip"))
+
+        assert plain.body == snapshot.body and "content-encoding" not in plain.headers
+        assert gzipped.headers["content-encoding"] == "gzip" and gzipped.body == snapshot.gzip
+        assert preferred.headers["content-encoding"] == "br" and preferred.body == snapshot.brotli
+        assert refused.headers["content-encoding"] == "gzip"
+        for response in (plain, gzipped, preferred):
+            assert response.headers["etag"] == snapshot.etag
+            assert response.headers["last-modified"] == "Sun, 18 Oct 2026 09:30:15 GMT"
+            assert response.headers["vary"] == "Accept-Encoding"
+            assert response.media_type == "application/json"
+
+    def test_conditional_requests(self, snapshot):
+        assert snapshot.to_response(make_request(if_none_match=snapshot.etag)).status_code == 304
+        assert snapshot.to_response(make_request(if_none_match='W/"other"')).status_code == 200
+        assert snapshot.to_response(
+            make_request(if_modified_since="Sun, 18 Oct 2026 09:30:15 GMT")
+        ).status_code == 304
+        assert snapshot.to_response(
+            make_request(if_modified_since="Sun, 18 Oct 2026 09:30:14 GMT")
+        ).status_code == 200
+        # If-None-Match takes precedence over If-Modified-Since
+        assert snapshot.to_response(make_request(
+            if_none_match='W/"other"', if_modified_since="Mon, 19 Oct 2026 00:00:00 GMT"
+        )).status_code == 200
+
+    def test_small_bodies_are_not_compressed(self):
+        snapshot = CatalogSnapshot.render({"packages": [], "total": 0}, None, generation=0)
+
+        response = snapshot.to_response(make_request(accept_encoding="br, gzip"))
+        assert snapshot.gzip is None and snapshot.brotli is None
+        assert response.body == b'{"packages":[],"total":0}'
+        assert "last-modified" not in response.headers
+
+    def test_latest_updated_at(self):
+        class Row:
+            def __init__(self, updated_at):
+                self.updated_at = updated_at
+
+        rows = [Row(UPDATED), Row(None), Row(UPDATED + timedelta(seconds=5))]
+        assert latest_updated_at(rows) == UPDATED + timedelta(seconds=5)
+        assert latest_updated_at([]) is None
+
+
+class TestCatalogSnapshotCache:
+    """Test cases for caching, invalidation and background refresh."""
+
+    def test_hits_skip_the_builder(self):
+        cache = CatalogSnapshotCache(refresh_in_background=False)
+        builder = CountingBuilder()
+
+        first = cache.get_or_build(("clinics", 1, 20, None), builder, FakeSession())
+        second = cache.get_or_build(("clinics", 1, 20, None), builder, FakeSession())
+
+        assert first is second
+        assert builder.calls == 1
+
+    def test_invalidate_retires_every_snapshot(self):
+        cache = CatalogSnapshotCache(refresh_in_background=False)
+        builder = CountingBuilder()
+        cache.get_or_build("packages", builder, FakeSession())
+
+        cache.invalidate()
+
+        assert cache.get("packages") is None
+        rebuilt = cache.get_or_build("packages", builder, FakeSession())
+        assert json.loads(rebuilt.body)["clinics"][0]["version"] == 2
+
+    def test_missing_results_are_not_cached(self):
+        cache = CatalogSnapshotCache(refresh_in_background=False)
+
+        assert cache.get_or_build("clinic", lambda db: None, FakeSession()) is None
+        assert cache.get("clinic") is None
+
+    def test_ttl_zero_disables_caching(self):
+        cache = CatalogSnapshotCache(max_age_seconds=0, refresh_in_background=False)
+        builder = CountingBuilder()
+
+        assert cache.get_or_build("packages", builder, FakeSession()) is not None
+        assert cache.get("packages") is None
+
+    def test_least_recently_used_shape_is_evicted(self):
+        cache = CatalogSnapshotCache(max_entries=2, refresh_in_background=False)
+        for key in ("a", "b"):
+            cache.build(key, CountingBuilder(items=1), FakeSession())
+        cache.get("a")
+        cache.build("c", CountingBuilder(items=1), FakeSession())
+
+        assert cache.get("a") is not None
+        assert cache.get("b") is None
+
+    def test_background_refresh_after_write(self):
+        sessions = []
+
+        def session_factory():
+            sessions.append(FakeSession())
+            return sessions[-1]
+
+        cache = CatalogSnapshotCache(session_factory=session_factory)
+        builder = CountingBuilder()
+        cache.get_or_build("packages", builder, FakeSession())
+
+        cache.invalidate()
+        deadline = time.monotonic() + 5
+        while cache.get("packages") is None and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+        snapshot = cache.get("packages")
+        assert snapshot is not None
+        assert json.loads(snapshot.body)["clinics"][0]["version"] == 2
+        assert sessions and all(session.closed for session in sessions)
+
+    @pytest.mark.benchmark
+    def test_hot_read_costs_microseconds(self):
+        cache = CatalogSnapshotCache(refresh_in_background=False)
+        cache.build(("clinics", 1, 20, None), CountingBuilder(items=2000), FakeSession())
+        request = make_request(accept_encoding="gzip, br")
+
+        rounds = 2000
+        started = time.perf_counter()
+        for _ in range(rounds):
+            cache.get(("clinics", 1, 20, None)).to_response(request)
+        per_read = (time.perf_counter() - started) / rounds
+
+        print(f"\nsnapshot hit: {per_read * 1e6:.1f} µs")
+        assert per_read < 200e-6
@@ -0,0 +1,121 @@
+"""
+Tests for the in-memory clinic geo index behind /api/clinics/nearby.
+"""
+
+import math
+import random
+import uuid
+from types import SimpleNamespace
+
+import pytest
+
+from app.services.clinic_geo_index import ClinicGeoIndex, EARTH_RADIUS_KM
+
+
+def make_clinic(lat, lng, rating=4.5, has_contract=False, city=None, country=None):
+    return SimpleNamespace(
+        id=uuid.uuid4(),
+        lat=lat,
+        lng=lng,
+        rating=rating,
+        has_contract=has_contract,
+        city=city,
+        country=country,
+    )
+
+
+def haversine_km(lat1, lng1, lat2, lng2):
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    dphi = phi2 - phi1
+    dlam = math.radians(lng2 - lng1)
+    a = math.sin(dphi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(dlam / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(a))
+
+
+def brute_force(clinics, lat, lng, k, radius_km=None, min_rating=None, has_contract=None):
+    candidates = []
+    for clinic in clinics:
+        if has_contract is not None and clinic.has_contract is not has_contract:
+            continue
+        if min_rating is not None and (clinic.rating is None or clinic.rating < min_rating):
+            continue
+        distance = haversine_km(lat, lng, clinic.lat, clinic.lng)
+        if radius_km is not None and distance > radius_km:
+            continue
+        candidates.append((distance, clinic.id))
+    return [clinic_id for _, clinic_id in sorted(candidates)[:k]]
+
+
+@pytest.fixture(scope="module")
+def clinics():
+    rng = random.Random(7)
+    clinics = [
+        make_clinic(
+            rng.uniform(-89.9, 89.9),
+            rng.uniform(-180, 180),
+            rating=rng.choice([None, 3.0, 4.0, 4.5, 5.0]),
+            has_contract=rng.random() < 0.3,
+        )
+        for _ in range(3000)
+    ]
+    # A dense cluster, as in the real catalog
+    clinics += [
+        make_clinic(41.0 + rng.uniform(-0.3, 0.3), 29.0 + rng.uniform(-0.3, 0.3), city="Istanbul", country="Turkey")
+        for _ in range(500)
+    ]
+    return clinics
+
+
+@pytest.fixture(scope="module")
+def index(clinics):
+    index = ClinicGeoIndex(cell_km=50)
+    index.load(clinics)
+    return index
+
+
+class TestClinicGeoIndex:
+    """Test cases for ClinicGeoIndex.nearest and locate."""
+
+    @pytest.mark.parametrize(
+        "lat,lng",
+        [(41.0, 29.0), (89.5, 10.0), (-89.5, -170.0), (0.0, 179.9), (0.0, -179.9), (-33.9, 151.2)],
+    )
+    def test_matches_brute_force(self, index, clinics, lat, lng):
+        hits = index.nearest(lat, lng, k=15)
+
+        assert [hit.clinic_id for hit in hits] == brute_force(clinics, lat, lng, 15)
+        distances = [hit.distance_km for hit in hits]
+        assert distances == sorted(distances)
+
+    def test_filters_match_brute_force(self, index, clinics):
+        hits = index.nearest(48.8, 2.3, k=10, radius_km=4000, min_rating=4.0, has_contract=True)
+
+        assert [hit.clinic_id for hit in hits] == brute_force(
+            clinics, 48.8, 2.3, 10, radius_km=4000, min_rating=4.0, has_contract=True
+        )
+        assert all(hit.distance_km <= 4000 for hit in hits)
+
+    def test_radius_excludes_far_clinics(self, index):
+        assert index.nearest(41.0, 29.0, k=5, radius_km=0.001) == []
+
+    def test_upsert_moves_and_removes_clinics(self):
+        index = ClinicGeoIndex()
+        clinic = make_clinic(41.0, 29.0)
+        index.load([clinic])
+
+        clinic.lat, clinic.lng = -33.9, 151.2
+        index.upsert(clinic)
+        assert index.nearest(-33.9, 151.2, k=1)[0].distance_km < 1
+
+        clinic.lat = None
+        index.upsert(clinic)
+        assert len(index) == 0
+
+    def test_locate_resolves_city_then_country(self, index):
+        istanbul = index.locate("Istanbul, Turkey")
+        turkey = index.locate("Unknown Town, turkey")
+
+        assert istanbul is not None and haversine_km(*istanbul, 41.0, 29.0) < 10
+        assert turkey is not None
+        assert index.locate("Atlantis") is None
+        assert index.locate(None) is None
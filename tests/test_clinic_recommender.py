@@ -0,0 +1,213 @@
+"""
+Tests for the vectorised clinic recommender behind /api/patients/{id}/recommendations.
+"""
+
+import math
+import random
+import time
+import uuid
+from decimal import Decimal
+from types import SimpleNamespace
+
+import pytest
+
+from app.services.clinic_geo_index import EARTH_RADIUS_KM
+from app.services.clinic_recommender import (
+    DEFAULT_WEIGHTS,
+    DISTANCE_SCALE_KM,
+    ClinicRecommender,
+    PatientPreferences,
+    parse_grafts,
+    split_methods,
+)
+
+
+# Stored method values (migration 011) and the token patients' methods match on
+METHOD_TOKENS = {
+    "FUE Transplant Method": "fue",
+    "DHI Transplant Method": "dhi",
+    "FUT Transplant Method": "fut",
+    "Sapphire FUE Method": "sapphire fue",
+}
+
+
+def make_clinic(rng):
+    return SimpleNamespace(
+        id=uuid.uuid4(),
+        lat=rng.choice([None, rng.uniform(35, 45)]),
+        lng=rng.uniform(-10, 45),
+        rating=rng.choice([None, 3.5, 4.2, 4.8, 5.0]),
+        reviews_count=rng.choice([None, 0, 40, 800, 5000]),
+    )
+
+
+def make_package(rng, clinic_id):
+    return SimpleNamespace(
+        id=uuid.uuid4(),
+        clinic_id=clinic_id,
+        is_active=rng.random() < 0.9,
+        price_normalized=rng.choice([None, Decimal("1500"), Decimal("2400"), Decimal("3100"), Decimal("6000")]),
+        grafts_count=rng.choice([None, "2000", "3000", "4500", "Unlimited"]),
+        hair_transplantation_method=rng.choice([None, *METHOD_TOKENS]),
+    )
+
+
+@pytest.fixture(scope="module")
+def catalog():
+    rng = random.Random(5)
+    clinics = [make_clinic(rng) for _ in range(800)]
+    packages = [make_package(rng, clinic.id) for clinic in clinics for _ in range(rng.randint(1, 6))]
+    return clinics, packages
+
+
+@pytest.fixture(scope="module")
+def recommender(catalog):
+    recommender = ClinicRecommender()
+    recommender.load(*catalog)
+    return recommender
+
+
+def brute_force(catalog, preferences):
+    """Reference scoring, one pair at a time."""
+    clinics, packages = catalog
+    clinic_by_id = {clinic.id: clinic for clinic in clinics}
+    max_reviews = max(math.log1p(clinic.reviews_count or 0) for clinic in clinics) or 1.0
+    rows = []
+    for package in packages:
+        if not package.is_active:
+            continue
+        clinic = clinic_by_id[package.clinic_id]
+        features = {
+            "rating": min(1.0, (clinic.rating or 0.0) / 5),
+            "reviews": math.log1p(clinic.reviews_count or 0) / max_reviews,
+        }
+        target = preferences.grafts_max or preferences.grafts_min
+        if target:
+            grafts = parse_grafts(package.grafts_count)
+            features["grafts"] = 0.5 if math.isnan(grafts) else min(1.0, grafts / target)
+        if preferences.budget:
+            if package.price_normalized is None:
+                features["budget"] = 0.5
+            else:
+                over = (float(package.price_normalized) - preferences.budget) / preferences.budget
+                features["budget"] = 1.0 - min(1.0, max(0.0, over))
+        if preferences.origin:
+            if clinic.lat is None:
+                features["distance"] = 0.5
+            else:
+                phi1, phi2 = math.radians(preferences.origin[0]), math.radians(clinic.lat)
+                dlam = math.radians(clinic.lng - preferences.origin[1])
+                a = math.sin((phi2 - phi1) / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(dlam / 2) ** 2
+                km = 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(a))
+                features["distance"] = math.exp(-km / DISTANCE_SCALE_KM)
+        if preferences.methods:
+            method = METHOD_TOKENS.get(package.hair_transplantation_method)
+            features["method"] = 0.5 if not method else float(method in preferences.methods)
+        weight_total = sum(DEFAULT_WEIGHTS[name] for name in features)
+        score = sum(value * DEFAULT_WEIGHTS[name] / weight_total for name, value in features.items())
+        rows.append((score, clinic.id, package.id, features))
+    return rows
+
+
+PREFERENCES = [
+    PatientPreferences(),
+    PatientPreferences(grafts_min=3000, grafts_max=4500, budget=3000, currency="USD", methods=["fue", "dhi"]),
+    PatientPreferences(budget=2000, origin=(41.0, 29.0)),
+    PatientPreferences(grafts_max=2500, origin=(40.4, -3.7), methods=["sapphire fue"]),
+]
+
+
+class TestClinicRecommender:
+    """Test cases for ClinicRecommender.recommend."""
+
+    @pytest.mark.parametrize("preferences", PREFERENCES)
+    def test_matches_brute_force(self, recommender, catalog, preferences):
+        expected = sorted(brute_force(catalog, preferences), key=lambda row: -row[0])[:25]
+        results = recommender.recommend(preferences, k=25, distinct_clinics=False)
+
+        assert [rec.score for rec in results] == pytest.approx([row[0] for row in expected], abs=1e-3)
+        by_package = {row[2]: row for row in brute_force(catalog, preferences)}
+        for rec in results:
+            _, clinic_id, _, features = by_package[rec.package_id]
+            assert rec.clinic_id == clinic_id
+            assert rec.breakdown == pytest.approx(features, abs=1e-3)
+
+    def test_distinct_clinics_keeps_each_clinics_best_package(self, recommender, catalog):
+        preferences = PREFERENCES[1]
+        results = recommender.recommend(preferences, k=30)
+
+        clinic_ids = [rec.clinic_id for rec in results]
+        assert len(clinic_ids) == len(set(clinic_ids)) == 30
+        best = {}
+        for score, clinic_id, _, _ in brute_force(catalog, preferences):
+            best[clinic_id] = max(best.get(clinic_id, 0.0), score)
+        for rec in results:
+            assert rec.score == pytest.approx(best[rec.clinic_id], abs=1e-3)
+        assert [rec.score for rec in results] == sorted((rec.score for rec in results), reverse=True)
+
+    @pytest.mark.benchmark
+    def test_scoring_thousands_of_packages_is_fast(self, recommender):
+        assert len(recommender) > 2000
+        preferences = PatientPreferences(
+            grafts_max=4000, budget=2500, origin=(41.0, 29.0), methods=["dhi"]
+        )
+        recommender.recommend(preferences, k=10)
+
+        started = time.perf_counter()
+        for _ in range(20):
+            recommender.recommend(preferences, k=10)
+        assert (time.perf_counter() - started) / 20 < 0.05
+
+    def test_patient_methods_match_stored_method_values(self):
+        rng = random.Random(2)
+        clinic = make_clinic(rng)
+        fue, fut = (make_package(rng, clinic.id) for _ in range(2))
+        for package, method in ((fue, "FUE Transplant Method"), (fut, "FUT Transplant Method")):
+            package.is_active = True
+            package.hair_transplantation_method = method
+        recommender = ClinicRecommender()
+        recommender.load([clinic], [fue, fut])
+
+        preferences = PatientPreferences.from_analysis({"procedure_type": "FUE/DHI"})
+        results = recommender.recommend(preferences, k=2, distinct_clinics=False)
+
+        breakdowns = {rec.package_id: rec.breakdown for rec in results}
+        assert breakdowns[fue.id]["method"] == 1.0
+        assert breakdowns[fut.id]["method"] == 0.0
+
+    def test_inactive_packages_and_unknown_clinics_are_skipped(self):
+        rng = random.Random(1)
+        clinic = make_clinic(rng)
+        inactive = make_package(rng, clinic.id)
+        inactive.is_active = False
+        orphan = make_package(rng, uuid.uuid4())
+        orphan.is_active = True
+        recommender = ClinicRecommender()
+        recommender.load([clinic], [inactive, orphan])
+
+        assert recommender.recommend(PatientPreferences(), k=5) == []
+
+
+class TestPreferenceParsing:
+    """Test cases for parsing recommender inputs."""
+
+    def test_parse_grafts(self):
+        assert parse_grafts("3000") == 3000
+        assert parse_grafts("4,000+") == 4000
+        assert parse_grafts("Unlimited") == math.inf
+        assert math.isnan(parse_grafts(None))
+        assert math.isnan(parse_grafts("ask us"))
+
+    def test_from_analysis(self):
+        preferences = PatientPreferences.from_analysis({
+            "graft_estimate": {"min": 3000, "max": 4500},
+            "cost_estimate": {"min": 1800, "max": 3500, "currency": "USD"},
+            "procedure_type": "FUE/DHI",
+        })
+
+        assert (preferences.grafts_min, preferences.grafts_max) == (3000, 4500)
+        assert (preferences.budget, preferences.currency) == (3500, "USD")
+        assert preferences.methods == ["fue", "dhi"]
+        assert split_methods("Sapphire FUE or DHI") == ["sapphire fue", "dhi"]
+        assert split_methods("Sapphire FUE Method, FUE Transplant Method/fue") == ["sapphire fue", "fue"]
+        assert PatientPreferences.from_analysis(None) == PatientPreferences()
@@ -0,0 +1,49 @@
+"""
+Tests for the cached clinic totals used by the catalog listing.
+"""
+
+from unittest.mock import MagicMock
+
+import pytest
+
+from app.database.entities import Clinic
+from app.database.repositories.clinic_repository import ClinicRepository
+from app.services import catalog_invalidation
+from app.services.clinic_cache import count_clinics, invalidate_clinic_counts
+
+
+class TestClinicCountCache:
+    """Test cases for count_clinics."""
+
+    @pytest.fixture(autouse=True)
+    def clear_cache(self):
+        invalidate_clinic_counts()
+        yield
+        invalidate_clinic_counts()
+
+    @pytest.fixture
+    def db(self):
+        db = MagicMock()
+        db.query.return_value.scalar.return_value = 12
+        db.query.return_value.filter.return_value.scalar.return_value = 5
+        return db
+
+    def test_count_is_cached_per_has_contract_filter(self, db):
+        repository = ClinicRepository(db)
+
+        assert count_clinics(repository) == 12
+        assert count_clinics(repository) == 12
+        assert count_clinics(repository, has_contract=True) == 5
+        assert count_clinics(repository, has_contract=True) == 5
+
+        assert db.query.call_count == 2
+
+    def test_clinic_write_invalidates_counts(self, db):
+        repository = ClinicRepository(db)
+        count_clinics(repository)
+
+        clinic = repository.update_has_contract(Clinic(title="Clinic"), True)
+        catalog_invalidation.clinic_written(clinic)
+        count_clinics(repository)
+
+        assert db.query.call_count == 2
@@ -0,0 +1,210 @@
+"""
+Tests for the streaming clinic catalog export (export_clinics.py).
+
+The Postgres-backed test runs in a throw-away schema and checks that an
+incremental `--since` export merged into the previous snapshot matches a full
+export. It is skipped when no Postgres DATABASE_URL is reachable.
+"""
+
+import bisect
+import gzip
+import json
+import uuid
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+import export_clinics
+from app.database.entities import Clinic
+
+
+def make_clinic(index, rating=None):
+    return {
+        "id": str(uuid.UUID(int=index)),
+        "name": f"Klinik {index} – İstanbul",
+        "rating": rating,
+        "reviews": index,
+        "packages": [{"id": str(uuid.UUID(int=10_000 + index)), "price": 1999.5}] if index % 2 else [],
+        "opening_hours": {"monday": "9:00 AM - 6:00 PM"},
+    }
+
+
+def trailer(total, pages):
+    return {"total": total, "total_pages": pages, "exported_at": "2026-10-18T12:00:00+00:00", "source": "postgres.clinics"}
+
+
+class TestWriteExport:
+    """Test cases for write_export and iter_snapshot_clinics."""
+
+    def test_matches_json_dumps_layout(self, tmp_path):
+        clinics = [make_clinic(index, rating=4.5) for index in range(5)]
+        output = tmp_path / "clinics.json"
+
+        stats = export_clinics.write_export(iter(clinics), output, trailer=trailer)
+
+        expected = json.dumps({"clinics": clinics, **trailer(5, 1)}, indent=2, ensure_ascii=False)
+        assert output.read_text(encoding="utf-8") == expected
+        assert stats == {"total": 5, "pages": 1, "packages": 2}
+
+    def test_empty_catalog(self, tmp_path):
+        output = tmp_path / "clinics.json"
+        export_clinics.write_export(iter([]), output, trailer=trailer)
+
+        assert output.read_text() == json.dumps({"clinics": [], **trailer(0, 1)}, indent=2)
+        assert list(export_clinics.iter_snapshot_clinics(output)) == []
+
+    def test_snapshot_reader_streams_back_every_clinic(self, tmp_path):
+        clinics = [make_clinic(index) for index in range(50)]
+        output = tmp_path / "clinics.json"
+        export_clinics.write_export(iter(clinics), output, trailer=trailer, gzip_copy=True)
+
+        assert list(export_clinics.iter_snapshot_clinics(output, chunk_size=97)) == clinics
+        gzipped = tmp_path / "clinics.json.gz"
+        assert list(export_clinics.iter_snapshot_clinics(gzipped, chunk_size=97)) == clinics
+        assert gzip.decompress(gzipped.read_bytes()).decode("utf-8") == output.read_text(encoding="utf-8")
+        assert export_clinics.read_snapshot_exported_at(output).isoformat() == "2026-10-18T12:00:00+00:00"
+
+    def test_shards_and_stale_shard_cleanup(self, tmp_path):
+        output = tmp_path / "clinics.json"
+        export_clinics.write_export(
+            iter([make_clinic(index) for index in range(25)]), output, trailer=trailer, shard_size=10
+        )
+        stats = export_clinics.write_export(
+            iter([make_clinic(index) for index in range(12)]), output, trailer=trailer, shard_size=10
+        )
+
+        assert stats["pages"] == 2
+        assert sorted(path.name for path in tmp_path.iterdir()) == [
+            "clinics-page-1.json",
+            "clinics-page-2.json",
+            "clinics.json",
+        ]
+        second = json.loads((tmp_path / "clinics-page-2.json").read_text())
+        assert [clinic["id"] for clinic in second["clinics"]] == [str(uuid.UUID(int=10)), str(uuid.UUID(int=11))]
+        assert (second["page"], second["limit"]) == (2, 10)
+        assert json.loads(output.read_text())["total_pages"] == 2
+
+    def test_failed_export_keeps_the_previous_file(self, tmp_path):
+        output = tmp_path / "clinics.json"
+        export_clinics.write_export(iter([make_clinic(1)]), output, trailer=trailer)
+        before = output.read_text()
+
+        def broken():
+            yield make_clinic(2)
+            raise RuntimeError("database went away")
+
+        with pytest.raises(RuntimeError):
+            export_clinics.write_export(broken(), output, trailer=trailer)
+        assert output.read_text() == before
+        assert [path.name for path in tmp_path.iterdir()] == ["clinics.json"]
+
+
+def lookup(index, query, **facets):
+    """Reference client: prefix-match every query token, intersect, then filter by facets."""
+    terms = index["terms"]
+    result = set(range(index["docs"]))
+    for token in export_clinics.tokenize(query):
+        matches = set()
+        position = bisect.bisect_left(terms, token)
+        while position < len(terms) and terms[position].startswith(token):
+            matches.update(export_clinics.decode_postings(index["postings"][position]))
+            position += 1
+        result &= matches
+    for facet, value in facets.items():
+        result &= set(export_clinics.decode_postings(index["facets"][facet].get(value, [])))
+    return sorted(result)
+
+
+class TestSearchIndexBuilder:
+    """Test cases for the static search index written next to the export."""
+
+    CLINICS = [
+        {"name": "Estetik İstanbul Klinik", "city": "Istanbul", "country": "Turkey",
+         "categories": ["Hair Transplant", "Cosmetic Surgery"], "hasContract": True},
+        {"name": "Clínica Capilar Madrid", "city": "Madrid", "country": "Spain",
+         "categories": ["Hair Transplant"], "hasContract": False},
+        {"name": "Dr. Şahin Hair", "city": "Izmir", "country": "Turkey",
+         "categories": [], "hasContract": False},
+    ]
+
+    @pytest.fixture
+    def index(self):
+        builder = export_clinics.SearchIndexBuilder()
+        assert list(builder.feed(iter(self.CLINICS))) == self.CLINICS
+        return json.loads(json.dumps(builder.to_dict(exported_at="2026-10-18T12:00:00+00:00", shard_size=2)))
+
+    def test_tokenize_folds_case_and_accents(self):
+        assert export_clinics.tokenize("Dr. Şahin – İSTANBUL Clínica") == ["dr", "sahin", "istanbul", "clinica"]
+        assert export_clinics.tokenize(["Hair-Transplant", None]) == ["hair", "transplant"]
+
+    def test_prefix_queries_and_facets(self, index):
+        assert lookup(index, "istan") == [0]
+        assert lookup(index, "hair") == [0, 1, 2]
+        assert lookup(index, "Hair tr") == [0, 1]
+        assert lookup(index, "clinica") == [1]
+        assert lookup(index, "sahin turkey") == [2]
+        assert lookup(index, "hair", country="Turkey") == [0, 2]
+        assert lookup(index, "", hasContract="true") == [0]
+        assert lookup(index, "", categories="Cosmetic Surgery") == [0]
+        assert lookup(index, "nothing") == []
+
+    def test_layout(self, index):
+        assert index["terms"] == sorted(index["terms"])
+        assert len(index["terms"]) == len(index["postings"])
+        assert (index["version"], index["docs"], index["shardSize"]) == (1, 3, 2)
+        assert index["facets"]["country"] == {"Spain": [1], "Turkey": [0, 2]}
+
+
+@pytest.fixture(scope="module")
+def catalog_connection(pg_schema):
+    """A transactional connection onto a seeded throw-away schema."""
+    connection = pg_schema.connect()
+    connection.exec_driver_sql("""
+        INSERT INTO clinics (id, title, rating, reviews_count, country, city,
+                             has_contract, package_ids, created_at, updated_at)
+        SELECT gen_random_uuid(), 'Clinic ' || g,
+               CASE WHEN mod(g, 7) = 0 THEN NULL ELSE mod(g, 50) / 10.0 END,
+               CASE WHEN mod(g, 5) = 0 THEN NULL ELSE mod(g, 13) END,
+               'Turkey', 'Istanbul', false, '{}', now(), now() - interval '1 day'
+        FROM generate_series(1, 3000) AS g
+    """)
+    connection.commit()
+    return connection
+
+
+def test_incremental_export_matches_full_export(catalog_connection, tmp_path):
+    incremental = tmp_path / "incremental.json"
+    full = tmp_path / "full.json"
+    with Session(bind=catalog_connection) as session:
+        first = export_clinics.export_clinics(session, incremental, batch_size=200)
+        session.commit()
+        assert first["total"] == first["changed"] == 3000
+
+        catalog_connection.execute(text(
+            "UPDATE clinics SET rating = 5.0, updated_at = now() WHERE title IN ('Clinic 10', 'Clinic 2999')"
+        ))
+        catalog_connection.execute(text("DELETE FROM clinics WHERE title = 'Clinic 11'"))
+        session.add(Clinic(title="Brand new clinic", rating=4.91, reviews_count=3))
+        session.commit()
+
+        second = export_clinics.export_clinics(session, incremental, since="auto", batch_size=200)
+        session.commit()
+        export_clinics.export_clinics(session, full, batch_size=200)
+        session.commit()
+
+    assert second["changed"] == 3
+    merged = json.loads(incremental.read_text())
+    expected = json.loads(full.read_text())
+    assert merged["total"] == expected["total"] == 3000
+    assert merged["clinics"] == expected["clinics"]
+    names = [clinic["name"] for clinic in merged["clinics"]]
+    assert names[:3] == ["Clinic 2999", "Clinic 10", "Brand new clinic"]
+    assert "Clinic 11" not in names
+
+    merged_index = json.loads((tmp_path / "incremental-search.json").read_text())
+    full_index = json.loads((tmp_path / "full-search.json").read_text())
+    for index in (merged_index, full_index):
+        del index["exportedAt"]
+    assert merged_index == full_index
+    assert lookup(full_index, "brand new") == [2]
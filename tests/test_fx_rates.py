@@ -0,0 +1,177 @@
+"""
+Tests for FX rate loading and normalized package prices
+(016_fx_rates_normalized_price.sql)
+
+The Postgres-backed tests run in a throw-away schema and check that
+`price_normalized` is set on create and update, recomputed in bulk when rates
+change, and served by its index. They are skipped when no Postgres
+DATABASE_URL is reachable.
+"""
+
+import json
+from decimal import Decimal
+from pathlib import Path
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.config.settings import settings
+from app.database.entities import Package
+from app.database.repositories.package_repository import PackageRepository
+from app.services import fx_rates
+
+
+MIGRATIONS_DIR = Path(__file__).resolve().parent.parent / "migrations"
+
+
+@pytest.fixture
+def rate_file(tmp_path, monkeypatch):
+    def write(data):
+        path = tmp_path / "rates.json"
+        path.write_text(json.dumps(data))
+        monkeypatch.setattr(settings, "FX_RATES_FILE", str(path))
+        fx_rates.fx_rate_cache.clear()
+        return str(path)
+
+    yield write
+    fx_rates.fx_rate_cache.clear()
+
+
+class TestRateFile:
+    """Test cases for load_rates_file and to_base."""
+
+    def test_bundled_file_is_valid(self):
+        rates = fx_rates.load_rates_file(
+            str(Path(__file__).resolve().parent.parent / "app" / "config" / "fx_rates.json")
+        )
+
+        assert rates[settings.FX_BASE_CURRENCY] == 1
+        assert {"USD", "EUR", "GBP", "TRY"} <= set(rates)
+
+    def test_offline_conversion_uses_the_file(self, rate_file):
+        rate_file({"base": settings.FX_BASE_CURRENCY, "rates": {"EUR": "1.10"}})
+
+        assert fx_rates.to_base(Decimal("2000"), "eur") == Decimal("2200.00")
+        assert fx_rates.to_base(10, None) == Decimal("10.00")
+        assert fx_rates.to_base(None, "EUR") is None
+        with pytest.raises(ValueError):
+            fx_rates.to_base(10, "JPY")
+
+    @pytest.mark.parametrize(
+        "data",
+        [
+            {"base": "XXX", "rates": {"EUR": "1.1"}},
+            {"base": settings.FX_BASE_CURRENCY, "rates": {"EUR": "0"}},
+            {"base": settings.FX_BASE_CURRENCY, "rates": {"EUR": "lots"}},
+        ],
+    )
+    def test_malformed_files_are_rejected(self, rate_file, data):
+        path = rate_file(data)
+
+        with pytest.raises(ValueError):
+            fx_rates.load_rates_file(path)
+
+
+@pytest.fixture(scope="module")
+def migrated_connection(pg_schema):
+    """Seed pre-migration packages in an isolated namespace and apply migration 016."""
+    connection = pg_schema.connect(autocommit=True)
+    connection.exec_driver_sql("DROP INDEX idx_packages_active_price_normalized")
+    connection.exec_driver_sql("ALTER TABLE packages DROP COLUMN price_normalized")
+    connection.exec_driver_sql("DROP TABLE fx_rates")
+    connection.exec_driver_sql("""
+        INSERT INTO packages (id, name, price, currency, is_active, created_at, updated_at,
+                              stem_cell_therapy_sessions, airport_lounge_access_included, breakfast_included,
+                              hotel_nights_included, hotel_star_rating, private_translator_included,
+                              laser_sessions, oxygen_therapy_sessions, post_operation_medication_included,
+                              prp_sessions_included, sedation_included)
+        SELECT gen_random_uuid(), 'Package ' || g, 1000 + mod(g, 5000),
+               (ARRAY['USD', 'EUR', 'GBP', 'TRY'])[1 + mod(g, 4)],
+               true, now(), now() - interval '1 day', 0, false, false, 0, 0, false, 0, 0, false, false, false
+        FROM generate_series(1, 40000) AS g
+    """)
+    connection.exec_driver_sql(
+        (MIGRATIONS_DIR / "016_fx_rates_normalized_price.sql").read_text()
+    )
+    connection.exec_driver_sql("ANALYZE")
+    yield connection
+    fx_rates.fx_rate_cache.clear()
+
+
+def test_backfill_normalizes_every_priced_package(migrated_connection):
+    mismatched = migrated_connection.execute(text("""
+        SELECT count(*) FROM packages AS p JOIN fx_rates AS fx ON fx.currency = p.currency
+        WHERE p.price_normalized IS DISTINCT FROM round(p.price * fx.rate_to_base, 2)
+    """)).scalar()
+
+    assert mismatched == 0
+
+
+def test_price_range_uses_the_index(migrated_connection):
+    plan = "\n".join(
+        row[0]
+        for row in migrated_connection.execute(text(
+            "EXPLAIN SELECT id FROM packages WHERE is_active "
+            "AND price_normalized BETWEEN 1500 AND 1510 ORDER BY price_normalized"
+        ))
+    )
+
+    assert "idx_packages_active_price_normalized" in plan, plan
+
+
+def test_create_and_update_keep_price_normalized_in_sync(migrated_connection):
+    with Session(bind=migrated_connection) as session:
+        repository = PackageRepository(session)
+        package = repository.create(name="FX check", price=Decimal("2000"), currency="EUR")
+        try:
+            assert package.price_normalized == Decimal("2160.00")
+
+            package.currency = "GBP"
+            package = repository.save(package)
+            assert package.price_normalized == Decimal("2540.00")
+
+            package.price = None
+            package = repository.save(package)
+            assert package.price_normalized is None
+
+            package.name = "Renamed"
+            package.price = Decimal("100")
+            package = repository.save(package)
+            assert package.price_normalized == Decimal("127.00")
+        finally:
+            repository.delete(package.id)
+
+
+def test_apply_rates_recomputes_in_bulk(migrated_connection):
+    before = migrated_connection.execute(
+        text("SELECT max(updated_at) FROM packages WHERE currency = 'TRY'")
+    ).scalar()
+
+    with Session(bind=migrated_connection) as session:
+        updated = fx_rates.apply_rates(session, {"TRY": Decimal("0.03")})
+        unchanged = fx_rates.apply_rates(session, {"TRY": Decimal("0.03")})
+        assert fx_rates.get_rates(session)["TRY"] == Decimal("0.03")
+
+    assert updated > 0
+    assert unchanged == 0
+    row = migrated_connection.execute(text(
+        "SELECT price, price_normalized FROM packages WHERE currency = 'TRY' LIMIT 1"
+    )).one()
+    assert row.price_normalized == (row.price * Decimal("0.03")).quantize(Decimal("0.01"))
+    assert migrated_connection.execute(
+        text("SELECT max(updated_at) FROM packages WHERE currency = 'TRY'")
+    ).scalar() == before
+
+
+def test_list_sorts_and_filters_across_currencies(migrated_connection):
+    with Session(bind=migrated_connection) as session:
+        packages = PackageRepository(session).list(
+            min_price=Decimal("1200"), max_price=Decimal("1300"), sort="price"
+        )
+
+    prices = [package.price_normalized for package in packages]
+    assert prices and prices == sorted(prices)
+    assert all(Decimal("1200") <= price <= Decimal("1300") for price in prices)
+    assert len({package.currency for package in packages}) > 1
+    assert isinstance(packages[0], Package)
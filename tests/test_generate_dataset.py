@@ -0,0 +1,109 @@
+"""
+Tests for the synthetic dataset generator (generate_dataset.py).
+
+The Postgres-backed test COPYs a small dataset into a throw-away schema and
+checks referential shape, derived columns and that a reload is identical. It
+is skipped when no Postgres DATABASE_URL is reachable.
+"""
+
+import statistics
+import uuid
+from collections import Counter
+from datetime import datetime, timezone
+
+import pytest
+from sqlalchemy import text
+
+import generate_dataset
+from generate_dataset import DatasetGenerator, DatasetSpec
+
+
+SMALL = DatasetSpec(users=2000, clinics=300, packages=40, seed=7)
+
+
+class TestDatasetGenerator:
+    """Test cases for the row generators."""
+
+    @pytest.mark.parametrize("table", list(DatasetGenerator.TABLES))
+    def test_same_seed_same_rows(self, table):
+        first = list(DatasetGenerator(SMALL).rows(table))
+        second = list(DatasetGenerator(SMALL).rows(table))
+        other = list(DatasetGenerator(DatasetSpec(users=2000, clinics=300, packages=40, seed=8)).rows(table))
+
+        assert first == second
+        assert first != other
+        assert all(len(row) == len(DatasetGenerator.TABLES[table]) for row in first)
+
+    def test_messages_are_long_tailed_and_bursty(self):
+        rows = list(DatasetGenerator(SMALL).rows("messages"))
+        per_user = sorted(Counter(row[1] for row in rows).values())
+        per_day = Counter(row[-1].date() for row in rows)
+
+        assert statistics.median(per_user) * 20 < per_user[-1]
+        assert max(per_day.values()) > 5 * statistics.median(per_day.values())
+        assert {row[2] for row in rows} == {"incoming", "outgoing"}
+
+    def test_cross_table_references(self):
+        generator = DatasetGenerator(SMALL)
+        user_ids = {row[0] for row in generator.rows("users")}
+        profile_ids = {row[0] for row in generator.rows("patient_profiles")}
+        consultation_ids = {row[0] for row in generator.rows("appointment")}
+
+        assert {row[1] for row in generator.rows("patient_profiles")} <= user_ids
+        assert {row[1] for row in generator.rows("medical_backgrounds")} <= profile_ids
+        assert {row[11] for row in generator.rows("appointment")} <= profile_ids
+        assert {row[6] for row in generator.rows("consultant_notes")} - {None} <= consultation_ids
+        assert 0.55 < len(profile_ids) / len(user_ids) < 0.65
+
+    def test_copy_value_escapes(self):
+        assert generate_dataset.copy_value(None) == "\\N"
+        assert generate_dataset.copy_value("a\tb\\c\nd") == "a\\tb\\\\c\\nd"
+        assert generate_dataset.copy_value(b"\x01\xff") == "\\\\x01ff"
+        assert generate_dataset.copy_value([uuid.UUID(int=1)]) == "{00000000-0000-0000-0000-000000000001}"
+        assert generate_dataset.copy_value(False) == "f"
+        assert generate_dataset.copy_value(datetime(2026, 1, 2, tzinfo=timezone.utc)) == "2026-01-02T00:00:00+00:00"
+
+
+@pytest.fixture(scope="module")
+def empty_connection(pg_schema):
+    """A connection onto an empty throw-away schema."""
+    connection = pg_schema.connect()
+    connection.commit()
+    return connection
+
+
+def test_load_is_complete_and_reproducible(empty_connection):
+    def fingerprint():
+        return empty_connection.execute(text(
+            "SELECT md5(string_agg(id::text || created_at::text, ',' ORDER BY id)) FROM messages"
+        )).scalar()
+
+    stats = generate_dataset.generate_dataset(empty_connection, SMALL)
+
+    for table, rows in stats.items():
+        assert empty_connection.exec_driver_sql(f'SELECT count(*) FROM "{table}"').scalar() == rows
+    assert stats["messages"] > stats["users"] > stats["patient_profiles"] > stats["medical_backgrounds"]
+    assert empty_connection.execute(text("""
+        SELECT count(*) FROM clinics AS c
+        WHERE c.package_ids IS DISTINCT FROM coalesce(
+            (SELECT array_agg(cp.package_id ORDER BY cp.assigned_at, cp.package_id)
+             FROM clinic_packages AS cp WHERE cp.clinic_id = c.id),
+            '{}'::uuid[]
+        )
+    """)).scalar() == 0
+    assert empty_connection.execute(text(
+        "SELECT count(*) FROM packages WHERE price_normalized IS NULL"
+    )).scalar() == 0
+    assert empty_connection.execute(text(
+        "SELECT count(DISTINCT currency) FROM packages"
+    )).scalar() == 4
+    assert empty_connection.execute(text(
+        "SELECT count(*) FROM clinics WHERE (opening_hours IS NULL) <> (opening_hours_bitmap IS NULL)"
+    )).scalar() == 0
+
+    before = fingerprint()
+    with pytest.raises(RuntimeError):
+        generate_dataset.generate_dataset(empty_connection, SMALL)
+    empty_connection.rollback()
+    assert generate_dataset.generate_dataset(empty_connection, SMALL, truncate=True) == stats
+    assert fingerprint() == before
@@ -0,0 +1,91 @@
+"""
+Tests for keyset-paginated transcript reads in HistoryService.
+"""
+
+import uuid
+from datetime import datetime, timedelta, timezone
+from unittest.mock import Mock
+
+import pytest
+
+from app.database.entities import Message
+from app.database.repositories.message_repository import MessageRepository
+from app.database.repositories.user_repository import UserRepository
+from app.services.history_service import HistoryService
+from app.utils.cursor_utils import CursorUtils
+
+
+def make_message(created_at: datetime) -> Message:
+    return Message(id=uuid.uuid4(), direction="incoming", body="hi", created_at=created_at)
+
+
+class TestTranscriptPagination:
+    """Test cases for HistoryService.get_transcript_page."""
+
+    @pytest.fixture
+    def message_repo(self):
+        return Mock(spec=MessageRepository)
+
+    @pytest.fixture
+    def history_service(self, message_repo):
+        return HistoryService(Mock(spec=UserRepository), message_repo)
+
+    def test_cursor_round_trip(self):
+        """Cursors decode back to the (created_at, id) sort key they were built from."""
+        created_at = datetime(2025, 1, 1, 12, 30, tzinfo=timezone.utc)
+        row_id = uuid.uuid4()
+
+        cursor = CursorUtils.encode(created_at, row_id)
+
+        assert CursorUtils.decode_uuid(cursor) == (created_at, row_id)
+
+    def test_malformed_cursor_raises_value_error(self):
+        with pytest.raises(ValueError):
+            CursorUtils.decode_uuid("not-a-cursor")
+
+    def test_next_cursor_points_at_last_row_when_more_rows_exist(self, history_service, message_repo):
+        """The repository over-fetches by one row; the extra row only signals another page."""
+        now = datetime.now(timezone.utc)
+        rows = [make_message(now - timedelta(minutes=i)) for i in range(4)]
+        message_repo.list_page_by_user.return_value = rows
+        user_id = uuid.uuid4()
+
+        messages, next_cursor = history_service.get_transcript_page(user_id, limit=3)
+
+        assert messages == rows[:3]
+        assert CursorUtils.decode_uuid(next_cursor) == (rows[2].created_at, rows[2].id)
+        message_repo.list_page_by_user.assert_called_once_with(
+            user_id,
+            limit=3,
+            after=None,
+            newest_first=True,
+            direction=None,
+            since=None,
+            until=None,
+        )
+
+    def test_last_page_has_no_cursor(self, history_service, message_repo):
+        message_repo.list_page_by_user.return_value = [make_message(datetime.now(timezone.utc))]
+
+        messages, next_cursor = history_service.get_transcript_page(uuid.uuid4(), limit=3)
+
+        assert len(messages) == 1
+        assert next_cursor is None
+
+    def test_cursor_is_forwarded_as_keyset_bound(self, history_service, message_repo):
+        created_at = datetime(2025, 1, 1, tzinfo=timezone.utc)
+        row_id = uuid.uuid4()
+        message_repo.list_page_by_user.return_value = []
+
+        history_service.get_transcript_page(
+            uuid.uuid4(),
+            limit=10,
+            cursor=CursorUtils.encode(created_at, row_id),
+            newest_first=False,
+            direction="outgoing",
+        )
+
+        kwargs = message_repo.list_page_by_user.call_args.kwargs
+        assert kwargs["after"] == (created_at, row_id)
+        assert kwargs["newest_first"] is False
+        assert kwargs["direction"] == "outgoing"
@@ -0,0 +1,169 @@
+"""
+Tests for the hot lookup index migration (012_hot_lookup_indexes.sql)
+
+These tests build the ORM schema inside a throw-away Postgres schema, apply the
+migration, load realistic row counts and assert that the planner picks an index
+for each hot query. They are skipped when no Postgres DATABASE_URL is reachable.
+"""
+
+from pathlib import Path
+
+import pytest
+from sqlalchemy import text
+
+
+MIGRATIONS_DIR = Path(__file__).resolve().parent.parent / "migrations"
+
+# (name, query, expected index) - queries mirror the repository/service lookups
+HOT_QUERIES = [
+    (
+        "conversation_state_by_device",
+        "SELECT * FROM conversation_states WHERE device_id = 'device-4242' "
+        "ORDER BY locked_at DESC LIMIT 1",
+        "idx_conversation_states_device_id_locked_at",
+    ),
+    (
+        "recent_messages_by_user",
+        "SELECT * FROM messages WHERE user_id = (SELECT id FROM users WHERE phone_number = 'whatsapp:+90000000042') "
+        "ORDER BY created_at DESC LIMIT 10",
+        "idx_messages_user_id_created_at",
+    ),
+    (
+        "user_by_phone_number",
+        "SELECT * FROM users WHERE phone_number = 'whatsapp:+90000000042' LIMIT 1",
+        "users_phone_number_key",
+    ),
+    (
+        "patient_by_email",
+        "SELECT * FROM patient_profiles WHERE email = 'patient42@example.com'",
+        "idx_patient_profiles_email",
+    ),
+    (
+        "todays_consultations",
+        "SELECT * FROM appointment WHERE \"startTime\" >= '2025-01-10 00:00' "
+        "AND \"startTime\" <= '2025-01-10 23:59:59' ORDER BY \"startTime\"",
+        "idx_appointment_start_time",
+    ),
+    (
+        "consultation_by_cal_booking_id",
+        "SELECT * FROM appointment WHERE \"zoomMeetingId\" = 'cal-4242'",
+        "idx_appointment_zoom_meeting_id",
+    ),
+    (
+        "notes_by_patient",
+        "SELECT * FROM consultant_notes WHERE patient_profile_id = "
+        "(SELECT id FROM patient_profiles WHERE email = 'patient42@example.com') "
+        "AND is_private = false ORDER BY \"createdAt\" DESC",
+        "idx_consultant_notes_patient_profile_id_created_at",
+    ),
+    (
+        "latest_image_submission_by_patient",
+        "SELECT * FROM patient_image_submissions WHERE patient_profile_id = "
+        "(SELECT id FROM patient_profiles WHERE email = 'patient42@example.com') "
+        "ORDER BY created_at DESC LIMIT 1",
+        "idx_patient_image_submissions_profile_id_created_at",
+    ),
+]
+
+SEED_STATEMENTS = [
+    """
+    INSERT INTO users (id, phone_number, name)
+    SELECT gen_random_uuid(), 'whatsapp:+9' || lpad(g::text, 10, '0'), 'User ' || g
+    FROM generate_series(1, 50000) AS g
+    """,
+    """
+    INSERT INTO messages (id, user_id, direction, body, created_at)
+    SELECT gen_random_uuid(), u.id,
+           CASE WHEN mod(g, 2) = 0 THEN 'incoming' ELSE 'outgoing' END,
+           'message ' || g,
+           now() - (g || ' seconds')::interval
+    FROM generate_series(1, 200000) AS g
+    JOIN LATERAL (
+        SELECT id FROM users WHERE phone_number = 'whatsapp:+9' || lpad((1 + mod(g, 5000))::text, 10, '0')
+    ) AS u ON true
+    """,
+    """
+    INSERT INTO patient_profiles (id, created_at, updated_at, deleted, user_id, name, phone, email, clinic_offer_ids)
+    SELECT gen_random_uuid(), now(), now(), false, u.id, u.name, u.phone_number,
+           'patient' || substr(u.phone_number, 12)::int || '@example.com', '{}'::uuid[]
+    FROM users AS u
+    """,
+    """
+    INSERT INTO conversation_states (id, created_at, updated_at, deleted, device_id, current_step, session_ttl, locked_at)
+    SELECT gen_random_uuid(), now(), now(), false, 'device-' || mod(g, 25000), 'initial_contact', 86400,
+           now() - (g || ' minutes')::interval
+    FROM generate_series(1, 50000) AS g
+    """,
+    """
+    INSERT INTO appointment (id, "createdAt", "updatedAt", "zoomMeetingId", topic, status, "attendeeName",
+                             "attendeeEmail", "rawPayload", "hostName", "hostEmail", "startTime")
+    SELECT gen_random_uuid()::text, now(), now(), 'cal-' || g, 'Consultation', 'scheduled', 'Patient ' || g,
+           'patient' || g || '@example.com', '{}'::jsonb, 'Host', 'host@example.com',
+           timestamp '2024-01-01' + (g || ' minutes')::interval
+    FROM generate_series(1, 50000) AS g
+    """,
+    """
+    INSERT INTO consultant_notes (id, "createdAt", "updatedAt", patient_profile_id, consultant_email,
+                                  note_content, note_type, is_private)
+    SELECT gen_random_uuid()::text, now() - (row_number() OVER () || ' minutes')::interval, now(), p.id,
+           'consultant@istanbulmedic.com', 'note', 'general', false
+    FROM patient_profiles AS p
+    """,
+    """
+    INSERT INTO patient_image_submissions (id, created_at, updated_at, deleted, patient_profile_id, image_urls)
+    SELECT gen_random_uuid(), now(), now(), false, p.id, ARRAY['https://example.com/' || p.id || '.jpg']
+    FROM patient_profiles AS p
+    """,
+]
+
+
+@pytest.fixture(scope="module")
+def indexed_connection(pg_schema):
+    """Create the schema in an isolated namespace, apply the migration and seed data."""
+    connection = pg_schema.connect(autocommit=True)
+    connection.exec_driver_sql(
+        (MIGRATIONS_DIR / "012_hot_lookup_indexes.sql").read_text()
+    )
+    for statement in SEED_STATEMENTS:
+        connection.exec_driver_sql(statement)
+    connection.exec_driver_sql("ANALYZE")
+    return connection
+
+
+def _plan(connection, query: str) -> str:
+    rows = connection.execute(text(f"EXPLAIN {query}")).fetchall()
+    return "\n".join(row[0] for row in rows)
+
+
+@pytest.mark.parametrize(
+    "query,index_name",
+    [(query, index_name) for _, query, index_name in HOT_QUERIES],
+    ids=[name for name, _, _ in HOT_QUERIES],
+)
+def test_hot_query_uses_index(indexed_connection, query, index_name):
+    """Each hot lookup should be answered through its dedicated index."""
+    plan = _plan(indexed_connection, query)
+
+    assert index_name in plan, plan
+    assert "Seq Scan" not in plan, plan
+
+
+def test_rollback_drops_indexes(indexed_connection):
+    """The rollback script removes every index added by the migration."""
+    migration_indexes = {index_name for _, _, index_name in HOT_QUERIES} - {"users_phone_number_key"}
+
+    indexed_connection.exec_driver_sql(
+        (MIGRATIONS_DIR / "012_hot_lookup_indexes_rollback.sql").read_text()
+    )
+    try:
+        remaining = {
+            row[0]
+            for row in indexed_connection.execute(
+                text("SELECT indexname FROM pg_indexes WHERE schemaname = current_schema()")
+            )
+        }
+        assert migration_indexes.isdisjoint(remaining)
+    finally:
+        indexed_connection.exec_driver_sql(
+            (MIGRATIONS_DIR / "012_hot_lookup_indexes.sql").read_text()
+        )
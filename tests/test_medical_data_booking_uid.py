@@ -0,0 +1,110 @@
+"""
+Tests for booking-UID lookups of medical questionnaire data
+(013_medical_background_booking_uid.sql)
+
+A throw-away Postgres schema is seeded with 50k patient profiles in the
+pre-migration shape, the migration is applied, and the lookup is checked for
+correct backfill, index usage and a single round trip. Skipped when no
+Postgres DATABASE_URL is reachable.
+"""
+
+from pathlib import Path
+
+import pytest
+from sqlalchemy import event, text
+from sqlalchemy.orm import Session
+
+from app.services.medical_data_service import MedicalDataService
+
+
+MIGRATIONS_DIR = Path(__file__).resolve().parent.parent / "migrations"
+PROFILE_COUNT = 50000
+
+SEED_STATEMENTS = [
+    f"""
+    INSERT INTO users (id, phone_number, name)
+    SELECT gen_random_uuid(), 'patient' || g || '@example.com', 'Patient ' || g
+    FROM generate_series(1, {PROFILE_COUNT}) AS g
+    """,
+    """
+    INSERT INTO patient_profiles (id, created_at, updated_at, deleted, user_id, name, phone, email, clinic_offer_ids)
+    SELECT gen_random_uuid(), now(), now(), false, u.id, u.name, u.phone_number, u.phone_number, '{}'::uuid[]
+    FROM users AS u
+    """,
+    # Half of the questionnaires kept the booking UID inside medical_data
+    """
+    INSERT INTO medical_backgrounds (id, created_at, updated_at, deleted, patient_profile_id, medical_data)
+    SELECT gen_random_uuid(), now(), now(), false, p.id,
+           CASE WHEN mod(row_number() OVER (ORDER BY p.email), 2) = 0
+                THEN jsonb_build_object('allergies', 'none', 'booking_uid', 'uid-' || p.email)
+                ELSE jsonb_build_object('allergies', 'none')
+           END
+    FROM patient_profiles AS p
+    """,
+    # ...the rest can only be recovered from the linked Cal.com booking
+    """
+    INSERT INTO appointment (id, "createdAt", "updatedAt", "zoomMeetingId", topic, status, "attendeeName",
+                             "attendeeEmail", "rawPayload", "hostName", "hostEmail", "startTime", patient_profile_id)
+    SELECT gen_random_uuid()::text, now(), now(), 'cal-' || p.email, 'Consultation', 'scheduled', p.name,
+           p.email, jsonb_build_object('data', jsonb_build_object('uid', 'uid-' || p.email)),
+           'Host', 'host@example.com', now(), p.id
+    FROM patient_profiles AS p
+    """,
+]
+
+
+@pytest.fixture(scope="module")
+def migrated_connection(pg_schema):
+    """Seed the pre-migration schema in an isolated namespace and apply migration 013."""
+    connection = pg_schema.connect(autocommit=True)
+    connection.exec_driver_sql("ALTER TABLE medical_backgrounds DROP COLUMN booking_uid")
+    for statement in SEED_STATEMENTS:
+        connection.exec_driver_sql(statement)
+    connection.exec_driver_sql(
+        (MIGRATIONS_DIR / "013_medical_background_booking_uid.sql").read_text()
+    )
+    connection.exec_driver_sql("ANALYZE")
+    return connection
+
+
+def test_migration_backfills_every_booking_uid(migrated_connection):
+    missing = migrated_connection.execute(
+        text("SELECT count(*) FROM medical_backgrounds WHERE booking_uid IS NULL")
+    ).scalar_one()
+
+    assert missing == 0
+
+
+def test_lookup_uses_booking_uid_index(migrated_connection):
+    rows = migrated_connection.execute(
+        text("EXPLAIN SELECT * FROM medical_backgrounds WHERE booking_uid = 'uid-patient4242@example.com'")
+    ).fetchall()
+    plan = "\n".join(row[0] for row in rows)
+
+    assert "idx_medical_backgrounds_booking_uid" in plan, plan
+    assert "Seq Scan" not in plan, plan
+
+
+@pytest.mark.parametrize("email", ["patient4242@example.com", "patient4243@example.com"])
+def test_service_lookup_is_a_single_query(migrated_connection, email):
+    """The service resolves the booking to its own patient in one round trip."""
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(migrated_connection, "before_cursor_execute", record)
+    try:
+        with Session(bind=migrated_connection) as session:
+            result = MedicalDataService(session).get_medical_data_by_booking_uid(f"uid-{email}")
+    finally:
+        event.remove(migrated_connection, "before_cursor_execute", record)
+
+    assert result is not None
+    assert result["patient_profile"]["email"] == email
+    assert len(statements) == 1
+
+
+def test_unknown_booking_uid_returns_none(migrated_connection):
+    with Session(bind=migrated_connection) as session:
+        assert MedicalDataService(session).get_medical_data_by_booking_uid("uid-missing") is None
@@ -0,0 +1,180 @@
+"""
+Tests for opening-hours bitmaps and the open-now clinic filter
+(017_clinic_opening_hours_bitmap.sql)
+
+The Postgres-backed tests run in a throw-away schema: pre-migration clinics are
+backfilled and the SQL `get_bit` filter is checked against the Python parser
+at instants across the week. They are skipped when no Postgres DATABASE_URL is
+reachable.
+"""
+
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.database.entities import Clinic
+from app.database.repositories.clinic_repository import ClinicRepository
+from app.utils.opening_hours_utils import BITMAP_BYTES, SLOTS_PER_DAY, OpeningHoursUtils
+
+
+MIGRATIONS_DIR = Path(__file__).resolve().parent.parent / "migrations"
+
+
+def open_slots(bitmap):
+    bits = int.from_bytes(bitmap, "little")
+    return {slot for slot in range(BITMAP_BYTES * 8) if bits >> slot & 1}
+
+
+def day_slots(day, start_hour, end_hour):
+    return set(range(day * SLOTS_PER_DAY + start_hour * 4, day * SLOTS_PER_DAY + end_hour * 4))
+
+
+class TestParse:
+    """Test cases for OpeningHoursUtils.parse."""
+
+    def test_scraped_weekday_dict(self):
+        bitmap = OpeningHoursUtils.parse({
+            "monday": "9:00 AM - 6:00 PM",
+            "tuesday": "9:00 AM - 6:00 PM",
+            "sunday": "Closed",
+        })
+
+        assert len(bitmap) == BITMAP_BYTES
+        assert open_slots(bitmap) == day_slots(0, 9, 18) | day_slots(1, 9, 18)
+
+    def test_list_form_with_day_ranges(self):
+        bitmap = OpeningHoursUtils.parse([
+            {"day": "Mon-Fri", "hours": "09:00–17:30"},
+            {"day": "Saturday", "hours": "10 AM to 1 PM"},
+        ])
+
+        expected = set().union(*(day_slots(day, 9, 17) for day in range(5)))
+        expected |= {day * SLOTS_PER_DAY + 17 * 4 + extra for day in range(5) for extra in (0, 1)}
+        assert open_slots(bitmap) == expected | day_slots(5, 10, 13)
+
+    @pytest.mark.parametrize(
+        "hours, expected",
+        [
+            ("Open 24 hours", day_slots(2, 0, 24)),
+            ("11-2 PM, 3:30pm to 7", day_slots(2, 11, 14) | day_slots(2, 16, 19) | {2 * SLOTS_PER_DAY + 62, 2 * SLOTS_PER_DAY + 63}),
+            ("8 AM - 12", day_slots(2, 8, 12)),
+            ("noon-midnight", day_slots(2, 12, 24)),
+            ("8:10am - 9:05am", set(range(2 * SLOTS_PER_DAY + 32, 2 * SLOTS_PER_DAY + 37))),
+        ],
+    )
+    def test_time_ranges(self, hours, expected):
+        assert open_slots(OpeningHoursUtils.parse({"wednesday": hours})) == expected
+
+    def test_overnight_hours_wrap_into_the_next_day_and_week(self):
+        friday = open_slots(OpeningHoursUtils.parse({"friday": "10pm - 2am"}))
+        sunday = open_slots(OpeningHoursUtils.parse({"sunday": "10 PM - 2"}))
+
+        assert friday == day_slots(4, 22, 24) | day_slots(5, 0, 2)
+        assert sunday == day_slots(6, 22, 24) | day_slots(0, 0, 2)
+
+    @pytest.mark.parametrize("opening_hours", [None, "9-5", {}, {"monday": "by appointment"}, {"holidays": "Closed"}])
+    def test_unparseable_hours_give_none(self, opening_hours):
+        assert OpeningHoursUtils.parse(opening_hours) is None
+
+    def test_all_closed_is_known_but_empty(self):
+        assert OpeningHoursUtils.parse({"sunday": "Closed"}) == bytes(BITMAP_BYTES)
+
+
+class TestTimezones:
+    """Test cases for resolve_timezone and is_open."""
+
+    def test_resolution_order(self):
+        assert OpeningHoursUtils.resolve_timezone({"timezone": "Asia/Tokyo"}, "Turkey", 29.0) == "Asia/Tokyo"
+        assert OpeningHoursUtils.resolve_timezone({"timezone": "Mars/Olympus"}, " Turkey ") == "Europe/Istanbul"
+        assert OpeningHoursUtils.resolve_timezone(None, "Atlantis", 44.5) == "Etc/GMT-3"
+        assert OpeningHoursUtils.resolve_timezone(None, None, -74.0) == "Etc/GMT+5"
+        assert OpeningHoursUtils.resolve_timezone(None) == "UTC"
+
+    def test_is_open_uses_the_clinic_timezone(self):
+        bitmap = OpeningHoursUtils.parse({"monday": "9:00 AM - 6:00 PM"})
+        # 2026-10-19 is a Monday; Istanbul is UTC+3
+        monday_0600_utc = datetime(2026, 10, 19, 6, 0, tzinfo=timezone.utc)
+
+        assert OpeningHoursUtils.is_open(bitmap, "Europe/Istanbul", monday_0600_utc)
+        assert not OpeningHoursUtils.is_open(bitmap, "Europe/Istanbul", monday_0600_utc - timedelta(minutes=1))
+        assert not OpeningHoursUtils.is_open(bitmap, "UTC", monday_0600_utc)
+        assert OpeningHoursUtils.is_open(bitmap, "UTC", datetime(2026, 10, 19, 9, 0))
+        assert not OpeningHoursUtils.is_open(None, "UTC", monday_0600_utc)
+
+
+OPENING_HOURS_SQL = """
+    (ARRAY[
+        NULL,
+        '{"monday": "9:00 AM - 6:00 PM", "tuesday": "9:00 AM - 6:00 PM", "wednesday": "9:00 AM - 6:00 PM",
+          "thursday": "9:00 AM - 6:00 PM", "friday": "9:00 AM - 5:00 PM", "saturday": "10 AM - 2 PM",
+          "sunday": "Closed"}',
+        '[{"day": "Mon-Sat", "hours": "08:30-20:00"}, {"day": "Sun", "hours": "Closed"}]',
+        '{"friday": "10pm - 2am", "saturday": "Open 24 hours", "timezone": "America/Bogota"}'
+    ]::jsonb[])[1 + mod(g, 4)]
+"""
+
+
+@pytest.fixture(scope="module")
+def migrated_connection(pg_schema):
+    """Seed pre-migration clinics in an isolated namespace, migrate and backfill."""
+    connection = pg_schema.connect(autocommit=True)
+    connection.exec_driver_sql("ALTER TABLE clinics DROP COLUMN opening_hours_bitmap, DROP COLUMN timezone")
+    connection.exec_driver_sql(f"""
+        INSERT INTO clinics (id, title, country, lng, opening_hours, has_contract, package_ids,
+                             created_at, updated_at)
+        SELECT gen_random_uuid(), 'Clinic ' || g,
+               (ARRAY['Turkey', 'Spain', NULL, 'Mexico'])[1 + mod(g, 4)],
+               (ARRAY[29.0, -3.7, 44.5, -99.1])[1 + mod(g / 4, 4)],
+               {OPENING_HOURS_SQL},
+               false, '{{}}', now(), now() - interval '1 day'
+        FROM generate_series(1, 2000) AS g
+    """)
+    connection.exec_driver_sql(
+        (MIGRATIONS_DIR / "017_clinic_opening_hours_bitmap.sql").read_text()
+    )
+    return connection
+
+
+def test_backfill_then_sql_filter_matches_python(migrated_connection):
+    before = migrated_connection.exec_driver_sql("SELECT max(updated_at) FROM clinics").scalar()
+    with Session(bind=migrated_connection) as session:
+        repository = ClinicRepository(session)
+        assert repository.backfill_opening_hours(batch_size=300) == 2000
+        assert repository.backfill_opening_hours(batch_size=300) == 0
+
+        rows = session.execute(select(Clinic.id, Clinic.opening_hours_bitmap, Clinic.timezone)).all()
+        start = datetime(2026, 10, 19, 0, 0, tzinfo=timezone.utc)
+        for hours in range(0, 7 * 24, 5):
+            at = start + timedelta(hours=hours, minutes=7 * hours)
+            expected = {row.id for row in rows if OpeningHoursUtils.is_open(row.opening_hours_bitmap, row.timezone, at)}
+            actual = set(session.scalars(select(Clinic.id).where(ClinicRepository.open_at_clause(at))))
+            assert actual == expected, at
+            assert repository.count(open_at=at) == len(expected)
+
+    assert migrated_connection.exec_driver_sql("SELECT max(updated_at) FROM clinics").scalar() == before
+    assert migrated_connection.exec_driver_sql(
+        "SELECT count(DISTINCT timezone) FROM clinics"
+    ).scalar() > 3
+
+
+def test_writes_keep_the_bitmap_in_sync(migrated_connection):
+    with Session(bind=migrated_connection) as session:
+        repository = ClinicRepository(session)
+        clinic = Clinic(title="Night clinic", country="Spain", opening_hours={"sunday": "Closed"})
+        session.add(clinic)
+        session.commit()
+        assert clinic.opening_hours_bitmap == bytes(BITMAP_BYTES)
+        assert clinic.timezone == "Europe/Madrid"
+
+        clinic = repository.update_fields(clinic, {"opening_hours": {"sunday": "9 PM - 3 AM"}, "country": "Turkey"})
+        sunday_2000_utc = datetime(2026, 10, 25, 20, 0, tzinfo=timezone.utc)
+        assert clinic.timezone == "Europe/Istanbul"
+        assert OpeningHoursUtils.is_open(clinic.opening_hours_bitmap, clinic.timezone, sunday_2000_utc)
+        page = repository.list_page(limit=5000, open_at=sunday_2000_utc)
+        assert clinic.id in {row.id for row in page}
+
+        session.delete(clinic)
+        session.commit()
@@ -0,0 +1,212 @@
+"""
+Tests for the patient detail read: the single-statement aggregate behind it and
+the cached payload that patient updates, offer changes and Cal.com bookings
+must retire.
+
+Runs against a throw-away schema and is skipped when no Postgres DATABASE_URL
+is reachable.
+"""
+
+import uuid
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.config.rate_limits import limiter
+from app.database.repositories.patient_profile_repository import PatientProfileRepository
+from app.dependencies.services import get_message_service
+from app.routers import patient_router, webhook
+from app.services.patient_cache import patient_details_cache
+
+
+FULL_ID, BARE_ID, EDITED_ID, OFFERED_ID, BOOKED_ID = (uuid.uuid4() for _ in range(5))
+CLINIC_IDS = [uuid.UUID(int=index) for index in (1, 2, 3)]
+
+
+@pytest.fixture(scope="module")
+def details_connection(pg_schema):
+    """
+    A connection onto a throw-away schema with three clinics and five patients.
+    Only FULL_ID has a medical background, consultations and offers.
+    """
+    connection = pg_schema.connect()
+    patients = [FULL_ID, BARE_ID, EDITED_ID, OFFERED_ID, BOOKED_ID]
+    connection.exec_driver_sql(
+        """
+        INSERT INTO clinics (id, title, city, rating, has_contract, package_ids, created_at, updated_at)
+        SELECT id, 'Clinic ' || n, 'Istanbul', 4.5, false, '{}', now(), now()
+        FROM unnest(%(clinics)s::uuid[]) WITH ORDINALITY AS c(id, n)
+        """,
+        {"clinics": CLINIC_IDS},
+    )
+    connection.exec_driver_sql(
+        """
+        INSERT INTO users (id, phone_number, name)
+        SELECT id, 'whatsapp:+90000000000' || n, 'User ' || n
+        FROM unnest(%(patients)s::uuid[]) WITH ORDINALITY AS p(id, n)
+        """,
+        {"patients": patients},
+    )
+    connection.exec_driver_sql(
+        """
+        INSERT INTO patient_profiles (id, created_at, updated_at, deleted, user_id, name, phone, email,
+                                      age, clinic_offer_ids)
+        SELECT id, now(), now(), false, id, 'Patient ' || n, 'whatsapp:+90000000000' || n,
+               'patient' || n || '@example.com', 30, CASE WHEN id = %(full)s THEN %(offers)s::uuid[] ELSE '{}' END
+        FROM unnest(%(patients)s::uuid[]) WITH ORDINALITY AS p(id, n)
+        """,
+        # offer order is deliberate: a repeat and a clinic that does not exist
+        {"patients": patients, "full": FULL_ID, "offers": [CLINIC_IDS[2], CLINIC_IDS[0], uuid.UUID(int=99), CLINIC_IDS[2]]},
+    )
+    connection.exec_driver_sql(
+        """
+        INSERT INTO medical_backgrounds (id, created_at, updated_at, deleted, patient_profile_id, medical_data)
+        VALUES (gen_random_uuid(), now(), now(), false, %(full)s, '{"allergies": "latex"}')
+        """,
+        {"full": FULL_ID},
+    )
+    # the newest start time wins, not the newest row or a row without a start time
+    connection.exec_driver_sql(
+        """
+        INSERT INTO appointment (id, "createdAt", "updatedAt", "zoomMeetingId", topic, status, "attendeeName",
+                                 "attendeeEmail", "rawPayload", "hostName", "hostEmail", patient_profile_id,
+                                 "startTime")
+        VALUES ('old', now() - interval '3 days', now(), 'booking-old', 'Consultation', 'completed', 'Patient 1',
+                'patient1@example.com', '{}', 'Host', 'host@example.com', %(full)s, timestamp '2026-01-01 10:00'),
+               ('latest', now() - interval '2 days', now(), 'booking-latest', 'Consultation', 'scheduled', 'Patient 1',
+                'patient1@example.com', '{}', 'Host', 'host@example.com', %(full)s, timestamp '2026-03-01 10:00'),
+               ('unscheduled', now(), now(), 'booking-unscheduled', 'Consultation', 'scheduled', 'Patient 1',
+                'patient1@example.com', '{}', 'Host', 'host@example.com', %(full)s, NULL)
+        """,
+        {"full": FULL_ID},
+    )
+    connection.commit()
+    return connection
+
+
+@pytest.fixture
+def statements(details_connection):
+    recorded = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        recorded.append(statement)
+
+    event.listen(details_connection, "before_cursor_execute", record)
+    yield recorded
+    event.remove(details_connection, "before_cursor_execute", record)
+
+
+@pytest.fixture
+def client(details_connection):
+    def get_db():
+        with Session(bind=details_connection) as session:
+            yield session
+
+    limiter.reset()
+    app = FastAPI()
+    app.state.limiter = limiter
+    app.include_router(patient_router.router)
+    app.include_router(webhook.router)
+    app.dependency_overrides[patient_router.get_db] = get_db
+    app.dependency_overrides[webhook.get_db] = get_db
+    app.dependency_overrides[get_message_service] = lambda: None
+    return TestClient(app)
+
+
+class TestGetAggregate:
+    """The patient detail aggregate is read in one statement."""
+
+    def test_patient_with_every_related_record(self, details_connection, statements):
+        with Session(bind=details_connection) as session:
+            aggregate = PatientProfileRepository(session).get_aggregate(str(FULL_ID))
+
+        assert len(statements) == 1
+        assert aggregate.profile.id == FULL_ID
+        assert aggregate.medical_background.medical_data == {"allergies": "latex"}
+        assert aggregate.latest_consultation.id == "latest"
+        # offer order, each clinic once, unknown ids dropped
+        assert [clinic.id for clinic in aggregate.offer_clinics] == [CLINIC_IDS[2], CLINIC_IDS[0]]
+
+    def test_patient_without_related_records(self, details_connection, statements):
+        with Session(bind=details_connection) as session:
+            aggregate = PatientProfileRepository(session).get_aggregate(BARE_ID)
+
+        assert len(statements) == 1
+        assert aggregate.profile.id == BARE_ID
+        assert aggregate.medical_background is None
+        assert aggregate.latest_consultation is None
+        assert aggregate.offer_clinics == []
+
+    def test_unknown_patient(self, details_connection):
+        with Session(bind=details_connection) as session:
+            assert PatientProfileRepository(session).get_aggregate(uuid.uuid4()) is None
+
+
+class TestDetailInvalidation:
+    """Writers retire the cached detail payload, so the next read is current."""
+
+    def get_cached(self, client, patient_id):
+        response = client.get(f"/api/patients/{patient_id}")
+        assert response.status_code == 200
+        assert patient_details_cache.get(str(patient_id)) is not None
+        return response.json()["data"]
+
+    def test_detail_payload(self, client):
+        details = self.get_cached(client, FULL_ID)
+
+        assert [clinic["id"] for clinic in details["offeredClinics"]] == [str(CLINIC_IDS[2]), str(CLINIC_IDS[0])]
+        assert details["medicalSummary"]["allergies"] == "latex"
+        assert details["consultationStatus"]["bookingUid"] == "booking-latest"
+        assert details["journeyStage"] == "consultation"
+
+    def test_profile_update(self, client):
+        self.get_cached(client, EDITED_ID)
+
+        response = client.put(
+            f"/api/patients/{EDITED_ID}",
+            json={"name": "Edited", "medicalSummary": {
+                "medications": "none", "medicationsDetails": "",
+                "allergies": "pollen", "allergiesDetails": "",
+                "medicalConditions": "none", "medicalConditionsDetails": "",
+                "previousSurgeries": "none", "previousSurgeriesDetails": "",
+            }},
+        )
+        assert response.status_code == 200
+        assert patient_details_cache.get(str(EDITED_ID)) is None
+
+        details = self.get_cached(client, EDITED_ID)
+        assert details["name"] == "Edited"
+        assert details["medicalSummary"]["allergies"] == "pollen"
+
+    def test_offer_change(self, client):
+        self.get_cached(client, OFFERED_ID)
+
+        response = client.post(f"/api/patients/{OFFERED_ID}/offers", json={"clinicIds": [str(CLINIC_IDS[1])]})
+        assert response.status_code == 200
+        assert patient_details_cache.get(str(OFFERED_ID)) is None
+
+        details = self.get_cached(client, OFFERED_ID)
+        assert [clinic["id"] for clinic in details["offeredClinics"]] == [str(CLINIC_IDS[1])]
+
+    def test_cal_booking(self, client):
+        self.get_cached(client, BOOKED_ID)
+
+        response = client.post("/api/cal-webhook", json={
+            "type": "BOOKING_CREATED",
+            "data": {
+                "id": "booking-new",
+                "title": "Consultation",
+                "startTime": "2026-05-01T10:00:00Z",
+                "status": "scheduled",
+                "attendees": [{"name": "Patient 5", "email": "patient5@example.com"}],
+            },
+        })
+        assert response.json()["result"]["patient_profile_linked"] is True
+        assert patient_details_cache.get(str(BOOKED_ID)) is None
+
+        details = self.get_cached(client, BOOKED_ID)
+        assert details["consultationStatus"]["bookingUid"] == "booking-new"
+        assert details["journeyStage"] == "consultation"
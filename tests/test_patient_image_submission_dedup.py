@@ -0,0 +1,158 @@
+"""
+Tests for URL-set hash deduplication of patient image submissions
+(014_patient_image_submissions_urls_hash.sql)
+
+The Postgres-backed tests seed pre-migration rows in a throw-away schema, apply
+the migration and check that the SQL backfill agrees with the Python digest and
+that lookups are a single indexed query. They are skipped when no Postgres
+DATABASE_URL is reachable.
+"""
+
+from pathlib import Path
+
+import pytest
+from sqlalchemy import event, text
+from sqlalchemy.orm import Session
+
+from app.database.entities import PatientImageSubmission
+from app.database.repositories.patient_image_submission_repository import (
+    PatientImageSubmissionRepository,
+)
+
+
+MIGRATIONS_DIR = Path(__file__).resolve().parent.parent / "migrations"
+
+
+class TestHashImageUrls:
+    """Test cases for PatientImageSubmission.hash_image_urls."""
+
+    def test_hash_ignores_url_order(self):
+        urls = ["https://cdn.example.com/b.jpg", "https://cdn.example.com/a.jpg"]
+
+        assert PatientImageSubmission.hash_image_urls(urls) == PatientImageSubmission.hash_image_urls(
+            reversed(urls)
+        )
+
+    def test_hash_counts_duplicates(self):
+        """Sorted-list equality treats [a, a] and [a] as different sets of uploads."""
+        single = PatientImageSubmission.hash_image_urls(["https://cdn.example.com/a.jpg"])
+        doubled = PatientImageSubmission.hash_image_urls(
+            ["https://cdn.example.com/a.jpg", "https://cdn.example.com/a.jpg"]
+        )
+
+        assert single != doubled
+
+
+@pytest.fixture(scope="module")
+def migrated_connection(pg_schema):
+    """Seed pre-migration submissions in an isolated namespace and apply migration 014."""
+    connection = pg_schema.connect(autocommit=True)
+    connection.exec_driver_sql(
+        "ALTER TABLE patient_image_submissions DROP COLUMN image_urls_hash"
+    )
+    connection.exec_driver_sql("""
+        INSERT INTO users (id, phone_number, name)
+        SELECT gen_random_uuid(), 'whatsapp:+9' || lpad(g::text, 10, '0'), 'User ' || g
+        FROM generate_series(1, 5000) AS g
+    """)
+    connection.exec_driver_sql("""
+        INSERT INTO patient_profiles (id, created_at, updated_at, deleted, user_id, name, phone, email, clinic_offer_ids)
+        SELECT gen_random_uuid(), now(), now(), false, u.id, u.name, u.phone_number,
+               'patient' || substr(u.phone_number, 12)::int || '@example.com', '{}'::uuid[]
+        FROM users AS u
+    """)
+    # Ten submissions per patient; URL order is deliberately unsorted
+    connection.exec_driver_sql("""
+        INSERT INTO patient_image_submissions (id, created_at, updated_at, deleted, patient_profile_id, image_urls)
+        SELECT gen_random_uuid(), now() - (g || ' minutes')::interval, now(), false, p.id,
+               ARRAY['https://cdn.example.com/' || p.id || '/' || g || '/side.jpg',
+                     'https://cdn.example.com/' || p.id || '/' || g || '/front.jpg']
+        FROM patient_profiles AS p CROSS JOIN generate_series(1, 10) AS g
+    """)
+    connection.exec_driver_sql(
+        (MIGRATIONS_DIR / "014_patient_image_submissions_urls_hash.sql").read_text()
+    )
+    connection.exec_driver_sql("ANALYZE")
+    return connection
+
+
+def _some_submission(connection):
+    return connection.execute(
+        text("SELECT id, patient_profile_id, image_urls, image_urls_hash FROM patient_image_submissions LIMIT 1")
+    ).one()
+
+
+def test_backfill_matches_python_digest(migrated_connection):
+    rows = migrated_connection.execute(
+        text("SELECT image_urls, image_urls_hash FROM patient_image_submissions LIMIT 200")
+    ).fetchall()
+
+    assert rows
+    for image_urls, image_urls_hash in rows:
+        assert image_urls_hash == PatientImageSubmission.hash_image_urls(image_urls)
+
+
+def test_lookup_is_a_single_indexed_query(migrated_connection):
+    submission_id, profile_id, image_urls, image_urls_hash = _some_submission(migrated_connection)
+    plan = "\n".join(
+        row[0]
+        for row in migrated_connection.execute(
+            text(
+                "EXPLAIN SELECT * FROM patient_image_submissions "
+                "WHERE patient_profile_id = :profile_id AND image_urls_hash = :digest"
+            ),
+            {"profile_id": profile_id, "digest": image_urls_hash},
+        )
+    )
+    assert "idx_patient_image_submissions_profile_id_urls_hash" in plan, plan
+
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(migrated_connection, "before_cursor_execute", record)
+    try:
+        with Session(bind=migrated_connection) as session:
+            match = PatientImageSubmissionRepository(session).find_by_profile_and_images(
+                patient_profile_id=profile_id,
+                image_urls=list(reversed(image_urls)),
+            )
+    finally:
+        event.remove(migrated_connection, "before_cursor_execute", record)
+
+    assert match is not None and match.id == submission_id
+    assert len(statements) == 1
+
+
+def test_subset_of_urls_does_not_match(migrated_connection):
+    _, profile_id, image_urls, _ = _some_submission(migrated_connection)
+
+    with Session(bind=migrated_connection) as session:
+        match = PatientImageSubmissionRepository(session).find_by_profile_and_images(
+            patient_profile_id=profile_id,
+            image_urls=image_urls[:1],
+        )
+
+    assert match is None
+
+
+def test_newest_duplicate_wins_and_hash_is_set_on_insert(migrated_connection):
+    _, profile_id, image_urls, _ = _some_submission(migrated_connection)
+
+    with Session(bind=migrated_connection) as session:
+        repository = PatientImageSubmissionRepository(session)
+        duplicate = repository.create(
+            patient_profile_id=profile_id,
+            image_urls=list(reversed(image_urls)),
+        )
+        try:
+            assert duplicate.image_urls_hash == PatientImageSubmission.hash_image_urls(image_urls)
+            match = repository.find_by_profile_and_images(
+                patient_profile_id=profile_id,
+                image_urls=image_urls,
+            )
+            assert match.id == duplicate.id
+        finally:
+            session.delete(duplicate)
+            session.commit()
@@ -0,0 +1,162 @@
+"""
+Tests for the keyset-paginated patient listing (GET /api/patients/).
+
+Runs against a throw-away schema seeded with 60 patients whose creation times
+tie in groups of six, so pages must break ties on id. Skipped when no
+Postgres DATABASE_URL is reachable.
+"""
+
+from datetime import datetime
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.config.rate_limits import limiter
+from app.routers import patient_router
+from app.utils import CursorUtils
+
+
+PATIENTS = 60
+
+
+def patient_name(g: int) -> str:
+    return f"Ayse {g}" if g % 10 == 0 else f"Patient {g}"
+
+
+@pytest.fixture(scope="module")
+def listing_connection(pg_schema):
+    """A connection onto a throw-away schema with 60 patients, six per creation day."""
+    connection = pg_schema.connect()
+    connection.exec_driver_sql(f"""
+        INSERT INTO users (id, phone_number, name)
+        SELECT ('00000000-0000-0000-0000-' || lpad(g::text, 12, '0'))::uuid,
+               'whatsapp:+9' || lpad(g::text, 10, '0'), 'User ' || g
+        FROM generate_series(1, {PATIENTS}) AS g
+    """)
+    connection.exec_driver_sql(f"""
+        INSERT INTO patient_profiles (id, created_at, updated_at, deleted, user_id, name, phone, email,
+                                      clinic_offer_ids)
+        SELECT gen_random_uuid(), timestamp '2026-01-01' + ((g - 1) / 6) * interval '1 day', now(), false,
+               ('00000000-0000-0000-0000-' || lpad(g::text, 12, '0'))::uuid,
+               CASE WHEN mod(g, 10) = 0 THEN 'Ayse ' ELSE 'Patient ' END || g,
+               'whatsapp:+9' || lpad(g::text, 10, '0'),
+               CASE WHEN mod(g, 15) = 0 THEN 'AYTEN' ELSE 'patient' END || g || '@example.com',
+               CASE WHEN mod(g, 3) = 0 THEN ARRAY[gen_random_uuid()] ELSE '{{}}'::uuid[] END
+        FROM generate_series(1, {PATIENTS}) AS g
+    """)
+    connection.commit()
+    return connection
+
+
+@pytest.fixture
+def client(listing_connection):
+    def get_db():
+        with Session(bind=listing_connection) as session:
+            yield session
+
+    limiter.reset()
+    app = FastAPI()
+    app.state.limiter = limiter
+    app.include_router(patient_router.router)
+    app.dependency_overrides[patient_router.get_db] = get_db
+    return TestClient(app)
+
+
+def names(response):
+    return {patient["name"] for patient in response.json()["data"]}
+
+
+def test_cursor_walk_has_no_gaps_or_duplicates(client, listing_connection):
+    expected = [
+        str(row_id)
+        for row_id in listing_connection.execute(
+            text("SELECT id FROM patient_profiles ORDER BY created_at DESC, id DESC")
+        ).scalars()
+    ]
+
+    seen, cursor = [], None
+    while True:
+        params = {"limit": 4, "fields": "id"}
+        if cursor:
+            params["cursor"] = cursor
+        body = client.get("/api/patients/", params=params).json()
+        assert body["count"] == len(body["data"]) <= 4
+        seen.extend(patient["id"] for patient in body["data"])
+        cursor = body["next_cursor"]
+        assert body["has_more"] is (cursor is not None)
+        if cursor is None:
+            break
+
+    # 4 does not divide the groups of 6 ties, so pages end in the middle of a tie
+    assert seen == expected
+
+
+def test_default_page_is_fifty(client):
+    body = client.get("/api/patients/").json()
+
+    assert body["count"] == 50
+    assert body["has_more"] is True
+    assert set(body["data"][0]) == set(patient_router.PATIENT_SUMMARY_FIELDS)
+
+
+def test_search_matches_a_name_or_email_prefix(client):
+    response = client.get("/api/patients/", params={"search": " ay ", "limit": 200})
+
+    # names starting "Ayse" (every 10th) or emails starting "AYTEN" (every 15th)
+    assert names(response) == {patient_name(g) for g in range(1, PATIENTS + 1) if g % 10 == 0 or g % 15 == 0}
+
+
+def test_created_range_is_half_open(client):
+    response = client.get(
+        "/api/patients/",
+        params={"createdFrom": "2026-01-02T00:00:00", "createdTo": "2026-01-04T00:00:00", "limit": 200},
+    )
+
+    # days 2 and 3 hold patients 7-18
+    assert names(response) == {patient_name(g) for g in range(7, 19)}
+    for patient in response.json()["data"]:
+        assert datetime(2026, 1, 2) <= datetime.fromisoformat(patient["created_at"]) < datetime(2026, 1, 4)
+
+
+@pytest.mark.parametrize("has_offers,remainder", [("true", 0), ("false", 1)])
+def test_has_offers_filter(client, has_offers, remainder):
+    response = client.get("/api/patients/", params={"hasOffers": has_offers, "limit": 200})
+
+    assert names(response) == {patient_name(g) for g in range(1, PATIENTS + 1) if (g % 3 == 0) == (remainder == 0)}
+    for patient in response.json()["data"]:
+        assert bool(patient["clinicOffers"]) is (has_offers == "true")
+
+
+@pytest.mark.parametrize("limit", [0, -1, 201])
+def test_limit_out_of_bounds_is_rejected(client, limit):
+    response = client.get("/api/patients/", params={"limit": limit})
+
+    assert response.status_code == 400
+    assert "limit" in response.json()["detail"]
+
+
+@pytest.mark.parametrize(
+    "cursor",
+    ["not-a-cursor", CursorUtils.encode(datetime(2026, 1, 1), "not-a-uuid")],
+)
+def test_invalid_cursor_is_rejected(client, cursor):
+    response = client.get("/api/patients/", params={"cursor": cursor})
+
+    assert response.status_code == 400
+
+
+def test_unchanged_page_answers_304(client):
+    first = client.get("/api/patients/", params={"limit": 5})
+    etag = first.headers["ETag"]
+
+    repeated = client.get("/api/patients/", params={"limit": 5}, headers={"If-None-Match": etag})
+    assert repeated.status_code == 304
+    assert repeated.headers["ETag"] == etag
+    assert repeated.content == b""
+
+    other_page = client.get("/api/patients/", params={"limit": 6}, headers={"If-None-Match": etag})
+    assert other_page.status_code == 200
+    assert other_page.headers["ETag"] != etag
@@ -0,0 +1,233 @@
+"""
+Tests for the tagged read cache: the in-process LRU and Redis-compatible
+backends, stampede protection and the tags catalog and consultation writes
+invalidate. The Redis backend runs against fakeredis.
+"""
+
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
+import pytest
+
+from app.services.consultation_service import ConsultationService
+from app.services.patient_cache import patient_details_cache
+from app.services.read_cache import (
+    CONSULTATIONS_TAG,
+    clinic_details_cache,
+    clinic_tag,
+    consultations_cache,
+    invalidate_catalog,
+    package_details_cache,
+    package_tag,
+)
+from app.utils import MemoryCacheBackend, RedisCacheBackend, SingleFlight, TaggedCache
+
+
+@pytest.fixture(params=["memory", "redis"])
+def backend(request):
+    if request.param == "memory":
+        return MemoryCacheBackend(max_entries=100)
+    fakeredis = pytest.importorskip("fakeredis")
+    return RedisCacheBackend(fakeredis.FakeRedis(), prefix=f"test-{uuid.uuid4().hex[:8]}:")
+
+
+class TestCacheBackends:
+    """Behaviour both backends share."""
+
+    def test_set_get_delete(self, backend):
+        backend.set("clinic_details:1", {"title": "Klinik"}, 60)
+
+        assert backend.get("clinic_details:1") == {"title": "Klinik"}
+        backend.delete("clinic_details:1")
+        assert backend.get("clinic_details:1") is None
+
+    def test_zero_ttl_disables_caching(self, backend):
+        backend.set("key", "value", 0)
+
+        assert backend.get("key") is None
+
+    def test_tags_drop_every_entry_carrying_them(self, backend):
+        backend.set("clinic_details:1", "clinic 1", 60, tags=["clinics", "clinic:1", "package:7"])
+        backend.set("clinic_details:2", "clinic 2", 60, tags=["clinics", "clinic:2"])
+        backend.set("patient_details:9", "patient 9", 60, tags=["clinic:1"])
+        backend.set("package_details:7", "package 7", 60, tags=["packages", "package:7"])
+
+        assert backend.invalidate_tags(["clinic:1"]) == 2
+        assert backend.get("clinic_details:1") is None and backend.get("patient_details:9") is None
+        assert backend.get("clinic_details:2") == "clinic 2"
+
+        assert backend.invalidate_tags(["package:7", "unknown"]) == 1
+        assert backend.get("package_details:7") is None
+
+        # entries tagged after an invalidation are tracked again
+        backend.set("clinic_details:1", "clinic 1 v2", 60, tags=["clinic:1"])
+        assert backend.invalidate_tags(["clinic:1"]) == 1
+
+    def test_clear(self, backend):
+        backend.set("a", 1, 60, tags=["t"])
+        backend.clear()
+
+        assert backend.get("a") is None
+        assert backend.invalidate_tags(["t"]) == 0
+
+
+class TestMemoryCacheBackend:
+    """Test cases for the in-process LRU backend."""
+
+    def test_entries_expire_after_ttl(self):
+        backend = MemoryCacheBackend()
+        with patch("app.utils.cache_backends.time.monotonic", return_value=100.0):
+            backend.set("key", "value", 30, tags=["tag"])
+        with patch("app.utils.cache_backends.time.monotonic", return_value=129.0):
+            assert backend.get("key") == "value"
+        with patch("app.utils.cache_backends.time.monotonic", return_value=130.0):
+            assert backend.get("key") is None
+        assert backend._tags == {}
+
+    def test_least_recently_used_entry_is_evicted(self):
+        backend = MemoryCacheBackend(max_entries=2)
+        backend.set("a", 1, 60, tags=["t"])
+        backend.set("b", 2, 60)
+        backend.get("a")
+        backend.set("c", 3, 60)
+
+        assert backend.get("a") == 1 and backend.get("b") is None and backend.get("c") == 3
+
+
+class TestRedisCacheBackend:
+    """Test cases specific to the network backend."""
+
+    @pytest.fixture
+    def client(self):
+        fakeredis = pytest.importorskip("fakeredis")
+        return fakeredis.FakeRedis()
+
+    def test_entries_and_tag_sets_expire(self, client):
+        backend = RedisCacheBackend(client, prefix="c:")
+        backend.set("short", 1, 10, tags=["shared"])
+        backend.set("long", 2, 60, tags=["shared"])
+        backend.set("shorter", 3, 5, tags=["shared"])
+
+        assert 9_000 < client.pttl("c:k:short") <= 10_000
+        # the tag set lives as long as its longest-lived member
+        assert 59_000 < client.pttl("c:t:shared") <= 60_000
+
+    def test_lock_is_exclusive_until_released(self, client):
+        backend = RedisCacheBackend(client, prefix="c:")
+
+        assert backend.acquire_lock("clinic_details:1", 5)
+        assert not backend.acquire_lock("clinic_details:1", 5)
+        backend.release_lock("clinic_details:1")
+        assert backend.acquire_lock("clinic_details:1", 5)
+
+    def test_loaders_in_other_processes_wait_for_the_value(self, client):
+        prefix = f"test-{uuid.uuid4().hex[:8]}:"
+        # two workers: separate single-flight groups, one shared server
+        first = TaggedCache(RedisCacheBackend(client, prefix=prefix), "clinic_details", 60, SingleFlight())
+        second = TaggedCache(RedisCacheBackend(client, prefix=prefix), "clinic_details", 60, SingleFlight())
+        started = threading.Event()
+        release = threading.Event()
+        calls = []
+
+        def slow_loader():
+            calls.append(1)
+            started.set()
+            assert release.wait(5)
+            return {"title": "Klinik"}
+
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            leader = pool.submit(first.get_or_set, "1", slow_loader)
+            assert started.wait(5)
+            waiter = pool.submit(second.get_or_set, "1", slow_loader)
+            time.sleep(0.05)
+            release.set()
+            assert leader.result() == waiter.result() == {"title": "Klinik"}
+
+        assert len(calls) == 1
+
+
+class TestTaggedCache:
+    """Test cases for cache-aside reads with stampede protection."""
+
+    def test_concurrent_misses_load_once(self):
+        cache = TaggedCache(MemoryCacheBackend(), "packages", 60)
+        release = threading.Event()
+        calls = []
+
+        def loader():
+            calls.append(1)
+            assert release.wait(5)
+            return ["package"]
+
+        with ThreadPoolExecutor(max_workers=10) as pool:
+            futures = [pool.submit(cache.get_or_set, "all", loader) for _ in range(10)]
+            deadline = time.monotonic() + 5
+            while cache.single_flight.stats()["flights"].get("packages", {}).get("coalesced", 0) < 9:
+                assert time.monotonic() < deadline
+                time.sleep(0.005)
+            release.set()
+            assert [future.result() for future in futures] == [["package"]] * 10
+
+        assert len(calls) == 1
+        assert cache.get_or_set("all", lambda: pytest.fail("served from cache")) == ["package"]
+
+    def test_missing_values_are_not_cached_and_tags_may_depend_on_the_value(self):
+        cache = TaggedCache(MemoryCacheBackend(), "clinic_details", 60)
+
+        assert cache.get_or_set("unknown", lambda: None) is None
+        assert cache.get("unknown") is None
+
+        cache.get_or_set("1", lambda: {"packages": [{"id": "7"}]}, tags=lambda value: [
+            package_tag(package["id"]) for package in value["packages"]
+        ])
+        cache.invalidate_tags(package_tag("7"))
+        assert cache.get("1") is None
+
+    def test_namespaces_share_tags_but_not_keys(self):
+        cache = TaggedCache(MemoryCacheBackend(), "clinic_details", 60)
+        patients = cache.namespaced("patient_details", 30)
+        cache.set("1", "clinic", tags=[clinic_tag(1)])
+        patients.set("1", "patient", tags=[clinic_tag(1)])
+
+        assert cache.get("1") == "clinic" and patients.get("1") == "patient"
+        cache.invalidate_tags(clinic_tag(1))
+        assert cache.get("1") is None and patients.get("1") is None
+
+
+class TestWriteInvalidation:
+    """Writes retire the cached reads built from the rows they touch."""
+
+    def test_catalog_writes(self):
+        clinic_id, package_id, patient_id = uuid.uuid4(), uuid.uuid4(), str(uuid.uuid4())
+        clinic_details_cache.set((clinic_id, None), {"id": clinic_id}, tags=[
+            "clinics", clinic_tag(clinic_id), package_tag(package_id)
+        ])
+        package_details_cache.set((package_id, None), {"id": package_id}, tags=["packages", package_tag(package_id)])
+        patient_details_cache.set(patient_id, {"id": patient_id}, tags=[clinic_tag(clinic_id)])
+
+        invalidate_catalog(package_ids=[package_id])
+        assert clinic_details_cache.get((clinic_id, None)) is None
+        assert package_details_cache.get((package_id, None)) is None
+        assert patient_details_cache.get(patient_id) == {"id": patient_id}
+
+        invalidate_catalog([clinic_id])
+        assert patient_details_cache.get(patient_id) is None
+
+        clinic_details_cache.set((clinic_id, None), {"id": clinic_id}, tags=["clinics"])
+        invalidate_catalog(all_clinics=True)
+        assert clinic_details_cache.get((clinic_id, None)) is None
+
+    def test_cal_webhook_retires_todays_consultations(self):
+        class Consultation:
+            patient_profile_id = uuid.uuid4()
+
+        consultations_cache.set("2026-10-18", [{"id": "1"}], tags=[CONSULTATIONS_TAG])
+        patient_details_cache.set(str(Consultation.patient_profile_id), {"id": "p"})
+
+        ConsultationService._invalidate_reads(Consultation())
+
+        assert consultations_cache.get("2026-10-18") is None
+        assert patient_details_cache.get(str(Consultation.patient_profile_id)) is None
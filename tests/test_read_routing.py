@@ -0,0 +1,182 @@
+"""
+Tests for read-replica routing: which session factory serves each request,
+read-your-writes pins, lag fallback, and the delayed re-eviction of caches a
+replica may have refilled. Lag is measured against a live server when a
+Postgres DATABASE_URL is reachable.
+"""
+
+import os
+import time
+
+import pytest
+from fastapi import Depends, FastAPI, Request
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.services import cache_events
+from app.services.cache_invalidation import InvalidationListener
+from app.services.read_routing import ReadRouter
+from app.utils import MemoryCacheBackend, TaggedCache
+
+
+def make_request(method="GET", device_id=None, host="10.0.0.1"):
+    headers = [(b"x-device-id", device_id.encode())] if device_id else []
+    return Request({"type": "http", "method": method, "headers": headers, "client": (host, 5000)})
+
+
+@pytest.fixture
+def factories():
+    primary = create_engine("sqlite://")
+    replica = create_engine("sqlite://")
+    yield sessionmaker(bind=primary), sessionmaker(bind=replica)
+    primary.dispose()
+    replica.dispose()
+
+
+@pytest.fixture
+def router(factories):
+    primary, replica = factories
+    pins = TaggedCache(MemoryCacheBackend(), "primary_pins", ttl_seconds=10)
+    router = ReadRouter(primary, replica, pins, max_lag_seconds=5)
+    router.replica_lag_seconds = lambda: 0.0
+    return router
+
+
+def engine_of(session):
+    return session.get_bind()
+
+
+def commit_write(session):
+    session.execute(text("SELECT 1"))
+    session.commit()
+    session.close()
+
+
+class TestReadRouter:
+    """Test cases for per-request session routing."""
+
+    def test_reads_use_the_replica_and_writes_the_primary(self, router, factories):
+        primary, replica = factories
+
+        assert engine_of(router.session_for(make_request("GET"))) is replica.kw["bind"]
+        assert engine_of(router.session_for(make_request("HEAD"))) is replica.kw["bind"]
+        for method in ("POST", "PUT", "PATCH", "DELETE"):
+            assert engine_of(router.session_for(make_request(method))) is primary.kw["bind"]
+        assert router.stats()["sessions"] == {"primary": 4, "replica": 2, "pinned": 0, "lagging": 0}
+
+    def test_clients_read_their_own_writes_from_the_primary(self, router, factories):
+        primary, replica = factories
+        commit_write(router.session_for(make_request("PUT", device_id="tablet")))
+
+        assert engine_of(router.session_for(make_request("GET", device_id="tablet"))) is primary.kw["bind"]
+        # another device, and the same address without the device header, still read the replica
+        assert engine_of(router.session_for(make_request("GET", device_id="laptop"))) is replica.kw["bind"]
+        assert engine_of(router.session_for(make_request("GET"))) is replica.kw["bind"]
+
+        commit_write(router.session_for(make_request("POST", host="10.0.0.2")))
+        assert engine_of(router.session_for(make_request("GET", host="10.0.0.2"))) is primary.kw["bind"]
+        assert router.stats()["sessions"]["pinned"] == 2
+
+    def test_pins_expire_after_the_sticky_window(self, factories):
+        primary, replica = factories
+        router = ReadRouter(primary, replica, TaggedCache(MemoryCacheBackend(), "pins", ttl_seconds=0.05), 5)
+        router.replica_lag_seconds = lambda: 0.0
+        commit_write(router.session_for(make_request("POST", device_id="tablet")))
+
+        time.sleep(0.1)
+        assert engine_of(router.session_for(make_request("GET", device_id="tablet"))) is replica.kw["bind"]
+
+    @pytest.mark.parametrize("lag", [12.0, None])
+    def test_lagging_or_unreachable_replica_falls_back_to_the_primary(self, router, factories, lag):
+        primary, _ = factories
+        router.replica_lag_seconds = lambda: lag
+
+        assert engine_of(router.session_for(make_request("GET"))) is primary.kw["bind"]
+        assert router.stats()["sessions"]["lagging"] == 1
+
+    def test_without_a_replica_everything_uses_the_primary(self, factories):
+        primary, _ = factories
+        pins = TaggedCache(MemoryCacheBackend(), "pins", ttl_seconds=10)
+        router = ReadRouter(primary, primary, pins, 5)
+        commit_write(router.session_for(make_request("POST", device_id="tablet")))
+
+        assert engine_of(router.session_for(make_request("GET"))) is primary.kw["bind"]
+        assert pins.get("device:tablet") is None
+        assert router.stats() == {
+            "configured": False,
+            "lagSeconds": 0.0,
+            "sessions": {"primary": 2, "replica": 0, "pinned": 0, "lagging": 0},
+        }
+
+    def test_dependency_routes_by_method(self, router, factories):
+        primary, replica = factories
+
+        def get_db(request: Request):
+            db = router.session_for(request)
+            try:
+                yield db
+            finally:
+                db.close()
+
+        app = FastAPI()
+
+        @app.get("/source")
+        def read(db: Session = Depends(get_db)):
+            return {"replica": db.get_bind() is replica.kw["bind"]}
+
+        @app.post("/source")
+        def write(db: Session = Depends(get_db)):
+            db.execute(text("SELECT 1"))
+            db.commit()
+            return {"replica": db.get_bind() is replica.kw["bind"]}
+
+        client = TestClient(app)
+        headers = {"X-Device-Id": "tablet"}
+        assert client.get("/source", headers=headers).json() == {"replica": True}
+        assert client.post("/source", headers=headers).json() == {"replica": False}
+        assert client.get("/source", headers=headers).json() == {"replica": False}
+
+
+def test_changes_are_evicted_again_after_the_sticky_window():
+    events = []
+    listener = InvalidationListener(
+        "", "channel", on_event=lambda entity, ids: events.append((entity, ids)), replay_seconds=0.05
+    )
+
+    listener.handle(cache_events.encode_event(cache_events.CLINIC, ["1"]))
+    listener.handle('{"origin": "another-worker", "entity": "package", "ids": null}')
+    assert events == [("package", None)]
+    assert listener.apply_due_replays() == 0
+
+    time.sleep(0.1)
+    assert listener.apply_due_replays() == 2
+    assert events == [("package", None), ("clinic", ["1"]), ("package", None)]
+
+
+def test_replica_lag_is_measured_on_the_server():
+    database_url = os.getenv("DATABASE_URL")
+    if not database_url or not database_url.startswith("postgresql"):
+        pytest.skip("DATABASE_URL must point at a Postgres database")
+    # a second engine onto the same server stands in for the replica
+    primary, replica = create_engine(database_url), create_engine(database_url)
+    unreachable = create_engine("postgresql+psycopg://nobody@127.0.0.1:1/none")
+    try:
+        try:
+            replica.connect().close()
+        except OperationalError as exc:
+            pytest.skip(f"Postgres not reachable: {exc}")
+        pins = TaggedCache(MemoryCacheBackend(), "pins", ttl_seconds=10)
+
+        router = ReadRouter(sessionmaker(bind=primary), sessionmaker(bind=replica), pins, 5)
+        # not in recovery, so not behind
+        assert router.replica_lag_seconds() == 0.0
+        assert router.stats()["configured"] is True
+
+        router = ReadRouter(sessionmaker(bind=primary), sessionmaker(bind=unreachable), pins, 5)
+        assert router.replica_lag_seconds() is None
+        assert router._read_route(None) == "lagging"
+    finally:
+        for engine in (primary, replica, unreachable):
+            engine.dispose()
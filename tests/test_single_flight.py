@@ -0,0 +1,173 @@
+"""
+Tests for single-flight coalescing of concurrent identical reads.
+"""
+
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+import pytest
+
+from app.services.consultation_service import ConsultationService
+from app.services.read_cache import consultations_cache
+from app.services.request_coalescing import request_coalescer
+from app.utils import SingleFlight
+
+
+class SlowQuery:
+    """Counts executions and holds each one open until released."""
+
+    def __init__(self):
+        self.calls = 0
+        self.release = threading.Event()
+
+    def __call__(self, value="rows"):
+        self.calls += 1
+        assert self.release.wait(5)
+        return [value]
+
+
+def wait_until(predicate, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not predicate() and time.monotonic() < deadline:
+        time.sleep(0.005)
+    assert predicate()
+
+
+class TestSingleFlight:
+    """Test cases for SingleFlight."""
+
+    def test_concurrent_identical_calls_share_one_execution(self):
+        flight = SingleFlight()
+        query = SlowQuery()
+
+        with ThreadPoolExecutor(max_workers=20) as pool:
+            futures = [pool.submit(flight.do, ("clinics", 1, 20), query) for _ in range(20)]
+            wait_until(lambda: flight.stats()["flights"].get("clinics", {}).get("coalesced") == 19)
+            query.release.set()
+            results = [future.result() for future in futures]
+
+        assert query.calls == 1
+        assert all(result is results[0] for result in results)
+        assert flight.stats() == {"inFlight": 0, "flights": {"clinics": {"executions": 1, "coalesced": 19}}}
+
+    def test_different_keys_and_later_calls_run_again(self):
+        flight = SingleFlight()
+        query = SlowQuery()
+        query.release.set()
+
+        assert flight.do(("packages", False), query, "a") == ["a"]
+        assert flight.do(("packages", True), query, "b") == ["b"]
+        assert flight.do(("packages", False), query, "c") == ["c"]
+        assert query.calls == 3
+        assert flight.stats()["flights"]["packages"] == {"executions": 3, "coalesced": 0}
+
+    def test_errors_are_shared_and_not_remembered(self):
+        flight = SingleFlight()
+        started = threading.Event()
+        release = threading.Event()
+
+        def failing():
+            started.set()
+            release.wait(5)
+            raise RuntimeError("database unavailable")
+
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            leader = pool.submit(flight.do, "key", failing)
+            assert started.wait(5)
+            follower = pool.submit(flight.do, "key", failing)
+            wait_until(lambda: flight.stats()["flights"]["key"]["coalesced"] == 1)
+            release.set()
+            for future in (leader, follower):
+                with pytest.raises(RuntimeError, match="database unavailable"):
+                    future.result()
+
+        assert flight.do("key", lambda: "recovered") == "recovered"
+
+    def test_async_callers_coalesce_off_the_event_loop(self):
+        flight = SingleFlight()
+        query = SlowQuery()
+
+        async def scenario():
+            tasks = [asyncio.create_task(flight.run(("clinics", 1), query)) for _ in range(10)]
+            # the event loop stays free while the leader runs in the threadpool
+            while flight.stats()["flights"].get("clinics", {}).get("coalesced", 0) < 9:
+                await asyncio.sleep(0.005)
+            query.release.set()
+            return await asyncio.gather(*tasks)
+
+        results = asyncio.run(scenario())
+        assert query.calls == 1
+        assert results == [["rows"]] * 10
+
+    def test_decorator_keys_ignore_self(self):
+        flight = SingleFlight()
+        query = SlowQuery()
+
+        class Service:
+            def __init__(self, db):
+                self.db = db
+
+            @flight.coalesce("today", key=lambda service: "2026-10-18")
+            def get_today(self):
+                return query()
+
+        with ThreadPoolExecutor(max_workers=5) as pool:
+            futures = [pool.submit(Service(db=index).get_today) for index in range(5)]
+            wait_until(lambda: flight.stats()["flights"].get("today", {}).get("coalesced") == 4)
+            query.release.set()
+            assert [future.result() for future in futures] == [["rows"]] * 5
+
+        assert query.calls == 1
+        assert Service.get_today.__name__ == "get_today"
+
+
+def test_todays_consultations_are_coalesced():
+    query = SlowQuery()
+
+    class Repository:
+        def get_todays_consultations(self):
+            query()
+            return []
+
+    def service():
+        consultation_service = ConsultationService.__new__(ConsultationService)
+        consultation_service.consultation_repository = Repository()
+        return consultation_service
+
+    consultations_cache.delete(datetime.now().date().isoformat())
+    before = request_coalescer.stats()["flights"].get("consultations_today", {"executions": 0, "coalesced": 0})
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        futures = [pool.submit(service().get_todays_consultations) for _ in range(8)]
+        wait_until(
+            lambda: request_coalescer.stats()["flights"]["consultations_today"]["coalesced"]
+            == before["coalesced"] + 7
+        )
+        query.release.set()
+        assert [future.result() for future in futures] == [[]] * 8
+
+    assert query.calls == 1
+
+
+def test_failed_consultation_load_is_not_cached():
+    class Repository:
+        fail = True
+
+        def get_todays_consultations(self):
+            if self.fail:
+                raise RuntimeError("connection reset")
+            return []
+
+    consultation_service = ConsultationService.__new__(ConsultationService)
+    consultation_service.consultation_repository = Repository()
+    key = datetime.now().date().isoformat()
+    consultations_cache.delete(key)
+
+    assert consultation_service.get_todays_consultations() == []
+    assert consultations_cache.get(key) is None
+
+    Repository.fail = False
+    assert consultation_service.get_todays_consultations() == []
+    assert consultations_cache.get(key) == []
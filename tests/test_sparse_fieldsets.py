@@ -0,0 +1,150 @@
+"""
+Tests for sparse fieldsets (`fields=` / `include=`) on catalog and patient reads.
+
+The Postgres-backed test runs in a throw-away schema and checks that a sparse
+clinic page is one narrow SELECT with no package loading. It is skipped when
+no Postgres DATABASE_URL is reachable.
+"""
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.database.repositories.clinic_repository import ClinicRepository
+from app.database.repositories.package_repository import PackageRepository
+from app.services.catalog_serializer import (
+    CLINIC_FIELDS,
+    CLINIC_RELATIONSHIPS,
+    clinic_columns,
+    clinic_dict,
+    clinic_dicts,
+    package_dict,
+)
+from app.utils import FieldsetUtils
+from tests.test_catalog_serializer import make_clinic, make_package
+
+
+def clinic_selection(fields=None, include=None):
+    return FieldsetUtils.merge(
+        FieldsetUtils.parse(fields, CLINIC_FIELDS),
+        FieldsetUtils.parse(include, CLINIC_RELATIONSHIPS, required=()),
+        CLINIC_FIELDS,
+        CLINIC_RELATIONSHIPS,
+    )
+
+
+class TestFieldsetUtils:
+    """Test cases for parsing and merging fields/include."""
+
+    def test_parse_orders_by_allowed_and_adds_id(self):
+        assert FieldsetUtils.parse(None, CLINIC_FIELDS) is None
+        assert FieldsetUtils.parse(" rating, title ,,city", CLINIC_FIELDS) == ("id", "title", "city", "rating")
+        assert FieldsetUtils.parse("", CLINIC_RELATIONSHIPS, required=()) == ()
+
+    def test_unknown_fields_are_rejected(self):
+        with pytest.raises(ValueError, match="Unknown field\\(s\\): nope, price"):
+            FieldsetUtils.parse("title,price,nope", CLINIC_FIELDS)
+
+    def test_merge(self):
+        attributes = tuple(name for name in CLINIC_FIELDS if name != "packages")
+
+        assert clinic_selection() is None
+        assert clinic_selection("title") == ("id", "title")
+        assert clinic_selection("title", "packages") == ("id", "title", "packages")
+        assert clinic_selection("title,packages") == ("id", "title", "packages")
+        assert clinic_selection(include="") == attributes
+        assert clinic_selection(include="packages") == tuple(CLINIC_FIELDS)
+
+
+class TestSparseSerializer:
+    """Test cases for serializing only the selected keys."""
+
+    def test_sparse_clinic_keeps_response_names_and_order(self):
+        package = make_package(1)
+        clinic = make_clinic(3, package_ids=[package.id], categories=None)
+
+        data = clinic_dict(clinic, {package.id: package}, fields=clinic_selection("hasContract,categories,title,packages"))
+
+        assert list(data) == ["id", "title", "categories", "hasContract", "packages"]
+        assert data["categories"] == []
+        assert data["packages"] == [package_dict(package)]
+
+    def test_sparse_output_is_a_subset_of_the_full_output(self):
+        lookup = {package.id: package for package in (make_package(index) for index in range(2))}
+        clinics = [make_clinic(index, package_ids=lookup) for index in range(3)]
+        selection = clinic_selection("title,city,rating,packageIds")
+
+        full = clinic_dicts(clinics, lookup)
+        sparse = clinic_dicts(clinics, lookup, fields=selection)
+        assert sparse == [{key: row[key] for key in selection} for row in full]
+
+    def test_sparse_package(self):
+        package = make_package(1)
+        assert package_dict(package, ("id", "name", "price")) == {
+            "id": package.id,
+            "name": "Package 1",
+            "price": package.price,
+        }
+
+    def test_columns_for_selection(self):
+        assert clinic_columns(None) is None
+        assert clinic_columns(clinic_selection("title,hasContract")) == ["id", "title", "has_contract"]
+        assert clinic_columns(clinic_selection("title", "packages")) == ["id", "title", "package_ids"]
+
+
+@pytest.fixture(scope="module")
+def catalog_connection(pg_schema):
+    """A connection onto a throw-away schema with linked clinics and packages."""
+    connection = pg_schema.connect()
+    with Session(bind=connection) as session:
+        PackageRepository(session).bulk_upsert([{"name": f"Package {index}"} for index in (1, 2, 3)])
+    connection.exec_driver_sql("""
+        INSERT INTO clinics (id, title, city, rating, has_contract, package_ids, created_at, updated_at)
+        SELECT gen_random_uuid(), 'Clinic ' || g, 'Istanbul', 4.5, false,
+               (SELECT array_agg(id ORDER BY name) FROM packages), now(), now()
+        FROM generate_series(1, 50) AS g
+    """)
+    connection.exec_driver_sql("""
+        INSERT INTO clinic_packages (clinic_id, package_id)
+        SELECT clinics.id, packages.id FROM clinics CROSS JOIN packages
+    """)
+    connection.commit()
+    return connection
+
+
+def test_sparse_page_is_one_narrow_select(catalog_connection):
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(catalog_connection, "before_cursor_execute", record)
+    try:
+        with Session(bind=catalog_connection) as session:
+            repository = ClinicRepository(session)
+            selection = clinic_selection("title,city,rating")
+            clinics = repository.list_page(
+                limit=20,
+                columns=clinic_columns(selection),
+                with_packages=False,
+            )
+            payload = clinic_dicts(clinics[:20], fields=selection)
+
+            assert len(statements) == 1
+            assert "opening_hours" not in statements[0] and "clinic_packages" not in statements[0]
+            assert payload[0]["title"].startswith("Clinic ") and set(payload[0]) == {"id", "title", "city", "rating"}
+
+            statements.clear()
+            session.expunge_all()
+            clinics = repository.list_page(limit=20)
+            full = clinic_dicts(clinics[:20])
+            # clinics, then their packages; the packages' clinics are not loaded back
+            assert len(statements) == 2
+            assert len(full[0]["packages"]) == 3
+
+            statements.clear()
+            packages = PackageRepository(session).list(columns=["name"])
+            assert len(statements) == 1 and "description" not in statements[0]
+            assert sorted(package.name for package in packages) == ["Package 1", "Package 2", "Package 3"]
+    finally:
+        event.remove(catalog_connection, "before_cursor_execute", record)
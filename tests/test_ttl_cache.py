@@ -0,0 +1,49 @@
+"""
+Tests for the in-process TTL cache backing patient detail reads.
+"""
+
+import uuid
+from unittest.mock import patch
+
+from app.services.patient_cache import invalidate_patient_details, patient_details_cache
+from app.utils import TTLCache
+
+
+class TestTTLCache:
+    """Test cases for TTLCache."""
+
+    def test_entries_expire_after_ttl(self):
+        cache = TTLCache(ttl_seconds=30)
+        with patch("app.utils.ttl_cache.time.monotonic", return_value=100.0):
+            cache.set("key", {"value": 1})
+        with patch("app.utils.ttl_cache.time.monotonic", return_value=129.0):
+            assert cache.get("key") == {"value": 1}
+        with patch("app.utils.ttl_cache.time.monotonic", return_value=130.0):
+            assert cache.get("key") is None
+
+    def test_zero_ttl_disables_caching(self):
+        cache = TTLCache(ttl_seconds=0)
+        cache.set("key", "value")
+
+        assert cache.get("key") is None
+
+    def test_full_cache_evicts_entry_closest_to_expiry(self):
+        cache = TTLCache(ttl_seconds=30, max_entries=2)
+        with patch("app.utils.ttl_cache.time.monotonic") as monotonic:
+            for now, key in enumerate(["first", "second", "third"], start=1):
+                monotonic.return_value = float(now)
+                cache.set(key, now)
+
+            assert cache.get("first") is None
+            assert cache.get("second") == 2
+            assert cache.get("third") == 3
+
+    def test_invalidate_patient_details_drops_entry(self):
+        """Writers invalidate by profile ID, whether given as UUID or string."""
+        patient_id = uuid.uuid4()
+        patient_details_cache.set(str(patient_id), {"id": str(patient_id)})
+
+        invalidate_patient_details(patient_id)
+        invalidate_patient_details(None)
+
+        assert patient_details_cache.get(str(patient_id)) is None